@@ -0,0 +1,333 @@
+"""Suite de benchmarks de los caminos calientes: simulación, estimación y resumen.
+
+Cada caso corre en un proceso nuevo (``spawn``) para que la memoria pico no
+dependa de casos anteriores, y registra:
+
+- ``wall_s``: mejor tiempo de ``--repeat`` repeticiones (y la mediana);
+- ``peak_rss_mb``: pico de RSS durante las llamadas medidas menos el RSS
+  previo. En Linux el pico (``VmHWM``) se reinicia tras el calentamiento vía
+  ``/proc/self/clear_refs``; si no se puede, se usa ``ru_maxrss`` (pico de toda
+  la vida del proceso, incluye armar las entradas) y la cifra es aproximada.
+  Mide páginas residentes, no bytes asignados: el allocator puede retener o
+  devolver memoria entre llamadas;
+- ``ess_bulk_min`` y ``ess_per_s`` (sólo Bayes): ESS bulk mínimo de ``b`` y
+  ESS por segundo de muestreo (``wall_s`` incluye además la compilación).
+
+La caché de respuestas del proceso (``data_access.response_cache``) se
+desactiva en el hijo: cada repetición mide el camino frío (filtrado y
+conversión a disperso incluidos), no un acierto de caché.
+
+Los resultados se agregan a un historial JSONL (una línea por caso y corrida) y
+se comparan contra un baseline guardado con ``--save-baseline``. Todo corre
+offline en CPU.
+
+Uso::
+
+    python benchmarks/bench_hot_paths.py --suite quick
+    python benchmarks/bench_hot_paths.py --suite quick --save-baseline
+    python benchmarks/bench_hot_paths.py --suite full --fail-on-regression --threshold 0.10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_DIR = Path("data/09_tracking/benchmarks")
+
+# Barridos personas × ítems × percent por estimador. Bayes usa draws/tune cortos:
+# interesa el costo relativo entre cambios de código, no la convergencia.
+SUITES: dict[str, dict[str, dict[str, Any]]] = {
+    "quick": {
+        "simulate": {"persons": [1000, 5000], "items": [40, 80]},
+        "mmle": {"persons": [1000], "items": [40, 80], "percent": [0.5, 1.0]},
+        "bayes": {"persons": [200], "items": [20], "percent": [1.0], "draws": 200, "tune": 200, "chains": 2},
+        "summary": {"persons": [1000], "items": [80], "cells": [100]},
+    },
+    "full": {
+        "simulate": {"persons": [1000, 10000, 50000], "items": [40, 80, 160]},
+        "mmle": {"persons": [1000, 5000], "items": [40, 80], "percent": [0.1, 0.5, 1.0]},
+        "bayes": {"persons": [500, 1000], "items": [40, 80], "percent": [0.5, 1.0], "draws": 500, "tune": 500, "chains": 2},
+        "summary": {"persons": [1000], "items": [80], "cells": [100, 2500]},
+    },
+}
+
+# Métricas comparadas contra el baseline y su sentido (True = más alto es mejor)
+COMPARED_METRICS = {"wall_s": False, "peak_rss_mb": False, "ess_per_s": True}
+
+
+# --------------------------------------------------------------------------- #
+# Entradas sintéticas (deterministas)
+# --------------------------------------------------------------------------- #
+def _inputs(persons: int, items: int, percent: float = 1.0, seed: int = 123):
+    import numpy as np
+
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1.nodes import (
+        generate_abilities_s1,
+        generate_difficulties_s1,
+        simulate_responses_s1,
+    )
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.subsample_s1.nodes import (
+        generate_subsample_mask_for_percent,
+    )
+
+    difficulties = generate_difficulties_s1(items, {"mean": 0.55, "variance": 0.457}, seed=seed)
+    abilities = generate_abilities_s1(persons, {"mean": 0.0, "variance": 1.0}, seed=seed)
+    responses = simulate_responses_s1(difficulties, abilities, seed=seed)
+    mask = generate_subsample_mask_for_percent(persons, seed=seed, percent=percent)
+    rng = np.random.default_rng(seed)
+    prior_pred = difficulties.rename(columns={"difficulty": "predicted_difficulty"})
+    prior_pred["predicted_difficulty"] += rng.normal(0.0, 0.3, items)
+    return difficulties, abilities, responses, mask, prior_pred
+
+
+# --------------------------------------------------------------------------- #
+# Casos: cada uno devuelve (función a medir, extractor de métricas extra)
+# --------------------------------------------------------------------------- #
+def _case_simulate(persons: int, items: int, **_: Any):
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1.nodes import simulate_responses_s1
+
+    difficulties, abilities, *_rest = _inputs(persons, items)
+    return lambda: simulate_responses_s1(difficulties, abilities, seed=123), None
+
+
+def _case_mmle(persons: int, items: int, percent: float, **_: Any):
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.mmle_estimation_s1.nodes import mmle_estimate_for_mask
+
+    _, _, responses, mask, _ = _inputs(persons, items, percent)
+    return lambda: mmle_estimate_for_mask(responses, mask, percent=percent), None
+
+
+def _case_bayes(persons: int, items: int, percent: float, draws: int, tune: int, chains: int, **_: Any):
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.bayes_estimation_s1.nodes import sample_bayes_posterior
+
+    _, _, responses, mask, prior_pred = _inputs(persons, items, percent)
+
+    def run():
+        return sample_bayes_posterior(
+            responses, mask, prior_pred, None, 0.457, draws, tune, chains, 0.9, seed=123
+        )
+
+    def extra(idata, wall_s: float) -> dict[str, float]:
+        import arviz as az
+
+        ess = az.ess(idata, var_names=["b"], method="bulk")["b"].values
+        ess_min = float(ess.min())
+        # ESS/s sobre el tiempo de muestreo (sin compilación del modelo)
+        sampling_s = float(idata.sample_stats.attrs.get("sampling_time", wall_s))
+        return {
+            "ess_bulk_min": ess_min,
+            "sampling_s": sampling_s,
+            "ess_per_s": ess_min / sampling_s if sampling_s > 0 else float("nan"),
+        }
+
+    return run, extra
+
+
+def _case_summary(persons: int, items: int, cells: int, **_: Any):
+    import numpy as np
+
+    from analisis_calidad_estimacion_1pl_bayesiana.datasets import make_results_frame
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.bayes_estimation_s1.nodes import summarize_bayes_estimation
+
+    difficulties, *_rest = _inputs(persons, items)
+    rng = np.random.default_rng(0)
+    truth = difficulties["difficulty"].to_numpy()
+    side = int(np.ceil(np.sqrt(cells)))
+    estimates = {}
+    for k in range(cells):
+        p, r = (k // side + 1) / side, (k % side + 1) / side
+        estimates[f"est_{k}"] = make_results_frame(
+            "bayes", truth + rng.normal(0, 0.2, items), sd=np.full(items, 0.2), percent=p, r_level=r
+        )
+    return lambda: summarize_bayes_estimation(difficulties, **estimates), None
+
+
+CASES: dict[str, Callable] = {
+    "simulate": _case_simulate,
+    "mmle": _case_mmle,
+    "bayes": _case_bayes,
+    "summary": _case_summary,
+}
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _reset_peak_rss() -> bool:
+    """Reinicia ``VmHWM`` (Linux >= 4.0); False si el kernel no lo permite."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset: bool) -> float:
+    if reset:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # kB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB en Linux
+
+
+def _run_case(kind: str, params: dict[str, Any], repeat: int) -> dict[str, Any]:
+    """Se ejecuta en el proceso hijo: arma entradas, mide y devuelve métricas."""
+    import logging
+
+    from analisis_calidad_estimacion_1pl_bayesiana.data_access import response_cache
+
+    logging.disable(logging.WARNING)
+    # Presupuesto 0: nada se guarda y cada repetición recalcula lo cacheable
+    response_cache().resize(0)
+    fn, extra = CASES[kind](**params)
+    # Una corrida de calentamiento (imports diferidos, cachés) salvo en Bayes,
+    # donde cada corrida ya es cara y el ESS/s usa sólo el tiempo de muestreo.
+    if extra is None:
+        fn()
+    reset = _reset_peak_rss()
+    rss_before = _rss_mb()
+    times, out = [], None
+    for _ in range(1 if kind == "bayes" else repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    peak_mb = _peak_rss_mb(reset)
+    result = {
+        "wall_s": min(times),
+        "wall_s_median": statistics.median(times),
+        "repeats": len(times),
+        "peak_rss_mb": max(peak_mb - rss_before, 0.0),
+        "peak_rss_exact": reset,
+    }
+    if extra is not None:
+        result.update(extra(out, min(times)))
+    return result
+
+
+# --------------------------------------------------------------------------- #
+# Orquestación, historial y reporte
+# --------------------------------------------------------------------------- #
+def _expand(suite: dict[str, dict[str, Any]], only: set[str] | None):
+    for kind, spec in suite.items():
+        if only and kind not in only:
+            continue
+        swept = {k: v for k, v in spec.items() if isinstance(v, list)}
+        fixed = {k: v for k, v in spec.items() if not isinstance(v, list)}
+        for combo in product(*swept.values()):
+            params = {**dict(zip(swept, combo)), **fixed}
+            case_id = kind + ":" + ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+            yield case_id, kind, params
+
+
+def _environment() -> dict[str, Any]:
+    import numpy as np
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], threshold: float) -> list[dict]:
+    """Filas de comparación caso × métrica; ``regression`` si empeora más que ``threshold``."""
+    rows = []
+    for case_id, metrics in results.items():
+        base = baseline.get(case_id)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            cur, ref = metrics.get(metric), base.get(metric)
+            if cur is None or ref is None or not ref:
+                continue
+            ratio = cur / ref
+            worse = ratio < 1 - threshold if higher_is_better else ratio > 1 + threshold
+            rows.append({"case": case_id, "metric": metric, "baseline": ref, "current": cur, "ratio": ratio, "regression": worse})
+    return rows
+
+
+def _print_report(rows: list[dict]) -> None:
+    if not rows:
+        print("Sin baseline comparable (use --save-baseline).")
+        return
+    width = max(len(r["case"]) for r in rows)
+    print(f"{'case'.ljust(width)}  {'metric':<12} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for r in rows:
+        flag = "  <-- regresión" if r["regression"] else ""
+        print(f"{r['case'].ljust(width)}  {r['metric']:<12} {r['baseline']:>10.4g} {r['current']:>10.4g} {r['ratio']:>7.3f}{flag}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="limitar a estos estimadores/caminos")
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones por caso (Bayes: 1)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_DIR / "history.jsonl")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_DIR / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="guardar esta corrida como baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="tolerancia relativa para marcar regresión")
+    parser.add_argument("--fail-on-regression", action="store_true", help="salir con código 1 si hay regresiones")
+    args = parser.parse_args(argv)
+
+    env = _environment()
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    results: dict[str, dict[str, Any]] = {}
+    ctx = mp.get_context("spawn")
+
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with args.history.open("a") as history:
+        for case_id, kind, params in _expand(SUITES[args.suite], set(args.only or ())):
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                metrics = pool.submit(_run_case, kind, params, args.repeat).result()
+            results[case_id] = metrics
+            history.write(json.dumps({"run_at": run_at, "suite": args.suite, "case": case_id, "kind": kind,
+                                      "params": params, **metrics, **env}) + "\n")
+            history.flush()
+            extra = f" ess/s={metrics['ess_per_s']:.1f}" if "ess_per_s" in metrics else ""
+            print(f"{case_id}: {metrics['wall_s']:.4f}s peak={metrics['peak_rss_mb']:.1f}MB{extra}")
+
+    rows: list[dict] = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        rows = compare(results, baseline.get("results", {}), args.threshold)
+        print(f"\nComparación vs baseline {baseline.get('git_commit')} ({baseline.get('run_at')}):")
+        _print_report(rows)
+
+    if args.save_baseline:
+        merged = json.loads(args.baseline.read_text()).get("results", {}) if args.baseline.exists() else {}
+        merged.update(results)
+        args.baseline.write_text(json.dumps({"run_at": run_at, **env, "results": merged}, indent=2))
+        print(f"Baseline guardado en {args.baseline}")
+
+    if args.fail_on_regression and any(r["regression"] for r in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
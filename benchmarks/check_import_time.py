@@ -0,0 +1,71 @@
+"""Chequeo de presupuesto de import del proyecto.
+
+Importa el ``pipeline_registry`` y arma todos los pipelines en un proceso nuevo
+(como ``kedro registry list`` o un worker del ParallelRunner) y verifica que:
+
+- no se haya cargado ningún backend pesado (PyMC, pytensor, girth, matplotlib,
+  scikit-learn, arviz): éstos se importan dentro de los nodos que los usan;
+- el tiempo total quede bajo el presupuesto (``--budget`` segundos).
+
+Uso::
+
+    python benchmarks/check_import_time.py --budget 2.0
+
+Sale con código 1 si alguna condición falla.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pymc", "pytensor", "girth", "matplotlib", "sklearn", "arviz")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from analisis_calidad_estimacion_1pl_bayesiana.pipeline_registry import register_pipelines
+t1 = time.perf_counter()
+register_pipelines()
+t2 = time.perf_counter()
+heavy = sorted(m for m in sys.modules if m.split(".")[0] in {heavy!r})
+print(json.dumps({{"import_s": t1 - t0, "register_s": t2 - t1, "heavy": sorted({{m.split(".")[0] for m in heavy}})}}))
+"""
+
+
+def measure() -> dict:
+    """Corre la sonda en un intérprete limpio y devuelve tiempos y módulos pesados."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(heavy=set(HEAVY_MODULES))],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=2.0, help="segundos para import + register_pipelines")
+    args = parser.parse_args(argv)
+
+    result = measure()
+    total = result["import_s"] + result["register_s"]
+    print(
+        f"import={result['import_s']:.3f}s register={result['register_s']:.3f}s "
+        f"total={total:.3f}s budget={args.budget:.3f}s"
+    )
+
+    ok = True
+    if result["heavy"]:
+        print(f"ERROR: módulos pesados importados al registrar pipelines: {result['heavy']}")
+        ok = False
+    if total > args.budget:
+        print(f"ERROR: import fuera de presupuesto ({total:.3f}s > {args.budget:.3f}s)")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Generador de carga sintética para el servicio de puntuación (``serving``).
+
+Simula un banco y respuestas con los nodos de ``sample_s1``
+(``generate_difficulties_s1``, ``generate_abilities_s1``, ``simulate_responses_s1``),
+borra una fracción de ítems por persona (``--missing``, patrones distintos) y
+envía ``--requests`` solicitudes ``POST /score`` con ``--concurrency``
+conexiones keep-alive. Reporta latencia p50/p99 y throughput del cliente, las
+métricas del servidor (``/metrics``) y el error de theta frente a la habilidad
+simulada.
+
+Sin ``--unix``/``--port`` levanta el servicio en el mismo proceso (socket Unix
+temporal) con el banco simulado; ``--compare-unbatched`` repite la carga con
+``max_batch=1`` para medir la ganancia del micro-lote.
+
+Uso::
+
+    python benchmarks/load_scoring_service.py --requests 5000 --concurrency 64
+    python benchmarks/load_scoring_service.py --compare-unbatched
+    python benchmarks/load_scoring_service.py --port 8765 --bank-items 40   # servicio ya corriendo
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1.nodes import (  # noqa: E402
+    generate_abilities_s1,
+    generate_difficulties_s1,
+    simulate_responses_s1,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.serving import ItemBank, start_service  # noqa: E402
+
+
+def build_workload(n_persons: int, n_items: int, missing: float, seed: int) -> tuple[pd.DataFrame, list[dict], np.ndarray]:
+    """Banco (``item_id, estimate``), payloads por persona y habilidades verdaderas."""
+    difficulties = generate_difficulties_s1(n_items, {"mean": 0.0, "variance": 1.0}, seed=seed)
+    abilities = generate_abilities_s1(n_persons, {"mean": 0.0, "variance": 1.0}, seed=seed)
+    responses = simulate_responses_s1(difficulties, abilities, seed=seed)
+    bank = difficulties.rename(columns={"difficulty": "estimate"})
+
+    rng = np.random.default_rng(seed)
+    values = responses.drop(columns=["person_id"]).to_numpy()
+    administered = rng.random(values.shape) >= missing
+    item_ids = bank["item_id"].astype(str).to_numpy()
+    payloads = [
+        {"id": int(pid), "responses": {item_ids[k]: int(values[p, k]) for k in np.flatnonzero(administered[p])}}
+        for p, pid in enumerate(responses["person_id"])
+    ]
+    return bank, payloads, abilities.sort_values("person_id")["ability"].to_numpy()
+
+
+async def _request(reader, writer, method: str, path: str, body: bytes = b"") -> tuple[int, Any]:
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: local\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _open(target: dict[str, Any]):
+    if target.get("unix"):
+        return await asyncio.open_unix_connection(target["unix"])
+    return await asyncio.open_connection(target["host"], target["port"])
+
+
+async def run_load(target: dict[str, Any], payloads: list[dict], n_requests: int, concurrency: int) -> dict[str, Any]:
+    bodies = [json.dumps(payloads[i % len(payloads)]).encode() for i in range(n_requests)]
+    latencies: list[float] = []
+    results: dict[int, dict] = {}
+    counter = iter(range(n_requests))
+
+    async def worker() -> None:
+        reader, writer = await _open(target)
+        try:
+            for i in counter:
+                t0 = time.perf_counter()
+                status, result = await _request(reader, writer, "POST", "/score", bodies[i])
+                latencies.append(time.perf_counter() - t0)
+                if status == 200:
+                    results[result["id"]] = result
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - start
+    reader, writer = await _open(target)
+    _, server_metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+    lat_ms = np.asarray(latencies) * 1e3
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": n_requests / elapsed,
+        "client_latency_ms": {
+            "p50": float(np.percentile(lat_ms, 50)),
+            "p99": float(np.percentile(lat_ms, 99)),
+            "mean": float(statistics.fmean(lat_ms)),
+        },
+        "server": server_metrics,
+        "results": results,
+    }
+
+
+async def _in_process(bank: pd.DataFrame, args: argparse.Namespace, max_batch: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        sock = str(Path(tmp) / "scoring.sock")
+        service, server = await start_service(
+            ItemBank.from_frame(bank), method=args.method, max_batch_size=max_batch,
+            max_wait_ms=args.max_wait_ms, unix_path=sock,
+        )
+        try:
+            return await run_load({"unix": sock}, args.payloads, args.requests, args.concurrency)
+        finally:
+            await service.close(server)
+
+
+def _report(label: str, out: dict[str, Any], abilities: np.ndarray) -> None:
+    theta = np.array([out["results"][pid]["theta"] for pid in sorted(out["results"])], dtype=float)
+    true = abilities[np.asarray(sorted(out["results"])) - 1]
+    srv = out["server"]
+    print(
+        f"{label}: {out['throughput_rps']:.0f} req/s | cliente p50={out['client_latency_ms']['p50']:.2f} ms "
+        f"p99={out['client_latency_ms']['p99']:.2f} ms | servidor p50={srv['latency_ms']['p50']:.2f} ms "
+        f"p99={srv['latency_ms']['p99']:.2f} ms, lotes={srv['batches']} (medio {srv['mean_batch_size']:.1f}) | "
+        f"RMSE theta={np.sqrt(np.nanmean((theta - true) ** 2)):.3f}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--persons", type=int, default=2000)
+    parser.add_argument("--bank-items", type=int, default=40)
+    parser.add_argument("--missing", type=float, default=0.2, help="fracción de ítems no administrados por persona")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--method", default="eap")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=123)
+    parser.add_argument("--unix", default=None, help="socket Unix de un servicio ya corriendo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="puerto TCP de un servicio ya corriendo")
+    parser.add_argument("--compare-unbatched", action="store_true", help="repite con max_batch=1")
+    parser.add_argument("--json", action="store_true", help="imprime el resultado completo en JSON")
+    args = parser.parse_args(argv)
+
+    bank, args.payloads, abilities = build_workload(args.persons, args.bank_items, args.missing, args.seed)
+    runs: dict[str, dict[str, Any]] = {}
+    if args.unix or args.port:
+        target = {"unix": args.unix, "host": args.host, "port": args.port}
+        runs["externo"] = asyncio.run(run_load(target, args.payloads, args.requests, args.concurrency))
+    else:
+        runs[f"max_batch={args.max_batch}"] = asyncio.run(_in_process(bank, args, args.max_batch))
+        if args.compare_unbatched:
+            runs["max_batch=1"] = asyncio.run(_in_process(bank, args, 1))
+
+    for label, out in runs.items():
+        _report(label, out, abilities)
+    if args.json:
+        print(json.dumps({label: {k: v for k, v in out.items() if k != "results"} for label, out in runs.items()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Agregación en streaming de métricas a través de réplicas Monte Carlo.
+
+Cada corrida del diseño percent × r produce una réplica (``params:replication``)
+con una fila de métricas por celda (ver :func:`metrics.recovery_metrics`). Para
+promediar muchas réplicas no hace falta conservar las estimaciones por ítem:
+:class:`ReplicationAggregator` mantiene, por celda y métrica,
+
+- media y varianza corrientes (Welford), de las que salen el error estándar
+  Monte Carlo de la media (``mcse = sd / sqrt(n)``) y del desvío empírico
+  (``sd / sqrt(2 (n - 1))``),
+- cuantiles aproximados con el algoritmo P² (Jain & Chlamtac, 1985): cinco
+  marcadores por cuantil.
+
+Los momentos y cuantiles ocupan memoria constante por celda y métrica; además
+cada celda guarda el conjunto de réplicas ya incorporadas (para que repetir una
+corrida no la cuente dos veces), que crece con el número de réplicas R. El
+estado pesa O(celdas × (métricas × cuantiles + R)), se serializa a JSON y se
+actualiza réplica a réplica (ver ``datasets.ReplicationAggregateDataset``).
+"""
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS: tuple[str, ...] = ("mse", "bias", "r2", "coverage")
+DEFAULT_QUANTILES: tuple[float, ...] = (0.05, 0.5, 0.95)
+
+STATE_VERSION = 1
+
+
+class RunningMoments:
+    """Media y suma de cuadrados centrada (Welford); ignora valores no finitos."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0) -> None:
+        self.n, self.mean, self.m2 = int(n), float(mean), float(m2)
+
+    def update(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def sd(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else float("nan")
+
+    def to_list(self) -> list[float]:
+        return [self.n, self.mean, self.m2]
+
+
+class P2Quantile:
+    """Cuantil ``p`` aproximado con el algoritmo P² (cinco marcadores).
+
+    Con menos de cinco observaciones el cuantil es exacto (interpolación lineal,
+    como ``np.quantile``).
+    """
+
+    __slots__ = ("p", "q", "pos", "desired")
+
+    def __init__(self, p: float, q: list[float] | None = None, pos: list[float] | None = None,
+                 desired: list[float] | None = None) -> None:
+        self.p = float(p)
+        self.q = list(q or [])
+        self.pos = list(pos or [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.desired = list(desired or [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0])
+
+    def update(self, x: float) -> None:
+        q = self.q
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        pos, p = self.pos, self.p
+        for i in range(k + 1, 5):
+            pos[i] += 1.0
+        for i, inc in enumerate((0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0)):
+            self.desired[i] += inc
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - pos[i]
+            if (d >= 1.0 and pos[i + 1] - pos[i] > 1.0) or (d <= -1.0 and pos[i - 1] - pos[i] < -1.0):
+                s = 1.0 if d > 0 else -1.0
+                # Predicción parabólica; si sale del intervalo, lineal
+                qp = q[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    j = i + int(s)
+                    qp = q[i] + s * (q[j] - q[i]) / (pos[j] - pos[i])
+                q[i] = qp
+                pos[i] += s
+
+    @property
+    def value(self) -> float:
+        if not self.q:
+            return float("nan")
+        if len(self.q) < 5:
+            return float(np.quantile(self.q, self.p))
+        return self.q[2]
+
+    def to_list(self) -> list[list[float]]:
+        return [self.q, self.pos, self.desired]
+
+
+def quantile_label(p: float) -> str:
+    """Sufijo de columna de un cuantil: 0.05 -> ``q5``, 0.5 -> ``q50``, 0.025 -> ``q2_5``."""
+    pct = float(p) * 100.0
+    return "q" + (f"{pct:g}".replace(".", "_"))
+
+
+class _CellState:
+    __slots__ = ("replications", "moments", "quantiles")
+
+    def __init__(self, metrics: Sequence[str], quantiles: Sequence[float]) -> None:
+        self.replications: set[int] = set()
+        self.moments = {m: RunningMoments() for m in metrics}
+        self.quantiles = {m: [P2Quantile(p) for p in quantiles] for m in metrics}
+
+
+class ReplicationAggregator:
+    """Acumula métricas por celda ``by`` a medida que llegan réplicas.
+
+    ``update`` recibe filas ``by`` + ``replication`` + métricas (una por celda y
+    réplica, p. ej. el resumen de una corrida). Una réplica ya incorporada en una
+    celda se ignora, así re-ejecutar una corrida no la cuenta dos veces. Métricas
+    ausentes en la tabla o no finitas no actualizan su acumulador (cada métrica
+    lleva su propio ``n``).
+    """
+
+    def __init__(
+        self,
+        by: Sequence[str],
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> None:
+        self.by = tuple(by)
+        self.metrics = tuple(metrics)
+        self.quantiles = tuple(float(p) for p in quantiles)
+        self._cells: dict[tuple, _CellState] = {}
+
+    def _cell(self, key: tuple) -> _CellState:
+        state = self._cells.get(key)
+        if state is None:
+            state = self._cells[key] = _CellState(self.metrics, self.quantiles)
+        return state
+
+    def update(self, rows: pd.DataFrame) -> int:
+        """Incorpora ``rows``; devuelve cuántas filas (celda × réplica) eran nuevas."""
+        metrics = [m for m in self.metrics if m in rows.columns]
+        keys = rows[list(self.by)].itertuples(index=False, name=None)
+        reps = rows["replication"].to_numpy(dtype=int) if "replication" in rows.columns else np.zeros(len(rows), int)
+        values = rows[metrics].to_numpy(dtype=float)
+
+        added = 0
+        for key, rep, row in zip(keys, reps, values):
+            state = self._cell(tuple(_normalize(v) for v in key))
+            if int(rep) in state.replications:
+                continue
+            state.replications.add(int(rep))
+            added += 1
+            for m, x in zip(metrics, row):
+                if not math.isfinite(x):
+                    continue
+                state.moments[m].update(x)
+                for sketch in state.quantiles[m]:
+                    sketch.update(x)
+
+        if added < len(rows):
+            logger.warning("[aggregation] %d filas ignoradas: réplica ya incorporada en la celda", len(rows) - added)
+        return added
+
+    def to_frame(self) -> pd.DataFrame:
+        """Tabla final: ``by`` + ``n_replications`` y, por métrica, media, sd, MCSE y cuantiles."""
+        records = []
+        for key in sorted(self._cells, key=_sort_key):
+            state = self._cells[key]
+            rec: dict[str, Any] = dict(zip(self.by, key))
+            rec["n_replications"] = len(state.replications)
+            for m in self.metrics:
+                mom = state.moments[m]
+                n = mom.n
+                rec[f"{m}_n"] = n
+                rec[f"{m}_mean"] = mom.mean if n else float("nan")
+                rec[f"{m}_sd"] = mom.sd
+                rec[f"{m}_mcse"] = mom.sd / math.sqrt(n) if n > 1 else float("nan")
+                rec[f"{m}_sd_mcse"] = mom.sd / math.sqrt(2.0 * (n - 1)) if n > 1 else float("nan")
+                for sketch in state.quantiles[m]:
+                    rec[f"{m}_{quantile_label(sketch.p)}"] = sketch.value
+            records.append(rec)
+        columns = [*self.by, "n_replications"]
+        for m in self.metrics:
+            columns += [f"{m}_{s}" for s in ("n", "mean", "sd", "mcse", "sd_mcse")]
+            columns += [f"{m}_{quantile_label(p)}" for p in self.quantiles]
+        return pd.DataFrame.from_records(records, columns=columns)
+
+    # ------------------------------------------------------------ serialización
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "by": list(self.by),
+            "metrics": list(self.metrics),
+            "quantiles": list(self.quantiles),
+            "cells": [
+                {
+                    "key": list(key),
+                    "replications": sorted(state.replications),
+                    "moments": {m: state.moments[m].to_list() for m in self.metrics},
+                    "quantiles": {m: [s.to_list() for s in state.quantiles[m]] for m in self.metrics},
+                }
+                for key, state in self._cells.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ReplicationAggregator":
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Versión de estado de agregación no soportada: {data.get('version')!r}")
+        agg = cls(data["by"], data["metrics"], data["quantiles"])
+        for cell in data["cells"]:
+            state = agg._cell(tuple(cell["key"]))
+            state.replications = set(int(r) for r in cell["replications"])
+            for m in agg.metrics:
+                state.moments[m] = RunningMoments(*cell["moments"][m])
+                state.quantiles[m] = [
+                    P2Quantile(p, *lists) for p, lists in zip(agg.quantiles, cell["quantiles"][m])
+                ]
+        return agg
+
+    def compatible_with(self, by: Iterable[str], metrics: Iterable[str], quantiles: Iterable[float]) -> bool:
+        return (self.by, self.metrics, self.quantiles) == (
+            tuple(by), tuple(metrics), tuple(float(p) for p in quantiles)
+        )
+
+
+def _normalize(value: Any) -> Any:
+    """Claves JSON-estables: floats nativos, NaN -> None (p. ej. r_level en MMLE)."""
+    if value is None:
+        return None
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _sort_key(key: tuple) -> tuple:
+    return tuple((v is None, v if v is not None else 0) for v in key)
@@ -0,0 +1,268 @@
+"""Acceso compartido a matrices de respuestas con caché LRU por proceso.
+
+Cada nodo de estimación de la grilla recibe ``sample__s1.responses`` y una
+máscara de personas. En vez de ordenar y filtrar en cada nodo, las matrices
+viven en una caché del proceso con claves ``(versión del dataset, máscara)``:
+
+- la versión de un objeto la registra quien lo carga
+  (:class:`~analisis_calidad_estimacion_1pl_bayesiana.datasets.ResponseMatrixDataset`:
+  ruta, tamaño y mtime del archivo) o, si no está registrada, sale de un hash del
+  contenido que se calcula una vez por objeto (registro por identidad con
+  ``weakref``: un DataFrame derivado nunca hereda la versión de otro);
+- la máscara entra por el hash de sus bytes.
+
+La caché tiene un presupuesto de bytes (``runtime.response_cache.max_mb``); al
+superarlo descarta las entradas menos usadas. Lleva contadores de aciertos,
+fallos y desalojos, que :class:`~analisis_calidad_estimacion_1pl_bayesiana.hooks.ResponseCacheHook`
+reporta al final de la corrida. Con ``ParallelRunner`` cada worker tiene su
+propia caché.
+
+Los objetos devueltos son compartidos y se guardan en sólo lectura: los
+arreglos (``ndarray``, campos de :class:`SparseResponses`, columnas de los
+DataFrames) tienen ``writeable=False``, así que escribir en ellos levanta
+``ValueError`` en vez de corromper la entrada para los demás nodos. Las
+derivaciones (filtrar, ordenar, ``copy()``) devuelven objetos nuevos y
+modificables. Si varios hilos piden a la vez una clave ausente, sólo uno la
+calcula; los demás esperan su resultado (cuentan como aciertos).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 2**20
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, SparseResponses):
+        return int(value.nbytes)
+    return int(getattr(value, "nbytes", 0))
+
+
+def _read_only(value: Any) -> Any:
+    """``value`` con sus arreglos en sólo lectura (sin copiar datos)."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, SparseResponses):
+        for field in fields(value):
+            getattr(value, field.name).flags.writeable = False
+    elif isinstance(value, pd.DataFrame):
+        # Un bloque por columna armado sobre vistas de sólo lectura: pandas no
+        # consolida con copy=False, así que las escrituras llegan a las vistas
+        columns = {}
+        for k, name in enumerate(value.columns):
+            arr = value.iloc[:, k].to_numpy()
+            if isinstance(arr, np.ndarray) and arr.flags.writeable:
+                arr = arr.view()
+                arr.flags.writeable = False
+            columns[k] = arr
+        frozen = pd.DataFrame(columns, index=value.index, copy=False)
+        frozen.columns = value.columns
+        registered = _registered(value)
+        if registered is not None:
+            register_version(frozen, *registered)
+        return frozen
+    return value
+
+
+class ResponseCache:
+    """LRU con presupuesto de bytes; segura entre hilos (ThreadRunner)."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._pending: dict[Hashable, Future] = {}
+        self._stats = CacheStats(max_bytes=int(max_bytes))
+
+    @property
+    def max_bytes(self) -> int:
+        return self._stats.max_bytes
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self._stats.max_bytes = int(max_bytes)
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Valor cacheado de ``key`` (sólo lectura) o ``compute()``, calculado una sola vez."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry[0]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        if not owner:
+            return pending.result()
+        # Fuera del lock global (otras claves siguen atendiéndose); la clave queda
+        # reservada por el Future hasta publicar el resultado o la excepción
+        try:
+            value = _read_only(compute())
+            self._store(key, value)
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(exc)
+            raise
+        with self._lock:
+            del self._pending[key]
+        pending.set_result(value)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._store(key, _read_only(value))
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        size = _nbytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._stats.bytes -= old[1]
+            # Entradas más grandes que todo el presupuesto no se guardan
+            if size <= self._stats.max_bytes:
+                self._entries[key] = (value, size)
+                self._stats.bytes += size
+            self._evict()
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._stats.bytes -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats(max_bytes=self._stats.max_bytes)
+
+    def _evict(self) -> None:
+        while self._entries and self._stats.bytes > self._stats.max_bytes:
+            key, (_, size) = self._entries.popitem(last=False)
+            self._stats.bytes -= size
+            self._stats.evictions += 1
+            self._stats.evicted_bytes += size
+            logger.debug("[data_access] desalojo %s (%d bytes)", key, size)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**self._stats.as_dict(), "entries": len(self._entries)})
+
+
+_CACHE = ResponseCache()
+
+
+def response_cache() -> ResponseCache:
+    """Caché del proceso."""
+    return _CACHE
+
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+# id(objeto) -> (weakref, versión, ya ordenado por person_id)
+_VERSIONS: dict[int, tuple[weakref.ref, str, bool]] = {}
+
+
+def register_version(frame: pd.DataFrame, version: str, sorted_by_person: bool = False) -> None:
+    """Asocia ``version`` al objeto ``frame`` mientras éste viva."""
+    key = id(frame)
+    _VERSIONS[key] = (weakref.ref(frame, lambda _, key=key: _VERSIONS.pop(key, None)), version, sorted_by_person)
+
+
+def _registered(frame: pd.DataFrame) -> tuple[str, bool] | None:
+    entry = _VERSIONS.get(id(frame))
+    if entry is None or entry[0]() is not frame:
+        return None
+    return entry[1], entry[2]
+
+
+def dataset_version(responses: pd.DataFrame) -> str:
+    """Versión de la matriz: la registrada o, si no hay, hash del contenido (una vez por objeto)."""
+    registered = _registered(responses)
+    if registered is not None:
+        return registered[0]
+    hashed = pd.util.hash_pandas_object(responses, index=False).to_numpy()
+    version = "content:" + _digest(hashed.tobytes(), ",".join(map(str, responses.columns)).encode())
+    register_version(responses, version)
+    return version
+
+
+def _mask_values(responses: pd.DataFrame, mask: pd.DataFrame) -> np.ndarray:
+    if "mask" not in mask.columns:
+        raise ValueError("La máscara debe tener una columna 'mask'.")
+    m = mask["mask"].to_numpy().astype(int)
+    if m.size != responses.shape[0]:
+        raise ValueError(f"Tamaño de máscara {m.size} no coincide con n_responses={responses.shape[0]}")
+    return m
+
+
+def sorted_responses(responses: pd.DataFrame) -> pd.DataFrame:
+    """``responses`` ordenado por ``person_id`` (una vez por versión)."""
+    version = dataset_version(responses)
+    if _registered(responses)[1]:
+        return responses
+    return _CACHE.get_or_compute(
+        ("sorted", version), lambda: responses.sort_values("person_id").reset_index(drop=True)
+    )
+
+
+def filter_responses_with_mask(responses: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
+    """Filtra filas de ``responses`` usando una máscara 0/1 (resultado cacheado).
+
+    Asume que ``responses`` tiene columna ``person_id`` y columnas ``item_1..item_N``.
+    Asume que la máscara tiene columna ``mask`` con largo igual al número total de personas.
+    Se alinea por orden: ``person_id`` ascendente ↔ índice 0..N-1 de la máscara.
+    """
+    m = _mask_values(responses, mask)
+    key = ("filtered", dataset_version(responses), _digest(m.tobytes()))
+
+    def compute() -> pd.DataFrame:
+        resp = sorted_responses(responses)
+        return resp[m == 1].reset_index(drop=True)
+
+    return _CACHE.get_or_compute(key, compute)
+
+
+def masked_sparse_responses(responses: pd.DataFrame, mask: pd.DataFrame) -> SparseResponses:
+    """:class:`SparseResponses` de las personas seleccionadas (cacheado)."""
+    m = _mask_values(responses, mask)
+    key = ("sparse", dataset_version(responses), _digest(m.tobytes()))
+    return _CACHE.get_or_compute(key, lambda: SparseResponses.from_dense(filter_responses_with_mask(responses, mask)))
@@ -0,0 +1,25 @@
+"""Datasets propios del proyecto (referenciables desde el catálogo)."""
+from .aggregate_state import ReplicationAggregateDataset, ReplicationAggregateState
+from .bytes_dataset import BytesDataset, BytesPartitionsDataset
+from .calibration_state import OnlineCalibrationDataset, OnlineCalibrationState
+from .response_chunks import ResponseChunksDataset
+from .response_matrix import ResponseMatrixDataset
+from .results_store import ResultsPartition, ResultsStoreDataset, make_person_frame, make_results_frame, read_results
+from .sparse_responses import SparseResponsesDataset
+
+__all__ = [
+    "BytesDataset",
+    "BytesPartitionsDataset",
+    "OnlineCalibrationDataset",
+    "OnlineCalibrationState",
+    "ReplicationAggregateDataset",
+    "ReplicationAggregateState",
+    "ResponseChunksDataset",
+    "ResponseMatrixDataset",
+    "ResultsPartition",
+    "ResultsStoreDataset",
+    "SparseResponsesDataset",
+    "make_person_frame",
+    "make_results_frame",
+    "read_results",
+]
@@ -0,0 +1,107 @@
+"""Estado persistente de la agregación Monte Carlo entre corridas (réplicas).
+
+Un nodo no puede leer y escribir el mismo dataset (Kedro lo ve como ciclo), así
+que la carga devuelve un handle, :class:`ReplicationAggregateState`, y el nodo
+de agregación llama a :meth:`ReplicationAggregateState.update`: lee el JSON,
+incorpora la réplica y lo reescribe de forma atómica, con un lock de archivo
+para que corridas concurrentes (otras réplicas) no pisen el estado.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+
+from analisis_calidad_estimacion_1pl_bayesiana.aggregation import ReplicationAggregator
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows: sin lock
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+@dataclass(frozen=True)
+class ReplicationAggregateState:
+    """Handle al archivo de estado (no contiene datos; es serializable)."""
+
+    filepath: str
+
+    def read(self) -> ReplicationAggregator | None:
+        path = Path(self.filepath)
+        if not path.is_file():
+            return None
+        return ReplicationAggregator.from_dict(json.loads(path.read_text()))
+
+    def update(
+        self,
+        rows: pd.DataFrame,
+        by: Sequence[str],
+        metrics: Sequence[str],
+        quantiles: Sequence[float],
+    ) -> pd.DataFrame:
+        """Incorpora ``rows`` al estado persistido y devuelve la tabla agregada.
+
+        Si el estado existente se armó con otra configuración (``by``, métricas o
+        cuantiles) se descarta y se empieza de cero, avisando en el log.
+        """
+        path = Path(self.filepath)
+        with _file_lock(path.with_name(f".{path.name}.lock")):
+            agg = self.read()
+            if agg is not None and not agg.compatible_with(by, metrics, quantiles):
+                logger.warning("[aggregation] %s tiene otra configuración; se reinicia el estado", path)
+                agg = None
+            if agg is None:
+                agg = ReplicationAggregator(by, metrics, quantiles)
+            added = agg.update(rows)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(agg.to_dict()))
+            os.replace(tmp, path)
+        logger.info("[aggregation] %s: %d filas nuevas (celda × réplica)", path, added)
+        return agg.to_frame()
+
+
+class ReplicationAggregateDataset(AbstractDataset[None, ReplicationAggregateState]):
+    """Dataset de sólo lectura que entrega el handle del estado de agregación.
+
+    Ejemplo de catálogo::
+
+        bayes_estimation__s1.bayes_estimation_mc_state:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.ReplicationAggregateDataset
+          filepath: data/07_model_output/mc_aggregate/bayes.json
+    """
+
+    def __init__(self, filepath: str, metadata: dict[str, Any] | None = None) -> None:
+        self._filepath = str(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": self._filepath}
+
+    def _load(self) -> ReplicationAggregateState:
+        return ReplicationAggregateState(self._filepath)
+
+    def _save(self, data: None) -> None:
+        raise DatasetError("ReplicationAggregateDataset es de sólo lectura: usar el handle (update)")
+
+    def _exists(self) -> bool:
+        return True
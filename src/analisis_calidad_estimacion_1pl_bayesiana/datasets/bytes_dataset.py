@@ -0,0 +1,82 @@
+"""Datasets de bytes crudos (p. ej. PNG ya renderizados por ``reporting_s1``)."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from kedro.io import AbstractDataset
+
+
+def _write_if_changed(path: Path, data: bytes) -> None:
+    if path.is_file() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class BytesDataset(AbstractDataset[bytes, bytes]):
+    """Guarda/lee un archivo binario tal cual.
+
+    La escritura es atómica y se omite si el archivo ya tiene exactamente el
+    mismo contenido, así una figura cacheada no cambia de ``mtime``.
+
+    Ejemplo de catálogo::
+
+        reporting__s1.mmle_fig_percent_vs_mse:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.BytesDataset
+          filepath: data/08_reporting/mmle_estimation__s1/fig_percent_vs_mse.png
+    """
+
+    def __init__(self, filepath: str, metadata: dict[str, Any] | None = None) -> None:
+        self._filepath = Path(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath)}
+
+    def _load(self) -> bytes:
+        return self._filepath.read_bytes()
+
+    def _save(self, data: bytes) -> None:
+        _write_if_changed(self._filepath, data)
+
+    def _exists(self) -> bool:
+        return self._filepath.is_file()
+
+
+class BytesPartitionsDataset(AbstractDataset[dict[str, bytes], dict[str, bytes]]):
+    """Directorio de archivos binarios: ``{nombre: bytes}`` <-> ``<path>/<nombre><suffix>``.
+
+    Equivale a un ``PartitionedDataset`` de :class:`BytesDataset`, pero sin estado
+    cacheado en la instancia, así el catálogo sigue siendo serializable para el
+    ``ParallelRunner``. Mismas garantías de escritura que :class:`BytesDataset`.
+    Guardar reemplaza el conjunto completo: se borran los archivos ``*<suffix>``
+    del directorio que no están en ``data`` (p. ej. páginas que sobran tras
+    achicar la grilla).
+    """
+
+    def __init__(self, path: str, filename_suffix: str = "", metadata: dict[str, Any] | None = None) -> None:
+        self._path = Path(path)
+        self._suffix = filename_suffix
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"path": str(self._path), "filename_suffix": self._suffix}
+
+    def _load(self) -> dict[str, bytes]:
+        files = sorted(self._path.glob(f"*{self._suffix}"))
+        return {f.name[: len(f.name) - len(self._suffix)]: f.read_bytes() for f in files if not f.name.startswith(".")}
+
+    def _save(self, data: dict[str, bytes]) -> None:
+        for name, payload in data.items():
+            _write_if_changed(self._path / f"{name}{self._suffix}", payload)
+        keep = {f"{name}{self._suffix}" for name in data}
+        for path in self._path.glob(f"*{self._suffix}"):
+            if path.is_file() and not path.name.startswith(".") and path.name not in keep:
+                path.unlink()
+
+    def _exists(self) -> bool:
+        return self._path.is_dir() and any(self._path.glob(f"*{self._suffix}"))
@@ -0,0 +1,102 @@
+"""Estado persistente de la calibración incremental de ítems (:mod:`irt.online`).
+
+Mismo esquema que :mod:`datasets.aggregate_state`: la carga devuelve un handle,
+:class:`OnlineCalibrationState`, y el nodo llama a
+:meth:`OnlineCalibrationState.update`, que lee el JSON, incorpora el lote y lo
+reescribe de forma atómica bajo un lock de archivo.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.online import OnlineCalibration
+from analisis_calidad_estimacion_1pl_bayesiana.irt.sparse import SparseResponses
+
+from .aggregate_state import _file_lock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OnlineCalibrationState:
+    """Handle al archivo de estado (no contiene datos; es serializable)."""
+
+    filepath: str
+
+    def read(self) -> OnlineCalibration | None:
+        path = Path(self.filepath)
+        if not path.is_file():
+            return None
+        return OnlineCalibration.from_dict(json.loads(path.read_text()))
+
+    def update(
+        self,
+        data: SparseResponses,
+        batch_id: str | None = None,
+        prior_mean: float = 0.0,
+        prior_sd: float = 1.0,
+        n_quadrature: int = 41,
+        n_iter: int = 10,
+        item_prior_mean: np.ndarray | None = None,
+    ) -> pd.DataFrame:
+        """Incorpora el lote ``data`` al estado persistido y devuelve la tabla por ítem.
+
+        Si el estado existente se armó con otro prior o cuadratura se descarta y se
+        empieza de cero, avisando en el log.
+        """
+        path = Path(self.filepath)
+        with _file_lock(path.with_name(f".{path.name}.lock")):
+            calib = self.read()
+            if calib is not None and not calib.compatible_with(prior_mean, prior_sd, n_quadrature):
+                logger.warning("[real_data] %s tiene otro prior/cuadratura; se reinicia la calibración", path)
+                calib = None
+            if calib is None:
+                calib = OnlineCalibration(float(prior_mean), float(prior_sd), int(n_quadrature))
+            added = calib.update(data, batch_id=batch_id, prior_mean=item_prior_mean, n_iter=n_iter)
+            if added:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(calib.to_dict()))
+                os.replace(tmp, path)
+        logger.info(
+            "[real_data] calibración incremental %s: lote %s (%d personas); %d lotes, %d personas, %d ítems",
+            path, calib.batches[-1] if added else "ya incorporado", data.n_persons,
+            len(calib.batches), calib.n_persons, len(calib.item_ids),
+        )
+        return calib.to_frame()
+
+
+class OnlineCalibrationDataset(AbstractDataset[None, OnlineCalibrationState]):
+    """Dataset de sólo lectura que entrega el handle del estado de calibración.
+
+    Ejemplo de catálogo::
+
+        real_data.online_calibration_state:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.OnlineCalibrationDataset
+          filepath: data/07_model_output/real_data/online_calibration.json
+    """
+
+    def __init__(self, filepath: str, metadata: dict[str, Any] | None = None) -> None:
+        self._filepath = str(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": self._filepath}
+
+    def _load(self) -> OnlineCalibrationState:
+        return OnlineCalibrationState(self._filepath)
+
+    def _save(self, data: None) -> None:
+        raise DatasetError("OnlineCalibrationDataset es de sólo lectura: usar el handle (update)")
+
+    def _exists(self) -> bool:
+        return True
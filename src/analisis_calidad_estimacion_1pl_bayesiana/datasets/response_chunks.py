@@ -0,0 +1,62 @@
+"""Dataset Parquet largo ordenado por persona para el EM fuera de memoria."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from kedro.io import AbstractDataset
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.chunked import ResponseChunks, write_response_chunks
+from analisis_calidad_estimacion_1pl_bayesiana.irt.sparse import SparseResponses
+
+
+class ResponseChunksDataset(AbstractDataset[SparseResponses, ResponseChunks]):
+    """``save`` recibe :class:`SparseResponses`; ``load`` devuelve un :class:`ResponseChunks`.
+
+    El load no lee datos: el handle se recorre por lotes en cada iteración EM, así
+    que el archivo puede ser más grande que la RAM (y venir de fuera de Kedro, con
+    ``person_col``/``item_col``/``response_col``/``trials_col`` propios).
+
+    Ejemplo de catálogo::
+
+        real_data.response_chunks:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.ResponseChunksDataset
+          filepath: data/03_primary/real_data/responses_by_person.parquet
+          row_group_rows: 1000000
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        person_col: str = "person_id",
+        item_col: str = "item_id",
+        response_col: str = "successes",
+        trials_col: str | None = "trials",
+        row_group_rows: int = 1_000_000,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        self._filepath = Path(filepath)
+        self._columns = {
+            "person_col": person_col,
+            "item_col": item_col,
+            "response_col": response_col,
+            "trials_col": trials_col,
+        }
+        self._row_group_rows = int(row_group_rows)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath), **self._columns, "row_group_rows": self._row_group_rows}
+
+    def _load(self) -> ResponseChunks:
+        return ResponseChunks(filepath=str(self._filepath), **self._columns)
+
+    def _save(self, data: SparseResponses) -> None:
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._filepath.with_name(f".{self._filepath.stem}.{os.getpid()}.tmp.parquet")
+        write_response_chunks(data, str(tmp), row_group_rows=self._row_group_rows)
+        os.replace(tmp, self._filepath)
+
+    def _exists(self) -> bool:
+        return self._filepath.is_file()
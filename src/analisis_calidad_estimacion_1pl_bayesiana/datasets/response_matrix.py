@@ -0,0 +1,69 @@
+"""Dataset CSV de la matriz de respuestas, leído una vez por proceso."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from kedro.io import AbstractDataset
+
+from analisis_calidad_estimacion_1pl_bayesiana.data_access import register_version, response_cache
+
+
+class ResponseMatrixDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """CSV ``person_id, item_1..item_N`` servido desde la caché de :mod:`data_access`.
+
+    El primer ``load`` del proceso parsea el archivo, lo ordena por
+    ``person_id`` y lo guarda en la caché con la versión ``(ruta, tamaño,
+    mtime)``; los siguientes devuelven el mismo objeto (en sólo lectura).
+    Cambiar el archivo cambia la versión, así que nunca se sirve una copia vieja.
+
+    Ejemplo de catálogo::
+
+        sample__s1.responses:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.ResponseMatrixDataset
+          filepath: data/02_intermediate/sample__s1/responses.csv
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        load_args: dict[str, Any] | None = None,
+        save_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        self._filepath = Path(filepath)
+        self._load_args = dict(load_args or {})
+        self._save_args = {"index": False, **(save_args or {})}
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath), "load_args": self._load_args, "save_args": self._save_args}
+
+    def _version(self) -> str:
+        stat = self._filepath.stat()
+        return f"file:{self._filepath.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _read(self, version: str) -> pd.DataFrame:
+        frame = pd.read_csv(self._filepath, **self._load_args)
+        if "person_id" in frame.columns and not frame["person_id"].is_monotonic_increasing:
+            frame = frame.sort_values("person_id").reset_index(drop=True)
+        register_version(frame, version, sorted_by_person="person_id" in frame.columns)
+        return frame
+
+    def _load(self) -> pd.DataFrame:
+        version = self._version()
+        return response_cache().get_or_compute(("file", version), lambda: self._read(version))
+
+    def _save(self, data: pd.DataFrame) -> None:
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: un lector concurrente ve el archivo viejo o el nuevo
+        tmp = self._filepath.with_name(f".{self._filepath.name}.{os.getpid()}.tmp")
+        data.to_csv(tmp, **self._save_args)
+        os.replace(tmp, self._filepath)
+        prefix = f"file:{self._filepath.resolve()}:"
+        response_cache().invalidate(lambda key: key[0] == "file" and key[1].startswith(prefix))
+
+    def _exists(self) -> bool:
+        return self._filepath.is_file()
@@ -0,0 +1,315 @@
+"""Almacén único de estimaciones en formato largo (Parquet particionado).
+
+Todas las estimaciones (MMLE, Bayes, ...) comparten un único directorio con
+particiones estilo Hive ``estimator=<e>/percent=<p>/r_level=<r>/`` y un archivo
+por réplica. Esquema mínimo de cada fila::
+
+    estimator, replication, percent, r_level, item_id, estimate, sd
+
+más columnas opcionales (``ppc_*``, chequeos predictivos de Bayes, ver
+:mod:`irt.ppc`; ``item_*fit*``/``person_*_misfit``, ajuste infit/outfit, ver
+:mod:`irt.fit`) que quedan en null cuando el estimador no las produce.
+
+Con ``table: persons`` el mismo formato guarda una tabla por persona (ajuste
+infit/outfit de cada persona en la celda, ver :mod:`irt.fit`) en otro
+directorio, con las mismas particiones y réplica::
+
+    estimator, replication, percent, r_level, person_id, theta, n_obs,
+    infit, outfit, infit_z, outfit_z
+
+Cada celda de la grilla es una entrada del catálogo (dataset factory) con
+``cell`` fijado, que escribe sólo su partición. Con ``lazy: true`` la carga no
+lee nada y devuelve un :class:`ResultsPartition`; los nodos de resumen juntan
+esos handles y hacen **una** lectura con filtros (predicate pushdown) vía
+:func:`read_results`, en vez de abrir un archivo por celda.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+
+from analisis_calidad_estimacion_1pl_bayesiana.grid import parse_grid_key
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ("estimator", "percent", "r_level")
+RESULT_COLUMNS = ("estimator", "replication", "percent", "r_level", "item_id", "estimate", "sd")
+PERSON_COLUMNS = ("estimator", "replication", "percent", "r_level", "person_id")
+# Columnas obligatorias al guardar, por tabla
+_REQUIRED = {"items": RESULT_COLUMNS, "persons": PERSON_COLUMNS}
+
+# Valor que pyarrow usa para particiones nulas (p. ej. r_level en MMLE)
+_HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _file_schema(table: str = "items"):
+    """Esquema fijo de cada archivo (columnas no particionadas) de ``table``.
+
+    Todos los archivos se escriben con este esquema (columnas ausentes quedan en
+    null), así el escaneo no depende de qué archivo se descubra primero.
+    """
+    import pyarrow as pa
+
+    if table == "persons":
+        return pa.schema([
+            ("replication", pa.int64()),
+            ("person_id", pa.int64()),
+            ("theta", pa.float64()),
+            ("n_obs", pa.int64()),
+            ("infit", pa.float64()),
+            ("outfit", pa.float64()),
+            ("infit_z", pa.float64()),
+            ("outfit_z", pa.float64()),
+        ])
+    return pa.schema([
+        ("replication", pa.int64()),
+        ("item_id", pa.int64()),
+        ("estimate", pa.float64()),
+        ("sd", pa.float64()),
+        ("ppc_item_p", pa.float64()),
+        ("ppc_item_fit", pa.float64()),
+        ("ppc_score_sd", pa.float64()),
+        ("ppc_odds_ratio", pa.float64()),
+        ("item_infit", pa.float64()),
+        ("item_outfit", pa.float64()),
+        ("item_infit_z", pa.float64()),
+        ("item_outfit_z", pa.float64()),
+        ("person_infit_misfit", pa.float64()),
+        ("person_outfit_misfit", pa.float64()),
+    ])
+
+
+def _partition_schema():
+    import pyarrow as pa
+
+    return pa.schema([("estimator", pa.string()), ("percent", pa.float64()), ("r_level", pa.float64())])
+
+
+def _open_dataset(root: str, table: str = "items"):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partitioning = ds.HivePartitioning(_partition_schema(), null_fallback=_HIVE_NULL)
+    schema = pa.unify_schemas([_file_schema(table), _partition_schema()])
+    return ds.dataset(root, format="parquet", partitioning=partitioning, schema=schema)
+
+
+def _partition_value(value: Any) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return _HIVE_NULL
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    return str(value)
+
+
+def make_results_frame(
+    estimator: str,
+    estimate: np.ndarray,
+    sd: np.ndarray | None = None,
+    percent: float = float("nan"),
+    r_level: float = float("nan"),
+    replication: int = 0,
+    item_id: np.ndarray | None = None,
+    extra: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Arma el DF largo de una celda con el esquema del almacén.
+
+    ``extra``: columnas opcionales del esquema (por ítem o escalares, que se
+    repiten en cada fila).
+    """
+    estimate = np.asarray(estimate, dtype=float)
+    n = estimate.size
+    return pd.DataFrame({
+        "estimator": estimator,
+        "replication": int(replication),
+        "percent": float(percent),
+        "r_level": float("nan") if r_level is None else float(r_level),
+        "item_id": np.arange(1, n + 1, dtype=int) if item_id is None else np.asarray(item_id, dtype=int),
+        "estimate": estimate,
+        "sd": np.full(n, np.nan) if sd is None else np.asarray(sd, dtype=float),
+        **{col: np.broadcast_to(np.asarray(values, dtype=float), (n,)) for col, values in (extra or {}).items()},
+    })
+
+
+def make_person_frame(
+    estimator: str,
+    person_id: np.ndarray,
+    columns: dict[str, Any],
+    percent: float = float("nan"),
+    r_level: float = float("nan"),
+    replication: int = 0,
+) -> pd.DataFrame:
+    """Arma el DF largo de una celda para la tabla ``persons`` (una fila por persona)."""
+    person_id = np.asarray(person_id)
+    return pd.DataFrame({
+        "estimator": estimator,
+        "replication": int(replication),
+        "percent": float(percent),
+        "r_level": float("nan") if r_level is None else float(r_level),
+        "person_id": person_id.astype(int),
+        **{col: np.broadcast_to(np.asarray(values), (person_id.size,)) for col, values in columns.items()},
+    })
+
+
+@dataclass(frozen=True)
+class ResultsPartition:
+    """Referencia perezosa a una porción del almacén (no contiene datos).
+
+    ``cell`` mapea columnas de partición a valores; una clave ausente no filtra.
+    ``table``: ``items`` (estimaciones) o ``persons``.
+    """
+
+    filepath: str
+    cell: tuple[tuple[str, Any], ...] = field(default=())
+    table: str = "items"
+
+    def expression(self):
+        import pyarrow.dataset as ds
+
+        expr = None
+        for col, value in self.cell:
+            term = ds.field(col).is_null() if value is None else ds.field(col) == value
+            expr = term if expr is None else expr & term
+        return expr
+
+    def to_pandas(self, columns: list[str] | None = None) -> pd.DataFrame:
+        return read_results([self], columns=columns)
+
+
+def read_results(
+    parts: Iterable[ResultsPartition | pd.DataFrame],
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Junta handles perezosos y/o DataFrames en un único DF largo.
+
+    Los handles que apuntan al mismo almacén se leen en un solo escaneo con la
+    disyunción de sus filtros; pyarrow poda directorios de partición que no
+    cumplen el predicado. Los DataFrames (p. ej. corridas en memoria) se
+    concatenan tal cual.
+    """
+    frames: list[pd.DataFrame] = []
+    by_root: dict[tuple[str, str], list[ResultsPartition]] = {}
+    for part in parts:
+        if isinstance(part, ResultsPartition):
+            by_root.setdefault((part.filepath, part.table), []).append(part)
+        else:
+            frames.append(part if columns is None else part[[c for c in columns if c in part.columns]])
+
+    for (root, table_name), handles in by_root.items():
+        if not Path(root).exists():
+            raise DatasetError(f"No existe el almacén de resultados {root!r}")
+        exprs = [h.expression() for h in handles]
+        flt = None
+        if all(e is not None for e in exprs):
+            for e in exprs:
+                flt = e if flt is None else flt | e
+        table = _open_dataset(root, table_name).to_table(columns=columns, filter=flt)
+        if columns is None:
+            # columnas de partición primero, como en el esquema lógico
+            table = table.select([*PARTITION_COLUMNS, *(c for c in table.column_names if c not in PARTITION_COLUMNS)])
+        frames.append(table.to_pandas())
+
+    if not frames:
+        return pd.DataFrame(columns=list(columns or RESULT_COLUMNS))
+    return pd.concat(frames, ignore_index=True)
+
+
+class ResultsStoreDataset(AbstractDataset[pd.DataFrame, "pd.DataFrame | ResultsPartition"]):
+    """Dataset Kedro sobre el almacén particionado de estimaciones.
+
+    Ejemplo de catálogo (una entrada por celda vía dataset factory)::
+
+        "bayes_estimation__s1.bayes_estimation_difficulty_p_{p}_r_{r}":
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.ResultsStoreDataset
+          filepath: data/07_model_output/results_store
+          cell: {estimator: bayes, percent: "{p}", r_level: "{r}"}
+          lazy: true
+
+    Los valores de ``percent``/``r_level`` aceptan claves de grilla (``0_3``).
+    Sin ``cell`` la entrada representa el almacén completo. ``table: persons``
+    apunta a la tabla por persona (ver docstring del módulo).
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        cell: dict[str, Any] | None = None,
+        lazy: bool = False,
+        columns: list[str] | None = None,
+        table: str = "items",
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        if table not in _REQUIRED:
+            raise DatasetError(f"Tabla no soportada: {table!r}. Opciones: {list(_REQUIRED)}")
+        self._table = table
+        self._filepath = str(filepath)
+        self._cell = self._normalize_cell(cell or {})
+        self._lazy = bool(lazy)
+        self._columns = list(columns) if columns else None
+        self.metadata = metadata
+
+    @staticmethod
+    def _normalize_cell(cell: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+        out = []
+        for col in PARTITION_COLUMNS:
+            if col not in cell:
+                continue
+            value = cell[col]
+            if col in ("percent", "r_level") and value is not None:
+                value = parse_grid_key(value) if isinstance(value, str) else float(value)
+            out.append((col, value))
+        return tuple(out)
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": self._filepath, "cell": dict(self._cell), "lazy": self._lazy, "table": self._table}
+
+    def _partition(self) -> ResultsPartition:
+        return ResultsPartition(self._filepath, self._cell, self._table)
+
+    def _load(self) -> pd.DataFrame | ResultsPartition:
+        if self._lazy:
+            return self._partition()
+        return read_results([self._partition()], columns=self._columns)
+
+    def _save(self, data: pd.DataFrame) -> None:
+        missing = [c for c in _REQUIRED[self._table] if c not in data.columns]
+        if missing:
+            raise DatasetError(f"Faltan columnas en resultados: {missing}")
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _file_schema(self._table)
+        data = data.copy()
+        for col, value in self._cell:
+            data[col] = value
+
+        keys = list(PARTITION_COLUMNS) + ["replication"]
+        for group_key, part in data.groupby(keys, dropna=False, sort=False):
+            values = dict(zip(keys, group_key))
+            directory = Path(self._filepath).joinpath(
+                *(f"{col}={_partition_value(values[col])}" for col in PARTITION_COLUMNS)
+            )
+            directory.mkdir(parents=True, exist_ok=True)
+            target = directory / f"replication={int(values['replication'])}.parquet"
+            part = part.reindex(columns=schema.names).reset_index(drop=True)
+            table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+            # Escritura atómica: otro proceso nunca ve un archivo a medio escribir
+            # (el prefijo "." hace que el escaneo ignore el temporal)
+            tmp = directory / f".{target.name}.{os.getpid()}.tmp"
+            pq.write_table(table, tmp)
+            os.replace(tmp, target)
+            logger.debug("[results_store] %s (%d filas)", target, len(part))
+
+    def _exists(self) -> bool:
+        if not Path(self._filepath).exists():
+            return False
+        key = "person_id" if self._table == "persons" else "item_id"
+        return not read_results([self._partition()], columns=[key]).empty
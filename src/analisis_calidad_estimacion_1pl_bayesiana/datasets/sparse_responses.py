@@ -0,0 +1,42 @@
+"""Dataset ``.npz`` para :class:`~analisis_calidad_estimacion_1pl_bayesiana.irt.SparseResponses`."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from kedro.io import AbstractDataset
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.sparse import SparseResponses
+
+
+class SparseResponsesDataset(AbstractDataset[SparseResponses, SparseResponses]):
+    """Guarda las celdas observadas como arreglos NumPy comprimidos (sin pickle).
+
+    Ejemplo de catálogo::
+
+        real_data.sparse_responses:
+          type: analisis_calidad_estimacion_1pl_bayesiana.datasets.SparseResponsesDataset
+          filepath: data/03_primary/real_data/responses.npz
+    """
+
+    def __init__(self, filepath: str, metadata: dict[str, Any] | None = None) -> None:
+        self._filepath = Path(filepath)
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": str(self._filepath)}
+
+    def _load(self) -> SparseResponses:
+        with np.load(self._filepath, allow_pickle=False) as npz:
+            return SparseResponses.from_arrays({name: npz[name] for name in npz.files})
+
+    def _save(self, data: SparseResponses) -> None:
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._filepath.with_name(f".{self._filepath.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp, **data.arrays())
+        os.replace(tmp, self._filepath)
+
+    def _exists(self) -> bool:
+        return self._filepath.is_file()
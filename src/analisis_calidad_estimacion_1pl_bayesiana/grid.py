@@ -0,0 +1,116 @@
+"""Grilla del diseño S1 (percent × r) construida a partir de ``parameters.yml``.
+
+Los pipelines se arman a partir de ``sample__s1.subsample.percents`` y
+``sample__s1.auto_pred.r_levels``; los datasets por celda se resuelven con los
+patrones (dataset factories) de ``conf/base/catalog.yml``, así que un diseño
+50×50 o 100×100 no requiere editar código ni catálogo.
+
+Nota: la grilla se fija al registrar los pipelines; ``kedro run --params`` no la
+modifica (cambiar la grilla en ``parameters.yml`` o en otro entorno de conf). Lo
+mismo vale para ``bayes_estimation.init_from_mmle``/``reuse_tuning``, que deciden
+si las celdas Bayes dependen del MMLE y de la celda de referencia: ``--params``
+puede apagarlos en una corrida, pero no activarlos si se registraron apagados.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVELS: tuple[float, ...] = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def grid_key(value: float) -> str:
+    """Clave estable de un nivel de la grilla para nombres de datasets/nodos: 0.3 -> ``0_3``."""
+    return str(float(value)).replace(".", "_")
+
+
+def parse_grid_key(key: str) -> float:
+    """Inversa de :func:`grid_key`: ``0_3`` -> 0.3."""
+    return float(key.replace("_", ".", 1))
+
+
+@dataclass(frozen=True, order=True)
+class GridCell:
+    """Clave tipada de una celda del diseño (en lugar de parsear ``est_p_0_3_r_0_7``).
+
+    ``r_level`` es ``None`` para estimadores sin prior (MMLE); ``percent`` es
+    ``None`` para datasets que sólo dependen de r (predicciones).
+    """
+
+    percent: float | None = None
+    r_level: float | None = None
+    replication: int = 0
+
+    def key(self, prefix: str) -> str:
+        """Nombre histórico de la celda, p. ej. ``est_p_0_3_r_0_7``."""
+        parts = [prefix]
+        if self.percent is not None:
+            parts.append(f"p_{grid_key(self.percent)}")
+        if self.r_level is not None:
+            parts.append(f"r_{grid_key(self.r_level)}")
+        return "_".join(parts)
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Niveles de la grilla S1, celdas Bayes del chequeo de precisión y dependencias del arranque en caliente."""
+
+    percents: tuple[float, ...] = DEFAULT_LEVELS
+    r_levels: tuple[float, ...] = DEFAULT_LEVELS
+    precision_check_cells: tuple[tuple[float, float], ...] = field(default=((1.0, 1.0),))
+    bayes_init_from_mmle: bool = False
+    bayes_reuse_tuning: bool = False
+
+    @classmethod
+    def from_parameters(cls, parameters: dict[str, Any]) -> "GridSpec":
+        s1 = parameters.get("sample__s1", {}) or {}
+        percents = (s1.get("subsample", {}) or {}).get("percents") or DEFAULT_LEVELS
+        r_levels = (s1.get("auto_pred", {}) or {}).get("r_levels") or DEFAULT_LEVELS
+        cells = (s1.get("precision_check", {}) or {}).get("bayes_cells")
+        bayes = s1.get("bayes_estimation", {}) or {}
+        if cells is None:
+            cells = cls.precision_check_cells
+        return cls(
+            percents=tuple(float(p) for p in percents),
+            r_levels=tuple(float(r) for r in r_levels),
+            precision_check_cells=tuple((float(p), float(r)) for p, r in cells),
+            bayes_init_from_mmle=bool(bayes.get("init_from_mmle", cls.bayes_init_from_mmle)),
+            bayes_reuse_tuning=bool(bayes.get("reuse_tuning", cls.bayes_reuse_tuning)),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def load_grid_spec(conf_source: str | None = None, env: str | None = None) -> GridSpec:
+    """Lee sólo los parámetros del proyecto (no el catálogo) y devuelve la grilla.
+
+    Usa el mismo ``CONFIG_LOADER_CLASS``/``CONFIG_LOADER_ARGS`` que la sesión de
+    Kedro. Si la configuración no está disponible (p. ej. importando el paquete
+    fuera del proyecto) se usa la grilla 10×10 por defecto.
+    """
+    from kedro.framework.project import settings
+
+    conf_path = Path(conf_source) if conf_source else Path.cwd() / settings.CONF_SOURCE
+    if not conf_path.is_dir():
+        logger.info("[grid] %s no existe; se usa la grilla por defecto", conf_path)
+        return GridSpec()
+
+    loader = settings.CONFIG_LOADER_CLASS(
+        conf_source=str(conf_path),
+        env=env or os.environ.get("KEDRO_ENV"),
+        **settings.CONFIG_LOADER_ARGS,
+    )
+    try:
+        parameters = loader["parameters"]
+    except Exception as ex:  # pragma: no cover
+        logger.warning("[grid] No se pudieron leer parámetros (%s); se usa la grilla por defecto", ex)
+        return GridSpec()
+
+    spec = GridSpec.from_parameters(parameters)
+    logger.info("[grid] percents=%d x r_levels=%d", len(spec.percents), len(spec.r_levels))
+    return spec
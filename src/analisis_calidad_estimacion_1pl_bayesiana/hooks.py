@@ -0,0 +1,309 @@
+"""Hooks del proyecto.
+
+:class:`InMemoryIntermediatesHook` implementa el modo *pass-through*: durante
+la corrida los datasets intermedios viven en memoria en vez de escribirse y
+re-parsearse (CSV/Parquet) entre nodos, y sólo se persiste lo que figura en la
+lista ``runtime.persist`` de ``parameters.yml``. Se activa con::
+
+    kedro run --params "runtime.in_memory_intermediates=true"
+
+:class:`ProfilingHook` perfila cada nodo (muestreo de pila o cProfile, memoria
+pico) y mide cada carga/guardado del catálogo. Se activa con::
+
+    kedro run --params "runtime.profiling.enabled=true"
+
+:class:`ResponseCacheHook` fija el presupuesto de la caché de matrices de
+respuestas (``runtime.response_cache.max_mb``, ver ``data_access.py``) y
+reporta aciertos, fallos y desalojos al terminar la corrida.
+"""
+from __future__ import annotations
+
+import cProfile
+import fnmatch
+import logging
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+from kedro.framework.hooks import hook_impl
+from kedro.io import MemoryDataset, SharedMemoryDataset
+
+from analisis_calidad_estimacion_1pl_bayesiana.data_access import response_cache
+from analisis_calidad_estimacion_1pl_bayesiana.profiling import NodeSampler, file_bytes, nbytes, write_reports
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERSIST: tuple[str, ...] = ("*_summary", "reporting__s1.*")
+
+
+def _matches(name: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _in_memory_outputs(runtime: dict[str, Any], pipeline) -> list[str]:
+    """Salidas de ``pipeline`` que :class:`InMemoryIntermediatesHook` deja en memoria."""
+    if not runtime.get("in_memory_intermediates", False):
+        return []
+    persist = runtime.get("persist")
+    persist = DEFAULT_PERSIST if persist is None else tuple(persist)
+    return [name for name in sorted(pipeline.all_outputs()) if not _matches(name, persist)]
+
+
+class InMemoryIntermediatesHook:
+    """Reemplaza los datasets producidos en la corrida que no están en la keep-list.
+
+    - Sólo afecta salidas de nodos del pipeline filtrado: los inputs externos
+      (p. ej. al usar ``--from-nodes``) se siguen leyendo del catálogo.
+    - Con el runner secuencial se usa ``MemoryDataset(copy_mode="assign")``: todos
+      los nodos consumidores reciben el mismo objeto (una única copia de
+      ``sample__s1.responses`` para toda la grilla; los nodos no lo mutan).
+    - Con ``ParallelRunner`` (o subclases) se usa ``SharedMemoryDataset``, que el
+      runner conecta a su manager; cada worker recibe el objeto serializado.
+    """
+
+    def __init__(self) -> None:
+        self._runtime: dict[str, Any] = {}
+
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        self._runtime = context.params.get("runtime", {}) or {}
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any], pipeline, catalog) -> None:
+        if not self._runtime.get("in_memory_intermediates", False):
+            return
+
+        # run_params["runner"] es el nombre/repr del runner (la sesión no pasa la instancia)
+        parallel = "ParallelRunner" in str(run_params.get("runner") or "")
+        produced = sorted(pipeline.all_outputs())
+        in_memory = _in_memory_outputs(self._runtime, pipeline)
+
+        for name in in_memory:
+            dataset = SharedMemoryDataset() if parallel else MemoryDataset(copy_mode="assign")
+            catalog.add(name, dataset, replace=True)
+
+        logger.info(
+            "[runtime] Intermedios en memoria: %d de %d datasets producidos (persisten: %s)",
+            len(in_memory), len(produced), ", ".join(n for n in produced if n not in in_memory) or "ninguno",
+        )
+
+
+class ProfilingHook:
+    """Perfilado opt-in por nodo y contabilidad de E/S del catálogo.
+
+    Configuración en ``runtime.profiling`` de ``parameters.yml``:
+
+    - ``mode``: ``sampling`` (pila muestreada cada ``interval_ms``; produce
+      ``profile.folded`` para flame graphs) o ``cprofile`` (un ``.prof`` por nodo,
+      visible con ``snakeviz``/``pstats``).
+    - ``tracemalloc``: además mide el pico de asignaciones Python/NumPy del nodo
+      (más preciso que el RSS, pero enlentece código Python puro).
+    - ``output_dir``: cada corrida escribe en ``<output_dir>/<timestamp>/``
+      ``nodes.csv`` y ``datasets.csv`` ordenados por tiempo.
+
+    El tiempo de nodo excluye cargas y guardados, que se reportan aparte. El
+    tamaño en disco sale del ``filepath`` de la configuración del catálogo
+    (``config_resolver``); los intermedios en memoria y los datasets sin archivo
+    único quedan sin él. Con
+    ``ParallelRunner`` cada worker instancia hooks nuevos sin contexto, por lo
+    que el perfilado sólo aplica al runner secuencial o de hilos.
+    """
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self._config: dict[str, Any] = {}
+        self._catalog = None
+        self._runtime: dict[str, Any] = {}
+        self._in_memory: set[str] = set()
+        self._lock = threading.Lock()
+        self._active: dict[str, dict[str, Any]] = {}
+        self._io_start: dict[tuple[str, str, int], float] = {}
+        self._node_rows: list[dict[str, Any]] = []
+        self._io_rows: list[dict[str, Any]] = []
+        self._folded: Counter[str] = Counter()
+        self._output_dir: Path | None = None
+
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        self._runtime = context.params.get("runtime", {}) or {}
+        self._config = dict(self._runtime.get("profiling", {}) or {})
+        self._enabled = bool(self._config.get("enabled", False))
+
+    @hook_impl
+    def after_catalog_created(self, catalog) -> None:
+        self._catalog = catalog
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any], pipeline, catalog) -> None:
+        if not self._enabled:
+            return
+        self._catalog = catalog
+        self._in_memory = set(_in_memory_outputs(self._runtime, pipeline))
+        root = Path(self._config.get("output_dir", "data/09_tracking/profiles"))
+        self._output_dir = root / datetime.now().strftime("%Y%m%dT%H%M%S")
+        if self._config.get("tracemalloc", False) and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        logger.info("[profiling] modo=%s, salida=%s", self._config.get("mode", "sampling"), self._output_dir)
+
+    # ------------------------------------------------------------------ nodos
+    @hook_impl
+    def before_node_run(self, node) -> None:
+        if not self._enabled:
+            return
+        mode = self._config.get("mode", "sampling")
+        state: dict[str, Any] = {
+            "sampler": NodeSampler(
+                threading.get_ident(),
+                root=node.name,
+                interval=float(self._config.get("interval_ms", 5)) / 1000.0,
+                stacks=mode == "sampling",
+            ),
+        }
+        if mode == "cprofile":
+            state["profile"] = cProfile.Profile()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            state["traced_start"] = tracemalloc.get_traced_memory()[0]
+        with self._lock:
+            self._active[node.name] = state
+        state["sampler"].start()
+        if "profile" in state:
+            state["profile"].enable()
+        state["t0"] = time.perf_counter()
+        state["cpu0"] = time.thread_time()
+
+    def _finish_node(self, node, failed: bool) -> None:
+        with self._lock:
+            state = self._active.pop(node.name, None)
+        if state is None:
+            return
+        wall = time.perf_counter() - state["t0"]
+        cpu = time.thread_time() - state["cpu0"]
+        if "profile" in state:
+            state["profile"].disable()
+        sampler: NodeSampler = state["sampler"]
+        sampler.stop()
+
+        row = {
+            "node": node.name,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "rss_peak_mb": sampler.rss_peak / 2**20,
+            "rss_delta_mb": (sampler.rss_peak - sampler.rss_start) / 2**20,
+            "failed": failed,
+        }
+        if "traced_start" in state:
+            row["traced_peak_mb"] = (tracemalloc.get_traced_memory()[1] - state["traced_start"]) / 2**20
+        with self._lock:
+            self._node_rows.append(row)
+            self._folded.update(sampler.samples)
+        if "profile" in state and self._output_dir is not None:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
+            state["profile"].dump_stats(self._output_dir / f"{node.name}.prof")
+
+    @hook_impl
+    def after_node_run(self, node) -> None:
+        if self._enabled:
+            self._finish_node(node, failed=False)
+
+    @hook_impl
+    def on_node_error(self, node) -> None:
+        if self._enabled:
+            self._finish_node(node, failed=True)
+
+    # --------------------------------------------------------------- datasets
+    def _io_begin(self, operation: str, dataset_name: str) -> None:
+        self._io_start[(operation, dataset_name, threading.get_ident())] = time.perf_counter()
+
+    def _io_end(self, operation: str, dataset_name: str, data: Any, node) -> None:
+        t0 = self._io_start.pop((operation, dataset_name, threading.get_ident()), None)
+        if t0 is None:
+            return
+        seconds = time.perf_counter() - t0
+        disk = None
+        if self._catalog is not None and dataset_name not in self._in_memory:
+            config = self._catalog.config_resolver.resolve_pattern(dataset_name)
+            disk = file_bytes(config.get("filepath"))
+        with self._lock:
+            self._io_rows.append({
+                "dataset": dataset_name,
+                "operation": operation,
+                "node": node.name,
+                "seconds": seconds,
+                "mem_bytes": nbytes(data),
+                "file_bytes": disk,
+            })
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str) -> None:
+        if self._enabled:
+            self._io_begin("load", dataset_name)
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, data: Any, node) -> None:
+        if self._enabled:
+            self._io_end("load", dataset_name, data, node)
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str) -> None:
+        if self._enabled:
+            self._io_begin("save", dataset_name)
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node) -> None:
+        if self._enabled:
+            self._io_end("save", dataset_name, data, node)
+
+    # -------------------------------------------------------------- reportes
+    def _write(self) -> None:
+        if not self._enabled or self._output_dir is None:
+            return
+        write_reports(self._output_dir, self._node_rows, self._io_rows, self._folded,
+                      top=int(self._config.get("top", 10)))
+        self._node_rows, self._io_rows, self._folded = [], [], Counter()
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        self._write()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        self._write()
+
+
+class ResponseCacheHook:
+    """Configura la caché de :mod:`data_access` y loguea sus estadísticas.
+
+    Con ``ParallelRunner`` cada worker tiene su propia caché (con el tamaño por
+    defecto); las estadísticas reportadas son las del proceso principal.
+    """
+
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        runtime = context.params.get("runtime", {}) or {}
+        config = runtime.get("response_cache", {}) or {}
+        if "max_mb" in config:
+            response_cache().resize(int(float(config["max_mb"]) * 2**20))
+
+    def _report(self) -> None:
+        stats = response_cache().stats()
+        if not (stats.hits or stats.misses):
+            return
+        logger.info(
+            "[data_access] caché de respuestas: aciertos=%d, fallos=%d, desalojos=%d (%.1f MB), "
+            "entradas=%d, %.1f de %.0f MB",
+            stats.hits, stats.misses, stats.evictions, stats.evicted_bytes / 2**20,
+            stats.entries, stats.bytes / 2**20, stats.max_bytes / 2**20,
+        )
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        self._report()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        self._report()
@@ -0,0 +1,15 @@
+"""Motores IRT propios sobre respuestas dispersas (celdas observadas)."""
+from .chunked import ResponseChunks, rasch_mml_em_chunked
+from .mml import MMLResult, normal_quadrature, rasch_mml_em
+from .online import OnlineCalibration
+from .sparse import SparseResponses
+
+__all__ = [
+    "MMLResult",
+    "OnlineCalibration",
+    "ResponseChunks",
+    "SparseResponses",
+    "normal_quadrature",
+    "rasch_mml_em",
+    "rasch_mml_em_chunked",
+]
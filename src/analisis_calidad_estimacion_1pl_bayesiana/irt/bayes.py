@@ -0,0 +1,190 @@
+"""Modelo de Rasch en PyMC sobre :class:`SparseResponses`.
+
+La verosimilitud es un ``Op`` propio (:mod:`irt.rasch_op`) que usa los totales
+de aciertos por persona e ítem más la grilla de celdas observadas: densa
+(``theta[:, None] - b[None, :]``, con máscara si faltan celdas) cuando la mayor
+parte está observada, o sólo sobre las celdas observadas (``theta[person] -
+b[item]``, con el número de intentos por celda) si no. El modelo no guarda la
+matriz 0/1 y ``logp`` y su gradiente salen de una misma pasada.
+
+Arranque en caliente: ``initvals`` (p. ej. dificultades MMLE y thetas EAP de la
+misma máscara) fija el punto inicial de las cadenas, y un :class:`NutsTuning`
+de una celda ya muestreada con el mismo número de personas e ítems fija el paso
+inicial y la matriz de masa diagonal (varianzas posteriores), de modo que el
+calentamiento sólo ajusta el paso y puede ser mucho más corto.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from analisis_calidad_estimacion_1pl_bayesiana.precision import pytensor_floatx, resolve_float_dtype
+
+from .sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+# Semiancho del ruido uniforme sumado a ``initvals`` en cada cadena (PyMC usa 1
+# con ``jitter+adapt_diag``; menor aquí porque el punto de partida ya es bueno)
+INIT_JITTER = 0.5
+
+
+@dataclass(frozen=True)
+class NutsTuning:
+    """Adaptación NUTS reutilizable: paso y varianzas posteriores de [theta, b]."""
+
+    step_size: float
+    variance: np.ndarray
+    n_persons: int
+    n_items: int
+
+    @classmethod
+    def from_trace(cls, idata) -> "NutsTuning":
+        """Paso final medio entre cadenas y varianza posterior de cada coordenada."""
+        post = idata.posterior
+        theta = post["theta"].stack(sample=("chain", "draw")).transpose(..., "sample").values
+        b = post["b"].stack(sample=("chain", "draw")).transpose(..., "sample").values
+        return cls(
+            step_size=float(idata.sample_stats["step_size"].isel(draw=-1).mean()),
+            variance=np.concatenate([theta.var(axis=1), b.var(axis=1)]),
+            n_persons=theta.shape[0],
+            n_items=b.shape[0],
+        )
+
+    def matches(self, data: SparseResponses) -> bool:
+        return (self.n_persons, self.n_items) == (data.n_persons, data.n_items)
+
+
+def import_pymc():
+    """Importa PyMC sólo cuando corre un nodo que lo necesita.
+
+    Importar PyMC/pytensor cuesta varios segundos; diferirlo mantiene rápidos el
+    arranque del CLI (``kedro registry list``, pipelines livianos) y el spawn de
+    workers del ParallelRunner.
+    """
+    try:
+        import pymc as pm
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(f"PyMC no está instalado en el entorno: {e}") from e
+    return pm
+
+
+def add_rasch_likelihood(pm, theta, b, data: SparseResponses) -> None:
+    """Agrega la log-verosimilitud observada ``responses`` (un ``Potential``) al modelo activo."""
+    from .rasch_op import RaschLogLik
+
+    logp, _, _ = RaschLogLik.from_responses(data)(theta, b)
+    pm.Potential("responses", logp)
+
+
+def sample_rasch_posterior(
+    data: SparseResponses,
+    mu_b: np.ndarray | float,
+    sigma_b: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None = None,
+    precision: str = "float64",
+    initvals: dict[str, np.ndarray] | None = None,
+    tuning: NutsTuning | None = None,
+    cores: int | None = None,
+):
+    """Rasch con theta ~ N(0, 1), b ~ N(mu_b, sigma_b); devuelve el ``InferenceData``.
+
+    ``initvals``: valores iniciales ``{"theta": ..., "b": ...}``; cada cadena
+    parte de ese punto más ruido ``U(-INIT_JITTER, INIT_JITTER)`` propio (con
+    semilla derivada de ``seed``), así R-hat sigue comparando arranques
+    distintos, también con ``tuning`` (PyMC no aplica jitter si se le pasa el
+    ``step``). ``tuning``: paso y matriz de masa de otra corrida con
+    las mismas dimensiones; la matriz queda fija y ``tune`` sólo adapta el paso.
+    Con dimensiones distintas se ignora y se adapta desde cero. ``cores``:
+    procesos para las cadenas (por defecto hasta 2; 1 dentro de un pool de workers).
+    """
+    pm = import_pymc()
+    dtype = resolve_float_dtype(precision)
+    mu_b = np.broadcast_to(np.asarray(mu_b, dtype=dtype), (data.n_items,))
+    coords = {"person": np.arange(data.n_persons), "item": np.arange(data.n_items)}
+
+    with pytensor_floatx(precision), pm.Model(coords=coords):
+        theta = pm.Normal("theta", mu=0.0, sigma=1.0, dims="person")
+        b = pm.Normal("b", mu=mu_b, sigma=float(sigma_b), dims="item")
+        add_rasch_likelihood(pm, theta, b, data)
+
+        kwargs: dict[str, Any] = {}
+        if initvals:
+            kwargs["initvals"] = _jittered_initvals(initvals, chains, seed, dtype)
+            kwargs["init"] = "adapt_diag"  # el jitter ya va en cada punto de partida
+        if tuning is not None and not tuning.matches(data):
+            logger.warning(
+                "[irt] Adaptación NUTS para %dx%d no aplica a %dx%d; se adapta desde cero",
+                tuning.n_persons, tuning.n_items, data.n_persons, data.n_items,
+            )
+            tuning = None
+        if tuning is not None:
+            size = data.n_persons + data.n_items
+            kwargs["step"] = pm.NUTS(
+                vars=[theta, b],
+                scaling=np.asarray(tuning.variance, dtype=dtype),
+                is_cov=True,
+                step_scale=tuning.step_size * size**0.25,
+                target_accept=float(target_accept),
+            )
+        else:
+            kwargs["target_accept"] = float(target_accept)
+
+        return pm.sample(
+            draws=draws,
+            tune=tune,
+            chains=chains,
+            random_seed=seed,
+            progressbar=False,
+            cores=min(chains, 2) if cores is None else int(cores),
+            **kwargs,
+        )
+
+
+def _jittered_initvals(
+    initvals: dict[str, np.ndarray], chains: int, seed: int | None, dtype: str
+) -> list[dict[str, np.ndarray]]:
+    """Un punto de partida por cadena: ``initvals`` + ``U(-INIT_JITTER, INIT_JITTER)``."""
+    rng = np.random.default_rng(None if seed is None else [int(seed), 1])
+    points = []
+    for _ in range(chains):
+        point = {}
+        for name, value in initvals.items():
+            value = np.asarray(value, dtype=float)
+            point[name] = (value + rng.uniform(-INIT_JITTER, INIT_JITTER, value.shape)).astype(dtype)
+        points.append(point)
+    return points
+
+
+def fit_rasch_advi(
+    data: SparseResponses,
+    mu_b: np.ndarray | float,
+    sigma_b: float,
+    draws: int,
+    n_iter: int,
+    seed: int | None = None,
+    precision: str = "float64",
+):
+    """Mismo modelo que :func:`sample_rasch_posterior` ajustado por ADVI (campo medio).
+
+    Devuelve un ``InferenceData`` con ``draws`` muestras de la aproximación
+    (una cadena). Mucho más rápido que NUTS, pero subestima la varianza posterior.
+    """
+    pm = import_pymc()
+    dtype = resolve_float_dtype(precision)
+    mu_b = np.broadcast_to(np.asarray(mu_b, dtype=dtype), (data.n_items,))
+    coords = {"person": np.arange(data.n_persons), "item": np.arange(data.n_items)}
+
+    with pytensor_floatx(precision), pm.Model(coords=coords):
+        theta = pm.Normal("theta", mu=0.0, sigma=1.0, dims="person")
+        b = pm.Normal("b", mu=mu_b, sigma=float(sigma_b), dims="item")
+        add_rasch_likelihood(pm, theta, b, data)
+        approx = pm.fit(n=int(n_iter), method="advi", random_seed=seed, progressbar=False)
+        return approx.sample(int(draws), random_seed=seed)
@@ -0,0 +1,170 @@
+"""MML-EM fuera de memoria: el paso E recorre bloques de personas desde Parquet.
+
+El archivo es formato largo ordenado por persona (todas las filas de una persona
+contiguas), p. ej. la exportación de una base con ``ORDER BY person``. Cada
+iteración EM lee los row groups en lotes de ``chunk_rows`` filas; las filas de la
+última persona de un lote se arrastran al siguiente para no partir a nadie. La
+memoria pico queda fijada por ``chunk_rows`` (más ítems × nodos de cuadratura),
+no por el tamaño del archivo.
+
+:func:`write_response_chunks` escribe ese formato desde :class:`SparseResponses`.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .mml import ExpectedCounts, MMLResult, e_step_block, initial_difficulties, mask_unobserved, normal_quadrature, run_em
+from .sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChunkIndex:
+    """Resultado de la pasada inicial: vocabulario de ítems y totales por ítem."""
+
+    item_ids: np.ndarray
+    n_obs: np.ndarray
+    successes: np.ndarray
+    n_persons: int
+    n_rows: int
+
+
+@dataclass(frozen=True)
+class ResponseChunks:
+    """Handle perezoso a un Parquet largo ordenado por persona (no contiene datos).
+
+    ``response_col`` son aciertos (0/1, o conteos si hay ``trials_col``).
+    """
+
+    filepath: str
+    person_col: str = "person_id"
+    item_col: str = "item_id"
+    response_col: str = "response"
+    trials_col: str | None = None
+    chunk_rows: int = 1_000_000
+
+    def _columns(self) -> list[str]:
+        cols = [self.person_col, self.item_col, self.response_col]
+        return cols + ([self.trials_col] if self.trials_col else [])
+
+    def _batches(self, columns: list[str]) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        with pq.ParquetFile(self.filepath) as pf:
+            for batch in pf.iter_batches(batch_size=int(self.chunk_rows), columns=columns):
+                yield batch.to_pandas()
+
+    def scan(self) -> ChunkIndex:
+        """Una pasada en streaming: ítems, observaciones/aciertos por ítem y personas."""
+        n_obs: pd.Series | None = None
+        succ: pd.Series | None = None
+        n_persons = 0
+        n_rows = 0
+        last = None
+        for frame in self._batches(self._columns()):
+            frame = frame.dropna(subset=[self.response_col])
+            trials = frame[self.trials_col] if self.trials_col else pd.Series(1, index=frame.index)
+            by_item = pd.DataFrame({"item": frame[self.item_col], "n": trials, "s": frame[self.response_col]})
+            sums = by_item.groupby("item", sort=False)[["n", "s"]].sum()
+            n_obs = sums["n"] if n_obs is None else n_obs.add(sums["n"], fill_value=0)
+            succ = sums["s"] if succ is None else succ.add(sums["s"], fill_value=0)
+            persons = frame[self.person_col].to_numpy()
+            if persons.size:
+                changes = np.count_nonzero(persons[1:] != persons[:-1]) + 1
+                n_persons += changes - int(last is not None and persons[0] == last)
+                last = persons[-1]
+            n_rows += len(frame)
+        if n_obs is None:
+            return ChunkIndex(np.array([]), np.array([]), np.array([]), 0, 0)
+        n_obs = n_obs.sort_index()
+        return ChunkIndex(
+            item_ids=n_obs.index.to_numpy(),
+            n_obs=n_obs.to_numpy(dtype=float),
+            successes=succ.reindex(n_obs.index).to_numpy(dtype=float),
+            n_persons=n_persons,
+            n_rows=n_rows,
+        )
+
+    def iter_blocks(self, item_ids: np.ndarray) -> Iterator[SparseResponses]:
+        """Bloques de personas completas como :class:`SparseResponses` (índices de ítem comunes)."""
+        item_index = pd.Index(item_ids)
+        carry: pd.DataFrame | None = None
+        last_person = None
+        for frame in self._batches(self._columns()):
+            frame = frame.dropna(subset=[self.response_col])
+            if frame.empty:
+                continue
+            persons = frame[self.person_col]
+            first = persons.iloc[0]
+            if not persons.is_monotonic_increasing or (last_person is not None and first < last_person):
+                raise ValueError(f"{self.filepath}: las filas deben estar ordenadas por {self.person_col!r}")
+            last_person = persons.iloc[-1]
+            if carry is not None:
+                frame = pd.concat([carry, frame], ignore_index=True)
+            # La última persona puede seguir en el próximo lote
+            tail = frame[self.person_col].to_numpy() == last_person
+            carry = frame[tail]
+            block = frame[~tail]
+            if not block.empty:
+                yield self._to_sparse(block, item_index)
+        if carry is not None and not carry.empty:
+            yield self._to_sparse(carry, item_index)
+
+    def _to_sparse(self, frame: pd.DataFrame, item_index: pd.Index) -> SparseResponses:
+        person, person_ids = pd.factorize(frame[self.person_col], sort=False)
+        item = item_index.get_indexer(frame[self.item_col])
+        trials = frame[self.trials_col].to_numpy() if self.trials_col else None
+        return SparseResponses.from_coo(
+            person, item, frame[self.response_col].to_numpy(dtype=np.int64), trials,
+            person_ids=np.asarray(person_ids), item_ids=item_index.to_numpy(),
+        )
+
+
+def write_response_chunks(data: SparseResponses, filepath: str, row_group_rows: int = 1_000_000) -> None:
+    """Escribe ``data`` como Parquet largo ordenado por persona (formato de :class:`ResponseChunks`).
+
+    Columnas: ``person_id``, ``item_id``, ``successes``, ``trials``.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({
+        "person_id": data.person_ids[data.person],
+        "item_id": data.item_ids[data.item],
+        "successes": data.successes,
+        "trials": data.trials,
+    })
+    pq.write_table(table, filepath, row_group_size=int(row_group_rows))
+
+
+def rasch_mml_em_chunked(
+    chunks: ResponseChunks,
+    n_quadrature: int = 41,
+    max_iter: int = 500,
+    tol: float = 1e-5,
+) -> tuple[MMLResult, ChunkIndex]:
+    """Igual que :func:`irt.rasch_mml_em`, pero cada paso E relee el archivo por bloques.
+
+    Devuelve el resultado y el índice de la pasada inicial (ítems y totales).
+    """
+    quad = normal_quadrature(n_quadrature)
+    index = chunks.scan()
+
+    def e_step(b: np.ndarray) -> ExpectedCounts:
+        total = ExpectedCounts.zeros(index.item_ids.size, quad.theta.size)
+        for block in chunks.iter_blocks(index.item_ids):
+            total.add(e_step_block(block.csr("trials"), block.csr("successes"), b, quad))
+        return total
+
+    result = run_em(e_step, initial_difficulties(index.n_obs, index.successes), quad, max_iter=max_iter, tol=tol)
+    logger.info(
+        "[irt] MML-EM por bloques: persons=%d, items=%d, filas=%d, chunk_rows=%d, iter=%d",
+        index.n_persons, index.item_ids.size, index.n_rows, chunks.chunk_rows, result.n_iter,
+    )
+    return mask_unobserved(result, index.n_obs > 0), index
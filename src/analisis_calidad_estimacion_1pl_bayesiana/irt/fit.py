@@ -0,0 +1,165 @@
+"""Estadísticos de ajuste infit/outfit (Wright y Masters, 1982) por ítem y por persona.
+
+Con probabilidades esperadas ``P = expit(theta - b)`` y, en cada celda
+observada con ``n`` intentos y ``x`` aciertos::
+
+    E = n P,  V = n P Q,  C = n P Q (1 + 3 (n - 2) P Q)   (4.º momento central)
+
+- ``outfit`` (media de residuos estandarizados al cuadrado, sensible a
+  respuestas inesperadas lejos de la dificultad): ``mean((x - E)² / V)``.
+- ``infit`` (ponderado por la información): ``sum((x - E)²) / sum(V)``.
+- ``*_z``: transformación cúbica de Wilson-Hilferty a ``t ≈ N(0, 1)``
+  con ``q²_out = sum(C / V²) / N² - 1 / N`` y ``q²_in = sum(C - V²) / sum(V)²``.
+
+Sólo se recorren las celdas observadas de :class:`SparseResponses`, por
+bloques de personas completas de a lo sumo ``max_cells`` celdas; los residuos
+del bloque se reducen de inmediato con ``bincount`` a sumas por ítem y por
+persona, así la memoria no crece con personas × ítems.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from .sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+# Columnas que se agregan a las filas (ítems) del almacén de resultados; el
+# ajuste de cada persona va a la tabla ``persons`` (:meth:`RaschFit.person_columns`)
+FIT_COLUMNS = (
+    "item_infit", "item_outfit", "item_infit_z", "item_outfit_z", "person_infit_misfit", "person_outfit_misfit",
+)
+
+
+@dataclass(frozen=True)
+class FitStatistics:
+    """Medias cuadráticas y ``t`` estandarizados (NaN sin observaciones)."""
+
+    infit: np.ndarray
+    outfit: np.ndarray
+    infit_z: np.ndarray
+    outfit_z: np.ndarray
+    n_obs: np.ndarray
+
+    def misfit(self, z_crit: float = 2.0) -> tuple[float, float]:
+        """Fracción con ``|t| > z_crit`` de infit y de outfit (entre los que tienen ``t``)."""
+        return tuple(
+            float(np.mean(np.abs(z[np.isfinite(z)]) > z_crit)) if np.isfinite(z).any() else float("nan")
+            for z in (self.infit_z, self.outfit_z)
+        )
+
+
+@dataclass(frozen=True)
+class RaschFit:
+    items: FitStatistics
+    persons: FitStatistics
+
+    def columns(self, z_crit: float = 2.0) -> dict[str, np.ndarray | float]:
+        """Columnas ``FIT_COLUMNS``: por ítem, y la fracción de personas con desajuste (resumen escalar)."""
+        person_infit, person_outfit = self.persons.misfit(z_crit)
+        return {
+            "item_infit": self.items.infit,
+            "item_outfit": self.items.outfit,
+            "item_infit_z": self.items.infit_z,
+            "item_outfit_z": self.items.outfit_z,
+            "person_infit_misfit": person_infit,
+            "person_outfit_misfit": person_outfit,
+        }
+
+    def person_columns(self) -> dict[str, np.ndarray]:
+        """Columnas por persona de la tabla ``persons`` del almacén (sin ``theta``)."""
+        p = self.persons
+        return {"n_obs": p.n_obs, "infit": p.infit, "outfit": p.outfit, "infit_z": p.infit_z, "outfit_z": p.outfit_z}
+
+
+class _FitSums:
+    """Sumas por unidad (ítem o persona) que definen infit/outfit."""
+
+    def __init__(self, n: int) -> None:
+        self.n_obs = np.zeros(n)
+        self.z2 = np.zeros(n)      # sum (x - E)² / V
+        self.sq = np.zeros(n)      # sum (x - E)²
+        self.var = np.zeros(n)     # sum V
+        self.kurt_out = np.zeros(n)  # sum C / V²
+        self.kurt_in = np.zeros(n)   # sum (C - V²)
+
+    def add(self, index: np.ndarray, n: int, weights: dict[str, np.ndarray], offset: int = 0) -> None:
+        for name, values in weights.items():
+            getattr(self, name)[offset:offset + n] += np.bincount(index, weights=values, minlength=n)
+
+    def statistics(self) -> FitStatistics:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            outfit = self.z2 / self.n_obs
+            infit = self.sq / self.var
+            q_out = np.sqrt(np.maximum(self.kurt_out / self.n_obs**2 - 1.0 / self.n_obs, 0.0))
+            q_in = np.sqrt(np.maximum(self.kurt_in / self.var**2, 0.0))
+            outfit_z = (np.cbrt(outfit) - 1.0) * (3.0 / q_out) + q_out / 3.0
+            infit_z = (np.cbrt(infit) - 1.0) * (3.0 / q_in) + q_in / 3.0
+        empty = self.n_obs == 0
+        for arr in (outfit, infit, outfit_z, infit_z):
+            arr[empty | ~np.isfinite(arr)] = np.nan
+        return FitStatistics(infit=infit, outfit=outfit, infit_z=infit_z, outfit_z=outfit_z, n_obs=self.n_obs.astype(int))
+
+
+def rasch_fit_statistics(
+    data: SparseResponses,
+    difficulty: np.ndarray,
+    theta: np.ndarray,
+    max_cells: int = 2_000_000,
+) -> RaschFit:
+    """Infit/outfit por ítem y por persona dados ``b`` (alineado con ``data.item_ids``) y ``theta``.
+
+    Celdas con ``b`` o ``theta`` no finitos (ítems no calibrados, puntajes
+    extremos en ML) se ignoran.
+    """
+    b = np.asarray(difficulty, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    n_persons, n_items = data.n_persons, data.n_items
+    if b.shape != (n_items,) or theta.shape != (n_persons,):
+        raise ValueError(f"Se esperaban {n_items} dificultades y {n_persons} thetas; llegaron {b.shape} y {theta.shape}")
+
+    items, persons = _FitSums(n_items), _FitSums(n_persons)
+    # data viene ordenado por (persona, ítem): cada bloque de personas es un tramo contiguo
+    person_step = int(np.clip(max_cells // max(n_items, 1), 1, max(n_persons, 1)))
+    bounds = np.searchsorted(data.person, np.arange(0, n_persons + person_step, person_step))
+    n_blocks = 0
+    for k, s in enumerate(range(0, n_persons, person_step)):
+        o0, o1 = int(bounds[k]), int(bounds[k + 1])
+        if o1 <= o0:
+            continue
+        n_blocks += 1
+        person, item = data.person[o0:o1], data.item[o0:o1]
+        n = data.trials[o0:o1].astype(float)
+        x = data.successes[o0:o1].astype(float)
+        eta = theta[person] - b[item]
+        with np.errstate(invalid="ignore"):
+            p = 1.0 / (1.0 + np.exp(-eta))
+        pq = p * (1.0 - p)
+        # P redondeada a 0/1 (sin varianza) o parámetros no finitos: la celda no informa
+        ok = np.isfinite(eta) & (pq > 0)
+        p, pq, n, x = p[ok], pq[ok], n[ok], x[ok]
+        var = n * pq
+        sq = (x - n * p) ** 2
+        kurt = var * (1.0 + 3.0 * (n - 2.0) * pq)
+        weights = {
+            "n_obs": np.ones_like(var),
+            "z2": sq / var,
+            "sq": sq,
+            "var": var,
+            "kurt_out": kurt / var**2,
+            "kurt_in": kurt - var**2,
+        }
+        items.add(item[ok], n_items, weights)
+        persons.add(person[ok] - s, min(person_step, n_persons - s), weights, offset=s)
+
+    result = RaschFit(items=items.statistics(), persons=persons.statistics())
+    logger.info(
+        "[irt] ajuste: persons=%d, items=%d, bloques=%d; infit/outfit medio de ítems=%.3f/%.3f; "
+        "personas con |t|>2 (infit/outfit)=%.3f/%.3f",
+        n_persons, n_items, n_blocks, np.nanmean(result.items.infit), np.nanmean(result.items.outfit),
+        *result.persons.misfit(),
+    )
+    return result
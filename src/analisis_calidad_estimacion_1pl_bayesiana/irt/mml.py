@@ -0,0 +1,205 @@
+"""MML-EM del modelo de Rasch sobre respuestas dispersas.
+
+Misma especificación que ``girth.rasch_mml(X, discrimination=1)``: habilidades
+N(0, 1) integradas con una cuadratura fija y dificultades estimadas por máxima
+verosimilitud marginal. La verosimilitud se evalúa sólo sobre celdas
+observadas: con ``A`` (observaciones) e ``Y`` (aciertos) dispersas personas ×
+ítems y ``E[i, q] = theta_q - b_i``,
+
+    log L[p, q] = (Y @ E)[p, q] - (A @ log1p(exp(E)))[p, q]
+
+de modo que cada iteración cuesta O(celdas observadas × nodos) en tiempo y
+O(ítems × nodos) en memoria, más un bloque de ``chunk_size`` personas.
+
+El paso E devuelve, por ítem y nodo, los conteos esperados de observaciones
+(``n_iq``) y aciertos (``r_iq``); el paso M resuelve cada ítem con Newton.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+# Dificultades de ítems con todas las respuestas iguales divergen: se acotan
+DIFFICULTY_BOUND = 15.0
+
+
+@dataclass(frozen=True)
+class Quadrature:
+    """Nodos ``theta`` y log-pesos normalizados de la distribución de habilidad."""
+
+    theta: np.ndarray
+    log_weights: np.ndarray
+
+
+def normal_quadrature(n_nodes: int = 41, bound: float = 5.0) -> Quadrature:
+    """Grilla equiespaciada en ``[-bound, bound]`` con pesos N(0, 1) normalizados."""
+    theta = np.linspace(-bound, bound, int(n_nodes))
+    log_w = -0.5 * theta**2
+    log_w -= np.logaddexp.reduce(log_w)
+    return Quadrature(theta=theta, log_weights=log_w)
+
+
+@dataclass
+class ExpectedCounts:
+    """Estadísticos suficientes del paso E (acumulables entre bloques de personas)."""
+
+    n: np.ndarray  # [ítems x nodos] observaciones esperadas
+    r: np.ndarray  # [ítems x nodos] aciertos esperados
+    log_likelihood: float = 0.0
+
+    @classmethod
+    def zeros(cls, n_items: int, n_nodes: int) -> "ExpectedCounts":
+        return cls(np.zeros((n_items, n_nodes)), np.zeros((n_items, n_nodes)), 0.0)
+
+    def add(self, other: "ExpectedCounts") -> None:
+        self.n += other.n
+        self.r += other.r
+        self.log_likelihood += other.log_likelihood
+
+
+@dataclass(frozen=True)
+class MMLResult:
+    difficulty: np.ndarray
+    se: np.ndarray
+    log_likelihood: float
+    n_iter: int
+    converged: bool
+
+    def to_frame(self, item_ids: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({"item_id": item_ids, "estimate": self.difficulty, "sd": self.se})
+
+
+def e_step_block(trials, successes, b: np.ndarray, quad: Quadrature) -> ExpectedCounts:
+    """Paso E para un bloque de personas (filas CSR de ``trials``/``successes``)."""
+    logits = quad.theta[None, :] - b[:, None]  # [ítems x nodos]
+    log_lik = successes @ logits - trials @ np.logaddexp(0.0, logits)  # [personas x nodos]
+    log_post = log_lik + quad.log_weights[None, :]
+    log_norm = np.logaddexp.reduce(log_post, axis=1)
+    weights = np.exp(log_post - log_norm[:, None])
+    return ExpectedCounts(
+        n=np.asarray(trials.T @ weights),
+        r=np.asarray(successes.T @ weights),
+        log_likelihood=float(log_norm.sum()),
+    )
+
+
+def m_step(counts: ExpectedCounts, b: np.ndarray, quad: Quadrature, newton_steps: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """Newton por ítem sobre la log-verosimilitud esperada; devuelve (b, información)."""
+    r_total = counts.r.sum(axis=1)
+    info = np.zeros_like(b)
+    for _ in range(newton_steps):
+        p = 1.0 / (1.0 + np.exp(-(quad.theta[None, :] - b[:, None])))
+        grad = (counts.n * p).sum(axis=1) - r_total
+        info = (counts.n * p * (1.0 - p)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            step = np.where(info > 0, grad / info, 0.0)
+        b = np.clip(b + step, -DIFFICULTY_BOUND, DIFFICULTY_BOUND)
+    return b, info
+
+
+def initial_difficulties(n_obs: np.ndarray, successes: np.ndarray) -> np.ndarray:
+    """Logit de la proporción de errores por ítem (0 para ítems sin datos)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = np.where(n_obs > 0, successes / n_obs, 0.5)
+    p = np.clip(p, 0.01, 0.99)
+    return np.log((1.0 - p) / p)
+
+
+def run_em(
+    e_step,
+    b0: np.ndarray,
+    quad: Quadrature,
+    max_iter: int = 500,
+    tol: float = 1e-5,
+) -> MMLResult:
+    """Bucle EM genérico: ``e_step(b) -> ExpectedCounts`` (en memoria, por bloques, ...)."""
+    b = np.asarray(b0, dtype=float).copy()
+    info = np.zeros_like(b)
+    loglik = -np.inf
+    converged = False
+    it = 0
+    for it in range(1, int(max_iter) + 1):
+        counts = e_step(b)
+        loglik = counts.log_likelihood
+        b_new, info = m_step(counts, b, quad)
+        delta = float(np.max(np.abs(b_new - b))) if b.size else 0.0
+        b = b_new
+        if delta < tol:
+            converged = True
+            break
+    if not converged:
+        logger.warning("[irt] MML-EM sin converger en %d iteraciones", it)
+    with np.errstate(divide="ignore"):
+        se = np.where(info > 0, 1.0 / np.sqrt(info), np.nan)
+    return MMLResult(difficulty=b, se=se, log_likelihood=loglik, n_iter=it, converged=converged)
+
+
+def rasch_mml_em(
+    data: SparseResponses,
+    n_quadrature: int = 41,
+    max_iter: int = 500,
+    tol: float = 1e-5,
+    chunk_size: int = 8192,
+    n_workers: int = 1,
+) -> MMLResult:
+    """Estima dificultades de Rasch por MML-EM usando sólo las celdas observadas.
+
+    ``chunk_size`` acota la matriz de posteriores [personas x nodos] del paso E y
+    define los bloques de personas. Con ``n_workers > 1`` esos mismos bloques se
+    reparten en un pool de procesos con memoria compartida (:mod:`irt.parallel`)
+    y la suma se hace en orden de bloque, así que el resultado es idéntico bit a
+    bit al de un proceso. Se usan a lo sumo tantos procesos como bloques: con
+    pocas personas hay que bajar ``chunk_size`` para repartir el trabajo. Ítems
+    sin observaciones quedan en NaN. ``se`` es el error estándar por ítem
+    (inversa de la información esperada del paso M final).
+    """
+    quad = normal_quadrature(n_quadrature)
+    trials = data.csr("trials")
+    successes = data.csr("successes")
+    n_persons = data.n_persons
+    step = max(1, int(chunk_size))
+    blocks = [(s, min(s + step, n_persons)) for s in range(0, n_persons, step)]
+
+    def e_step(b: np.ndarray) -> ExpectedCounts:
+        total = ExpectedCounts.zeros(data.n_items, quad.theta.size)
+        for start, stop in blocks:
+            total.add(e_step_block(trials[start:stop], successes[start:stop], b, quad))
+        return total
+
+    n_obs = np.bincount(data.item, weights=data.trials, minlength=data.n_items)
+    succ = np.bincount(data.item, weights=data.successes, minlength=data.n_items)
+    b0 = initial_difficulties(n_obs, succ)
+    workers = min(max(1, int(n_workers)), len(blocks))
+    if workers < int(n_workers):
+        logger.info("[irt] MML-EM: %d bloque(s) de %d personas; se usan %d de %d workers (bajar chunk_size)",
+                    len(blocks), step, workers, int(n_workers))
+    if workers > 1:
+        from .parallel import ShardedEStep
+
+        with ShardedEStep(trials, successes, blocks, quad, n_workers=workers) as sharded:
+            result = run_em(sharded, b0, quad, max_iter=max_iter, tol=tol)
+    else:
+        result = run_em(e_step, b0, quad, max_iter=max_iter, tol=tol)
+    logger.info(
+        "[irt] MML-EM: persons=%d, items=%d, obs=%d, bloques=%d, workers=%d, iter=%d, loglik=%.3f",
+        n_persons, data.n_items, data.n_observations, len(blocks), workers, result.n_iter, result.log_likelihood,
+    )
+    return mask_unobserved(result, n_obs > 0)
+
+
+def mask_unobserved(result: MMLResult, observed: np.ndarray) -> MMLResult:
+    """Ítems sin observaciones: estimación y error estándar NaN."""
+    return MMLResult(
+        difficulty=np.where(observed, result.difficulty, np.nan),
+        se=np.where(observed, result.se, np.nan),
+        log_likelihood=result.log_likelihood,
+        n_iter=result.n_iter,
+        converged=result.converged,
+    )
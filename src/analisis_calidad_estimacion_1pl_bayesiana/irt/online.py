@@ -0,0 +1,164 @@
+"""Calibración incremental de dificultades de Rasch (Bayes secuencial con Laplace).
+
+El estado es una normal independiente por ítem, ``b_i ~ N(mean_i, 1/precision_i)``,
+que arranca en el prior de siempre (``N(mu_b, sigma_b)``) y actúa como prior del
+lote siguiente. Para cada lote nuevo:
+
+1. Paso E sobre las personas del lote (habilidades N(0, 1) integradas con la
+   cuadratura de :mod:`irt.mml`) con las dificultades actuales: conteos
+   esperados ``n_iq``/``r_iq`` de los ítems presentes.
+2. Newton sobre ``log N(b | mean, 1/precision) + sum_q r_iq (theta_q - b) -
+   n_iq log(1 + exp(theta_q - b))``; los pasos 1-2 se repiten sobre el mismo
+   lote hasta ``n_iter`` veces.
+3. Aproximación de Laplace: la media pasa al modo y la precisión suma la
+   información esperada del lote.
+
+El costo de una actualización depende sólo del lote (celdas observadas × nodos)
+y de los ítems que aparecen en él; lo ya procesado vive en el estado.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .mml import DIFFICULTY_BOUND, e_step_block, normal_quadrature
+from .sparse import SparseResponses, _plain_ids
+
+STATE_VERSION = 1
+
+
+def batch_fingerprint(data: SparseResponses) -> str:
+    """Hash del contenido del lote: el mismo archivo no se incorpora dos veces."""
+    digest = hashlib.sha256()
+    for name, array in sorted(data.arrays().items()):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class OnlineCalibration:
+    """Posterior normal por ítem más la bitácora de lotes incorporados."""
+
+    prior_mean: float = 0.0
+    prior_sd: float = 1.0
+    n_quadrature: int = 41
+    item_ids: list = field(default_factory=list)
+    mean: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    precision: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    n_obs: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    batches: list[str] = field(default_factory=list)
+    n_persons: int = 0
+
+    def _positions(self, item_ids: Sequence[Any], prior_mean: np.ndarray | None = None) -> np.ndarray:
+        """Posición en el estado de cada ítem; los ítems nuevos entran con el prior."""
+        index = {item: k for k, item in enumerate(self.item_ids)}
+        new = [item for item in item_ids if item not in index]
+        if new:
+            if prior_mean is None:
+                new_mean = np.full(len(new), self.prior_mean)
+            else:
+                lookup = dict(zip(item_ids, prior_mean))
+                new_mean = np.array([lookup[item] for item in new], dtype=float)
+            for item in new:
+                index[item] = len(self.item_ids)
+                self.item_ids.append(item)
+            self.mean = np.concatenate([self.mean, new_mean])
+            self.precision = np.concatenate([self.precision, np.full(len(new), self.prior_sd**-2)])
+            self.n_obs = np.concatenate([self.n_obs, np.zeros(len(new), dtype=np.int64)])
+        return np.array([index[item] for item in item_ids], dtype=np.int64)
+
+    def update(
+        self,
+        data: SparseResponses,
+        batch_id: str | None = None,
+        prior_mean: np.ndarray | None = None,
+        n_iter: int = 10,
+        tol: float = 1e-6,
+    ) -> bool:
+        """Incorpora un lote; devuelve ``False`` si ``batch_id`` ya estaba incorporado.
+
+        ``prior_mean`` (alineado con ``data.item_ids``) fija la media inicial de
+        los ítems que aparecen por primera vez (p. ej. una predicción externa).
+        """
+        batch_id = str(batch_id) if batch_id is not None else batch_fingerprint(data)
+        if batch_id in self.batches:
+            return False
+        item_ids = [_as_key(item) for item in _plain_ids(data.item_ids)]
+        pos = self._positions(item_ids, prior_mean)
+        quad = normal_quadrature(self.n_quadrature)
+        trials, successes = data.csr("trials"), data.csr("successes")
+        m0, lam0 = self.mean[pos], self.precision[pos]
+
+        b = m0.copy()
+        info = np.zeros_like(b)
+        for _ in range(max(1, int(n_iter))):
+            counts = e_step_block(trials, successes, b, quad)
+            p = 1.0 / (1.0 + np.exp(-(quad.theta[None, :] - b[:, None])))
+            grad = (counts.n * p).sum(axis=1) - counts.r.sum(axis=1) - lam0 * (b - m0)
+            info = (counts.n * p * (1.0 - p)).sum(axis=1)
+            b_new = np.clip(b + grad / (lam0 + info), -DIFFICULTY_BOUND, DIFFICULTY_BOUND)
+            delta = float(np.max(np.abs(b_new - b))) if b.size else 0.0
+            b = b_new
+            if delta < tol:
+                break
+
+        self.mean[pos] = b
+        self.precision[pos] = lam0 + info
+        self.n_obs[pos] += np.bincount(data.item, weights=data.trials, minlength=data.n_items).astype(np.int64)
+        self.n_persons += data.n_persons
+        self.batches.append(batch_id)
+        return True
+
+    def to_frame(self) -> pd.DataFrame:
+        """[item_id, n_obs, estimate, sd] con la posterior actual."""
+        return pd.DataFrame({
+            "item_id": self.item_ids,
+            "n_obs": self.n_obs,
+            "estimate": self.mean,
+            "sd": 1.0 / np.sqrt(self.precision),
+        })
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "prior_mean": self.prior_mean,
+            "prior_sd": self.prior_sd,
+            "n_quadrature": self.n_quadrature,
+            "item_ids": list(self.item_ids),
+            "mean": self.mean.tolist(),
+            "precision": self.precision.tolist(),
+            "n_obs": self.n_obs.tolist(),
+            "batches": list(self.batches),
+            "n_persons": self.n_persons,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "OnlineCalibration":
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Versión de estado de calibración no soportada: {data.get('version')!r}")
+        return cls(
+            prior_mean=float(data["prior_mean"]),
+            prior_sd=float(data["prior_sd"]),
+            n_quadrature=int(data["n_quadrature"]),
+            item_ids=[_as_key(item) for item in data["item_ids"]],
+            mean=np.asarray(data["mean"], dtype=float),
+            precision=np.asarray(data["precision"], dtype=float),
+            n_obs=np.asarray(data["n_obs"], dtype=np.int64),
+            batches=list(data["batches"]),
+            n_persons=int(data["n_persons"]),
+        )
+
+    def compatible_with(self, prior_mean: float, prior_sd: float, n_quadrature: int) -> bool:
+        return (self.prior_mean, self.prior_sd, self.n_quadrature) == (
+            float(prior_mean), float(prior_sd), int(n_quadrature)
+        )
+
+
+def _as_key(item: Any) -> Any:
+    """Ids nativos (``np.int64(3)`` y ``3`` son el mismo ítem; estables en JSON)."""
+    return item.item() if isinstance(item, np.generic) else item
@@ -0,0 +1,147 @@
+"""Paso E del MML-EM repartido por bloques de personas en un pool de procesos.
+
+Las matrices CSR de observaciones/aciertos se copian una vez a
+``multiprocessing.shared_memory``; cada worker se adjunta al iniciar y construye
+vistas sin copia. Por iteración sólo viajan ``b`` y el índice de bloque: cada
+bloque escribe sus conteos esperados en su propia ranura de un arreglo
+compartido ``[bloques x 2 x ítems x nodos]`` y el proceso principal los suma en
+orden de bloque, igual que :func:`irt.rasch_mml_em` en un proceso. Con la misma
+partición (``chunk_size``) el resultado es idéntico bit a bit para cualquier
+número de workers.
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Sequence
+
+import numpy as np
+
+from .mml import ExpectedCounts, Quadrature, e_step_block
+
+# Estado de cada worker (se llena en _init_worker)
+_WORKER: dict = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Se adjunta a un bloque existente; el dueño (proceso principal) hace ``unlink``.
+
+    Los workers ``spawn`` comparten el resource tracker del principal, donde el
+    bloque ya está registrado: adjuntarse no agrega un segundo dueño.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _view(shm: shared_memory.SharedMemory, shape: tuple[int, ...], dtype: str) -> np.ndarray:
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+class _SharedArrays:
+    """Arreglos NumPy respaldados por ``SharedMemory`` (nombre, forma y dtype picklables)."""
+
+    def __init__(self) -> None:
+        self.blocks: list[shared_memory.SharedMemory] = []
+        self.specs: dict[str, tuple[str, tuple[int, ...], str]] = {}
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        view = self.empty(key, array.shape, array.dtype)
+        view[...] = array
+        return view
+
+    def empty(self, key: str, shape: tuple[int, ...], dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks.append(shm)
+        self.specs[key] = (shm.name, tuple(shape), dtype.str)
+        return _view(shm, shape, dtype.str)
+
+    def release(self) -> None:
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks.clear()
+
+
+def _init_worker(specs: dict, shapes: dict, blocks: Sequence[tuple[int, int]], quad: Quadrature) -> None:
+    from scipy import sparse
+
+    handles = {key: _attach(name) for key, (name, _, _) in specs.items()}
+    arrays = {key: _view(handles[key], shape, dtype) for key, (_, shape, dtype) in specs.items()}
+    for kind in ("trials", "successes"):
+        _WORKER[kind] = sparse.csr_matrix(
+            (arrays[f"{kind}_data"], arrays[f"{kind}_indices"], arrays[f"{kind}_indptr"]),
+            shape=shapes[kind], copy=False,
+        )
+    _WORKER.update(handles=handles, counts=arrays["counts"], loglik=arrays["loglik"], blocks=blocks, quad=quad)
+
+
+def _run_block(k: int, b: np.ndarray) -> int:
+    start, stop = _WORKER["blocks"][k]
+    counts = e_step_block(_WORKER["trials"][start:stop], _WORKER["successes"][start:stop], b, _WORKER["quad"])
+    _WORKER["counts"][k, 0] = counts.n
+    _WORKER["counts"][k, 1] = counts.r
+    _WORKER["loglik"][k] = counts.log_likelihood
+    return k
+
+
+class ShardedEStep:
+    """``e_step(b) -> ExpectedCounts`` evaluado en ``n_workers`` procesos.
+
+    Uso como context manager (libera el pool y la memoria compartida)::
+
+        with ShardedEStep(trials, successes, blocks, quad, n_workers=4) as e_step:
+            result = run_em(e_step, b0, quad)
+    """
+
+    def __init__(self, trials, successes, blocks: Sequence[tuple[int, int]], quad: Quadrature, n_workers: int) -> None:
+        self._blocks = list(blocks)
+        self._quad = quad
+        self._n_workers = max(1, min(int(n_workers), len(self._blocks)))
+        self._n_items = trials.shape[1]
+        self._shared = _SharedArrays()
+        self._counts = self._loglik = None
+        self._pool: ProcessPoolExecutor | None = None
+        try:
+            for kind, matrix in (("trials", trials), ("successes", successes)):
+                self._shared.put(f"{kind}_data", matrix.data)
+                self._shared.put(f"{kind}_indices", matrix.indices)
+                self._shared.put(f"{kind}_indptr", matrix.indptr)
+            self._counts = self._shared.empty("counts", (len(self._blocks), 2, self._n_items, quad.theta.size), np.float64)
+            self._loglik = self._shared.empty("loglik", (len(self._blocks),), np.float64)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._n_workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._shared.specs, {"trials": trials.shape, "successes": successes.shape}, self._blocks, quad),
+            )
+        except BaseException:
+            self.close()
+            raise
+
+    def __call__(self, b: np.ndarray) -> ExpectedCounts:
+        b = np.ascontiguousarray(b, dtype=float)
+        # Todos los bloques terminan antes de reducir: las ranuras no se pisan entre iteraciones
+        list(self._pool.map(_run_block, range(len(self._blocks)), [b] * len(self._blocks)))
+        total = ExpectedCounts.zeros(self._n_items, self._quad.theta.size)
+        for k in range(len(self._blocks)):
+            total.add(ExpectedCounts(self._counts[k, 0].copy(), self._counts[k, 1].copy(), float(self._loglik[k])))
+        return total
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        # Sin vistas vivas: SharedMemory.close() falla si quedan buffers exportados
+        self._counts = self._loglik = None
+        self._shared.release()
+
+    def __enter__(self) -> "ShardedEStep":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
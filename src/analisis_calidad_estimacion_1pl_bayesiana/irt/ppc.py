@@ -0,0 +1,196 @@
+"""Chequeos predictivos posteriores (PPC) del modelo de Rasch sin materializar ``p``.
+
+Se recorren los draws de ``b``/``theta`` por bloques (draws × personas) de a lo
+sumo ``max_cells`` celdas: en cada bloque se generan datos replicados sólo en
+las celdas observadas y se reducen de inmediato a estadísticos por draw. La
+memoria queda acotada por ``max_cells`` (más ``draws × ítems`` acumuladores, y
+``ítems²`` por draw del bloque para los odds ratios), no por draws × personas ×
+ítems.
+
+Estadísticos (valor p predictivo posterior, PPP = P(T_rep > T_obs) + ½ P(=)):
+
+- ``item_p``: proporción de aciertos de cada ítem (un PPP por ítem).
+- ``item_fit``: discrepancia realizada chi-cuadrado de las proporciones por ítem,
+  ``sum_i (O_i - E_i)² / V_i`` con ``E``/``V`` del draw (Gelman et al.).
+- ``score_sd``: desviación estándar del puntaje bruto (dispersión de la
+  distribución de puntajes).
+- ``odds_ratio``: log odds ratio medio entre pares de ítems (dependencia local;
+  Sinharay, 2005); además ``pair_extreme``, la fracción de pares con PPP fuera
+  de ``[tail, 1 - tail]``. Sólo con datos 0/1 (``trials == 1``).
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from .sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+# Columnas que se agregan a las filas del almacén de resultados
+PPC_COLUMNS = ("ppc_item_p", "ppc_item_fit", "ppc_score_sd", "ppc_odds_ratio")
+
+
+@dataclass(frozen=True)
+class PPCResult:
+    item_p: np.ndarray
+    item_fit: float
+    score_sd: float
+    odds_ratio: float
+    pair_extreme: float
+    n_draws: int
+
+    def columns(self) -> dict[str, np.ndarray | float]:
+        """Columnas ``PPC_COLUMNS`` (las escalares se repiten en cada fila de ítem)."""
+        return {
+            "ppc_item_p": self.item_p,
+            "ppc_item_fit": self.item_fit,
+            "ppc_score_sd": self.score_sd,
+            "ppc_odds_ratio": self.odds_ratio,
+        }
+
+
+class _Exceedance:
+    """Cuenta T_rep > T_obs (y empates) draw a draw."""
+
+    def __init__(self, shape=()) -> None:
+        self.greater = np.zeros(shape)
+        self.ties = np.zeros(shape)
+        self.n = 0
+
+    def add(self, rep: np.ndarray, obs: np.ndarray | float) -> None:
+        self.greater += (rep > obs).sum(axis=0)
+        self.ties += (rep == obs).sum(axis=0)
+        self.n += rep.shape[0]
+
+    @property
+    def ppp(self) -> np.ndarray:
+        if not self.n:
+            return np.full(self.greater.shape, np.nan)
+        return (self.greater + 0.5 * self.ties) / self.n
+
+
+def _log_odds_ratios(n11: np.ndarray, n1_: np.ndarray, n_1: np.ndarray, n__: np.ndarray) -> np.ndarray:
+    """log OR con corrección +0.5 a partir de conteos co-observados (por par de ítems)."""
+    n10 = n1_ - n11
+    n01 = n_1 - n11
+    n00 = n__ - n11 - n10 - n01
+    return np.log((n11 + 0.5) * (n00 + 0.5) / ((n10 + 0.5) * (n01 + 0.5)))
+
+
+def thin_draws(n_draws: int, max_draws: int | None) -> np.ndarray:
+    """Índices equiespaciados de a lo sumo ``max_draws`` draws (todos si es ``None``)."""
+    if max_draws is None or max_draws <= 0 or max_draws >= n_draws:
+        return np.arange(n_draws)
+    return np.unique(np.linspace(0, n_draws - 1, int(max_draws)).round().astype(np.int64))
+
+
+def posterior_predictive_checks(
+    data: SparseResponses,
+    b_draws: np.ndarray,
+    theta_draws: np.ndarray,
+    max_cells: int = 2_000_000,
+    tail: float = 0.025,
+    seed: int | None = None,
+) -> PPCResult:
+    """PPC por bloques. ``b_draws``: [draws x ítems]; ``theta_draws``: [draws x personas]."""
+    b_draws = np.asarray(b_draws, dtype=float)
+    theta_draws = np.asarray(theta_draws, dtype=float)
+    n_draws, n_items = b_draws.shape
+    n_persons = data.n_persons
+    if theta_draws.shape != (n_draws, n_persons):
+        raise ValueError(f"theta_draws con forma {theta_draws.shape}; se esperaba {(n_draws, n_persons)}")
+    rng = np.random.default_rng(seed)
+    binary = data.is_binary
+    trials_csr = data.csr("trials")
+    succ_csr = data.csr("successes")
+
+    # Bloques: personas completas (filas) y tantos draws como quepan en max_cells
+    person_step = int(np.clip(max_cells // max(n_items, 1), 1, max(n_persons, 1)))
+    person_blocks = [(s, min(s + person_step, n_persons)) for s in range(0, n_persons, person_step)]
+    draw_step = max(1, int(max_cells // max(person_step * n_items, 1)))
+    if binary:
+        draw_step = max(1, min(draw_step, int(max_cells // max(n_items * n_items, 1))))
+
+    # Estadísticos observados (sin draws)
+    observed = np.asarray(succ_csr.sum(axis=0)).ravel().astype(float)
+    raw = np.asarray(succ_csr.sum(axis=1)).ravel().astype(float)
+    score_sd_obs = float(raw.std())
+    iu = np.triu_indices(n_items, k=1)
+    if binary:
+        mask = trials_csr.astype(float)
+        y = succ_csr.astype(float)
+        co_obs = np.asarray((mask.T @ mask).todense())
+        n11 = np.asarray((y.T @ y).todense())
+        n1_ = np.asarray((y.T @ mask).todense())
+        lor_obs = _log_odds_ratios(n11, n1_, n1_.T, co_obs)[iu]
+        # Pares nunca co-observados no informan
+        informative = co_obs[iu] > 0
+        lor_obs = lor_obs[informative]
+
+    item_p = _Exceedance(n_items)
+    item_fit = _Exceedance()
+    score_sd = _Exceedance()
+    odds_ratio = _Exceedance()
+    pair_ppp = _Exceedance(int(informative.sum()) if binary else 0)
+
+    for d0 in range(0, n_draws, draw_step):
+        d1 = min(d0 + draw_step, n_draws)
+        c = d1 - d0
+        rep_items = np.zeros((c, n_items))
+        expected = np.zeros((c, n_items))
+        variance = np.zeros((c, n_items))
+        raw_sum = np.zeros(c)
+        raw_sq = np.zeros(c)
+        if binary:
+            rep_n11 = np.zeros((c, n_items, n_items))
+            rep_n1_ = np.zeros((c, n_items, n_items))
+        for s, e in person_blocks:
+            n = trials_csr[s:e].toarray().astype(float)  # [personas x ítems], 0 = no observado
+            p = 1.0 / (1.0 + np.exp(-(theta_draws[d0:d1, s:e, None] - b_draws[d0:d1, None, :])))
+            if binary:
+                y_rep = (rng.random(p.shape) < p) * n
+            else:
+                y_rep = rng.binomial(n.astype(np.int64)[None], p).astype(float)
+            rep_items += y_rep.sum(axis=1)
+            expected += (n * p).sum(axis=1)
+            variance += (n * p * (1.0 - p)).sum(axis=1)
+            scores = y_rep.sum(axis=2)
+            raw_sum += scores.sum(axis=1)
+            raw_sq += (scores**2).sum(axis=1)
+            if binary:
+                y_t = y_rep.transpose(0, 2, 1)
+                rep_n11 += y_t @ y_rep
+                rep_n1_ += y_t @ n
+            del p, y_rep
+
+        item_p.add(rep_items, observed)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            disc_rep = np.nansum((rep_items - expected) ** 2 / variance, axis=1)
+            disc_obs = np.nansum((observed[None, :] - expected) ** 2 / variance, axis=1)
+        item_fit.add(disc_rep - disc_obs, 0.0)
+        sd_rep = np.sqrt(np.maximum(raw_sq / n_persons - (raw_sum / n_persons) ** 2, 0.0))
+        score_sd.add(sd_rep, score_sd_obs)
+        if binary:
+            lor_rep = _log_odds_ratios(rep_n11, rep_n1_, rep_n1_.transpose(0, 2, 1), co_obs[None])
+            lor_rep = lor_rep[:, iu[0], iu[1]][:, informative]
+            pair_ppp.add(lor_rep, lor_obs)
+            odds_ratio.add(lor_rep.mean(axis=1), float(lor_obs.mean()) if lor_obs.size else np.nan)
+
+    pairs = pair_ppp.ppp
+    result = PPCResult(
+        item_p=item_p.ppp,
+        item_fit=float(item_fit.ppp),
+        score_sd=float(score_sd.ppp),
+        odds_ratio=float(odds_ratio.ppp) if binary and pairs.size else float("nan"),
+        pair_extreme=float(np.mean((pairs < tail) | (pairs > 1.0 - tail))) if binary and pairs.size else float("nan"),
+        n_draws=n_draws,
+    )
+    logger.info(
+        "[irt] PPC: draws=%d, persons=%d, items=%d, bloques=%dx%d; PPP item_fit=%.3f, score_sd=%.3f, odds_ratio=%.3f",
+        n_draws, n_persons, n_items, -(-n_draws // draw_step), len(person_blocks),
+        result.item_fit, result.score_sd, result.odds_ratio,
+    )
+    return result
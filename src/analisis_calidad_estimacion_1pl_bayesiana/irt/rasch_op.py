@@ -0,0 +1,143 @@
+"""Log-verosimilitud de Rasch por estadísticos suficientes como ``Op`` de pytensor.
+
+Para Rasch (``logit P(y=1) = theta_p - b_i``, ``n_pi`` intentos por celda)::
+
+    log L = sum_p r_p theta_p - sum_i s_i b_i - sum_pi n_pi log(1 + exp(theta_p - b_i))
+
+(más una constante combinatoria con ``n_pi > 1``, que no afecta al muestreo).
+El término lineal depende sólo de los totales de aciertos por persona (``r``) y
+por ítem (``s``); sólo el *softplus* necesita la grilla de celdas observadas. El
+``Op`` recibe esos totales (y la máscara/intentos si faltan celdas), así el
+modelo no guarda la matriz 0/1 y cada evaluación hace una única pasada que
+devuelve ``logp`` y los gradientes respecto de ``theta`` y ``b`` sobre buffers
+reutilizados entre pasos leapfrog (los de trabajo, propios del ``Op``, y los
+gradientes, que se escriben en el almacenamiento de salida de pytensor).
+
+Importa pytensor al cargarse: sólo se usa desde :mod:`irt.bayes`, que lo
+importa al construir el modelo (ver ``import_pymc``).
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytensor.tensor as pt
+from pytensor.graph.basic import Apply
+from pytensor.graph.op import Op
+
+from .sparse import SparseResponses
+
+
+def _softplus_and_sigmoid(z: np.ndarray, e: np.ndarray, g: np.ndarray) -> None:
+    """In-place: ``z <- log(1 + exp(z))`` y ``g <- sigmoid(z)`` (``e`` de trabajo)."""
+    np.abs(z, out=e)
+    np.negative(e, out=e)
+    np.exp(e, out=e)  # exp(-|z|) en (0, 1]: estable para cualquier z
+    np.add(e, 1.0, out=g)
+    np.reciprocal(g, out=g)  # 1 / (1 + exp(-|z|)) = sigmoid(|z|)
+    np.subtract(1.0, g, out=g, where=z < 0)  # sigmoid(z) = 1 - sigmoid(|z|) si z < 0
+    np.log1p(e, out=e)
+    np.maximum(z, 0.0, out=z)
+    z += e
+
+
+def _output(storage: list, shape: tuple[int, ...], dtype) -> np.ndarray:
+    """Arreglo de salida de pytensor reutilizado si ya tiene la forma y el dtype pedidos."""
+    out = storage[0]
+    if out is None or out.shape != shape or out.dtype != dtype:
+        out = storage[0] = np.empty(shape, dtype=dtype)
+    return out
+
+
+class RaschLogLik(Op):
+    """``(theta, b) -> (logp, dlogp/dtheta, dlogp/db)`` en una sola pasada.
+
+    Con ``person``/``item`` (celdas observadas) evalúa sólo esas celdas;
+    sin ellos usa la grilla densa personas × ítems, con ``weights`` opcional
+    (0/1 para celdas faltantes o número de intentos). Sólo la salida ``logp``
+    es diferenciable; su gradiente reutiliza las otras dos salidas del mismo
+    nodo (pytensor fusiona las aplicaciones idénticas), así ``logp`` y
+    ``dlogp`` comparten el cálculo.
+    """
+
+    def __init__(
+        self,
+        person_totals: np.ndarray,
+        item_totals: np.ndarray,
+        weights: np.ndarray | None = None,
+        person: np.ndarray | None = None,
+        item: np.ndarray | None = None,
+    ) -> None:
+        self.person_totals = np.asarray(person_totals, dtype=float)
+        self.item_totals = np.asarray(item_totals, dtype=float)
+        self.weights = None if weights is None else np.asarray(weights, dtype=float)
+        self.person = None if person is None else np.asarray(person, dtype=np.intp)
+        self.item = None if item is None else np.asarray(item, dtype=np.intp)
+        self._buffers: dict = {}
+
+    @classmethod
+    def from_responses(cls, data: SparseResponses, dense: bool | None = None) -> "RaschLogLik":
+        """``Op`` para ``data``; por defecto denso si al menos la mitad de la grilla está observada."""
+        r = np.bincount(data.person, weights=data.successes, minlength=data.n_persons)
+        s = np.bincount(data.item, weights=data.successes, minlength=data.n_items)
+        if dense is None:
+            dense = data.density >= 0.5
+        if not dense:
+            return cls(r, s, weights=data.trials, person=data.person, item=data.item)
+        weights = None
+        if not (data.is_complete and data.is_binary):
+            weights = data.csr("trials").toarray().astype(float)
+        return cls(r, s, weights=weights)
+
+    def __getstate__(self) -> dict:
+        # Los buffers se recrean en el proceso destino (pm.sample con cores > 1)
+        return {**self.__dict__, "_buffers": {}}
+
+    def make_node(self, theta, b) -> Apply:
+        theta = pt.as_tensor_variable(theta)
+        b = pt.as_tensor_variable(b)
+        dtype = theta.type.dtype
+        return Apply(self, [theta, b], [pt.scalar(dtype=dtype), theta.type(), b.type()])
+
+    def _work(self, shape: tuple[int, ...], dtype) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        key = (shape, np.dtype(dtype).str)
+        work = self._buffers.get(key)
+        if work is None:
+            work = self._buffers[key] = tuple(np.empty(shape, dtype=dtype) for _ in range(3))
+        return work
+
+    def perform(self, node, inputs, output_storage) -> None:
+        theta, b = inputs
+        dtype = theta.dtype
+        if self.person is None:
+            z, e, g = self._work((theta.size, b.size), dtype)
+            np.subtract(theta[:, None], b[None, :], out=z)
+        else:
+            z, e, g = self._work(self.person.shape, dtype)
+            np.take(theta, self.person, out=z)
+            np.take(b, self.item, out=e)
+            z -= e
+        _softplus_and_sigmoid(z, e, g)
+        if self.weights is not None:
+            z *= self.weights
+            g *= self.weights
+
+        logp = self.person_totals @ theta - self.item_totals @ b - z.sum()
+        output_storage[0][0] = np.asarray(logp, dtype=dtype)
+        d_theta = _output(output_storage[1], theta.shape, dtype)
+        d_b = _output(output_storage[2], b.shape, dtype)
+        if self.person is None:
+            np.sum(g, axis=1, out=d_theta)
+            np.sum(g, axis=0, out=d_b)
+        else:
+            # bincount no admite ``out``: su resultado temporal se copia al buffer
+            np.copyto(d_theta, np.bincount(self.person, weights=g, minlength=theta.size), casting="same_kind")
+            np.copyto(d_b, np.bincount(self.item, weights=g, minlength=b.size), casting="same_kind")
+        np.subtract(self.person_totals, d_theta, out=d_theta, casting="same_kind")
+        np.subtract(d_b, self.item_totals, out=d_b, casting="same_kind")
+
+    def grad(self, inputs, output_grads):
+        _, d_theta, d_b = self(*inputs)
+        g = output_grads[0]
+        return [g * d_theta, g * d_b]
+
+    def connection_pattern(self, node):
+        return [[True, False, False], [True, False, False]]
@@ -0,0 +1,194 @@
+"""Puntuación de habilidades (theta) con dificultades ya calibradas.
+
+En Rasch el puntaje bruto es suficiente: para un mismo conjunto de ítems
+administrados (un *patrón*), EAP, MAP y ML dependen sólo del número de aciertos.
+Por eso no se estima persona por persona: se agrupan las personas por patrón
+(ítems y número de observaciones por ítem), se calcula una tabla
+(patrón, puntaje) -> (theta, se) para los pares que aparecen y se asigna con un
+*gather*. Con datos completos hay un único patrón y la tabla es la clásica
+puntaje bruto -> theta (:func:`raw_score_table`).
+
+- ``eap``: media y sd posteriores con theta ~ N(0, 1) sobre la cuadratura de
+  :mod:`irt.mml`.
+- ``map``: modo posterior (Newton); ``se = 1 / sqrt(info + 1)``.
+- ``ml``: máxima verosimilitud (Newton); ``se = 1 / sqrt(info)``. Con puntaje 0
+  o máximo la estimación no existe y queda en NaN.
+"""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from .mml import normal_quadrature
+from .sparse import SparseResponses
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+SCORING_METHODS = ("eap", "map", "ml")
+
+# Pesos aleatorios fijos por ítem para agrupar patrones con dos hashes de 64 bits
+# (los grupos se verifican contra el patrón exacto, ver :func:`score_persons`)
+_PATTERN_SEED = 20240611
+
+
+def _check_method(method: str) -> str:
+    method = str(method).lower()
+    if method not in SCORING_METHODS:
+        raise ValueError(f"Método de puntuación no soportado: {method!r}. Opciones: {list(SCORING_METHODS)}")
+    return method
+
+
+def _row_sums(matrix: sparse.csr_matrix, values: np.ndarray) -> np.ndarray:
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return np.bincount(rows, weights=values, minlength=matrix.shape[0])
+
+
+def _factorize_rows(*columns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Códigos 0..G-1 de las filas distintas (por hash, sin ordenar) y primera fila de cada una."""
+    codes = pd.DataFrame(dict(enumerate(columns))).groupby(list(range(len(columns))), sort=False).ngroup()
+    codes = codes.to_numpy()
+    first = np.empty(int(codes.max()) + 1 if codes.size else 0, dtype=np.int64)
+    first[codes[::-1]] = np.arange(codes.size)[::-1]
+    return codes, first
+
+
+def _exact_pattern_codes(observed: sparse.csr_matrix) -> np.ndarray:
+    """Códigos de patrón por comparación exacta de (ítems, observaciones) de cada fila."""
+    observed = observed.copy()
+    observed.sort_indices()
+    rows = (
+        observed.indices[s:e].tobytes() + b"|" + observed.data[s:e].tobytes()
+        for s, e in zip(observed.indptr[:-1], observed.indptr[1:])
+    )
+    return pd.factorize(pd.Series(list(rows), dtype=object), sort=False)[0]
+
+
+def _eap(patterns: sparse.csr_matrix, b: np.ndarray, pattern: np.ndarray, raw: np.ndarray, n_quadrature: int):
+    quad = normal_quadrature(n_quadrature)
+    # log prod_i (1 + exp(theta_q - b_i))^n_i por patrón: [patrones x nodos]
+    log_denom = np.asarray(patterns @ np.logaddexp(0.0, quad.theta[None, :] - b[:, None]))
+    log_post = quad.log_weights[None, :] + raw[:, None] * quad.theta[None, :] - log_denom[pattern]
+    log_post -= np.logaddexp.reduce(log_post, axis=1)[:, None]
+    w = np.exp(log_post)
+    mean = w @ quad.theta
+    var = w @ quad.theta**2 - mean**2
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def _newton(
+    patterns: sparse.csr_matrix,
+    b: np.ndarray,
+    pattern: np.ndarray,
+    raw: np.ndarray,
+    prior_precision: float,
+    max_iter: int = 100,
+    tol: float = 1e-10,
+):
+    n_max = _row_sums(patterns, patterns.data)[pattern]
+    theta = np.full(raw.shape, np.nan)
+    se = np.full(raw.shape, np.nan)
+    # ML: sin solución finita con puntaje nulo o perfecto (o sin ítems); quedan en NaN
+    solve = np.ones(raw.shape, dtype=bool) if prior_precision > 0 else (raw > 0) & (raw < n_max)
+    rows = patterns[pattern[solve]]  # un renglón (ítems del patrón) por par (patrón, puntaje)
+    r = raw[solve]
+    t = np.log((r + 0.5) / (n_max[solve] - r + 0.5))
+    info = np.zeros_like(t)
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-(np.repeat(t, np.diff(rows.indptr)) - b[rows.indices])))
+        expected = _row_sums(rows, rows.data * p)
+        info = _row_sums(rows, rows.data * p * (1.0 - p))
+        step = np.clip((r - expected - prior_precision * t) / (info + prior_precision), -1.0, 1.0)
+        t = t + step
+        if np.max(np.abs(step), initial=0.0) < tol:
+            break
+    theta[solve] = t
+    se[solve] = 1.0 / np.sqrt(info + prior_precision)
+    return theta, se
+
+
+def _score_pairs(patterns, b, pattern, raw, method: str, n_quadrature: int):
+    if method == "eap":
+        return _eap(patterns, b, pattern, raw, n_quadrature)
+    return _newton(patterns, b, pattern, raw, prior_precision=1.0 if method == "map" else 0.0)
+
+
+def raw_score_table(difficulty: np.ndarray, method: str = "eap", n_quadrature: int = 41) -> pd.DataFrame:
+    """Tabla puntaje bruto -> [theta, se] para el test completo (todos los ítems, una vez)."""
+    from scipy import sparse
+
+    method = _check_method(method)
+    b = np.asarray(difficulty, dtype=float)
+    b = b[np.isfinite(b)]
+    patterns = sparse.csr_matrix(np.ones((1, b.size)))
+    raw = np.arange(b.size + 1, dtype=float)
+    theta, se = _score_pairs(patterns, b, np.zeros(raw.size, dtype=np.int64), raw, method, n_quadrature)
+    return pd.DataFrame({"raw_score": raw.astype(int), "theta": theta, "se": se})
+
+
+def score_persons(
+    data: SparseResponses,
+    difficulty: np.ndarray,
+    method: str = "eap",
+    n_quadrature: int = 41,
+) -> pd.DataFrame:
+    """Habilidad de cada persona de ``data`` dadas dificultades alineadas con ``data.item_ids``.
+
+    Ítems con dificultad NaN (no calibrados) se ignoran. Devuelve
+    [person_id, n_items, raw_score, max_score, theta, se].
+    """
+    from scipy import sparse
+
+    method = _check_method(method)
+    b = np.asarray(difficulty, dtype=float)
+    if b.shape != (data.n_items,):
+        raise ValueError(f"Se esperaban {data.n_items} dificultades (una por ítem), llegaron {b.shape}")
+    keep = np.isfinite(b)[data.item]
+    person, item = data.person[keep], data.item[keep]
+    trials, successes = data.trials[keep].astype(np.int64), data.successes[keep].astype(np.int64)
+    n_persons = data.n_persons
+
+    # Patrón = multiconjunto de ítems administrados; dos hashes aditivos de 64 bits
+    # (suma modular por persona con cumsum, vectorizado) proponen los grupos
+    weights = np.random.default_rng(_PATTERN_SEED).integers(0, 2**63, size=(2, data.n_items), dtype=np.uint64)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(person, minlength=n_persons))])
+    keys = np.empty((n_persons, 2), dtype=np.uint64)
+    for k in range(2):
+        cumulative = np.concatenate([[np.uint64(0)], np.cumsum(weights[k][item] * trials.astype(np.uint64))])
+        keys[:, k] = cumulative[indptr[1:]] - cumulative[indptr[:-1]]
+    pattern_of, first = _factorize_rows(keys[:, 0], keys[:, 1])
+
+    observed = sparse.csr_matrix((trials.astype(float), (person, item)), shape=(n_persons, data.n_items))
+    # Cada persona debe tener exactamente el patrón representante de su grupo; si
+    # una colisión de hash juntó patrones distintos, se agrupa por comparación exacta
+    mismatch = observed - observed[first][pattern_of]
+    mismatch.eliminate_zeros()
+    if mismatch.nnz:
+        logger.warning("[irt] scoring: colisión de hash de patrones; se agrupa por comparación exacta")
+        pattern_of = _exact_pattern_codes(observed)
+        first = np.empty(int(pattern_of.max()) + 1, dtype=np.int64)
+        first[pattern_of[::-1]] = np.arange(pattern_of.size)[::-1]
+    patterns = observed[first]
+    raw = np.bincount(person, weights=successes, minlength=n_persons)
+    max_score = np.bincount(person, weights=trials, minlength=n_persons)
+
+    # Una entrada de tabla por par (patrón, puntaje) observado; luego gather por persona
+    pair_of, pair_first = _factorize_rows(pattern_of, raw)
+    theta, se = _score_pairs(patterns, b, pattern_of[pair_first], raw[pair_first], method, n_quadrature)
+    logger.debug(
+        "[irt] scoring %s: persons=%d, patrones=%d, entradas de tabla=%d",
+        method, n_persons, patterns.shape[0], pair_first.size,
+    )
+    return pd.DataFrame({
+        "person_id": data.person_ids,
+        "n_items": np.diff(indptr),
+        "raw_score": raw.astype(np.int64),
+        "max_score": max_score.astype(np.int64),
+        "theta": theta[pair_of],
+        "se": se[pair_of],
+    })
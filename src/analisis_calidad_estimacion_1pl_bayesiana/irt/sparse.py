@@ -0,0 +1,231 @@
+"""Respuestas dispersas (persona, ítem, respuesta) para datos reales con faltantes.
+
+Los pipelines de simulación usan un DataFrame denso ``person_id, item_1..item_N``;
+los datos reales suelen llegar en formato largo con la mayoría de las celdas sin
+observar (y a veces con varias observaciones del mismo par persona-ítem, p. ej.
+jugadas repetidas). :class:`SparseResponses` guarda sólo las celdas observadas,
+agregadas como ``successes`` de ``trials`` (binomial), ordenadas por persona e
+ítem (orden CSR). La memoria escala con las celdas observadas, no con
+personas × ítems.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+INDEX_DTYPE = np.int32
+COUNT_DTYPE = np.int32
+
+_ITEM_COLUMN = re.compile(r"^item_(\d+)$")
+
+
+@dataclass(frozen=True, eq=False)
+class SparseResponses:
+    """Celdas observadas de una matriz de respuestas personas × ítems.
+
+    - ``person``/``item``: índices 0-based (``INDEX_DTYPE``) de cada celda, en
+      orden (persona, ítem) y sin pares repetidos.
+    - ``successes``/``trials``: respuestas correctas y observaciones de la celda
+      (``trials == 1`` en datos 0/1 sin repeticiones).
+    - ``person_ids``/``item_ids``: identificadores originales por índice.
+    """
+
+    person: np.ndarray
+    item: np.ndarray
+    successes: np.ndarray
+    trials: np.ndarray
+    person_ids: np.ndarray
+    item_ids: np.ndarray
+
+    # ------------------------------------------------------------ propiedades
+    @property
+    def n_persons(self) -> int:
+        return int(self.person_ids.shape[0])
+
+    @property
+    def n_items(self) -> int:
+        return int(self.item_ids.shape[0])
+
+    @property
+    def nnz(self) -> int:
+        return int(self.person.shape[0])
+
+    @property
+    def n_observations(self) -> int:
+        return int(self.trials.sum())
+
+    @property
+    def is_binary(self) -> bool:
+        """``True`` si cada celda observada tiene exactamente una respuesta 0/1."""
+        return bool(np.all(self.trials == 1))
+
+    @property
+    def is_complete(self) -> bool:
+        """``True`` si todas las celdas personas × ítems están observadas."""
+        return self.nnz == self.n_persons * self.n_items
+
+    @property
+    def density(self) -> float:
+        cells = self.n_persons * self.n_items
+        return self.nnz / cells if cells else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.person, self.item, self.successes, self.trials))
+
+    # ----------------------------------------------------------- construcción
+    @classmethod
+    def from_coo(
+        cls,
+        person: np.ndarray,
+        item: np.ndarray,
+        successes: np.ndarray,
+        trials: np.ndarray | None = None,
+        person_ids: np.ndarray | None = None,
+        item_ids: np.ndarray | None = None,
+    ) -> "SparseResponses":
+        """Ordena por (persona, ítem) y suma celdas repetidas."""
+        person = np.asarray(person, dtype=np.int64)
+        item = np.asarray(item, dtype=np.int64)
+        successes = np.asarray(successes, dtype=np.int64)
+        trials = np.ones_like(successes) if trials is None else np.asarray(trials, dtype=np.int64)
+        if person_ids is not None:
+            n_persons = len(person_ids)
+        else:
+            n_persons = int(person.max()) + 1 if person.size else 0
+        if item_ids is not None:
+            n_items = len(item_ids)
+        else:
+            n_items = int(item.max()) + 1 if item.size else 0
+
+        width = max(n_items, 1)
+        key = person * width + item
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if key.size else np.array([], dtype=np.int64)
+
+        def _sum(values: np.ndarray) -> np.ndarray:
+            if not key.size:
+                return np.array([], dtype=COUNT_DTYPE)
+            return np.add.reduceat(values[order], starts).astype(COUNT_DTYPE)
+
+        return cls(
+            person=(key[starts] // width).astype(INDEX_DTYPE),
+            item=(key[starts] % width).astype(INDEX_DTYPE),
+            successes=_sum(successes),
+            trials=_sum(trials),
+            person_ids=np.arange(n_persons) if person_ids is None else np.asarray(person_ids),
+            item_ids=np.arange(n_items) if item_ids is None else np.asarray(item_ids),
+        )
+
+    @classmethod
+    def from_long(
+        cls,
+        frame: pd.DataFrame,
+        person_col: str = "person_id",
+        item_col: str = "item_id",
+        response_col: str = "response",
+    ) -> "SparseResponses":
+        """Desde formato largo (una fila por observación); respuestas nulas se descartan.
+
+        Las respuestas deben ser 0/1 (o booleanas). Los ids se ordenan, así el
+        índice de cada persona/ítem es estable entre corridas.
+        """
+        frame = frame[[person_col, item_col, response_col]].dropna(subset=[response_col])
+        response = frame[response_col].to_numpy()
+        if response.dtype == bool:
+            response = response.astype(np.int64)
+        response = np.asarray(response, dtype=float)
+        if not np.isin(response, (0.0, 1.0)).all():
+            raise ValueError(f"La columna {response_col!r} debe ser binaria (0/1)")
+        person, person_ids = pd.factorize(frame[person_col], sort=True)
+        item, item_ids = pd.factorize(frame[item_col], sort=True)
+        return cls.from_coo(
+            person, item, response.astype(np.int64),
+            person_ids=np.asarray(person_ids), item_ids=np.asarray(item_ids),
+        )
+
+    @classmethod
+    def from_dense(cls, responses: pd.DataFrame) -> "SparseResponses":
+        """Desde el DF denso ``person_id, item_1..item_N`` (NaN = no observado)."""
+        if "person_id" not in responses.columns:
+            raise ValueError("Se espera columna 'person_id' en responses.")
+        resp = responses.sort_values("person_id")
+        item_cols = [c for c in resp.columns if c != "person_id"]
+        item_ids = np.array([int(m.group(1)) if (m := _ITEM_COLUMN.match(str(c))) else c for c in item_cols])
+        values = resp[item_cols].to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        person, item = np.nonzero(observed)
+        return cls(
+            person=person.astype(INDEX_DTYPE),
+            item=item.astype(INDEX_DTYPE),
+            successes=values[observed].astype(COUNT_DTYPE),
+            trials=np.ones(person.size, dtype=COUNT_DTYPE),
+            person_ids=resp["person_id"].to_numpy(),
+            item_ids=item_ids,
+        )
+
+    # ---------------------------------------------------------- operaciones
+    def select_persons(self, keep: np.ndarray) -> "SparseResponses":
+        """Subconjunto de personas (máscara booleana por índice de persona)."""
+        keep = np.asarray(keep, dtype=bool)
+        if keep.size != self.n_persons:
+            raise ValueError(f"Tamaño de máscara {keep.size} no coincide con n_persons={self.n_persons}")
+        new_index = np.cumsum(keep) - 1
+        rows = keep[self.person]
+        return SparseResponses(
+            person=new_index[self.person[rows]].astype(INDEX_DTYPE),
+            item=self.item[rows],
+            successes=self.successes[rows],
+            trials=self.trials[rows],
+            person_ids=self.person_ids[keep],
+            item_ids=self.item_ids,
+        )
+
+    def to_dense(self, dtype: Any = np.int8) -> np.ndarray:
+        """Matriz personas × ítems (sólo datos completos 0/1)."""
+        if not (self.is_complete and self.is_binary):
+            raise ValueError("to_dense requiere datos completos con una observación 0/1 por celda")
+        out = np.empty((self.n_persons, self.n_items), dtype=dtype)
+        out[self.person, self.item] = self.successes
+        return out
+
+    def csr(self, values: str = "trials"):
+        """``scipy.sparse.csr_matrix`` personas × ítems de ``trials`` o ``successes``."""
+        from scipy import sparse
+
+        data = getattr(self, values).astype(np.float64)
+        return sparse.csr_matrix((data, (self.person, self.item)), shape=(self.n_persons, self.n_items))
+
+    def item_table(self) -> pd.DataFrame:
+        """Observaciones y proporción de aciertos por ítem."""
+        trials = np.bincount(self.item, weights=self.trials, minlength=self.n_items)
+        succ = np.bincount(self.item, weights=self.successes, minlength=self.n_items)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p_value = succ / trials
+        return pd.DataFrame({"item_id": self.item_ids, "n_obs": trials.astype(int), "p_value": p_value})
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Arreglos para serializar (``np.savez``) sin objetos Python."""
+        return {
+            "person": self.person, "item": self.item, "successes": self.successes, "trials": self.trials,
+            "person_ids": _plain_ids(self.person_ids), "item_ids": _plain_ids(self.item_ids),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "SparseResponses":
+        return cls(**{name: np.asarray(arrays[name]) for name in
+                      ("person", "item", "successes", "trials", "person_ids", "item_ids")})
+
+
+def _plain_ids(ids: Sequence[Any]) -> np.ndarray:
+    arr = np.asarray(ids)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int64)
+    if arr.dtype.kind == "f" and np.all(np.mod(arr, 1) == 0):
+        return arr.astype(np.int64)
+    return arr.astype(str)
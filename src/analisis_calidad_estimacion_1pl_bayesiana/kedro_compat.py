@@ -0,0 +1,59 @@
+"""APIs privadas de Kedro que usan los runners propios, en un solo lugar.
+
+:class:`runner.CostAwareParallelRunner` y :class:`work_queue.WorkQueueRunner`
+reimplementan el bucle ``_run`` de los runners de Kedro y reutilizan sus
+métodos privados (validación del catálogo, liberación de datasets, sugerencia
+de reanudación, pool de procesos), el constructor de ``Task`` y
+``DataCatalog._get_dataset``. Kedro no los garantiza ni entre versiones de
+parche, así que:
+
+- ``pyproject.toml`` fija la versión exacta (:data:`KEDRO_VERSION`);
+- :func:`check_runner_internals` falla al arrancar la corrida, con un mensaje
+  claro, si falta alguno (en vez de un ``AttributeError`` a mitad de camino);
+- ``tests/test_runners.py`` corre ambos runners sobre un pipeline chico.
+"""
+from __future__ import annotations
+
+import inspect
+import logging
+from typing import TYPE_CHECKING, Any, Iterable
+
+import kedro
+from kedro.runner.task import Task
+
+if TYPE_CHECKING:
+    from kedro.io import CatalogProtocol
+
+logger = logging.getLogger(__name__)
+
+KEDRO_VERSION = "0.19.14"
+
+# Argumentos de Task(...) que pasan los runners propios
+TASK_PARAMETERS = ("node", "catalog", "hook_manager", "is_async", "session_id", "parallel")
+
+
+def check_runner_internals(runner: Any, methods: Iterable[str]) -> None:
+    """Verifica que ``runner`` tenga los métodos privados ``methods`` y que ``Task`` acepte sus argumentos."""
+    missing = [name for name in methods if not callable(getattr(runner, name, None))]
+    parameters = inspect.signature(Task).parameters
+    missing += [f"Task({name}=...)" for name in TASK_PARAMETERS if name not in parameters]
+    if missing:
+        raise RuntimeError(
+            f"{type(runner).__name__} usa APIs privadas de Kedro {KEDRO_VERSION} que no existen en la versión "
+            f"instalada ({kedro.__version__}): {', '.join(missing)}. Instalar kedro=={KEDRO_VERSION}."
+        )
+    if kedro.__version__ != KEDRO_VERSION:
+        logger.warning(
+            "[runner] %s se probó con Kedro %s (instalado: %s)", type(runner).__name__, KEDRO_VERSION, kedro.__version__
+        )
+
+
+def catalog_dataset(catalog: CatalogProtocol, name: str) -> Any:
+    """Instancia del dataset ``name`` en ``catalog`` (resuelve dataset factories)."""
+    get = getattr(catalog, "_get_dataset", None)
+    if get is None:
+        raise RuntimeError(
+            f"{type(catalog).__name__} no expone _get_dataset (Kedro {kedro.__version__}); "
+            f"instalar kedro=={KEDRO_VERSION}"
+        )
+    return get(name)
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from kedro.pipeline import Pipeline, pipeline
 
+from analisis_calidad_estimacion_1pl_bayesiana.grid import load_grid_spec
+
 from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1 import (
     create_pipeline as create_sample_s1,
 )
@@ -21,18 +23,49 @@ from analisis_calidad_estimacion_1pl_bayesiana.pipelines.bayes_estimation_s1 imp
 from analisis_calidad_estimacion_1pl_bayesiana.pipelines.reporting_s1 import (
     create_pipeline as create_reporting_s1,
 )
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.precision_check_s1 import (
+    create_pipeline as create_precision_check_s1,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.adaptive_design_s1 import (
+    create_pipeline as create_adaptive_design_s1,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sbc_s1 import (
+    create_pipeline as create_sbc_s1,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.real_data import (
+    create_online_pipeline as create_real_data_online,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.real_data import (
+    create_out_of_core_pipeline as create_real_data_out_of_core,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.real_data import (
+    create_pipeline as create_real_data,
+)
+
+
+# Datasets producidos por otros pipelines de S1: se conectan sin prefijar el namespace
+_S1_SHARED_PREFIXES = ("sample__s1.", "subsample__s1.", "auto_pred__s1.", "mmle_estimation__s1.")
+
+
+def _shared_inputs(pipe: Pipeline) -> dict[str, str]:
+    """Mapa identidad para los inputs que vienen de otros namespaces de S1."""
+    return {name: name for name in pipe.inputs() if name.startswith(_S1_SHARED_PREFIXES)}
 
 
 def register_pipelines() -> dict[str, Pipeline]:
     """Register the project's pipelines.
 
+    La grilla (percents × r_levels) se lee de ``parameters.yml``; ver ``grid.py``.
+
     Returns:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
+    grid = load_grid_spec()
+
     s1 = create_sample_s1()
     s1_ns = pipeline(s1, namespace="sample__s1").tag({"sample", "sample_1"})
 
-    auto_pred = create_auto_pred_s1()
+    auto_pred = create_auto_pred_s1(r_levels=grid.r_levels)
     auto_pred_ns = pipeline(
         auto_pred,
         namespace="auto_pred__s1",
@@ -45,7 +78,7 @@ def register_pipelines() -> dict[str, Pipeline]:
         },
     ).tag({"sample", "sample_1", "auto_pred"})
 
-    subsample = create_subsample_s1()
+    subsample = create_subsample_s1(percents=grid.percents)
     subsample_ns = pipeline(
         subsample,
         namespace="subsample__s1",
@@ -56,70 +89,59 @@ def register_pipelines() -> dict[str, Pipeline]:
         },
     ).tag({"sample", "sample_1", "random_subsample"})
 
-    mmle = create_mmle_estimation_s1()
+    mmle = create_mmle_estimation_s1(percents=grid.percents)
     mmle_ns = pipeline(
         mmle,
         namespace="mmle_estimation__s1",
-        inputs={
-            # datos originales
-            "sample__s1.responses": "sample__s1.responses",
-            "sample__s1.difficulties": "sample__s1.difficulties",
-            # máscaras de subsample
-            "subsample__s1.subsample_mask_p_0_1": "subsample__s1.subsample_mask_p_0_1",
-            "subsample__s1.subsample_mask_p_0_2": "subsample__s1.subsample_mask_p_0_2",
-            "subsample__s1.subsample_mask_p_0_3": "subsample__s1.subsample_mask_p_0_3",
-            "subsample__s1.subsample_mask_p_0_4": "subsample__s1.subsample_mask_p_0_4",
-            "subsample__s1.subsample_mask_p_0_5": "subsample__s1.subsample_mask_p_0_5",
-            "subsample__s1.subsample_mask_p_0_6": "subsample__s1.subsample_mask_p_0_6",
-            "subsample__s1.subsample_mask_p_0_7": "subsample__s1.subsample_mask_p_0_7",
-            "subsample__s1.subsample_mask_p_0_8": "subsample__s1.subsample_mask_p_0_8",
-            "subsample__s1.subsample_mask_p_0_9": "subsample__s1.subsample_mask_p_0_9",
-            "subsample__s1.subsample_mask_p_1_0": "subsample__s1.subsample_mask_p_1_0",
+        # datos originales + una máscara de subsample por percent
+        inputs=_shared_inputs(mmle),
+        parameters={
+            "precision": "params:sample__s1.precision",
+            "replication": "params:sample__s1.replication",
+            "mc_metrics": "params:sample__s1.mc_aggregate.metrics",
+            "mc_quantiles": "params:sample__s1.mc_aggregate.quantiles",
+            "engine": "params:sample__s1.mmle_estimation.engine",
+            "n_workers": "params:sample__s1.mmle_estimation.n_workers",
+            "chunk_size": "params:sample__s1.mmle_estimation.chunk_size",
+            "person_fit": "params:sample__s1.mmle_estimation.person_fit",
         },
     ).tag({"sample", "sample_1", "mmle", "estimation"})
 
-    bayes = create_bayes_estimation_s1()
+    bayes = create_bayes_estimation_s1(
+        percents=grid.percents,
+        r_levels=grid.r_levels,
+        init_from_mmle=grid.bayes_init_from_mmle,
+        reuse_tuning=grid.bayes_reuse_tuning,
+    )
     bayes_ns = pipeline(
         bayes,
         namespace="bayes_estimation__s1",
-        inputs={
-            # datos originales
-            "sample__s1.responses": "sample__s1.responses",
-            "sample__s1.difficulties": "sample__s1.difficulties",
-            # máscaras de subsample
-            "subsample__s1.subsample_mask_p_0_1": "subsample__s1.subsample_mask_p_0_1",
-            "subsample__s1.subsample_mask_p_0_2": "subsample__s1.subsample_mask_p_0_2",
-            "subsample__s1.subsample_mask_p_0_3": "subsample__s1.subsample_mask_p_0_3",
-            "subsample__s1.subsample_mask_p_0_4": "subsample__s1.subsample_mask_p_0_4",
-            "subsample__s1.subsample_mask_p_0_5": "subsample__s1.subsample_mask_p_0_5",
-            "subsample__s1.subsample_mask_p_0_6": "subsample__s1.subsample_mask_p_0_6",
-            "subsample__s1.subsample_mask_p_0_7": "subsample__s1.subsample_mask_p_0_7",
-            "subsample__s1.subsample_mask_p_0_8": "subsample__s1.subsample_mask_p_0_8",
-            "subsample__s1.subsample_mask_p_0_9": "subsample__s1.subsample_mask_p_0_9",
-            "subsample__s1.subsample_mask_p_1_0": "subsample__s1.subsample_mask_p_1_0",
-            # predicciones auto_pred
-            "auto_pred__s1.pred_difficulty_r_0_1": "auto_pred__s1.pred_difficulty_r_0_1",
-            "auto_pred__s1.pred_difficulty_r_0_2": "auto_pred__s1.pred_difficulty_r_0_2",
-            "auto_pred__s1.pred_difficulty_r_0_3": "auto_pred__s1.pred_difficulty_r_0_3",
-            "auto_pred__s1.pred_difficulty_r_0_4": "auto_pred__s1.pred_difficulty_r_0_4",
-            "auto_pred__s1.pred_difficulty_r_0_5": "auto_pred__s1.pred_difficulty_r_0_5",
-            "auto_pred__s1.pred_difficulty_r_0_6": "auto_pred__s1.pred_difficulty_r_0_6",
-            "auto_pred__s1.pred_difficulty_r_0_7": "auto_pred__s1.pred_difficulty_r_0_7",
-            "auto_pred__s1.pred_difficulty_r_0_8": "auto_pred__s1.pred_difficulty_r_0_8",
-            "auto_pred__s1.pred_difficulty_r_0_9": "auto_pred__s1.pred_difficulty_r_0_9",
-            "auto_pred__s1.pred_difficulty_r_1_0": "auto_pred__s1.pred_difficulty_r_1_0",
-        },
+        # datos originales + máscaras de subsample + predicciones auto_pred + MMLE (arranque)
+        inputs=_shared_inputs(bayes),
         parameters={
             "seed": "params:sample__s1.seed",
+            "precision": "params:sample__s1.precision",
+            "replication": "params:sample__s1.replication",
+            "mc_metrics": "params:sample__s1.mc_aggregate.metrics",
+            "mc_quantiles": "params:sample__s1.mc_aggregate.quantiles",
             "draws": "params:sample__s1.bayes_estimation.draws",
             "tune": "params:sample__s1.bayes_estimation.tune",
             "chains": "params:sample__s1.bayes_estimation.chains",
             "target_accept": "params:sample__s1.bayes_estimation.target_accept",
+            "ppc_draws": "params:sample__s1.bayes_estimation.ppc_draws",
+            "ppc_max_cells": "params:sample__s1.bayes_estimation.ppc_max_cells",
+            "person_fit": "params:sample__s1.bayes_estimation.person_fit",
             # sigma_prior_b: override si está definido, si no, calculado por pipeline (ver más abajo)
             # Aquí pasamos ambos para que el pipeline elija
             "sigma_prior_override": "params:sample__s1.bayes_estimation.sigma_prior_override",
             # También pasamos la var base para computar sigma por defecto
             "base_stat_variance": "params:sample__s1.test_parameters.stat_difficulty.variance",
+            # Sólo los que el pipeline usa (dependen de init_from_mmle/reuse_tuning)
+            **{
+                name: f"params:sample__s1.bayes_estimation.{name}"
+                for name in ("init_from_mmle", "reuse_tuning", "warm_tune")
+                if f"params:{name}" in bayes.inputs()
+            },
         },
     ).tag({"sample", "sample_1", "bayes", "estimation"})
 
@@ -131,9 +153,81 @@ def register_pipelines() -> dict[str, Pipeline]:
             "mmle_estimation__s1.mmle_estimation_summary": "mmle_estimation__s1.mmle_estimation_summary",
             "bayes_estimation__s1.bayes_estimation_summary": "bayes_estimation__s1.bayes_estimation_summary",
         },
+        parameters={
+            "cache_dir": "params:sample__s1.reporting.cache_dir",
+            "workers": "params:sample__s1.reporting.workers",
+            "facet_metrics": "params:sample__s1.reporting.facet_metrics",
+            "facet_panels_per_page": "params:sample__s1.reporting.facet_panels_per_page",
+        },
     ).tag({"sample", "sample_1", "reporting"})
 
-    all_pipes = s1_ns + auto_pred_ns + subsample_ns + mmle_ns + bayes_ns + reporting_ns
+    precision_check = create_precision_check_s1(
+        percents=grid.percents, bayes_cells=grid.precision_check_cells
+    )
+    precision_check_ns = pipeline(
+        precision_check,
+        namespace="precision_check__s1",
+        inputs=_shared_inputs(precision_check),
+        parameters={
+            "seed": "params:sample__s1.seed",
+            "reference_precision": "params:sample__s1.precision_check.reference",
+            "candidate_precision": "params:sample__s1.precision_check.candidate",
+            "tolerance": "params:sample__s1.precision_check.tolerance",
+            "draws": "params:sample__s1.bayes_estimation.draws",
+            "tune": "params:sample__s1.bayes_estimation.tune",
+            "chains": "params:sample__s1.bayes_estimation.chains",
+            "target_accept": "params:sample__s1.bayes_estimation.target_accept",
+            "sigma_prior_override": "params:sample__s1.bayes_estimation.sigma_prior_override",
+            "base_stat_variance": "params:sample__s1.test_parameters.stat_difficulty.variance",
+        },
+    ).tag({"sample", "sample_1", "precision_check"})
+
+    sbc = create_sbc_s1()
+    sbc_ns = pipeline(
+        sbc,
+        namespace="sbc__s1",
+        parameters={
+            "sbc": "params:sample__s1.sbc",
+            "stat_difficulty": "params:sample__s1.test_parameters.stat_difficulty",
+            "seed": "params:sample__s1.seed",
+            "precision": "params:sample__s1.precision",
+            "cache_dir": "params:sample__s1.reporting.cache_dir",
+        },
+    ).tag({"sample_1", "sbc"})
+
+    adaptive = create_adaptive_design_s1()
+    adaptive_ns = pipeline(
+        adaptive,
+        namespace="adaptive_design__s1",
+        inputs=_shared_inputs(adaptive),
+        parameters={
+            "design": "params:sample__s1.adaptive_design",
+            "bayes": "params:sample__s1.bayes_estimation",
+            "mmle_engine": "params:sample__s1.mmle_estimation.engine",
+            "seed": "params:sample__s1.seed",
+            "precision": "params:sample__s1.precision",
+            "n_total": "params:sample__s1.student_parameters.number_of_students",
+            "base_stat_variance": "params:sample__s1.test_parameters.stat_difficulty.variance",
+            "replication": "params:sample__s1.replication",
+            "cache_dir": "params:sample__s1.reporting.cache_dir",
+        },
+    ).tag({"sample", "sample_1", "adaptive_design"})
+
+    def _real_data_ns(pipe: Pipeline) -> Pipeline:
+        return pipeline(
+            pipe,
+            namespace="real_data",
+            # params:<x> -> params:real_data.<x> (bloque real_data de parameters.yml)
+            parameters={name: name.replace("params:", "params:real_data.", 1) for name in pipe.inputs()
+                        if name.startswith("params:")},
+        ).tag({"real_data"})
+
+    real_data_ns = _real_data_ns(create_real_data())
+    real_data_out_of_core_ns = _real_data_ns(create_real_data_out_of_core())
+    real_data_online_ns = _real_data_ns(create_real_data_online())
+
+    # Una sola construcción (y un solo ordenamiento topológico) en vez de sumas encadenadas
+    all_pipes = Pipeline([s1_ns, auto_pred_ns, subsample_ns, mmle_ns, bayes_ns, reporting_ns])
 
     return {
         "sample_s1": s1_ns,
@@ -142,5 +236,17 @@ def register_pipelines() -> dict[str, Pipeline]:
         "mmle_estimation_s1": mmle_ns,
         "bayes_estimation_s1": bayes_ns,
         "reporting_s1": reporting_ns,
+        # No forma parte de __default__: re-estima en dos precisiones (chequeo puntual)
+        "precision_check_s1": precision_check_ns,
+        # No forma parte de __default__: calibración del modelo Bayes con datos simulados del prior
+        "sbc_s1": sbc_ns,
+        # No forma parte de __default__: grilla gruesa + celdas elegidas por un sustituto GP
+        "adaptive_design_s1": adaptive_ns,
+        # Datos reales (formato largo, disperso): requiere data/01_raw/real_data/
+        "real_data": real_data_ns,
+        # MMLE por lotes sobre real_data.response_chunks (Parquet ordenado por persona)
+        "real_data_out_of_core": real_data_out_of_core_ns,
+        # Calibración incremental: cada corrida suma el archivo actual como un lote nuevo
+        "real_data_online": real_data_online_ns,
         "__default__": all_pipes,
     }
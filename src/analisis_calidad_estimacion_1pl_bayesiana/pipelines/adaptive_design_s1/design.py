@@ -0,0 +1,154 @@
+"""Refinamiento adaptativo del diseño percent × r con un sustituto gaussiano.
+
+La grilla completa (todas las combinaciones de percents y r) gasta la mayoría
+de los ajustes MCMC en zonas planas. Aquí se ajusta un proceso gaussiano (GP,
+scikit-learn) a la diferencia ``métrica Bayes - métrica MMLE`` sobre las celdas
+ya evaluadas y se eligen las siguientes con el criterio *straddle* (Bryan et
+al., 2005)::
+
+    a(x) = kappa * sd(x) - |mu(x) - threshold|
+
+que es alto donde el sustituto es incierto o cerca del cruce (``threshold``,
+por defecto 0: Bayes empata con MMLE). Los candidatos son los puntos de una
+retícula fina (paso ``resolution``); cada ronda toma ``batch_size`` candidatos
+uno a uno, agregando al GP el valor predicho de cada elegido (*kriging
+believer*) para no amontonarlos. Se detiene al agotar el presupuesto o cuando
+ningún candidato tiene ``a(x) > 0`` (todos clasificados al nivel de ``kappa``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class DesignSpace:
+    """Rectángulo percent × r y retícula de candidatos (mismos niveles que ``grid_key``)."""
+
+    percent_bounds: tuple[float, float] = (0.1, 1.0)
+    r_bounds: tuple[float, float] = (0.1, 1.0)
+    resolution: float = 0.05
+
+    def _axis(self, bounds: tuple[float, float]) -> np.ndarray:
+        lo, hi = float(bounds[0]), float(bounds[1])
+        n = int(round((hi - lo) / self.resolution)) + 1
+        # Redondeo para que las claves (grid_key) sean estables: 0.35, no 0.35000000000000003
+        return np.round(np.linspace(lo, hi, max(n, 2)), 6)
+
+    def candidates(self) -> np.ndarray:
+        """[n x 2] con (percent, r) de toda la retícula."""
+        p, r = np.meshgrid(self._axis(self.percent_bounds), self._axis(self.r_bounds), indexing="ij")
+        return np.column_stack([p.ravel(), r.ravel()])
+
+    def coarse(self, n_levels: int) -> np.ndarray:
+        """Grilla inicial de ``n_levels`` × ``n_levels`` puntos de la retícula (incluye los bordes)."""
+        axes = []
+        for bounds in (self.percent_bounds, self.r_bounds):
+            axis = self._axis(bounds)
+            axes.append(axis[np.unique(np.linspace(0, axis.size - 1, int(n_levels)).round().astype(int))])
+        p, r = np.meshgrid(*axes, indexing="ij")
+        return np.column_stack([p.ravel(), r.ravel()])
+
+    def scale(self, x: np.ndarray) -> np.ndarray:
+        lo = np.array([self.percent_bounds[0], self.r_bounds[0]], dtype=float)
+        hi = np.array([self.percent_bounds[1], self.r_bounds[1]], dtype=float)
+        return (np.asarray(x, dtype=float) - lo) / np.where(hi > lo, hi - lo, 1.0)
+
+
+class Surrogate:
+    """GP Matérn 5/2 (escalas por eje) + ruido blanco sobre la retícula escalada a [0, 1]²."""
+
+    def __init__(self, space: DesignSpace, seed: int | None = None) -> None:
+        self.space = space
+        self.seed = seed
+        self._gp = None
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "Surrogate":
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+        kernel = (
+            ConstantKernel(1.0, (1e-3, 1e3)) * Matern(length_scale=[0.3, 0.3], length_scale_bounds=(0.05, 10.0), nu=2.5)
+            + WhiteKernel(1e-2, (1e-6, 1.0))
+        )
+        self._gp = GaussianProcessRegressor(
+            kernel, normalize_y=True, n_restarts_optimizer=2, random_state=self.seed
+        ).fit(self.space.scale(x), np.asarray(y, dtype=float))
+        return self
+
+    def conditioned(self, x: np.ndarray, y: np.ndarray) -> "Surrogate":
+        """Mismo kernel ya ajustado (sin re-optimizar hiperparámetros) sobre otros datos."""
+        from sklearn.gaussian_process import GaussianProcessRegressor
+
+        other = Surrogate(self.space, self.seed)
+        other._gp = GaussianProcessRegressor(self._gp.kernel_, normalize_y=True, optimizer=None).fit(
+            self.space.scale(x), np.asarray(y, dtype=float)
+        )
+        return other
+
+    def predict(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        mu, sd = self._gp.predict(self.space.scale(x), return_std=True)
+        return mu, sd
+
+    @property
+    def kernel(self) -> str:
+        return str(self._gp.kernel_)
+
+
+def straddle(mu: np.ndarray, sd: np.ndarray, threshold: float = 0.0, kappa: float = 1.96) -> np.ndarray:
+    return kappa * sd - np.abs(mu - threshold)
+
+
+def propose_batch(
+    surrogate: Surrogate,
+    x: np.ndarray,
+    y: np.ndarray,
+    candidates: np.ndarray,
+    batch_size: int,
+    threshold: float = 0.0,
+    kappa: float = 1.96,
+    exclude: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Hasta ``batch_size`` candidatos con ``a(x) > 0`` fuera de ``x``/``exclude``; devuelve (puntos, a(x))."""
+    evaluated = {tuple(row) for row in np.round(np.vstack([x, exclude]) if exclude is not None else x, 6)}
+    pool = np.array([c for c in candidates if tuple(np.round(c, 6)) not in evaluated]).reshape(-1, 2)
+    chosen, scores = [], []
+    model, x_aug, y_aug = surrogate, np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    for _ in range(int(batch_size)):
+        if pool.shape[0] == 0:
+            break
+        mu, sd = model.predict(pool)
+        score = straddle(mu, sd, threshold, kappa)
+        best = int(np.argmax(score))
+        if score[best] <= 0.0:
+            break
+        chosen.append(pool[best])
+        scores.append(float(score[best]))
+        # Kriging believer: el elegido entra con su media predicha y baja la incertidumbre vecina
+        x_aug = np.vstack([x_aug, pool[best]])
+        y_aug = np.append(y_aug, mu[best])
+        pool = np.delete(pool, best, axis=0)
+        model = surrogate.conditioned(x_aug, y_aug)
+    return np.array(chosen).reshape(-1, 2), np.array(scores)
+
+
+def crossover_by_r(surface: pd.DataFrame, threshold: float = 0.0) -> pd.DataFrame:
+    """Por cada r de la retícula: menor percent donde la media predicha cruza ``threshold``.
+
+    ``surface``: [percent, r_level, mu]. NaN si no cruza dentro del rango.
+    """
+    rows = []
+    for r, sub in surface.sort_values("percent").groupby("r_level"):
+        p = sub["percent"].to_numpy()
+        d = sub["mu"].to_numpy() - threshold
+        cross = np.flatnonzero(np.sign(d[:-1]) != np.sign(d[1:]))
+        if cross.size:
+            i = int(cross[0])
+            # Interpolación lineal entre los dos puntos de la retícula
+            p_cross = p[i] + (p[i + 1] - p[i]) * d[i] / (d[i] - d[i + 1]) if d[i] != d[i + 1] else p[i]
+        else:
+            p_cross = np.nan
+        rows.append({"r_level": float(r), "percent_crossover": float(p_cross)})
+    return pd.DataFrame(rows)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+from statistics import NormalDist
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.grid import grid_key
+from analisis_calidad_estimacion_1pl_bayesiana.metrics import recovery_metrics
+
+from ..auto_pred_s1.nodes import generate_predicted_difficulties_for_r
+from ..bayes_estimation_s1.nodes import bayes_estimate_for_mask_and_prior, bayes_estimate_reference_cell
+from ..mmle_estimation_s1.nodes import mmle_estimate_for_mask
+from ..reporting_s1.figures import FigureSpec, render_specs
+from ..subsample_s1.nodes import generate_subsample_mask_for_percent
+from .design import DesignSpace, Surrogate, crossover_by_r, propose_batch, straddle
+
+logger = logging.getLogger(__name__)
+
+DESIGN_METRICS = ("mse", "mae", "r2", "r")
+
+
+class _CellRunner:
+    """Evalúa celdas (percent, r) con los mismos nodos que la grilla, cacheando lo que comparten.
+
+    Máscaras, predicciones y MMLE se generan con las mismas semillas que
+    ``subsample_s1``/``auto_pred_s1``/``mmle_estimation_s1``. Sin ``reuse_tuning``
+    (por defecto) una celda que también está en la grilla da el mismo resultado
+    (con o sin ``init_from_mmle``: el MMLE es el mismo). Con ``reuse_tuning`` la
+    primera celda Bayes que se visita de cada percent calienta completo y publica
+    su adaptación NUTS para las demás; como el diseño no visita los r en el orden
+    de la grilla, esa referencia (y por lo tanto el resultado de las demás celdas)
+    puede diferir de ``bayes_estimation_s1``.
+    """
+
+    def __init__(
+        self,
+        responses: pd.DataFrame,
+        difficulties: pd.DataFrame,
+        bayes: Dict[str, Any],
+        mmle_engine: str,
+        seed: int,
+        precision: str,
+        n_total: int,
+        base_stat_variance: float,
+        replication: int,
+    ) -> None:
+        self.responses = responses
+        self.difficulties = difficulties
+        self.bayes = bayes
+        self.mmle_engine = mmle_engine
+        self.seed = seed
+        self.precision = precision
+        self.n_total = n_total
+        self.base_stat_variance = base_stat_variance
+        self.replication = replication
+        self._masks: dict[str, pd.DataFrame] = {}
+        self._mmle: dict[str, tuple[pd.DataFrame, pd.DataFrame]] = {}
+        self._preds: dict[str, pd.DataFrame] = {}
+        self._tuning: dict[str, Any] = {}
+
+    def _mask(self, percent: float) -> pd.DataFrame:
+        key = grid_key(percent)
+        if key not in self._masks:
+            self._masks[key] = generate_subsample_mask_for_percent(self.n_total, seed=self.seed, percent=percent)
+        return self._masks[key]
+
+    def mmle(self, percent: float) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """(estimaciones, métricas) MMLE del percent."""
+        key = grid_key(percent)
+        if key not in self._mmle:
+            est = mmle_estimate_for_mask(
+                self.responses, self._mask(percent), precision=self.precision, percent=percent,
+                replication=self.replication, engine=self.mmle_engine, person_fit=False,
+            )
+            self._mmle[key] = (est, recovery_metrics(est, self.difficulties, by=["percent"]))
+        return self._mmle[key]
+
+    def _pred(self, r_level: float) -> pd.DataFrame:
+        key = grid_key(r_level)
+        if key not in self._preds:
+            self._preds[key] = generate_predicted_difficulties_for_r(self.difficulties, r_level, seed=self.seed)
+        return self._preds[key]
+
+    def bayes_metrics(self, percent: float, r_level: float) -> pd.DataFrame:
+        b = self.bayes
+        args = dict(
+            responses=self.responses,
+            mask=self._mask(percent),
+            prior_pred=self._pred(r_level),
+            sigma_prior_override=b.get("sigma_prior_override"),
+            base_stat_variance=self.base_stat_variance,
+            draws=int(b["draws"]),
+            tune=int(b["tune"]),
+            chains=int(b["chains"]),
+            target_accept=float(b["target_accept"]),
+            seed=self.seed,
+            precision=self.precision,
+            percent=percent,
+            r_level=r_level,
+            replication=self.replication,
+            mmle_estimates=self.mmle(percent)[0],
+            init_from_mmle=bool(b.get("init_from_mmle", False)),
+            person_fit=False,  # el diseño sólo usa métricas de recuperación
+        )
+        key = grid_key(percent)
+        if key in self._tuning:
+            frame = bayes_estimate_for_mask_and_prior(
+                **args, tuning=self._tuning[key],
+                reuse_tuning=bool(b.get("reuse_tuning", False)), warm_tune=b.get("warm_tune"),
+            )
+        else:
+            frame, _, self._tuning[key] = bayes_estimate_reference_cell(**args)
+        return recovery_metrics(frame, self.difficulties, by=["percent", "r_level"], sd_col="sd")
+
+
+def run_adaptive_design_s1(
+    responses: pd.DataFrame,
+    difficulties: pd.DataFrame,
+    design: Dict[str, Any],
+    bayes: Dict[str, Any],
+    mmle_engine: str,
+    seed: int,
+    precision: str,
+    n_total: int,
+    base_stat_variance: float,
+    replication: int = 0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Evalúa la grilla gruesa y refina con el sustituto hasta ``max_fits`` ajustes Bayes.
+
+    La respuesta es ``diff = <metric>_bayes - <metric>_mmle`` en cada celda (ver
+    :mod:`.design`). Devuelve:
+
+    - celdas evaluadas [round, percent, r_level, <metric>_bayes, <metric>_mmle,
+      diff, acquisition] (``round=0`` la grilla gruesa; ``acquisition`` es el
+      straddle con que se eligió la celda);
+    - superficie final sobre la retícula [percent, r_level, mu, sd, p_below,
+      round] con ``p_below = P(diff < threshold)`` y la ronda en que se evaluó
+      cada punto (NaN si no se evaluó).
+    """
+    metric = str(design.get("metric", "mse"))
+    if metric not in DESIGN_METRICS:
+        raise ValueError(f"Métrica de diseño no soportada: {metric!r}. Opciones: {list(DESIGN_METRICS)}")
+    space = DesignSpace(
+        percent_bounds=tuple(design.get("percent_bounds", (0.1, 1.0))),
+        r_bounds=tuple(design.get("r_bounds", (0.1, 1.0))),
+        resolution=float(design.get("resolution", 0.05)),
+    )
+    threshold = float(design.get("threshold", 0.0))
+    kappa = float(design.get("kappa", 1.96))
+    max_fits = int(design.get("max_fits", 40))
+    batch_size = int(design.get("batch_size", 4))
+
+    runner = _CellRunner(
+        responses, difficulties, bayes, mmle_engine, int(seed), precision, int(n_total),
+        float(base_stat_variance), int(replication),
+    )
+    rows: list[dict[str, Any]] = []
+
+    def evaluate(points: np.ndarray, round_: int, scores: np.ndarray | None = None) -> None:
+        for i, (p, r) in enumerate(points):
+            p, r = float(p), float(r)
+            bayes_value = float(runner.bayes_metrics(p, r)[metric].iloc[0])
+            mmle_value = float(runner.mmle(p)[1][metric].iloc[0])
+            rows.append({
+                "round": round_, "percent": p, "r_level": r,
+                f"{metric}_bayes": bayes_value, f"{metric}_mmle": mmle_value,
+                "diff": bayes_value - mmle_value,
+                "acquisition": float(scores[i]) if scores is not None else np.nan,
+            })
+            logger.info(
+                "[adaptive_s1] ronda %d: percent=%.3f r=%.3f %s bayes-mmle=%.5f",
+                round_, p, r, metric, bayes_value - mmle_value,
+            )
+
+    candidates = space.candidates()
+    initial = space.coarse(int(design.get("initial_levels", 4)))[:max_fits]
+    evaluate(initial, 0)
+
+    round_ = 0
+    while True:
+        cells = pd.DataFrame(rows)
+        ok = np.isfinite(cells["diff"].to_numpy())
+        x, y = cells.loc[ok, ["percent", "r_level"]].to_numpy(), cells.loc[ok, "diff"].to_numpy()
+        surrogate = Surrogate(space, seed=int(seed)).fit(x, y)
+        remaining = max_fits - len(rows)
+        if remaining <= 0:
+            break
+        points, scores = propose_batch(
+            surrogate, x, y, candidates, min(batch_size, remaining), threshold, kappa,
+            exclude=cells[["percent", "r_level"]].to_numpy(),
+        )
+        if points.shape[0] == 0:
+            logger.info("[adaptive_s1] todos los candidatos clasificados (straddle <= 0); se detiene")
+            break
+        round_ += 1
+        evaluate(points, round_, scores)
+
+    cells = pd.DataFrame(rows)
+    mu, sd = surrogate.predict(candidates)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_below = np.array([NormalDist().cdf(z) for z in (threshold - mu) / np.maximum(sd, 1e-12)])
+    surface = pd.DataFrame({"percent": candidates[:, 0], "r_level": candidates[:, 1], "mu": mu, "sd": sd, "p_below": p_below})
+    surface = surface.merge(cells[["percent", "r_level", "round"]], on=["percent", "r_level"], how="left")
+    logger.info(
+        "[adaptive_s1] %d ajustes Bayes en %d rondas (retícula de %d celdas); kernel=%s; candidatos sin clasificar=%d",
+        len(rows), round_ + 1, candidates.shape[0], surrogate.kernel,
+        int((straddle(mu, sd, threshold, kappa) > 0).sum()),
+    )
+    return cells, surface
+
+
+def summarize_adaptive_design_s1(surface: pd.DataFrame, design: Dict[str, Any]) -> pd.DataFrame:
+    """Percent de cruce (Bayes empata con MMLE) por nivel r según la media del sustituto."""
+    crossover = crossover_by_r(surface, float(design.get("threshold", 0.0)))
+    logger.info("[adaptive_s1] cruce por r: %s", crossover.round(3).to_dict(orient="list"))
+    return crossover
+
+
+def plot_adaptive_design_s1(surface: pd.DataFrame, design: Dict[str, Any], cache_dir: str | None = None) -> bytes:
+    """Mapa de la diferencia predicha con la curva de cruce y las celdas evaluadas por ronda (PNG)."""
+    metric = str(design.get("metric", "mse"))
+    data = surface[["percent", "r_level", "mu", "round"]].sort_values(["percent", "r_level"]).reset_index(drop=True)
+    spec = FigureSpec(
+        "adaptive_surface",
+        data,
+        {"threshold": float(design.get("threshold", 0.0)),
+         "title": f"Diseño adaptativo: {metric} Bayes - MMLE (sustituto GP)"},
+        size=(6.5, 5.0),
+    )
+    return render_specs({"adaptive_surface": spec}, cache_dir=cache_dir)["adaptive_surface"]
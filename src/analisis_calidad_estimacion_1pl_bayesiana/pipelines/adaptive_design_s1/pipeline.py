@@ -0,0 +1,49 @@
+"""Diseño adaptativo percent × r (S1): grilla gruesa + refinamiento con sustituto GP.
+
+Un único nodo conduce el experimento (las celdas a evaluar dependen de los
+resultados anteriores, así que no pueden ser nodos fijos del DAG); ver
+``design.py``. No forma parte de ``__default__``.
+"""
+
+from kedro.pipeline import Pipeline, node
+
+from .nodes import plot_adaptive_design_s1, run_adaptive_design_s1, summarize_adaptive_design_s1
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return Pipeline(
+        [
+            node(
+                func=run_adaptive_design_s1,
+                inputs=dict(
+                    responses="sample__s1.responses",
+                    difficulties="sample__s1.difficulties",
+                    design="params:design",
+                    bayes="params:bayes",
+                    mmle_engine="params:mmle_engine",
+                    seed="params:seed",
+                    precision="params:precision",
+                    n_total="params:n_total",
+                    base_stat_variance="params:base_stat_variance",
+                    replication="params:replication",
+                ),
+                outputs=["adaptive_cells", "adaptive_surface"],
+                name="s1_adaptive_design_run",
+                tags={"sample_1", "adaptive_design", "bayes", "mmle"},
+            ),
+            node(
+                func=summarize_adaptive_design_s1,
+                inputs=dict(surface="adaptive_surface", design="params:design"),
+                outputs="adaptive_crossover",
+                name="s1_adaptive_design_crossover",
+                tags={"sample_1", "adaptive_design"},
+            ),
+            node(
+                func=plot_adaptive_design_s1,
+                inputs=dict(surface="adaptive_surface", design="params:design", cache_dir="params:cache_dir"),
+                outputs="adaptive_surface_figure",
+                name="s1_adaptive_design_figure",
+                tags={"sample_1", "adaptive_design", "reporting"},
+            ),
+        ]
+    )
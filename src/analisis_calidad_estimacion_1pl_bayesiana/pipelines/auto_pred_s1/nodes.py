@@ -1,9 +1,11 @@
 import logging
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Mapping
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import r2_score
+
+from analisis_calidad_estimacion_1pl_bayesiana.grid import GridCell, parse_grid_key
+from analisis_calidad_estimacion_1pl_bayesiana.metrics import recovery_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -98,51 +100,32 @@ def generate_predicted_difficulties_for_r(
 
 def summarize_pred_discrimination(
     difficulties: pd.DataFrame,
+    cells: Mapping[str, GridCell] | None = None,
     **preds: pd.DataFrame,
 ) -> pd.DataFrame:
     """Resumen de discriminación lograda por cada dataset de predicción.
 
     Espera ``difficulties`` con columnas [item_id, difficulty] y múltiples
     dataframes de predicción como kwargs, donde cada uno tiene columnas
-    [item_id, predicted_difficulty]. Las claves de kwargs deben tener el
-    formato ``pred_r_0_1``, ``pred_r_0_2``, etc., de donde se extrae el
-    ``r_target``.
+    [item_id, predicted_difficulty]. ``cells`` mapea cada kwarg a su celda
+    (``GridCell(r_level=...)``) y lo fija el pipeline con ``partial``; sin él,
+    el r objetivo se toma de claves con formato ``pred_r_0_1``.
     """
-    diffs = difficulties.sort_values("item_id").reset_index(drop=True)
-    true = diffs["difficulty"].to_numpy(dtype=float)
-
-    rows: list[dict] = []
-    for key, df in sorted(preds.items()):
-        # Extraer r objetivo de la clave 'pred_r_0_1' -> 0.1
-        try:
-            r_str = key.split("pred_r_")[-1]
-            r_target = float(r_str.replace("_", "."))
-            r2_target = r_target ** 2
-        except Exception:
-            r_target, r2_target = (float("nan"), float("nan"))
-
-        pred_df = df.sort_values("item_id").reset_index(drop=True)
-        pred = pred_df["predicted_difficulty"].to_numpy(dtype=float)
-
-        # Alinear si fuese necesario
-        if pred_df.shape[0] != diffs.shape[0] or not np.all(pred_df["item_id"].to_numpy() == diffs["item_id"].to_numpy()):
-            merged = pd.merge(diffs, pred_df, on="item_id", how="inner")
-            true_al = merged["difficulty"].to_numpy(dtype=float)
-            pred_al = merged["predicted_difficulty"].to_numpy(dtype=float)
-        else:
-            true_al, pred_al = true, pred
-
-        corr = float(np.corrcoef(true_al, pred_al)[0, 1]) if true_al.size > 1 else 1.0
-        r2 = corr * corr
-        rows.append({
-            "dataset_key": key,
-            "r_target": r_target,
-            "r2_target": r2_target,
-            "r_achieved": corr,
-            "r2_achieved": r2,
-            "n_items": int(true_al.size),
-        })
-
-    summary = pd.DataFrame(rows).sort_values("r_target").reset_index(drop=True)
+    cells = dict(cells or {})
+    frames = []
+    for key, df in preds.items():
+        cell = cells.get(key) or GridCell(r_level=parse_grid_key(key.split("pred_r_")[-1]))
+        frames.append(df[["item_id", "predicted_difficulty"]].assign(r_target=float(cell.r_level)))
+    long = pd.concat(frames, ignore_index=True)
+
+    metrics = recovery_metrics(long, difficulties, by=["r_target"], estimate_col="predicted_difficulty")
+    summary = pd.DataFrame({
+        "dataset_key": [GridCell(r_level=r).key("pred") for r in metrics["r_target"]],
+        "r_target": metrics["r_target"].astype(float),
+        "r2_target": metrics["r_target"].astype(float) ** 2,
+        "r_achieved": metrics["r"],
+        "r2_achieved": metrics["r2"],
+        "n_items": metrics["n_items"],
+    })
     logger.info("[auto_pred_s1] resumen discriminación: %s", summary.to_dict(orient="list"))
     return summary
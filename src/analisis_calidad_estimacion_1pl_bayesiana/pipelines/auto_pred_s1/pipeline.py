@@ -1,6 +1,8 @@
 from functools import partial, update_wrapper
 from kedro.pipeline import Pipeline, node
 
+from analisis_calidad_estimacion_1pl_bayesiana.grid import DEFAULT_LEVELS, GridCell, grid_key
+
 from .nodes import generate_predicted_difficulties_for_r, summarize_pred_discrimination
 
 
@@ -9,17 +11,17 @@ def create_pipeline(**kwargs) -> Pipeline:
 
     - Input: difficulties (de sample 1)
     - Params: seed
-    - Output: 10 datasets persistentes: pred_difficulty_r_0_1, ..., pred_difficulty_r_1_0
+    - Output: un dataset persistente por nivel r: pred_difficulty_r_0_1, ..., pred_difficulty_r_1_0
     """
-
-    r_levels = [
-        0.1, 0.2, 0.3, 0.4, 0.5,
-        0.6, 0.7, 0.8, 0.9, 1.0,
-    ]
+    r_levels = kwargs.get("r_levels", DEFAULT_LEVELS)
 
     nodes = []
+    summary_inputs = {"difficulties": "difficulties"}
+    summary_cells: dict[str, GridCell] = {}
     for r in r_levels:
-        out_name = f"pred_difficulty_r_{str(r).replace('.', '_')}"
+        out_name = f"pred_difficulty_r_{grid_key(r)}"
+        summary_inputs[f"pred_r_{grid_key(r)}"] = out_name
+        summary_cells[f"pred_r_{grid_key(r)}"] = GridCell(r_level=float(r))
         # Envolver el partial para mejorar el logging en Kedro
         func = partial(generate_predicted_difficulties_for_r, discrimination=r)
         update_wrapper(func, generate_predicted_difficulties_for_r)
@@ -31,29 +33,18 @@ def create_pipeline(**kwargs) -> Pipeline:
                     seed="params:seed",
                 ),
                 outputs=out_name,
-                name=f"s1_generate_pred_for_r_{str(r).replace('.', '_')}",
+                name=f"s1_generate_pred_for_r_{grid_key(r)}",
                 tags={"sample_1", "auto_pred"},
             )
         )
 
     # Nodo de resumen de discriminación lograda (corr y corr^2) para todos los outputs
-    summary_inputs = {
-        "difficulties": "difficulties",
-        "pred_r_0_1": "pred_difficulty_r_0_1",
-        "pred_r_0_2": "pred_difficulty_r_0_2",
-        "pred_r_0_3": "pred_difficulty_r_0_3",
-        "pred_r_0_4": "pred_difficulty_r_0_4",
-        "pred_r_0_5": "pred_difficulty_r_0_5",
-        "pred_r_0_6": "pred_difficulty_r_0_6",
-        "pred_r_0_7": "pred_difficulty_r_0_7",
-        "pred_r_0_8": "pred_difficulty_r_0_8",
-        "pred_r_0_9": "pred_difficulty_r_0_9",
-        "pred_r_1_0": "pred_difficulty_r_1_0",
-    }
-
+    # La celda de cada input va tipada en el partial (no se parsea del nombre)
+    summary_func = partial(summarize_pred_discrimination, cells=summary_cells)
+    update_wrapper(summary_func, summarize_pred_discrimination)
     nodes.append(
         node(
-            func=summarize_pred_discrimination,
+            func=summary_func,
             inputs=summary_inputs,
             outputs="pred_discrimination_summary",
             name="s1_summarize_pred_discrimination",
@@ -1,36 +1,148 @@
 import logging
-from typing import Dict
+from typing import Any, Dict, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
 
+from analisis_calidad_estimacion_1pl_bayesiana.data_access import masked_sparse_responses
+from analisis_calidad_estimacion_1pl_bayesiana.datasets import (
+    ReplicationAggregateState,
+    ResultsPartition,
+    make_person_frame,
+    make_results_frame,
+    read_results,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.grid import GridCell
+from analisis_calidad_estimacion_1pl_bayesiana.irt import SparseResponses
+from analisis_calidad_estimacion_1pl_bayesiana.irt.bayes import NutsTuning, sample_rasch_posterior
+from analisis_calidad_estimacion_1pl_bayesiana.irt.fit import FIT_COLUMNS, rasch_fit_statistics
+from analisis_calidad_estimacion_1pl_bayesiana.irt.ppc import PPC_COLUMNS, posterior_predictive_checks, thin_draws
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import score_persons
+from analisis_calidad_estimacion_1pl_bayesiana.metrics import fit_summary, recovery_metrics
+from analisis_calidad_estimacion_1pl_bayesiana.precision import resolve_float_dtype
+
+from ..sample_s1.nodes import replication_truth
+
 logger = logging.getLogger(__name__)
 
-try:
-    import pymc as pm
-    import pytensor.tensor as pt
-except Exception as e:  # pragma: no cover
-    pm = None  # type: ignore
-    pt = None  # type: ignore
-    logger.warning("PyMC no disponible: %s", e)
 
+def sample_bayes_posterior(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    prior_pred: pd.DataFrame,
+    sigma_prior_override: float | None,
+    base_stat_variance: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None = None,
+    precision: str = "float64",
+    mmle_estimates: pd.DataFrame | None = None,
+    tuning: NutsTuning | None = None,
+):
+    """Ajusta el modelo 1PL con prior N(mu=prior_pred, sigma) y devuelve el ``InferenceData``.
+
+    sigma = sigma_prior_override si no es None; si no, sqrt(base_stat_variance).
+    prior_pred: DF [item_id, predicted_difficulty]
+    precision: ``float64`` o ``float32``; fija ``pytensor.config.floatX`` del modelo.
+    mmle_estimates: DF [item_id, estimate] de la misma máscara; si se da, las
+    cadenas parten de esas dificultades y de las thetas EAP que implican.
+    tuning: adaptación NUTS de otra celda (ver :class:`NutsTuning`).
+    Separado del nodo para que benchmarks y diagnósticos accedan a la traza.
+    """
+    data = masked_sparse_responses(responses, mask)  # completa 0/1 -> verosimilitud densa
+
+    pred = prior_pred.drop_duplicates("item_id").set_index("item_id")["predicted_difficulty"]
+    mu_b = pred.reindex(data.item_ids).to_numpy(dtype=float)
+
+    sigma_prior_b = float(sigma_prior_override) if sigma_prior_override is not None else float(np.sqrt(max(base_stat_variance, 0.0)))
+
+    initvals = None if mmle_estimates is None else _mmle_initvals(data, mmle_estimates, mu_b)
+    return sample_rasch_posterior(
+        data, mu_b, sigma_prior_b, draws, tune, chains, target_accept, seed=seed, precision=precision,
+        initvals=initvals, tuning=tuning,
+    )
 
-def _filter_responses_with_mask(responses: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
-    if "mask" not in mask.columns:
-        raise ValueError("La máscara debe tener una columna 'mask'.")
-    resp = responses.sort_values("person_id").reset_index(drop=True)
-    m = mask["mask"].to_numpy().astype(int)
-    if m.size != resp.shape[0]:
-        raise ValueError(f"Tamaño de máscara {m.size} no coincide con n_responses={resp.shape[0]}")
-    selected = resp[m == 1].reset_index(drop=True)
-    return selected
 
+def _mmle_initvals(data: SparseResponses, mmle_estimates: pd.DataFrame, mu_b: np.ndarray) -> dict[str, np.ndarray]:
+    """``initvals`` desde MMLE: b (NaN/extremos -> media del prior) y theta EAP dado ese b."""
+    est = mmle_estimates.drop_duplicates("item_id").set_index("item_id")["estimate"]
+    b0 = est.reindex(data.item_ids).to_numpy(dtype=float)
+    b0 = np.clip(np.where(np.isfinite(b0), b0, mu_b), -6.0, 6.0)
+    theta0 = score_persons(data, b0, method="eap")["theta"].to_numpy()
+    return {"theta": theta0, "b": b0}
 
-def _responses_matrix(filtered_responses: pd.DataFrame) -> np.ndarray:
-    if "person_id" not in filtered_responses.columns:
-        raise ValueError("Se espera columna 'person_id' en responses.")
-    X = filtered_responses.drop(columns=["person_id"]).to_numpy(dtype=int)
-    return X  # [persons x items]
+
+def _mmle_for_replication(mmle_estimates: pd.DataFrame | ResultsPartition | None, replication: int) -> pd.DataFrame | None:
+    if mmle_estimates is None:
+        return None
+    frame = read_results([mmle_estimates], columns=["replication", "item_id", "estimate"])
+    frame = frame[frame["replication"] == int(replication)]
+    if frame.empty:
+        logger.warning("[bayes_s1] Sin estimaciones MMLE para la réplica %d; arranque por defecto", replication)
+        return None
+    return frame
+
+
+def _estimate_cell(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    prior_pred: pd.DataFrame,
+    sigma_prior_override: float | None,
+    base_stat_variance: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None,
+    precision: str,
+    percent: float,
+    r_level: float,
+    replication: int,
+    ppc_draws: int,
+    ppc_max_cells: int,
+    mmle_estimates: pd.DataFrame | ResultsPartition | None,
+    init_from_mmle: bool,
+    tuning: NutsTuning | None,
+    person_fit: bool = True,
+):
+    dtype = resolve_float_dtype(precision)
+    idata = sample_bayes_posterior(
+        responses, mask, prior_pred, sigma_prior_override, base_stat_variance,
+        draws, tune, chains, target_accept, seed=seed, precision=precision,
+        mmle_estimates=_mmle_for_replication(mmle_estimates, replication) if init_from_mmle else None,
+        tuning=tuning,
+    )
+
+    b_post = idata.posterior["b"]
+    b_hat = b_post.mean(dim=("chain", "draw")).values.astype(dtype)
+    b_sd = b_post.std(dim=("chain", "draw")).values.astype(dtype)
+
+    # Ajuste infit/outfit con las medias posteriores de b y theta
+    data = masked_sparse_responses(responses, mask)
+    extra: dict[str, Any] = {}
+    person_ids, person_columns = np.empty(0, dtype=int), {}
+    if person_fit:
+        theta_hat = idata.posterior["theta"].mean(dim=("chain", "draw")).values
+        fit = rasch_fit_statistics(data, b_post.mean(dim=("chain", "draw")).values, theta_hat)
+        extra = fit.columns()
+        person_ids, person_columns = data.person_ids, {"theta": theta_hat, **fit.person_columns()}
+    persons = make_person_frame(
+        "bayes", person_ids, person_columns, percent=percent, r_level=r_level, replication=replication,
+    )
+    if ppc_draws and int(ppc_draws) > 0:
+        b_draws = b_post.stack(sample=("chain", "draw")).transpose("sample", ...).values
+        theta_draws = idata.posterior["theta"].stack(sample=("chain", "draw")).transpose("sample", ...).values
+        keep = thin_draws(b_draws.shape[0], int(ppc_draws))
+        ppc = posterior_predictive_checks(
+            data, b_draws[keep], theta_draws[keep], max_cells=int(ppc_max_cells), seed=seed,
+        )
+        extra.update(ppc.columns())
+    frame = make_results_frame(
+        "bayes", b_hat, sd=b_sd, percent=percent, r_level=r_level, replication=replication, extra=extra
+    )
+    return frame, persons, idata
 
 
 def bayes_estimate_for_mask_and_prior(
@@ -44,102 +156,192 @@ def bayes_estimate_for_mask_and_prior(
     chains: int,
     target_accept: float,
     seed: int | None = None,
+    precision: str = "float64",
+    percent: float = float("nan"),
+    r_level: float = float("nan"),
+    replication: int = 0,
+    ppc_draws: int = 0,
+    ppc_max_cells: int = 2_000_000,
+    mmle_estimates: pd.DataFrame | ResultsPartition | None = None,
+    init_from_mmle: bool = False,
+    tuning: NutsTuning | None = None,
+    reuse_tuning: bool = False,
+    warm_tune: int | None = None,
+    person_fit: bool = True,
 ) -> pd.DataFrame:
-    """Estima b por MCMC con prior N(mu=prior_pred, sigma).
+    """Estimaciones por ítem de :func:`bayes_estimate_cell` (sin la tabla por persona)."""
+    return bayes_estimate_cell(
+        responses, mask, prior_pred, sigma_prior_override, base_stat_variance,
+        draws, tune, chains, target_accept, seed, precision, percent, r_level, replication,
+        ppc_draws, ppc_max_cells, mmle_estimates, init_from_mmle, tuning, reuse_tuning, warm_tune, person_fit,
+    )[0]
 
-    sigma = sigma_prior_override si no es None; si no, sqrt(base_stat_variance).
-    prior_pred: DF [item_id, predicted_difficulty]
-    Devuelve DF [item_id, est_bayes_difficulty]
+
+def bayes_estimate_cell(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    prior_pred: pd.DataFrame,
+    sigma_prior_override: float | None,
+    base_stat_variance: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None = None,
+    precision: str = "float64",
+    percent: float = float("nan"),
+    r_level: float = float("nan"),
+    replication: int = 0,
+    ppc_draws: int = 0,
+    ppc_max_cells: int = 2_000_000,
+    mmle_estimates: pd.DataFrame | ResultsPartition | None = None,
+    init_from_mmle: bool = False,
+    tuning: NutsTuning | None = None,
+    reuse_tuning: bool = False,
+    warm_tune: int | None = None,
+    person_fit: bool = True,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Estima b por MCMC con prior N(mu=prior_pred, sigma) (ver :func:`sample_bayes_posterior`).
+
+    Devuelve dos DF largos del almacén de resultados:
+
+    - ítems: [estimator="bayes", replication, percent, r_level, item_id,
+      estimate, sd, item_*fit*, person_*_misfit, ppc_*] con media y desviación
+      estándar posteriores de b;
+    - personas (tabla ``persons``): [..., person_id, theta, n_obs, infit,
+      outfit, infit_z, outfit_z] con la media posterior de theta;
+
+    con el ajuste infit/outfit (:mod:`irt.fit`) evaluado en las medias
+    posteriores de b y theta (``person_fit=False`` lo omite: ítems sin columnas
+    de ajuste y tabla por persona vacía). Con ``ppc_draws > 0`` los ítems agregan
+    los valores p predictivos posteriores (:mod:`irt.ppc`) calculados sobre
+    ``ppc_draws`` draws equiespaciados, en bloques de a lo sumo ``ppc_max_cells``.
+
+    Arranque en caliente: con ``init_from_mmle`` las cadenas parten de
+    ``mmle_estimates`` (MMLE de la misma máscara) y thetas EAP; con
+    ``reuse_tuning`` y un ``tuning`` de la celda de referencia del mismo percent
+    (:func:`bayes_estimate_reference_cell`) se fijan paso y matriz de masa y el
+    calentamiento baja a ``warm_tune`` pasos.
     """
-    if pm is None:
-        raise RuntimeError("PyMC no está instalado en el entorno.")
-
-    filt = _filter_responses_with_mask(responses, mask)
-    Y = _responses_matrix(filt)  # persons x items
-    n_persons, n_items = int(Y.shape[0]), int(Y.shape[1])
-
-    pred = prior_pred.sort_values("item_id").reset_index(drop=True)
-    mu_b = pred["predicted_difficulty"].to_numpy(dtype=float)
-    if mu_b.shape[0] != n_items:
-        # alinear si hay discrepancia
-        item_cols = [c for c in filt.columns if c != "person_id"]
-        item_ids = np.arange(1, len(item_cols) + 1, dtype=int)
-        pred2 = pd.DataFrame({"item_id": item_ids}).merge(pred, on="item_id", how="left")
-        mu_b = pred2["predicted_difficulty"].to_numpy(dtype=float)
+    if not reuse_tuning:
+        tuning = None
+    if tuning is not None and warm_tune is not None:
+        tune = int(warm_tune)
+    frame, persons, _ = _estimate_cell(
+        responses, mask, prior_pred, sigma_prior_override, base_stat_variance,
+        draws, tune, chains, target_accept, seed, precision, percent, r_level, replication,
+        ppc_draws, ppc_max_cells, mmle_estimates, init_from_mmle, tuning, person_fit,
+    )
+    return frame, persons
 
-    sigma_prior_b = float(sigma_prior_override) if sigma_prior_override is not None else float(np.sqrt(max(base_stat_variance, 0.0)))
 
-    coords = {"person": np.arange(n_persons), "item": np.arange(n_items)}
-
-    with pm.Model(coords=coords) as model:
-        theta = pm.Normal("theta", mu=0.0, sigma=1.0, dims="person")
-        b = pm.Normal("b", mu=mu_b, sigma=sigma_prior_b, dims="item")
-        lin = theta[:, None] - b[None, :]
-        p = pm.Deterministic("p", pm.math.sigmoid(lin))
-        pm.Bernoulli("responses", p=p, observed=Y)
-
-        idata = pm.sample(
-            draws=draws,
-            tune=tune,
-            chains=chains,
-            target_accept=float(target_accept),
-            random_seed=seed,
-            progressbar=False,
-            cores=min(chains, 2),
-        )
+def bayes_estimate_reference_cell(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    prior_pred: pd.DataFrame,
+    sigma_prior_override: float | None,
+    base_stat_variance: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None = None,
+    precision: str = "float64",
+    percent: float = float("nan"),
+    r_level: float = float("nan"),
+    replication: int = 0,
+    ppc_draws: int = 0,
+    ppc_max_cells: int = 2_000_000,
+    mmle_estimates: pd.DataFrame | ResultsPartition | None = None,
+    init_from_mmle: bool = False,
+    person_fit: bool = True,
+) -> tuple[pd.DataFrame, pd.DataFrame, NutsTuning]:
+    """Celda de referencia de un percent: calentamiento completo (``tune``).
 
-    b_hat = idata.posterior["b"].mean(dim=("chain", "draw")).values
-    out = pd.DataFrame({"item_id": np.arange(1, n_items + 1, dtype=int), "est_bayes_difficulty": b_hat})
-    return out
+    Devuelve ítems y personas como :func:`bayes_estimate_cell` y además la
+    adaptación NUTS (paso y varianzas posteriores), que reutilizan las demás
+    celdas del percent: misma máscara, mismas dimensiones y una geometría
+    posterior casi igual.
+    """
+    frame, persons, idata = _estimate_cell(
+        responses, mask, prior_pred, sigma_prior_override, base_stat_variance,
+        draws, tune, chains, target_accept, seed, precision, percent, r_level, replication,
+        ppc_draws, ppc_max_cells, mmle_estimates, init_from_mmle, None, person_fit,
+    )
+    return frame, persons, NutsTuning.from_trace(idata)
 
 
 def summarize_bayes_estimation(
-    difficulties: pd.DataFrame,
-    **estimates: pd.DataFrame,
+    difficulties: pd.DataFrame | Mapping[str, Any],
+    **estimates: pd.DataFrame | ResultsPartition,
 ) -> pd.DataFrame:
-    true_df = difficulties.sort_values("item_id").reset_index(drop=True)
-
-    rows: list[dict] = []
-    for key, est_df in sorted(estimates.items()):
-        # key formato: est_p_0_3_r_0_7
-        try:
-            tmp = key.split("est_p_")[-1]
-            p_str, r_str = tmp.split("_r_")
-            percent = float(p_str.replace("_", "."))
-            r_level = float(r_str.replace("_", "."))
-        except Exception:
-            percent = float("nan")
-            r_level = float("nan")
-
-        est_df = est_df.sort_values("item_id").reset_index(drop=True)
-        merged = pd.merge(true_df, est_df, on="item_id", how="inner")
-        y_true = merged["difficulty"].to_numpy(dtype=float)
-        y_hat = merged["est_bayes_difficulty"].to_numpy(dtype=float)
-
-        if y_true.size < 2 or np.all(~np.isfinite(y_hat)):
-            r = np.nan
-            r2 = np.nan
-            mse = np.nan
-            mae = np.nan
-            bias = np.nan
-        else:
-            r = float(np.corrcoef(y_true, y_hat)[0, 1])
-            r2 = r * r
-            err = y_hat - y_true
-            mse = float(np.mean(err ** 2))
-            mae = float(np.mean(np.abs(err)))
-            bias = float(np.mean(err))
-
-        rows.append({
-            "dataset_key": key,
-            "percent": percent,
-            "r_level": r_level,
-            "r": r,
-            "r2": r2,
-            "mse": mse,
-            "mae": mae,
-            "bias": bias,
-            "n_items": int(y_true.size),
-        })
-
-    return pd.DataFrame(rows).sort_values(["percent", "r_level"]).reset_index(drop=True)
+    """Compara b estimado vs verdadero para cada celda (percent, r_level).
+
+    ``difficulties``: como en :func:`summarize_mmle_estimation` (cada réplica se
+    compara con sus propias dificultades verdaderas).
+    ``estimates``: valores en formato largo del almacén (DF o handle perezoso),
+    leídos en un único escaneo; la celda sale de las columnas percent/r_level/
+    replication, no de las claves de los kwargs. ``coverage`` usa la desviación
+    posterior (intervalo normal al 95%).
+
+    Columnas PPC (NaN si la celda se estimó sin chequeos): valores p de la
+    discrepancia por ítem (``ppc_item_fit``), de la sd del puntaje bruto
+    (``ppc_score_sd``) y del log odds ratio medio entre pares (``ppc_odds_ratio``),
+    y ``ppc_item_extreme``: fracción de ítems con valor p fuera de [0.025, 0.975].
+    Columnas de ajuste infit/outfit: ver :func:`metrics.fit_summary`.
+    """
+    by = ["percent", "r_level", "replication"]
+    results = read_results(
+        estimates.values(),
+        columns=["replication", "percent", "r_level", "item_id", "estimate", "sd", *FIT_COLUMNS, *PPC_COLUMNS],
+    )
+    summary = recovery_metrics(results, replication_truth(difficulties, results), by=by, sd_col="sd")
+    summary = summary.merge(fit_summary(results, by), on=by, how="left")
+    summary = summary.merge(_ppc_summary(results, by), on=by, how="left")
+    summary.insert(0, "dataset_key", [
+        GridCell(percent=p, r_level=r).key("est") for p, r in zip(summary["percent"], summary["r_level"])
+    ])
+    return summary.astype({"percent": float, "r_level": float, "replication": int}).reset_index(drop=True)
+
+
+def _ppc_summary(results: pd.DataFrame, by: list[str], tail: float = 0.025) -> pd.DataFrame:
+    """Un renglón por celda con los valores p predictivos (escalares repetidos por ítem)."""
+    results = results.reindex(columns=[*by, *PPC_COLUMNS])
+    item_p = results["ppc_item_p"]
+    results = results.assign(ppc_item_extreme=((item_p < tail) | (item_p > 1.0 - tail)).where(item_p.notna()))
+    return (
+        results.groupby(by, dropna=False)
+        .agg(
+            ppc_item_fit=("ppc_item_fit", "first"),
+            ppc_score_sd=("ppc_score_sd", "first"),
+            ppc_odds_ratio=("ppc_odds_ratio", "first"),
+            ppc_item_extreme=("ppc_item_extreme", "mean"),
+        )
+        .reset_index()
+    )
+
+
+def concat_summaries(**summaries: pd.DataFrame) -> pd.DataFrame:
+    """Concatena resúmenes parciales (uno por percent) en el resumen global."""
+    return (
+        pd.concat(list(summaries.values()), ignore_index=True)
+        .sort_values(["percent", "r_level", "replication"])
+        .reset_index(drop=True)
+    )
+
+
+def aggregate_bayes_replications(
+    bayes_summary: pd.DataFrame,
+    state: ReplicationAggregateState,
+    replication: int,
+    metrics: Sequence[str],
+    quantiles: Sequence[float],
+) -> pd.DataFrame:
+    """Incorpora la réplica actual al agregado Monte Carlo por celda (percent, r_level).
+
+    Ver :func:`aggregate_mmle_replications`; memoria constante en el número de
+    réplicas (ver ``aggregation.ReplicationAggregator``).
+    """
+    rows = bayes_summary[bayes_summary["replication"] == int(replication)]
+    metrics = [m for m in metrics if m in rows.columns]
+    return state.update(rows, by=["percent", "r_level"], metrics=metrics, quantiles=quantiles)
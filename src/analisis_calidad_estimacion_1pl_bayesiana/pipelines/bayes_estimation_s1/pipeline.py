@@ -1,63 +1,140 @@
+from functools import partial, update_wrapper
+
 from kedro.pipeline import Pipeline, node
 
-from .nodes import bayes_estimate_for_mask_and_prior, summarize_bayes_estimation
+from analisis_calidad_estimacion_1pl_bayesiana.grid import DEFAULT_LEVELS, grid_key
+
+from .nodes import (
+    aggregate_bayes_replications,
+    bayes_estimate_cell,
+    bayes_estimate_reference_cell,
+    concat_summaries,
+    summarize_bayes_estimation,
+)
 
 
 def create_pipeline(**kwargs) -> Pipeline:
     """Pipeline Bayes estimation sobre grid (masks x predicciones) en S1.
 
-    - Inputs: responses, difficultés, 10 máscaras y 10 predicciones
-    - Output: 100 CSVs de dificultades estimadas + 1 resumen global
+    - Inputs: responses, difficultés, una máscara por percent y una predicción por r
+    - Output: una partición (estimator=bayes, percent, r_level) del almacén de
+      resultados por celda (y otra de la tabla de ajuste por persona) + 1
+      resumen global + agregado Monte Carlo entre réplicas
+
+    Arranque en caliente: la primera celda de cada percent (celda de referencia)
+    calienta con ``tune`` pasos y publica su adaptación NUTS
+    (``bayes_tuning_p_<p>``); las demás celdas del percent (misma máscara) la
+    reutilizan con ``warm_tune`` pasos si ``reuse_tuning`` está activo. Todas
+    pueden partir de la estimación MMLE de la máscara (``init_from_mmle``).
+    Ambas opciones llegan también como kwargs al armar el pipeline: apagadas
+    (por defecto), las celdas no reciben el MMLE ni la adaptación y no esperan
+    por ellos.
+
+    El resumen se arma en dos niveles (un resumen parcial por percent y luego su
+    concatenación) para que ningún nodo tenga percents × r_levels inputs: con
+    grillas grandes ese fan-in domina el tiempo de construcción del pipeline.
     """
-    percents = kwargs.get("percents", [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
-    r_levels = kwargs.get("r_levels", [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    percents = kwargs.get("percents", DEFAULT_LEVELS)
+    r_levels = kwargs.get("r_levels", DEFAULT_LEVELS)
+    init_from_mmle = kwargs.get("init_from_mmle", False)
+    reuse_tuning = kwargs.get("reuse_tuning", False)
 
     nodes = []
-    est_output_names: list[tuple[str, str]] = []
+    partial_summaries: dict[str, str] = {}
 
     for p in percents:
-        p_key = str(p).replace('.', '_')
+        p_key = grid_key(p)
         mask_ds = f"subsample__s1.subsample_mask_p_{p_key}"
-        for r in r_levels:
-            r_key = str(r).replace('.', '_')
+        tuning_ds = f"bayes_tuning_p_{p_key}"
+        summary_inputs = {"difficulties": "sample__s1.difficulties_by_replication"}
+        for k, r in enumerate(r_levels):
+            r_key = grid_key(r)
             pred_ds = f"auto_pred__s1.pred_difficulty_r_{r_key}"
             out_name = f"bayes_estimation_difficulty_p_{p_key}_r_{r_key}"
-            est_output_names.append((f"est_p_{p_key}_r_{r_key}", out_name))
+            person_ds = f"bayes_person_fit_p_{p_key}_r_{r_key}"
+            summary_inputs[f"est_p_{p_key}_r_{r_key}"] = out_name
+
+            reference = k == 0
+            base = bayes_estimate_reference_cell if reference else bayes_estimate_cell
+            func = partial(base, percent=float(p), r_level=float(r))
+            update_wrapper(func, base)
+
+            inputs = dict(
+                responses="sample__s1.responses",
+                mask=mask_ds,
+                prior_pred=pred_ds,
+                sigma_prior_override="params:sigma_prior_override",
+                base_stat_variance="params:base_stat_variance",
+                draws="params:draws",
+                tune="params:tune",
+                chains="params:chains",
+                target_accept="params:target_accept",
+                seed="params:seed",
+                precision="params:precision",
+                replication="params:replication",
+                ppc_draws="params:ppc_draws",
+                ppc_max_cells="params:ppc_max_cells",
+                person_fit="params:person_fit",
+            )
+            if init_from_mmle:
+                inputs.update(
+                    mmle_estimates=f"mmle_estimation__s1.mmle_estimation_difficulty_p_{p_key}",
+                    init_from_mmle="params:init_from_mmle",
+                )
+            if reuse_tuning and not reference:
+                inputs.update(tuning=tuning_ds, reuse_tuning="params:reuse_tuning", warm_tune="params:warm_tune")
 
             nodes.append(
                 node(
-                    func=bayes_estimate_for_mask_and_prior,
-                    inputs=dict(
-                        responses="sample__s1.responses",
-                        mask=mask_ds,
-                        prior_pred=pred_ds,
-                        sigma_prior_override="params:sigma_prior_override",
-                        base_stat_variance="params:base_stat_variance",
-                        draws="params:draws",
-                        tune="params:tune",
-                        chains="params:chains",
-                        target_accept="params:target_accept",
-                        seed="params:seed",
-                    ),
-                    outputs=out_name,
+                    func=func,
+                    inputs=inputs,
+                    outputs=[out_name, person_ds, tuning_ds] if reference else [out_name, person_ds],
                     name=f"s1_bayes_estimate_p_{p_key}_r_{r_key}",
-                    tags={"sample_1", "bayes", "estimation"},
+                    # memory_heavy: la traza NUTS guarda draws × chains × (personas + ítems)
+                    # grid_cell: ejecutable por workers remotos (work_queue)
+                    tags={"sample_1", "bayes", "estimation", "memory_heavy", "grid_cell"},
                 )
             )
 
-    # Summary node
-    summary_inputs = {"difficulties": "sample__s1.difficulties"}
-    for key, out_name in est_output_names:
-        summary_inputs[key] = out_name
+        # Resumen parcial de las celdas de este percent (en memoria)
+        partial_name = f"bayes_estimation_summary_p_{p_key}"
+        partial_summaries[f"summary_p_{p_key}"] = partial_name
+        nodes.append(
+            node(
+                func=summarize_bayes_estimation,
+                inputs=summary_inputs,
+                outputs=partial_name,
+                name=f"s1_bayes_estimation_summary_p_{p_key}",
+                tags={"sample_1", "bayes", "estimation"},
+            )
+        )
 
+    # Summary node
     nodes.append(
         node(
-            func=summarize_bayes_estimation,
-            inputs=summary_inputs,
+            func=concat_summaries,
+            inputs=partial_summaries,
             outputs="bayes_estimation_summary",
             name="s1_bayes_estimation_summary",
             tags={"sample_1", "bayes", "estimation"},
         )
     )
 
+    # Agregado en streaming entre corridas (una réplica por corrida)
+    nodes.append(
+        node(
+            func=aggregate_bayes_replications,
+            inputs=dict(
+                bayes_summary="bayes_estimation_summary",
+                state="bayes_estimation_mc_state",
+                replication="params:replication",
+                metrics="params:mc_metrics",
+                quantiles="params:mc_quantiles",
+            ),
+            outputs="bayes_estimation_mc_summary",
+            name="s1_bayes_estimation_mc_aggregate",
+            tags={"sample_1", "bayes", "estimation"},
+        )
+    )
+
     return Pipeline(nodes)
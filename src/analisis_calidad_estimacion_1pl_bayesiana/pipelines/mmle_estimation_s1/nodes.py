@@ -1,124 +1,194 @@
 import logging
-from typing import Dict
+from typing import Any, Dict, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
-from girth import rasch_mml
 
-logger = logging.getLogger(__name__)
-
-
-def _filter_responses_with_mask(responses: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
-    """Filtra filas de ``responses`` usando una máscara 0/1.
-
-    Asume que ``responses`` tiene columna ``person_id`` y columnas ``item_1..item_N``.
-    Asume que la máscara tiene columna ``mask`` con largo igual al número total de personas.
-    Se alinea por orden: ``person_id`` ascendente ↔ índice 0..N-1 de la máscara.
-    """
-    if "mask" not in mask.columns:
-        raise ValueError("La máscara debe tener una columna 'mask'.")
-
-    resp = responses.sort_values("person_id").reset_index(drop=True)
-    m = mask["mask"].to_numpy().astype(int)
-    if m.size != resp.shape[0]:
-        raise ValueError(f"Tamaño de máscara {m.size} no coincide con n_responses={resp.shape[0]}")
+from analisis_calidad_estimacion_1pl_bayesiana.data_access import filter_responses_with_mask, masked_sparse_responses
+from analisis_calidad_estimacion_1pl_bayesiana.datasets import (
+    ReplicationAggregateState,
+    ResultsPartition,
+    make_person_frame,
+    make_results_frame,
+    read_results,
+)
+from analisis_calidad_estimacion_1pl_bayesiana.grid import GridCell
+from analisis_calidad_estimacion_1pl_bayesiana.irt import SparseResponses, rasch_mml_em
+from analisis_calidad_estimacion_1pl_bayesiana.irt.fit import FIT_COLUMNS, rasch_fit_statistics
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import score_persons
+from analisis_calidad_estimacion_1pl_bayesiana.metrics import fit_summary, recovery_metrics
+from analisis_calidad_estimacion_1pl_bayesiana.precision import RESPONSE_DTYPE, resolve_float_dtype
+
+from ..sample_s1.nodes import replication_truth
 
-    selected = resp[m == 1]
-    selected = selected.reset_index(drop=True)
-    return selected
+logger = logging.getLogger(__name__)
 
 
 def _responses_to_items_x_persons_matrix(filtered_responses: pd.DataFrame) -> np.ndarray:
-    """Convierte el DF de respuestas filtradas a matriz [items x participantes] de 0/1."""
+    """Convierte el DF de respuestas filtradas a matriz [items x participantes] de 0/1 (``int8``)."""
     if "person_id" not in filtered_responses.columns:
         raise ValueError("Se espera columna 'person_id' en responses.")
-    X = filtered_responses.drop(columns=["person_id"]).to_numpy(dtype=int)
+    X = filtered_responses.drop(columns=["person_id"]).to_numpy(dtype=RESPONSE_DTYPE)
     # Rasch MML espera [items x participants]
     return X.T
 
 
-def mmle_estimate_for_mask(responses: pd.DataFrame, mask: pd.DataFrame) -> pd.DataFrame:
-    """Aplica filtro por ``mask`` y estima dificultades con ``girth.rasch_mml``.
+MMLE_ENGINES = ("girth", "sparse")
+
+
+def _cell_fit(
+    data: SparseResponses, difficulty: np.ndarray, percent: float, replication: int, person_fit: bool = True
+) -> tuple[dict[str, np.ndarray | float], pd.DataFrame]:
+    """Ajuste infit/outfit (:mod:`irt.fit`) con las b estimadas y thetas EAP dadas esas b.
 
-    Devuelve DF con columnas: [item_id, est_difficulty].
+    Devuelve las columnas por ítem del almacén y la tabla por persona; con
+    ``person_fit=False`` no se calcula nada (sin columnas de ajuste, tabla vacía).
+    """
+    if not person_fit:
+        return {}, make_person_frame("mmle", np.empty(0, dtype=int), {}, percent=percent, replication=replication)
+    b = np.asarray(difficulty, dtype=float)
+    theta = score_persons(data, b, method="eap")["theta"].to_numpy()
+    fit = rasch_fit_statistics(data, b, theta)
+    persons = make_person_frame(
+        "mmle", data.person_ids, {"theta": theta, **fit.person_columns()}, percent=percent, replication=replication
+    )
+    return fit.columns(), persons
+
+
+def mmle_estimate_for_mask(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    precision: str = "float64",
+    percent: float = float("nan"),
+    replication: int = 0,
+    engine: str = "girth",
+    n_workers: int = 1,
+    chunk_size: int = 8192,
+    person_fit: bool = True,
+) -> pd.DataFrame:
+    """Estimaciones por ítem de :func:`mmle_estimate_cell` (sin la tabla por persona)."""
+    return mmle_estimate_cell(
+        responses, mask, precision, percent, replication, engine, n_workers, chunk_size, person_fit
+    )[0]
+
+
+def mmle_estimate_cell(
+    responses: pd.DataFrame,
+    mask: pd.DataFrame,
+    precision: str = "float64",
+    percent: float = float("nan"),
+    replication: int = 0,
+    engine: str = "girth",
+    n_workers: int = 1,
+    chunk_size: int = 8192,
+    person_fit: bool = True,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Aplica filtro por ``mask`` y estima dificultades por MML (Rasch).
+
+    ``engine``:
+    - ``girth`` (por defecto): ``girth.rasch_mml`` sobre la matriz densa ``int8``;
+      girth no entrega errores estándar, por lo que ``sd`` queda en NaN.
+    - ``sparse``: EM propio (:func:`irt.rasch_mml_em`) sólo sobre celdas
+      observadas (admite NaN en ``responses``); ``sd`` es el error estándar.
+      ``n_workers > 1`` reparte los bloques de ``chunk_size`` personas del paso E
+      en procesos (mismo resultado que con un proceso). girth ignora ambos.
+
+    Ambos trabajan internamente en float64; ``precision`` fija el dtype de las
+    estimaciones devueltas.
+
+    Devuelve dos DF largos del almacén de resultados:
+
+    - ítems: [estimator="mmle", replication, percent, r_level=NaN, item_id,
+      estimate, sd, item_*fit*, person_*_misfit];
+    - personas (tabla ``persons``): [..., person_id, theta, n_obs, infit,
+      outfit, infit_z, outfit_z];
+
+    con el ajuste infit/outfit (:mod:`irt.fit`) de las dificultades estimadas y
+    las thetas EAP que implican. ``person_fit=False`` omite el puntaje EAP y el
+    ajuste: los ítems quedan sin columnas de ajuste (NaN en el almacén) y la
+    tabla por persona vacía (no se escribe ninguna partición).
     """
-    filtered = _filter_responses_with_mask(responses, mask)
+    if engine not in MMLE_ENGINES:
+        raise ValueError(f"Motor MMLE no soportado: {engine!r}. Opciones: {list(MMLE_ENGINES)}")
+    dtype = resolve_float_dtype(precision)
+    filtered = filter_responses_with_mask(responses, mask)
     n_selected = int(filtered.shape[0])
-    X_items_by_persons = _responses_to_items_x_persons_matrix(filtered)
 
     if n_selected < 2:
         logger.warning("[mmle_s1] Muy pocos participantes seleccionados: %d", n_selected)
 
+    data = masked_sparse_responses(responses, mask)
+    if engine == "sparse":
+        result = rasch_mml_em(data, chunk_size=chunk_size, n_workers=n_workers)
+        logger.info("[mmle_s1] Estimación OK (sparse): persons=%d, items=%d, iter=%d",
+                    n_selected, data.n_items, result.n_iter)
+        fit, persons = _cell_fit(data, result.difficulty, percent, replication, person_fit)
+        items = make_results_frame(
+            "mmle", result.difficulty.astype(dtype), sd=result.se.astype(dtype),
+            percent=percent, replication=replication, item_id=data.item_ids, extra=fit,
+        )
+        return items, persons
+
+    X_items_by_persons = _responses_to_items_x_persons_matrix(filtered)
+
+    # girth (y scipy) se importan sólo cuando corre un nodo de estimación
+    from girth import rasch_mml
+
     try:
         result: Dict[str, np.ndarray | float] = rasch_mml(X_items_by_persons, discrimination=1)
-        diffs = np.asarray(result["Difficulty"], dtype=float)
-        # Alineamos con item_id = 1..N (como en sample__s1)
-        out = pd.DataFrame({
-            "item_id": np.arange(1, diffs.size + 1, dtype=int),
-            "est_difficulty": diffs,
-        })
+        diffs = np.asarray(result["Difficulty"], dtype=dtype)
         logger.info("[mmle_s1] Estimación OK: persons=%d, items=%d", n_selected, diffs.size)
-        return out
     except Exception as ex:  # pragma: no cover
         logger.exception("[mmle_s1] Error en rasch_mml con persons=%d: %s", n_selected, ex)
         # Devuelve NaNs para mantener el flujo
         n_items = filtered.shape[1] - 1
-        return pd.DataFrame({
-            "item_id": np.arange(1, n_items + 1, dtype=int),
-            "est_difficulty": np.full((n_items,), np.nan, dtype=float),
-        })
+        diffs = np.full((n_items,), np.nan, dtype=dtype)
+
+    # item_id = 1..N (como en sample__s1)
+    fit, persons = _cell_fit(data, diffs, percent, replication, person_fit)
+    return make_results_frame("mmle", diffs, percent=percent, replication=replication, extra=fit), persons
 
 
 def summarize_mmle_estimation(
-    difficulties: pd.DataFrame,
-    **estimates: pd.DataFrame,
+    difficulties: pd.DataFrame | Mapping[str, Any],
+    **estimates: pd.DataFrame | ResultsPartition,
 ) -> pd.DataFrame:
     """Compara dificultades estimadas vs verdaderas para cada máscara.
 
-    ``difficulties``: columnas [item_id, difficulty]
-    ``estimates``: kwargs con claves como 'est_p_0_1', valores DF [item_id, est_difficulty]
+    ``difficulties``: columnas [item_id, difficulty] (estimaciones de la réplica en
+    curso, p. ej. en memoria) o las particiones de ``difficulties_by_replication``:
+    cada réplica del almacén se compara con sus propias dificultades verdaderas y
+    las réplicas sin partición se omiten.
+    ``estimates``: valores en formato largo del almacén (DF o handle perezoso); las
+    claves de los kwargs no se interpretan: la celda sale de las columnas
+    percent/replication. Los handles se leen en un único escaneo y las métricas se
+    calculan para todas las celdas a la vez (:func:`recovery_metrics`), junto con
+    el resumen del ajuste infit/outfit (:func:`fit_summary`).
     """
-    true_df = difficulties.sort_values("item_id").reset_index(drop=True)
-
-    rows: list[dict] = []
-    for key, est_df in sorted(estimates.items()):
-        # extrae el percent de la clave 'est_p_0_1' -> 0.1
-        try:
-            p_str = key.split("est_p_")[-1]
-            percent = float(p_str.replace("_", "."))
-        except Exception:
-            percent = float("nan")
-
-        est_df = est_df.sort_values("item_id").reset_index(drop=True)
-        merged = pd.merge(true_df, est_df, on="item_id", how="inner")
-        y_true = merged["difficulty"].to_numpy(dtype=float)
-        y_hat = merged["est_difficulty"].to_numpy(dtype=float)
-
-        if y_true.size < 2 or np.all(~np.isfinite(y_hat)):
-            r = np.nan
-            r2 = np.nan
-            mse = np.nan
-            mae = np.nan
-            bias = np.nan
-        else:
-            r = float(np.corrcoef(y_true, y_hat)[0, 1])
-            r2 = r * r
-            err = y_hat - y_true
-            mse = float(np.mean(err ** 2))
-            mae = float(np.mean(np.abs(err)))
-            bias = float(np.mean(err))
-
-        rows.append({
-            "dataset_key": key,
-            "percent": percent,
-            "r": r,
-            "r2": r2,
-            "mse": mse,
-            "mae": mae,
-            "bias": bias,
-            "n_items": int(y_true.size),
-        })
-
-    summary = pd.DataFrame(rows).sort_values("percent").reset_index(drop=True)
+    by = ["percent", "replication"]
+    results = read_results(estimates.values(), columns=["replication", "percent", "item_id", "estimate", *FIT_COLUMNS])
+    summary = recovery_metrics(results, replication_truth(difficulties, results), by=by)
+    summary = summary.merge(fit_summary(results, by), on=by, how="left")
+    summary.insert(0, "dataset_key", [GridCell(percent=p).key("est") for p in summary["percent"]])
+    summary = summary.astype({"percent": float, "replication": int}).reset_index(drop=True)
     logger.info("[mmle_s1] resumen estimación: %s", summary.to_dict(orient="list"))
     return summary
+
+
+def aggregate_mmle_replications(
+    mmle_summary: pd.DataFrame,
+    state: ReplicationAggregateState,
+    replication: int,
+    metrics: Sequence[str],
+    quantiles: Sequence[float],
+) -> pd.DataFrame:
+    """Incorpora la réplica actual al agregado Monte Carlo por percent.
+
+    Sólo se pliegan las filas de ``replication`` (el resumen puede traer réplicas
+    anteriores del almacén); métricas ausentes en el resumen (p. ej. ``coverage``,
+    MMLE no tiene errores estándar) se omiten. Devuelve media, sd, MCSE y
+    cuantiles por percent sobre todas las réplicas acumuladas.
+    """
+    rows = mmle_summary[mmle_summary["replication"] == int(replication)]
+    metrics = [m for m in metrics if m in rows.columns]
+    return state.update(rows, by=["percent"], metrics=metrics, quantiles=quantiles)
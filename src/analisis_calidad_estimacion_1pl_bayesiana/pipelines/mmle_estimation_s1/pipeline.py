@@ -1,42 +1,59 @@
+from functools import partial, update_wrapper
+
 from kedro.pipeline import Pipeline, node
 
-from .nodes import mmle_estimate_for_mask, summarize_mmle_estimation
+from analisis_calidad_estimacion_1pl_bayesiana.grid import DEFAULT_LEVELS, grid_key
+
+from .nodes import aggregate_mmle_replications, mmle_estimate_cell, summarize_mmle_estimation
 
 
 def create_pipeline(**kwargs) -> Pipeline:
     """Pipeline MMLE estimation sobre subsamples (S1).
 
-    - Inputs: responses (completo) y 10 máscaras persistidas
-    - Output: 10 CSVs de dificultades estimadas por máscara + 1 resumen global
+    - Inputs: responses (completo) y una máscara persistida por percent
+    - Output: una partición (estimator=mmle, percent) del almacén de resultados
+      por máscara (y otra de la tabla de ajuste por persona) + 1 resumen global
+      + agregado Monte Carlo entre réplicas
     """
-    percents = kwargs.get("percents", [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    percents = kwargs.get("percents", DEFAULT_LEVELS)
 
     nodes = []
     est_output_names = []
 
     for p in percents:
-        key = str(p).replace('.', '_')
+        key = grid_key(p)
         mask_name = f"subsample_mask_p_{key}"
         out_name = f"mmle_estimation_difficulty_p_{key}"
         est_output_names.append((p, out_name))
 
+        # percent queda fijado en el nodo: se escribe como columna/partición del almacén
+        func = partial(mmle_estimate_cell, percent=float(p))
+        update_wrapper(func, mmle_estimate_cell)
+
         nodes.append(
             node(
-                func=mmle_estimate_for_mask,
+                func=func,
                 inputs=dict(
                     responses="sample__s1.responses",
                     mask=f"subsample__s1.{mask_name}",
+                    precision="params:precision",
+                    replication="params:replication",
+                    engine="params:engine",
+                    n_workers="params:n_workers",
+                    chunk_size="params:chunk_size",
+                    person_fit="params:person_fit",
                 ),
-                outputs=out_name,
+                outputs=[out_name, f"mmle_person_fit_p_{key}"],
                 name=f"s1_mmle_estimate_for_{mask_name}",
-                tags={"sample_1", "mmle", "estimation"},
+                # grid_cell: ejecutable por workers remotos (work_queue)
+                tags={"sample_1", "mmle", "estimation", "grid_cell"},
             )
         )
 
     # Summary node
-    summary_inputs = {"difficulties": "sample__s1.difficulties"}
+    summary_inputs = {"difficulties": "sample__s1.difficulties_by_replication"}
     for p, out_name in est_output_names:
-        summary_inputs[f"est_p_{str(p).replace('.', '_')}"] = out_name
+        summary_inputs[f"est_p_{grid_key(p)}"] = out_name
 
     nodes.append(
         node(
@@ -48,4 +65,21 @@ def create_pipeline(**kwargs) -> Pipeline:
         )
     )
 
+    # Agregado en streaming entre corridas (una réplica por corrida)
+    nodes.append(
+        node(
+            func=aggregate_mmle_replications,
+            inputs=dict(
+                mmle_summary="mmle_estimation_summary",
+                state="mmle_estimation_mc_state",
+                replication="params:replication",
+                metrics="params:mc_metrics",
+                quantiles="params:mc_quantiles",
+            ),
+            outputs="mmle_estimation_mc_summary",
+            name="s1_mmle_estimation_mc_aggregate",
+            tags={"sample_1", "mmle", "estimation"},
+        )
+    )
+
     return Pipeline(nodes)
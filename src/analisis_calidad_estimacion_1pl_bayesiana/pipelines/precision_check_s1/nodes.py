@@ -0,0 +1,46 @@
+import logging
+
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.precision import compare_summary_metrics
+
+logger = logging.getLogger(__name__)
+
+# Dónde actúa la precisión candidata: MMLE (girth / EM propio) calcula siempre en
+# float64 y sólo convierte las estimaciones; Bayes corre el modelo en esa precisión
+CANDIDATE_SCOPE = {"mmle": "output_cast", "bayes": "model"}
+
+
+def check_precision_accuracy(
+    tolerance: float,
+    mmle_reference: pd.DataFrame,
+    mmle_candidate: pd.DataFrame,
+    bayes_reference: pd.DataFrame | None = None,
+    bayes_candidate: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Compara métricas resumen float64 (referencia) vs precisión candidata.
+
+    Devuelve DF largo [estimator, candidate_scope, percent, r_level, metric,
+    reference, candidate, abs_diff, within_tolerance]. ``candidate_scope``
+    (:data:`CANDIDATE_SCOPE`) aclara qué mide cada fila: en MMLE
+    (``output_cast``) la estimación corre en float64 y sólo se convierte el
+    resultado, así que la diferencia es la de redondear a la precisión
+    candidata; en Bayes (``model``) el muestreo corre en esa precisión.
+    """
+    parts = [compare_summary_metrics(mmle_reference, mmle_candidate, tolerance).assign(estimator="mmle")]
+    if bayes_reference is not None and bayes_candidate is not None:
+        parts.append(compare_summary_metrics(bayes_reference, bayes_candidate, tolerance).assign(estimator="bayes"))
+
+    out = pd.concat(parts, ignore_index=True)
+    out["candidate_scope"] = out["estimator"].map(CANDIDATE_SCOPE)
+    if "r_level" not in out.columns:
+        out["r_level"] = float("nan")
+    cols = ["estimator", "candidate_scope", "percent", "r_level", "metric", "reference", "candidate", "abs_diff",
+            "within_tolerance"]
+    out = out[cols].sort_values(["estimator", "percent", "r_level", "metric"]).reset_index(drop=True)
+
+    logger.info(
+        "[precision_check_s1] %d/%d métricas dentro de tolerancia=%.2e (max abs_diff=%.3e)",
+        int(out["within_tolerance"].sum()), len(out), float(tolerance), float(out["abs_diff"].max()),
+    )
+    return out
@@ -0,0 +1,123 @@
+"""Chequeo de exactitud del modo de precisión reducida (S1).
+
+Re-estima con ``float64`` (ruta de referencia) y con la precisión candidata
+(por defecto ``float32``) y compara las métricas resumen (r, r2, mse, mae, bias):
+- MMLE: todas las máscaras (barato). girth y el EM propio calculan en float64:
+  la fila mide sólo la conversión de las estimaciones (``candidate_scope =
+  output_cast`` en el resumen).
+- Bayes: sólo las celdas (percent, r) de ``bayes_cells`` (MCMC es caro); el
+  modelo corre en la precisión candidata (``candidate_scope = model``).
+
+Las estimaciones intermedias quedan en memoria; sólo se persiste
+``precision_check_summary``.
+"""
+
+from functools import partial, update_wrapper
+
+from kedro.pipeline import Pipeline, node
+
+from analisis_calidad_estimacion_1pl_bayesiana.grid import DEFAULT_LEVELS, grid_key
+
+from ..bayes_estimation_s1.nodes import bayes_estimate_for_mask_and_prior, summarize_bayes_estimation
+from ..mmle_estimation_s1.nodes import mmle_estimate_for_mask, summarize_mmle_estimation
+from .nodes import check_precision_accuracy
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    percents = kwargs.get("percents", DEFAULT_LEVELS)
+    bayes_cells = kwargs.get("bayes_cells", [(1.0, 1.0)])
+
+    nodes = []
+    summary_inputs: dict[str, dict[str, str]] = {"reference": {}, "candidate": {}}
+    bayes_summary_inputs: dict[str, dict[str, str]] = {"reference": {}, "candidate": {}}
+
+    for role, precision in (("reference", "params:reference_precision"), ("candidate", "params:candidate_precision")):
+        for p in percents:
+            p_key = grid_key(p)
+            out_name = f"mmle_difficulty_p_{p_key}_{role}"
+            summary_inputs[role][f"est_p_{p_key}"] = out_name
+            func = partial(mmle_estimate_for_mask, percent=float(p))
+            update_wrapper(func, mmle_estimate_for_mask)
+            nodes.append(
+                node(
+                    func=func,
+                    inputs=dict(
+                        responses="sample__s1.responses",
+                        mask=f"subsample__s1.subsample_mask_p_{p_key}",
+                        precision=precision,
+                    ),
+                    outputs=out_name,
+                    name=f"s1_precision_check_mmle_p_{p_key}_{role}",
+                    tags={"sample_1", "precision_check", "mmle"},
+                )
+            )
+
+        for p, r in bayes_cells:
+            p_key = grid_key(p)
+            r_key = grid_key(r)
+            out_name = f"bayes_difficulty_p_{p_key}_r_{r_key}_{role}"
+            bayes_summary_inputs[role][f"est_p_{p_key}_r_{r_key}"] = out_name
+            func = partial(bayes_estimate_for_mask_and_prior, percent=float(p), r_level=float(r))
+            update_wrapper(func, bayes_estimate_for_mask_and_prior)
+            nodes.append(
+                node(
+                    func=func,
+                    inputs=dict(
+                        responses="sample__s1.responses",
+                        mask=f"subsample__s1.subsample_mask_p_{p_key}",
+                        prior_pred=f"auto_pred__s1.pred_difficulty_r_{r_key}",
+                        sigma_prior_override="params:sigma_prior_override",
+                        base_stat_variance="params:base_stat_variance",
+                        draws="params:draws",
+                        tune="params:tune",
+                        chains="params:chains",
+                        target_accept="params:target_accept",
+                        seed="params:seed",
+                        precision=precision,
+                    ),
+                    outputs=out_name,
+                    name=f"s1_precision_check_bayes_p_{p_key}_r_{r_key}_{role}",
+                    tags={"sample_1", "precision_check", "bayes", "memory_heavy"},
+                )
+            )
+
+        nodes.append(
+            node(
+                func=summarize_mmle_estimation,
+                inputs={"difficulties": "sample__s1.difficulties", **summary_inputs[role]},
+                outputs=f"mmle_summary_{role}",
+                name=f"s1_precision_check_mmle_summary_{role}",
+                tags={"sample_1", "precision_check", "mmle"},
+            )
+        )
+        if bayes_cells:
+            nodes.append(
+                node(
+                    func=summarize_bayes_estimation,
+                    inputs={"difficulties": "sample__s1.difficulties", **bayes_summary_inputs[role]},
+                    outputs=f"bayes_summary_{role}",
+                    name=f"s1_precision_check_bayes_summary_{role}",
+                    tags={"sample_1", "precision_check", "bayes"},
+                )
+            )
+
+    check_inputs = {
+        "tolerance": "params:tolerance",
+        "mmle_reference": "mmle_summary_reference",
+        "mmle_candidate": "mmle_summary_candidate",
+    }
+    if bayes_cells:
+        check_inputs["bayes_reference"] = "bayes_summary_reference"
+        check_inputs["bayes_candidate"] = "bayes_summary_candidate"
+
+    nodes.append(
+        node(
+            func=check_precision_accuracy,
+            inputs=check_inputs,
+            outputs="precision_check_summary",
+            name="s1_precision_check_summary",
+            tags={"sample_1", "precision_check"},
+        )
+    )
+
+    return Pipeline(nodes)
@@ -0,0 +1 @@
+from .pipeline import create_online_pipeline, create_out_of_core_pipeline, create_pipeline  # noqa: F401
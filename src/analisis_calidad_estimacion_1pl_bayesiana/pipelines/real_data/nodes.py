@@ -0,0 +1,163 @@
+import logging
+from dataclasses import replace
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.datasets import OnlineCalibrationState
+from analisis_calidad_estimacion_1pl_bayesiana.irt import ResponseChunks, SparseResponses, rasch_mml_em, rasch_mml_em_chunked
+from analisis_calidad_estimacion_1pl_bayesiana.irt.bayes import sample_rasch_posterior
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import score_persons
+
+logger = logging.getLogger(__name__)
+
+
+def build_sparse_responses(
+    raw: pd.DataFrame,
+    person_col: str,
+    item_col: str,
+    response_col: str,
+    positive_values: Sequence[Any] | None = None,
+) -> SparseResponses:
+    """Convierte datos reales en formato largo a celdas observadas dispersas.
+
+    ``raw``: una fila por observación (persona, ítem, respuesta); filas con
+    respuesta nula son celdas no observadas. Si ``positive_values`` está
+    definido, la respuesta es 1 cuando el valor está en esa lista (p. ej.
+    ``decision in ["CC", "IC"]`` en los datos de faltas NBA); si no, la columna ya
+    debe ser 0/1. Observaciones repetidas del mismo par se suman como ensayos.
+    """
+    frame = raw[[person_col, item_col, response_col]].dropna()
+    if positive_values is not None:
+        frame = frame.assign(**{response_col: frame[response_col].isin(list(positive_values)).astype(np.int8)})
+    data = SparseResponses.from_long(frame, person_col, item_col, response_col)
+    logger.info(
+        "[real_data] %d observaciones -> persons=%d, items=%d, celdas=%d (densidad %.4f, %.1f MB)",
+        len(frame), data.n_persons, data.n_items, data.nnz, data.density, data.nbytes / 2**20,
+    )
+    return data
+
+
+def estimate_mmle_sparse(
+    responses: SparseResponses,
+    n_quadrature: int = 41,
+    max_iter: int = 500,
+    tol: float = 1e-5,
+    n_workers: int = 1,
+    chunk_size: int = 8192,
+) -> pd.DataFrame:
+    """MML-EM de Rasch sólo sobre celdas observadas.
+
+    ``n_workers > 1`` reparte los bloques de ``chunk_size`` personas del paso E
+    en procesos con memoria compartida (resultado idéntico al de un proceso).
+    Devuelve [item_id, n_obs, p_value, estimate, sd].
+    """
+    result = rasch_mml_em(
+        responses, n_quadrature=n_quadrature, max_iter=max_iter, tol=tol, chunk_size=chunk_size, n_workers=n_workers
+    )
+    table = responses.item_table()
+    table["estimate"] = result.difficulty
+    table["sd"] = result.se
+    return table
+
+
+def export_response_chunks(responses: SparseResponses) -> SparseResponses:
+    """Identidad: el dataset de salida escribe el Parquet ordenado por persona."""
+    return responses
+
+
+def estimate_mmle_out_of_core(
+    chunks: ResponseChunks,
+    chunk_rows: int = 1_000_000,
+    n_quadrature: int = 41,
+    max_iter: int = 500,
+    tol: float = 1e-5,
+) -> pd.DataFrame:
+    """MML-EM de Rasch leyendo ``chunks`` por lotes de ``chunk_rows`` filas en cada iteración.
+
+    Mismo resultado que :func:`estimate_mmle_sparse` sin cargar el archivo en
+    memoria. Devuelve [item_id, n_obs, p_value, estimate, sd].
+    """
+    chunks = replace(chunks, chunk_rows=int(chunk_rows))
+    result, index = rasch_mml_em_chunked(chunks, n_quadrature=n_quadrature, max_iter=max_iter, tol=tol)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_value = index.successes / index.n_obs
+    table = pd.DataFrame({"item_id": index.item_ids, "n_obs": index.n_obs.astype(int), "p_value": p_value})
+    table["estimate"] = result.difficulty
+    table["sd"] = result.se
+    return table
+
+
+def update_online_calibration(
+    responses: SparseResponses,
+    state: OnlineCalibrationState,
+    batch_id: str | None = None,
+    prior_sd: float = 1.0,
+    n_quadrature: int = 41,
+    n_iter: int = 10,
+) -> pd.DataFrame:
+    """Incorpora ``responses`` como un lote nuevo a la calibración persistida.
+
+    Bayes secuencial (:class:`irt.OnlineCalibration`): arranca en el prior
+    ``b ~ N(0, prior_sd)`` y cada lote actualiza la posterior normal de sus
+    ítems con un costo que depende sólo del lote. ``batch_id=None`` usa un hash
+    del contenido; un lote ya incorporado no se vuelve a sumar.
+    Devuelve [item_id, n_obs, estimate, sd] con la posterior acumulada.
+    """
+    return state.update(
+        responses, batch_id=batch_id, prior_sd=prior_sd, n_quadrature=n_quadrature, n_iter=n_iter
+    )
+
+
+def estimate_bayes_sparse(
+    responses: SparseResponses,
+    sigma_b: float,
+    draws: int,
+    tune: int,
+    chains: int,
+    target_accept: float,
+    seed: int | None = None,
+    precision: str = "float64",
+) -> pd.DataFrame:
+    """Rasch bayesiano (theta ~ N(0, 1), b ~ N(0, sigma_b)) sobre celdas observadas.
+
+    Devuelve [item_id, n_obs, p_value, estimate, sd] con media y desviación
+    estándar posteriores de b.
+    """
+    idata = sample_rasch_posterior(
+        responses, 0.0, sigma_b, draws, tune, chains, target_accept, seed=seed, precision=precision
+    )
+    b_post = idata.posterior["b"]
+    table = responses.item_table()
+    table["estimate"] = b_post.mean(dim=("chain", "draw")).values
+    table["sd"] = b_post.std(dim=("chain", "draw")).values
+    return table
+
+
+def score_abilities(
+    responses: SparseResponses,
+    item_estimates: pd.DataFrame,
+    method: str = "eap",
+    n_quadrature: int = 41,
+) -> pd.DataFrame:
+    """Puntúa a cada persona con las dificultades calibradas (``item_id``, ``estimate``).
+
+    Usa tablas (patrón de ítems, puntaje bruto) -> theta (:mod:`irt.scoring`);
+    ítems sin estimación se ignoran. Devuelve
+    [person_id, n_items, raw_score, max_score, theta, se].
+    """
+    difficulty = (
+        pd.Series(item_estimates["estimate"].to_numpy(dtype=float), index=item_estimates["item_id"].astype(str))
+        .reindex(pd.Index(responses.item_ids).astype(str))
+        .to_numpy()
+    )
+    n_missing = int(np.isnan(difficulty).sum())
+    if n_missing:
+        logger.warning("[real_data] %d ítems sin dificultad calibrada; no se usan para puntuar", n_missing)
+    scores = score_persons(responses, difficulty, method=method, n_quadrature=n_quadrature)
+    logger.info(
+        "[real_data] Puntuación %s: persons=%d, theta media=%.3f, se media=%.3f",
+        method, len(scores), scores["theta"].mean(), scores["se"].mean(),
+    )
+    return scores
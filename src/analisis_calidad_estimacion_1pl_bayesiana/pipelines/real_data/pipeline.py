@@ -0,0 +1,138 @@
+"""Pipeline de datos reales: ingesta dispersa y calibración de Rasch.
+
+- Input: ``raw_responses`` en formato largo (persona, ítem, respuesta) con
+  celdas faltantes; columnas configurables en ``params:real_data``.
+- Outputs: ``sparse_responses`` (sólo celdas observadas, ``.npz``), las
+  dificultades por ítem de MMLE (EM disperso) y Bayes (PyMC) y la habilidad de
+  cada persona puntuada con cada calibración (``*_person_scores``).
+
+No forma parte de ``__default__``: requiere un archivo de datos reales en
+``data/01_raw/real_data/``. También exporta ``response_chunks`` (Parquet ordenado
+por persona), la entrada de :func:`create_out_of_core_pipeline`: MMLE con el
+paso E leyendo el archivo por lotes, para datos más grandes que la RAM.
+:func:`create_online_pipeline` incorpora el archivo actual como un lote nuevo a
+una calibración incremental persistida (sin reajustar lo ya visto).
+"""
+from kedro.pipeline import Pipeline, node
+
+from .nodes import (
+    build_sparse_responses,
+    estimate_bayes_sparse,
+    estimate_mmle_out_of_core,
+    estimate_mmle_sparse,
+    export_response_chunks,
+    score_abilities,
+    update_online_calibration,
+)
+
+
+def _ingestion_node():
+    return node(
+        func=build_sparse_responses,
+        inputs=dict(
+            raw="raw_responses",
+            person_col="params:person_col",
+            item_col="params:item_col",
+            response_col="params:response_col",
+            positive_values="params:positive_values",
+        ),
+        outputs="sparse_responses",
+        name="real_data_build_sparse_responses",
+        tags={"real_data", "ingestion"},
+    )
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return Pipeline([
+        _ingestion_node(),
+        node(
+            func=export_response_chunks,
+            inputs="sparse_responses",
+            outputs="response_chunks",
+            name="real_data_export_response_chunks",
+            tags={"real_data", "ingestion"},
+        ),
+        node(
+            func=estimate_mmle_sparse,
+            inputs=dict(
+                responses="sparse_responses",
+                n_quadrature="params:mmle.n_quadrature",
+                max_iter="params:mmle.max_iter",
+                tol="params:mmle.tol",
+                n_workers="params:mmle.n_workers",
+                chunk_size="params:mmle.chunk_size",
+            ),
+            outputs="mmle_item_estimates",
+            name="real_data_mmle_estimate",
+            tags={"real_data", "mmle", "estimation"},
+        ),
+        node(
+            func=estimate_bayes_sparse,
+            inputs=dict(
+                responses="sparse_responses",
+                sigma_b="params:bayes.sigma_b",
+                draws="params:bayes.draws",
+                tune="params:bayes.tune",
+                chains="params:bayes.chains",
+                target_accept="params:bayes.target_accept",
+                seed="params:bayes.seed",
+                precision="params:bayes.precision",
+            ),
+            outputs="bayes_item_estimates",
+            name="real_data_bayes_estimate",
+            tags={"real_data", "bayes", "estimation", "memory_heavy"},
+        ),
+        *[
+            node(
+                func=score_abilities,
+                inputs=dict(
+                    responses="sparse_responses",
+                    item_estimates=f"{estimator}_item_estimates",
+                    method="params:scoring.method",
+                    n_quadrature="params:scoring.n_quadrature",
+                ),
+                outputs=f"{estimator}_person_scores",
+                name=f"real_data_{estimator}_score_persons",
+                tags={"real_data", estimator, "scoring"},
+            )
+            for estimator in ("mmle", "bayes")
+        ],
+    ])
+
+
+def create_out_of_core_pipeline(**kwargs) -> Pipeline:
+    return Pipeline([
+        node(
+            func=estimate_mmle_out_of_core,
+            inputs=dict(
+                chunks="response_chunks",
+                chunk_rows="params:mmle.chunk_rows",
+                n_quadrature="params:mmle.n_quadrature",
+                max_iter="params:mmle.max_iter",
+                tol="params:mmle.tol",
+            ),
+            outputs="mmle_out_of_core_item_estimates",
+            name="real_data_mmle_out_of_core_estimate",
+            tags={"real_data", "mmle", "estimation", "out_of_core"},
+        ),
+    ])
+
+
+def create_online_pipeline(**kwargs) -> Pipeline:
+    return Pipeline([
+        _ingestion_node(),
+        node(
+            func=update_online_calibration,
+            inputs=dict(
+                responses="sparse_responses",
+                state="online_calibration_state",
+                batch_id="params:online.batch_id",
+                prior_sd="params:bayes.sigma_b",
+                n_quadrature="params:online.n_quadrature",
+                n_iter="params:online.n_iter",
+            ),
+            outputs="online_item_estimates",
+            name="real_data_online_calibration_update",
+            tags={"real_data", "online", "estimation"},
+        ),
+    ])
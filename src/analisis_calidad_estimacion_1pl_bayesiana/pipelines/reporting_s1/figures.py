@@ -0,0 +1,280 @@
+"""Render de figuras con caché por hash y workers en paralelo.
+
+Cada figura se describe con un :class:`FigureSpec` (tipo de gráfico, datos y
+opciones). Su clave es un hash del tipo, las opciones, el contenido de los datos
+y :data:`RENDER_VERSION`; el PNG se guarda en ``cache_dir/<clave>.png`` y sólo se
+re-dibujan las figuras cuya clave no está en caché. La caché guarda a lo sumo
+:data:`CACHE_MAX_ENTRIES` PNG: cada acierto renueva el mtime del archivo y, tras
+escribir, se borran los menos usados recientemente.
+
+Se dibuja con la API orientada a objetos (``matplotlib.figure.Figure`` +
+``FigureCanvasAgg``), sin estado global de pyplot, así las figuras pendientes
+se reparten entre procesos worker.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+logger = logging.getLogger(__name__)
+
+# Subir al cambiar el aspecto de cualquier figura: invalida toda la caché
+RENDER_VERSION = 1
+
+# Mínimo de figuras pendientes para usar el pool: cada worker ``spawn`` importa
+# matplotlib/pandas (~2 s) y una figura tarda ~0.25 s, así que con menos figuras
+# el render en serie es más rápido (2 figuras: 0.5 s en serie vs 2.3 s con 4 workers)
+PARALLEL_MIN_FIGURES = 12
+
+# PNG que conserva la caché (LRU por mtime); cada cambio de datos o de
+# RENDER_VERSION deja entradas huérfanas que, sin límite, crecerían para siempre
+CACHE_MAX_ENTRIES = 500
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """Figura a renderizar: ``kind`` indexa :data:`RENDERERS`."""
+
+    kind: str
+    data: pd.DataFrame = field(hash=False, compare=False)
+    options: dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+    size: tuple[float, float] = (6.0, 4.0)
+
+    def key(self) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps(
+            {"v": RENDER_VERSION, "kind": self.kind, "options": self.options, "size": self.size,
+             "columns": [str(c) for c in self.data.columns]},
+            sort_keys=True, default=str,
+        ).encode())
+        h.update(pd.util.hash_pandas_object(self.data, index=False).to_numpy().tobytes())
+        return h.hexdigest()[:32]
+
+
+# --------------------------------------------------------------------------- #
+# Dibujantes (reciben un Axes/Figure OO; sin pyplot)
+# --------------------------------------------------------------------------- #
+def _draw_metric_vs_percent(ax: Axes, df: pd.DataFrame, metric: str, title: str) -> None:
+    # Hay dos casos: MMLE (solo percent) y Bayes (percent y r_level)
+    if "r_level" in df.columns and df["r_level"].notna().any():
+        # Graficar una línea por r_level
+        for r, sub in df.groupby("r_level", dropna=True):
+            sub2 = sub.sort_values("percent")
+            ax.plot(sub2["percent"], sub2[metric], marker="o", label=f"r={r}")
+        ax.legend(title="r_level", loc="best")
+    else:
+        sub2 = df.sort_values("percent")
+        ax.plot(sub2["percent"], sub2[metric], marker="o")
+
+    ax.set_xlabel("percent")
+    ax.set_ylabel(metric)
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+
+
+def _render_metric_vs_percent(fig, df: pd.DataFrame, metric: str, title: str) -> None:
+    _draw_metric_vs_percent(fig.add_subplot(), df, metric, title)
+
+
+def _render_bayes_with_mmle_hlines(fig, df: pd.DataFrame, metric: str, title: str, baseline: float | None) -> None:
+    from matplotlib.lines import Line2D
+
+    ax = fig.add_subplot()
+    # Graficar Bayes (líneas por r) como antes
+    for r, sub in df.groupby("r_level", dropna=True):
+        sub2 = sub.sort_values("percent")
+        ax.plot(sub2["percent"], sub2[metric], marker="o", label=f"Bayes r={r}")
+
+    # Determinar rango en X (percent)
+    percents = sorted(df["percent"].unique().tolist())
+    if len(percents) == 0:
+        x_min, x_max = 0.0, 1.0
+    else:
+        x_min, x_max = float(min(percents)), float(max(percents))
+
+    # Línea horizontal (baseline MMLE, percent=1.0) y leyenda sólo si existe
+    handles, labels = ax.get_legend_handles_labels()
+    if baseline is not None:
+        baseline_label = "MMLE baseline (percent=1.0)"
+        ax.hlines(y=baseline, xmin=x_min, xmax=x_max, colors="tab:gray", linestyles="dashed", alpha=0.7)
+        custom = [Line2D([0], [0], color="tab:gray", linestyle="--", alpha=0.8, label=baseline_label)]
+        ax.legend(handles + custom, labels + [baseline_label], loc="best")
+    else:
+        ax.legend(loc="best")
+
+    ax.set_xlabel("percent")
+    ax.set_ylabel(metric)
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+
+
+def _render_facet_page(fig, df: pd.DataFrame, metric: str, title: str, ncols: int) -> None:
+    """Un panel por ``r_level``: una línea fina por réplica y la media en negrita."""
+    r_levels = sorted(df["r_level"].dropna().unique().tolist())
+    nrows = max(1, int(np.ceil(len(r_levels) / ncols)))
+    axes = fig.subplots(nrows, ncols, sharex=True, sharey=True, squeeze=False).ravel()
+    for ax, r in zip(axes, r_levels):
+        sub = df[df["r_level"] == r]
+        for _, rep in sub.groupby("replication"):
+            rep = rep.sort_values("percent")
+            ax.plot(rep["percent"], rep[metric], color="tab:blue", alpha=0.25, linewidth=0.8)
+        mean = sub.groupby("percent", as_index=False)[metric].mean()
+        ax.plot(mean["percent"], mean[metric], color="tab:blue", marker="o", markersize=3)
+        ax.set_title(f"r={r}", fontsize=8)
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(labelsize=7)
+    for ax in axes[len(r_levels):]:
+        ax.set_visible(False)
+    fig.supxlabel("percent")
+    fig.supylabel(metric)
+    fig.suptitle(title)
+
+
+def _render_sbc_ranks(fig, df: pd.DataFrame, n_bins: int, n_ranks: int, title: str, ncols: int = 4) -> None:
+    """Histograma de rangos SBC (todos los ítems + uno por ítem) con banda binomial del 99%."""
+    from scipy import stats
+
+    items = sorted(df["item_id"].unique().tolist())
+    panels = [("todos", df)] + [(f"ítem {i}", df[df["item_id"] == i]) for i in items]
+    nrows = int(np.ceil(len(panels) / ncols))
+    axes = fig.subplots(nrows, ncols, squeeze=False).ravel()
+    edges = np.linspace(0, n_ranks, n_bins + 1)
+    for ax, (label, sub) in zip(axes, panels):
+        n = len(sub)
+        lo, hi = stats.binom.ppf([0.005, 0.995], n, 1.0 / n_bins)
+        ax.axhspan(lo, hi, color="tab:gray", alpha=0.25, linewidth=0)
+        ax.axhline(n / n_bins, color="tab:gray", linewidth=0.8)
+        ax.hist(sub["rank"], bins=edges, color="tab:blue", alpha=0.8)
+        ax.set_title(label, fontsize=8)
+        ax.tick_params(labelsize=6)
+    for ax in axes[len(panels):]:
+        ax.set_visible(False)
+    fig.supxlabel("rango de b verdadero")
+    fig.suptitle(title)
+
+
+def _render_adaptive_surface(fig, df: pd.DataFrame, threshold: float, title: str) -> None:
+    """Media del sustituto (percent × r), curva ``mu = threshold`` y celdas evaluadas por ronda."""
+    from matplotlib.colors import TwoSlopeNorm
+
+    ax = fig.add_subplot()
+    grid = df.pivot(index="r_level", columns="percent", values="mu")
+    p, r, mu = grid.columns.to_numpy(), grid.index.to_numpy(), grid.to_numpy()
+    lo, hi = float(np.nanmin(mu)), float(np.nanmax(mu))
+    norm = TwoSlopeNorm(vcenter=threshold, vmin=min(lo, threshold - 1e-12), vmax=max(hi, threshold + 1e-12))
+    filled = ax.contourf(p, r, mu, levels=20, cmap="RdBu_r", norm=norm)
+    fig.colorbar(filled, ax=ax, label="Bayes - MMLE (predicho)")
+    if lo < threshold < hi:
+        ax.contour(p, r, mu, levels=[threshold], colors="k", linewidths=1.5)
+    evaluated = df[df["round"].notna()]
+    points = ax.scatter(evaluated["percent"], evaluated["r_level"], c=evaluated["round"], cmap="viridis",
+                        edgecolors="k", s=30, zorder=3)
+    fig.colorbar(points, ax=ax, label="ronda", ticks=np.unique(evaluated["round"]))
+    ax.set_xlabel("percent")
+    ax.set_ylabel("r_level")
+    ax.set_title(title)
+
+
+RENDERERS: dict[str, Callable[..., None]] = {
+    "metric_vs_percent": _render_metric_vs_percent,
+    "bayes_with_mmle_hlines": _render_bayes_with_mmle_hlines,
+    "facet_page": _render_facet_page,
+    "sbc_ranks": _render_sbc_ranks,
+    "adaptive_surface": _render_adaptive_surface,
+}
+
+
+def render_png(spec: FigureSpec) -> bytes:
+    """Dibuja ``spec`` en un ``Figure`` Agg y devuelve el PNG (bytes deterministas)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.size)
+    FigureCanvasAgg(fig)
+    RENDERERS[spec.kind](fig, spec.data, **spec.options)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    # Sin metadatos variables (versión de matplotlib) para que el PNG sea estable
+    fig.savefig(buf, format="png", metadata={"Software": None})
+    return buf.getvalue()
+
+
+def evict_cache(cache: Path, keep: set[str] = frozenset(), max_entries: int | None = None) -> int:
+    """Borra los PNG usados hace más tiempo por encima de ``max_entries``; nunca los de ``keep``.
+
+    Devuelve cuántos se borraron. Otro proceso puede estar desalojando a la vez:
+    los archivos que ya no existen se ignoran.
+    """
+    max_entries = CACHE_MAX_ENTRIES if max_entries is None else int(max_entries)
+    entries = []
+    for path in cache.glob("*.png"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(reverse=True)
+    removed = 0
+    for _, path in entries[max_entries:]:
+        if path.stem not in keep:
+            path.unlink(missing_ok=True)
+            removed += 1
+    if removed:
+        logger.info("[reporting_s1] caché de figuras: %d PNG desalojados (máx. %d)", removed, max_entries)
+    return removed
+
+
+def render_specs(
+    specs: dict[str, FigureSpec],
+    cache_dir: str | os.PathLike | None = None,
+    workers: int = 1,
+) -> dict[str, bytes]:
+    """Devuelve ``nombre -> PNG`` renderizando sólo las figuras sin entrada en caché.
+
+    ``cache_dir=None`` desactiva la caché. Con ``workers > 1`` y al menos
+    :data:`PARALLEL_MIN_FIGURES` figuras pendientes se renderiza en un pool de
+    procesos (contexto ``spawn``); con menos, en serie.
+    """
+    cache = Path(cache_dir) if cache_dir else None
+    keys = {name: spec.key() for name, spec in specs.items()}
+    out: dict[str, bytes] = {}
+    stale: list[str] = []
+    for name, key in keys.items():
+        path = cache / f"{key}.png" if cache else None
+        if path is not None and path.is_file():
+            out[name] = path.read_bytes()
+            os.utime(path)  # uso reciente: lo último en desalojarse
+        else:
+            stale.append(name)
+
+    if len(stale) >= PARALLEL_MIN_FIGURES and int(workers or 1) > 1:
+        with ProcessPoolExecutor(max_workers=min(int(workers), len(stale)), mp_context=mp.get_context("spawn")) as pool:
+            rendered = dict(zip(stale, pool.map(render_png, [specs[n] for n in stale])))
+    else:
+        rendered = {n: render_png(specs[n]) for n in stale}
+
+    if cache is not None and rendered:
+        cache.mkdir(parents=True, exist_ok=True)
+        for name, png in rendered.items():
+            path = cache / f"{keys[name]}.png"
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(png)
+            os.replace(tmp, path)
+        evict_cache(cache, keep=set(keys.values()))
+
+    out.update(rendered)
+    logger.info("[reporting_s1] figuras: %d en caché, %d renderizadas", len(specs) - len(stale), len(stale))
+    return {name: out[name] for name in specs}
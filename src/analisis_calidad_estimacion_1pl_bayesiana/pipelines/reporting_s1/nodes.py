@@ -1,113 +1,130 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
 from typing import Literal
 
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.grid import grid_key
 
-def _plot_metric_vs_percent(df: pd.DataFrame, metric: Literal["mse", "r2"], title: str) -> plt.Figure:
-    fig, ax = plt.subplots(figsize=(6, 4))
-    # Hay dos casos: MMLE (solo percent) y Bayes (percent y r_level)
-    if "r_level" in df.columns and df["r_level"].notna().any():
-        # Graficar una línea por r_level
-        for r, sub in df.groupby("r_level", dropna=True):
-            sub2 = sub.sort_values("percent")
-            ax.plot(sub2["percent"], sub2[metric], marker="o", label=f"r={r}")
-        ax.legend(title="r_level", loc="best")
-    else:
-        sub2 = df.sort_values("percent")
-        ax.plot(sub2["percent"], sub2[metric], marker="o")
+from .figures import FigureSpec, render_specs
+
+
+def _replication_mean(df: pd.DataFrame, by: list[str], metric: str) -> tuple[pd.DataFrame, str]:
+    """Media de ``metric`` entre réplicas por ``by`` (un punto por celda) y nota para el título.
+
+    El resumen trae una fila por (celda, réplica) del almacén; sin promediar, cada
+    línea recorrería las réplicas en zig-zag.
+    """
+    n_reps = int(df["replication"].nunique()) if "replication" in df.columns else 1
+    data = df.groupby(by, as_index=False, dropna=False)[metric].mean().sort_values(by).reset_index(drop=True)
+    return data, f" (media de {n_reps} réplicas)" if n_reps > 1 else ""
 
-    ax.set_xlabel("percent")
-    ax.set_ylabel(metric)
-    ax.set_title(title)
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-    return fig
 
+def _metric_spec(df: pd.DataFrame, metric: Literal["mse", "r2"], title: str) -> FigureSpec:
+    # Sólo las columnas dibujadas entran al hash: cambios en otras métricas no invalidan la caché
+    by = [c for c in ("percent", "r_level") if c in df.columns]
+    data, note = _replication_mean(df, by, metric)
+    return FigureSpec("metric_vs_percent", data, {"metric": metric, "title": title + note})
 
-def plot_mmle_summary(mmle_summary: pd.DataFrame) -> dict:
-    """Genera figuras percent vs MSE y percent vs R2 para MMLE.
 
-    Espera columnas: [percent, mse, r2].
+def plot_mmle_summary(mmle_summary: pd.DataFrame, cache_dir: str | None = None, workers: int = 1) -> dict:
+    """Genera figuras percent vs MSE y percent vs R2 para MMLE (PNG).
+
+    Espera columnas: [percent, mse, r2] (y ``replication``: se grafica la media
+    entre réplicas).
     Devuelve dict con claves: mmle_fig_percent_vs_mse, mmle_fig_percent_vs_r2
     """
-    figs = {}
-    figs["mmle_fig_percent_vs_mse"] = _plot_metric_vs_percent(mmle_summary, "mse", "MMLE: percent vs MSE")
-    figs["mmle_fig_percent_vs_r2"] = _plot_metric_vs_percent(mmle_summary, "r2", "MMLE: percent vs R2")
-    return figs
+    specs = {
+        "mmle_fig_percent_vs_mse": _metric_spec(mmle_summary, "mse", "MMLE: percent vs MSE"),
+        "mmle_fig_percent_vs_r2": _metric_spec(mmle_summary, "r2", "MMLE: percent vs R2"),
+    }
+    return render_specs(specs, cache_dir=cache_dir, workers=workers)
 
 
-def plot_bayes_summary(bayes_summary: pd.DataFrame) -> dict:
-    """Genera figuras percent vs MSE y percent vs R2 para Bayes.
+def plot_bayes_summary(bayes_summary: pd.DataFrame, cache_dir: str | None = None, workers: int = 1) -> dict:
+    """Genera figuras percent vs MSE y percent vs R2 para Bayes (PNG).
 
-    Espera columnas: [percent, r_level, mse, r2].
+    Espera columnas: [percent, r_level, mse, r2] (media entre réplicas, como en MMLE).
     Devuelve dict con claves: bayes_fig_percent_vs_mse, bayes_fig_percent_vs_r2
     """
-    figs = {}
-    figs["bayes_fig_percent_vs_mse"] = _plot_metric_vs_percent(bayes_summary, "mse", "Bayes: percent vs MSE (por r)")
-    figs["bayes_fig_percent_vs_r2"] = _plot_metric_vs_percent(bayes_summary, "r2", "Bayes: percent vs R2 (por r)")
-    return figs
+    specs = {
+        "bayes_fig_percent_vs_mse": _metric_spec(bayes_summary, "mse", "Bayes: percent vs MSE (por r)"),
+        "bayes_fig_percent_vs_r2": _metric_spec(bayes_summary, "r2", "Bayes: percent vs R2 (por r)"),
+    }
+    return render_specs(specs, cache_dir=cache_dir, workers=workers)
 
 
-# --- Nuevos: Bayes con líneas horizontales de MMLE como baseline ---
+# --- Bayes con líneas horizontales de MMLE como baseline ---
 
-def _plot_bayes_with_mmle_hlines(
+def _bayes_with_mmle_spec(
     bayes_summary: pd.DataFrame,
     mmle_summary: pd.DataFrame,
     metric: Literal["mse", "r2"],
     title: str,
-) -> plt.Figure:
-    # Graficar Bayes (líneas por r) como antes
-    fig, ax = plt.subplots(figsize=(6, 4))
-    for r, sub in bayes_summary.groupby("r_level", dropna=True):
-        sub2 = sub.sort_values("percent")
-        ax.plot(sub2["percent"], sub2[metric], marker="o", label=f"Bayes r={r}")
-
-    # Determinar rango en X (percent)
-    percents = sorted(bayes_summary["percent"].unique().tolist())
-    if len(percents) == 0:
-        x_min, x_max = 0.0, 1.0
-    else:
-        x_min, x_max = float(min(percents)), float(max(percents))
-
-    # Línea horizontal (baseline MMLE) usando SOLO percent=1.0
-    baseline_drawn = False
-    mmle_p1 = mmle_summary.loc[mmle_summary["percent"] == 1.0, ["percent", metric]].dropna()
-    if not mmle_p1.empty:
-        y = float(mmle_p1.iloc[0][metric])
-        ax.hlines(y=y, xmin=x_min, xmax=x_max, colors="tab:gray", linestyles="dashed", alpha=0.7)
-        baseline_label = "MMLE baseline (percent=1.0)"
-        baseline_drawn = True
-
-    # Leyenda: añadir baseline sólo si fue dibujada
-    from matplotlib.lines import Line2D
-    handles, labels = ax.get_legend_handles_labels()
-    if baseline_drawn:
-        custom = [Line2D([0], [0], color="tab:gray", linestyle="--", alpha=0.8, label=baseline_label)]
-        ax.legend(handles + custom, labels + [baseline_label], loc="best")
-    else:
-        ax.legend(loc="best")
-
-    ax.set_xlabel("percent")
-    ax.set_ylabel(metric)
-    ax.set_title(title)
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-    return fig
+) -> FigureSpec:
+    # Línea horizontal (baseline MMLE) usando SOLO percent=1.0, media entre réplicas
+    mmle_p1 = mmle_summary.loc[mmle_summary["percent"] == 1.0, metric].dropna()
+    baseline = float(mmle_p1.mean()) if not mmle_p1.empty else None
+    data, note = _replication_mean(bayes_summary, ["percent", "r_level"], metric)
+    return FigureSpec(
+        "bayes_with_mmle_hlines", data, {"metric": metric, "title": title + note, "baseline": baseline}
+    )
 
 
 def plot_bayes_vs_mmle_baselines(
     mmle_summary: pd.DataFrame,
     bayes_summary: pd.DataFrame,
+    cache_dir: str | None = None,
+    workers: int = 1,
 ) -> dict:
-    """Figuras combinadas Bayes (por r) + líneas horizontales MMLE por percent.
+    """Figuras combinadas Bayes (por r) + línea horizontal MMLE (percent=1.0).
+
+    Ambas curvas son medias entre las réplicas de los resúmenes.
 
     Devuelve dict con claves: bayes_r2_with_mmle_hlines, bayes_mse_with_mmle_hlines
     """
-    figs = {}
-    figs["bayes_r2_with_mmle_hlines"] = _plot_bayes_with_mmle_hlines(
-        bayes_summary, mmle_summary, "r2", "Bayes vs MMLE: percent vs R2 (por r + baseline MMLE)"
-    )
-    figs["bayes_mse_with_mmle_hlines"] = _plot_bayes_with_mmle_hlines(
-        bayes_summary, mmle_summary, "mse", "Bayes vs MMLE: percent vs MSE (por r + baseline MMLE)"
-    )
-    return figs
+    specs = {
+        "bayes_r2_with_mmle_hlines": _bayes_with_mmle_spec(
+            bayes_summary, mmle_summary, "r2", "Bayes vs MMLE: percent vs R2 (por r + baseline MMLE)"
+        ),
+        "bayes_mse_with_mmle_hlines": _bayes_with_mmle_spec(
+            bayes_summary, mmle_summary, "mse", "Bayes vs MMLE: percent vs MSE (por r + baseline MMLE)"
+        ),
+    }
+    return render_specs(specs, cache_dir=cache_dir, workers=workers)
+
+
+def plot_bayes_facets(
+    bayes_summary: pd.DataFrame,
+    metrics: list[str],
+    panels_per_page: int = 16,
+    cache_dir: str | None = None,
+    workers: int = 1,
+) -> dict[str, bytes]:
+    """Paneles percent × r × réplica: un panel por r_level, una línea por réplica.
+
+    Los paneles se agrupan en páginas de ``panels_per_page``; cada página es una
+    figura independiente (cacheada y renderizada en paralelo). Devuelve
+    ``{"<metric>_r_<desde>__<hasta>": PNG}`` (``BytesPartitionsDataset``).
+    """
+    r_levels = sorted(bayes_summary["r_level"].dropna().unique().tolist())
+    per_page = max(1, int(panels_per_page))
+    ncols = min(per_page, 4)
+    specs: dict[str, FigureSpec] = {}
+    for metric in metrics:
+        for start in range(0, len(r_levels), per_page):
+            page_levels = r_levels[start:start + per_page]
+            data = (
+                bayes_summary.loc[bayes_summary["r_level"].isin(page_levels), ["r_level", "percent", "replication", metric]]
+                .sort_values(["r_level", "replication", "percent"])
+                .reset_index(drop=True)
+            )
+            nrows = -(-len(page_levels) // ncols)
+            name = f"{metric}_r_{grid_key(page_levels[0])}__{grid_key(page_levels[-1])}"
+            specs[name] = FigureSpec(
+                "facet_page",
+                data,
+                {"metric": metric, "title": f"Bayes: percent vs {metric} por r y réplica", "ncols": ncols},
+                size=(3.0 * ncols, 2.4 * nrows + 0.8),
+            )
+    return render_specs(specs, cache_dir=cache_dir, workers=workers)
@@ -1,13 +1,19 @@
 from kedro.pipeline import Pipeline, node
 
-from .nodes import plot_mmle_summary, plot_bayes_summary, plot_bayes_vs_mmle_baselines
+from .nodes import plot_bayes_facets, plot_bayes_summary, plot_bayes_vs_mmle_baselines, plot_mmle_summary
 
 
 def create_pipeline(**kwargs) -> Pipeline:
+    """Figuras de S1 como PNG, con caché por hash de los datos y render en paralelo.
+
+    Opciones de render (``params:cache_dir``, ``params:workers``) compartidas por
+    todos los nodos; ver ``figures.py``.
+    """
+    render = {"cache_dir": "params:cache_dir", "workers": "params:workers"}
     nodes = [
         node(
             func=plot_mmle_summary,
-            inputs={"mmle_summary": "mmle_estimation__s1.mmle_estimation_summary"},
+            inputs={"mmle_summary": "mmle_estimation__s1.mmle_estimation_summary", **render},
             outputs={
                 # Use local names; pipeline namespace will prefix to reporting__s1.*
                 "mmle_fig_percent_vs_mse": "mmle_fig_percent_vs_mse",
@@ -18,7 +24,7 @@ def create_pipeline(**kwargs) -> Pipeline:
         ),
         node(
             func=plot_bayes_summary,
-            inputs={"bayes_summary": "bayes_estimation__s1.bayes_estimation_summary"},
+            inputs={"bayes_summary": "bayes_estimation__s1.bayes_estimation_summary", **render},
             outputs={
                 # Use local names; pipeline namespace will prefix to reporting__s1.*
                 "bayes_fig_percent_vs_mse": "bayes_fig_percent_vs_mse",
@@ -32,6 +38,7 @@ def create_pipeline(**kwargs) -> Pipeline:
             inputs={
                 "mmle_summary": "mmle_estimation__s1.mmle_estimation_summary",
                 "bayes_summary": "bayes_estimation__s1.bayes_estimation_summary",
+                **render,
             },
             outputs={
                 "bayes_r2_with_mmle_hlines": "bayes_r2_with_mmle_hlines",
@@ -40,5 +47,17 @@ def create_pipeline(**kwargs) -> Pipeline:
             name="s1_plot_bayes_vs_mmle_baselines",
             tags={"sample_1", "reporting", "comparison"},
         ),
+        node(
+            func=plot_bayes_facets,
+            inputs={
+                "bayes_summary": "bayes_estimation__s1.bayes_estimation_summary",
+                "metrics": "params:facet_metrics",
+                "panels_per_page": "params:facet_panels_per_page",
+                **render,
+            },
+            outputs="bayes_facets",
+            name="s1_plot_bayes_facets",
+            tags={"sample_1", "reporting", "bayes"},
+        ),
     ]
     return Pipeline(nodes)
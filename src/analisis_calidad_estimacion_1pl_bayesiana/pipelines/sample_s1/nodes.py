@@ -1,41 +1,103 @@
 import logging
-from typing import Dict
+from typing import Any, Dict, Mapping
 
 import numpy as np
 import pandas as pd
 
+from analisis_calidad_estimacion_1pl_bayesiana.precision import RESPONSE_DTYPE, resolve_float_dtype
+
 logger = logging.getLogger(__name__)
 
+# Flujo aleatorio de cada nodo de simulación (dificultades, habilidades, respuestas)
+_DIFFICULTY_STREAM, _ABILITY_STREAM, _RESPONSE_STREAM = 0, 1, 2
+
+
+def simulation_rng(seed: int | None, stream: int, replication: int = 0) -> np.random.RandomState:
+    """Generador de un nodo de simulación para la réplica ``replication``.
+
+    La réplica 0 usa ``RandomState(seed + stream)``, la secuencia histórica
+    (mismos datos que antes de existir réplicas). Cada réplica ``r > 0`` deriva
+    su semilla de ``SeedSequence([seed, r, stream])``: con la misma ``seed``,
+    otra réplica siempre simula datos nuevos.
+    """
+    if seed is None:
+        return np.random.RandomState()
+    if not replication:
+        return np.random.RandomState(int(seed) + stream)
+    return np.random.RandomState(np.random.SeedSequence([int(seed), int(replication), stream]).generate_state(4))
+
 
 def generate_difficulties_s1(
     n_items: int,
     stat_difficulty: Dict[str, float],
     seed: int | None = None,
+    replication: int = 0,
 ) -> pd.DataFrame:
-    """Genera dificultades de ítems para el sample 1."""
-    if seed is not None:
-        np.random.seed(seed)
+    """Genera dificultades de ítems para el sample 1 (ver :func:`simulation_rng`)."""
+    rng = simulation_rng(seed, _DIFFICULTY_STREAM, replication)
     mu = float(stat_difficulty.get("mean", 0.0))
     var = float(stat_difficulty.get("variance", 1.0))
     sd = float(np.sqrt(max(var, 0.0)))
-    d = np.random.normal(mu, sd, int(n_items))
+    d = rng.normal(mu, sd, int(n_items))
     df = pd.DataFrame({"item_id": np.arange(1, int(n_items) + 1), "difficulty": d})
     logger.info("[s1] Generated difficulties: n_items=%d, mu=%.3f, var=%.3f", int(n_items), mu, var)
     return df
 
 
+def record_replication_difficulties(difficulties: pd.DataFrame, replication: int = 0) -> Dict[str, pd.DataFrame]:
+    """Partición ``replication=<r>`` con las dificultades verdaderas de la réplica.
+
+    Los resúmenes leen estimaciones de todas las réplicas del almacén; cada una
+    se compara con las dificultades que se simularon para ella (ver
+    :func:`stack_replication_difficulties`).
+    """
+    return {f"replication={int(replication)}": difficulties}
+
+
+def stack_replication_difficulties(partitions: Mapping[str, Any]) -> pd.DataFrame:
+    """Junta las particiones por réplica en [replication, item_id, difficulty].
+
+    ``partitions``: carga de ``difficulties_by_replication`` (claves
+    ``replication=<r>``; valores DataFrame o funciones de carga perezosa).
+    """
+    frames = [
+        (part() if callable(part) else part)[["item_id", "difficulty"]].assign(replication=int(key.rsplit("=", 1)[-1]))
+        for key, part in partitions.items()
+    ]
+    if not frames:
+        return pd.DataFrame(columns=["replication", "item_id", "difficulty"])
+    return pd.concat(frames, ignore_index=True)[["replication", "item_id", "difficulty"]]
+
+
+def replication_truth(difficulties: pd.DataFrame | Mapping[str, Any], estimates: pd.DataFrame) -> pd.DataFrame:
+    """Dificultades verdaderas con las que se comparan ``estimates`` en los resúmenes.
+
+    Un DataFrame [item_id, difficulty] se usa tal cual (estimaciones de la
+    réplica en curso); las particiones de ``difficulties_by_replication`` se
+    apilan para emparejar por (replication, item_id). Las réplicas de
+    ``estimates`` sin partición se omiten con una advertencia.
+    """
+    if isinstance(difficulties, pd.DataFrame):
+        return difficulties
+    truth = stack_replication_difficulties(difficulties)
+    missing = sorted(set(estimates["replication"].astype(int)) - set(truth["replication"].astype(int)))
+    if missing:
+        logger.warning("[s1] Réplicas sin dificultades verdaderas guardadas (se omiten del resumen): %s", missing)
+    return truth
+
+
 def generate_abilities_s1(
     n_persons: int,
     theta_distribution: Dict[str, float],
     seed: int | None = None,
+    replication: int = 0,
 ) -> pd.DataFrame:
-    """Genera habilidades de personas para el sample 1."""
-    if seed is not None:
-        np.random.seed(seed + 1 if seed is not None else None)
+    """Genera habilidades de personas para el sample 1 (ver :func:`simulation_rng`)."""
+    rng = simulation_rng(seed, _ABILITY_STREAM, replication)
     mu = float(theta_distribution.get("mean", 0.0))
     var = float(theta_distribution.get("variance", 1.0))
     sd = float(np.sqrt(max(var, 0.0)))
-    t = np.random.normal(mu, sd, int(n_persons))
+    t = rng.normal(mu, sd, int(n_persons))
     df = pd.DataFrame({"person_id": np.arange(1, int(n_persons) + 1), "ability": t})
     logger.info("[s1] Generated abilities: n_persons=%d, mu=%.3f, var=%.3f", int(n_persons), mu, var)
     return df
@@ -45,25 +107,35 @@ def simulate_responses_s1(
     item_difficulties: pd.DataFrame,
     person_abilities: pd.DataFrame,
     seed: int | None = None,
+    precision: str = "float64",
+    replication: int = 0,
 ) -> pd.DataFrame:
-    """Simula respuestas binarias con modelo 1PL (discriminación=1)."""
-    if seed is not None:
-        np.random.seed(seed + 2 if seed is not None else None)
+    """Simula respuestas binarias con modelo 1PL (discriminación=1).
+
+    Las probabilidades se calculan en bloque [personas x ítems] con el dtype de
+    ``precision``; las respuestas se guardan como ``int8``. Los uniformes se
+    extraen en el mismo orden que la versión por persona, por lo que con
+    ``float64`` el resultado es idéntico al histórico (réplica 0; ver
+    :func:`simulation_rng`).
+    """
+    rng = simulation_rng(seed, _RESPONSE_STREAM, replication)
 
+    dtype = resolve_float_dtype(precision)
     item_difficulties = item_difficulties.sort_values("item_id")
     person_abilities = person_abilities.sort_values("person_id")
 
     n_items = int(item_difficulties.shape[0])
-    diffs = item_difficulties["difficulty"].to_numpy()
-
-    rows = []
-    for pid, ability in zip(person_abilities["person_id"], person_abilities["ability" ]):
-        logits = ability - diffs
-        probs = 1.0 / (1.0 + np.exp(-logits))
-        responses = (np.random.rand(n_items) < probs).astype(int)
-        rows.append(np.concatenate([[pid], responses]))
-
-    cols = ["person_id"] + [f"item_{i}" for i in range(1, n_items + 1)]
-    responses_df = pd.DataFrame(rows, columns=cols)
-    logger.info("[s1] Simulated responses: persons=%d, items=%d", len(person_abilities), n_items)
+    n_persons = int(person_abilities.shape[0])
+    diffs = item_difficulties["difficulty"].to_numpy(dtype=dtype)
+    abilities = person_abilities["ability"].to_numpy(dtype=dtype)
+
+    logits = abilities[:, None] - diffs[None, :]
+    probs = 1.0 / (1.0 + np.exp(-logits))
+    uniforms = rng.random_sample((n_persons, n_items)).astype(dtype, copy=False)
+    responses = (uniforms < probs).astype(RESPONSE_DTYPE)
+
+    cols = [f"item_{i}" for i in range(1, n_items + 1)]
+    responses_df = pd.DataFrame(responses, columns=cols)
+    responses_df.insert(0, "person_id", person_abilities["person_id"].to_numpy())
+    logger.info("[s1] Simulated responses: persons=%d, items=%d, precision=%s", n_persons, n_items, dtype.name)
     return responses_df
@@ -2,6 +2,8 @@
 
 Este pipeline genera:
 - difficulties: dificultades de ítems (persistido como CSV en data/02_intermediate/sample__s1/)
+- difficulties_by_replication: las mismas dificultades, una partición CSV por réplica
+  (los resúmenes comparan cada réplica del almacén con su propia verdad)
 - abilities: habilidades de personas (persistido como CSV en data/02_intermediate/sample__s1/)
 - responses: respuestas simuladas 1PL (persistido como CSV en data/02_intermediate/sample__s1/)
 
@@ -16,12 +18,13 @@ from kedro.pipeline import Pipeline, node
 from .nodes import (
     generate_difficulties_s1,
     generate_abilities_s1,
+    record_replication_difficulties,
     simulate_responses_s1,
 )
 
 
 def create_pipeline(**kwargs) -> Pipeline:
-    """Crea el pipeline S1 con tres nodos: dificultades, habilidades y respuestas.
+    """Crea el pipeline S1: dificultades (y su partición por réplica), habilidades y respuestas.
 
     Los datasets de salida (difficulties, abilities, responses) se configuran en el
     catálogo para persistirse bajo data/02_intermediate/sample__s1/.
@@ -36,6 +39,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                 n_items="params:test_parameters.number_of_questions",
                 stat_difficulty="params:test_parameters.stat_difficulty",
                 seed="params:seed",
+                replication="params:replication",
             ),
             outputs="difficulties",
             name="s1_generate_difficulties",
@@ -43,6 +47,17 @@ def create_pipeline(**kwargs) -> Pipeline:
         )
     )
 
+    # Guardar las dificultades verdaderas en la partición de la réplica
+    nodes.append(
+        node(
+            func=record_replication_difficulties,
+            inputs=dict(difficulties="difficulties", replication="params:replication"),
+            outputs="difficulties_by_replication",
+            name="s1_record_replication_difficulties",
+            tags={"sample", "sample_1"},  # ver nota en el docstring superior
+        )
+    )
+
     # Generar habilidades de personas (sample 1)
     nodes.append(
         node(
@@ -51,6 +66,7 @@ def create_pipeline(**kwargs) -> Pipeline:
                 n_persons="params:student_parameters.number_of_students",
                 theta_distribution="params:student_parameters.theta_distribution",
                 seed="params:seed",
+                replication="params:replication",
             ),
             outputs="abilities",
             name="s1_generate_abilities",
@@ -66,6 +82,8 @@ def create_pipeline(**kwargs) -> Pipeline:
                 item_difficulties="difficulties",
                 person_abilities="abilities",
                 seed="params:seed",
+                precision="params:precision",
+                replication="params:replication",
             ),
             outputs="responses",  # antes: "responses_full"
             name="s1_simulate_responses",
@@ -0,0 +1,229 @@
+"""Calibración basada en simulación (SBC; Talts et al., 2018) del modelo Bayes de S1.
+
+Cada simulación ``k``:
+
+1. extrae ``b ~ N(mu_b, sigma_b)`` y ``theta ~ N(0, 1)`` del prior con los
+   generadores de ``sample_s1`` y simula respuestas con ``simulate_responses_s1``;
+2. ajusta el mismo modelo que ``bayes_estimation_s1`` (backend ``nuts`` o ``advi``);
+3. guarda, por ítem, el rango de ``b`` verdadero entre ``n_rank_draws`` draws
+   equiespaciados de la posterior (0..``n_rank_draws``).
+
+Si el ajuste está bien calibrado los rangos son uniformes. Las simulaciones se
+reparten en un pool de procesos (contexto ``spawn``; cada worker corre sus
+cadenas en serie) y cada una se escribe al terminar en
+``checkpoint_dir/<huella de la configuración>/sim_<k>.json``: al relanzar sólo
+corren las que faltan, y cambiar la configuración no reutiliza resultados viejos.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SBC_BACKENDS = ("nuts", "advi")
+
+
+@dataclass(frozen=True)
+class SBCSettings:
+    n_persons: int
+    n_items: int
+    mu_b: float
+    sigma_b: float
+    backend: str = "nuts"
+    draws: int = 500
+    tune: int = 500
+    chains: int = 2
+    target_accept: float = 0.9
+    advi_iterations: int = 20_000
+    n_rank_draws: int = 99
+    precision: str = "float64"
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.backend not in SBC_BACKENDS:
+            raise ValueError(f"Backend SBC no soportado: {self.backend!r}. Opciones: {list(SBC_BACKENDS)}")
+
+    def fingerprint(self) -> str:
+        payload = json.dumps(asdict(self), sort_keys=True, default=str).encode()
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def simulation_seed(self, sim: int) -> int:
+        """Semilla de 32 bits propia de cada simulación (independiente del orden de ejecución)."""
+        return int(np.random.SeedSequence([int(self.seed), int(sim)]).generate_state(1)[0])
+
+
+def simulate_from_prior(settings: SBCSettings, sim: int):
+    """(b verdadero, SparseResponses) de la simulación ``sim``."""
+    from analisis_calidad_estimacion_1pl_bayesiana.irt import SparseResponses
+    from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1.nodes import (
+        generate_abilities_s1,
+        generate_difficulties_s1,
+        simulate_responses_s1,
+    )
+
+    seed = settings.simulation_seed(sim)
+    difficulties = generate_difficulties_s1(
+        settings.n_items, {"mean": settings.mu_b, "variance": settings.sigma_b**2}, seed=seed
+    )
+    abilities = generate_abilities_s1(settings.n_persons, {"mean": 0.0, "variance": 1.0}, seed=seed)
+    responses = simulate_responses_s1(difficulties, abilities, seed=seed, precision=settings.precision)
+    return difficulties["difficulty"].to_numpy(dtype=float), SparseResponses.from_dense(responses)
+
+
+def _fit(settings: SBCSettings, data, seed: int):
+    from analisis_calidad_estimacion_1pl_bayesiana.irt.bayes import fit_rasch_advi, sample_rasch_posterior
+
+    if settings.backend == "advi":
+        return fit_rasch_advi(
+            data, settings.mu_b, settings.sigma_b, settings.draws, settings.advi_iterations,
+            seed=seed, precision=settings.precision,
+        )
+    return sample_rasch_posterior(
+        data, settings.mu_b, settings.sigma_b, settings.draws, settings.tune, settings.chains,
+        settings.target_accept, seed=seed, precision=settings.precision, cores=1,
+    )
+
+
+def _diagnostics(idata) -> dict[str, float]:
+    stats = idata.get("sample_stats")
+    out = {"divergences": float("nan"), "max_rhat": float("nan"), "min_ess_bulk": float("nan")}
+    if stats is None or "diverging" not in stats:
+        return out
+    import arviz as az
+
+    out["divergences"] = float(stats["diverging"].sum())
+    out["min_ess_bulk"] = float(az.ess(idata, var_names=["b"])["b"].min())
+    if idata.posterior.sizes["chain"] > 1:
+        out["max_rhat"] = float(az.rhat(idata, var_names=["b"])["b"].max())
+    return out
+
+
+def run_simulation(settings: SBCSettings, sim: int, checkpoint: str | None = None) -> dict[str, Any]:
+    """Simula, ajusta y calcula rangos de ``sim``; escribe ``checkpoint`` si se da."""
+    from analisis_calidad_estimacion_1pl_bayesiana.irt.ppc import thin_draws
+
+    # Los workers no heredan la configuración de logging: silenciar el muestreo
+    logging.getLogger("pymc").setLevel(logging.ERROR)
+    t0 = time.perf_counter()
+    b_true, data = simulate_from_prior(settings, sim)
+    idata = _fit(settings, data, settings.simulation_seed(sim))
+    draws = idata.posterior["b"].stack(sample=("chain", "draw")).transpose("sample", ...).values
+    draws = draws[thin_draws(draws.shape[0], settings.n_rank_draws)]
+    result = {
+        "sim": int(sim),
+        "b_true": b_true.tolist(),
+        "rank": (draws < b_true[None, :]).sum(axis=0).astype(int).tolist(),
+        "n_ranks": int(draws.shape[0]) + 1,
+        **_diagnostics(idata),
+        "seconds": time.perf_counter() - t0,
+    }
+    if checkpoint is not None:
+        path = Path(checkpoint)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(result))
+        os.replace(tmp, path)
+    return result
+
+
+def run_sbc(
+    settings: SBCSettings,
+    n_simulations: int,
+    n_workers: int = 1,
+    checkpoint_dir: str | None = None,
+) -> pd.DataFrame:
+    """Corre (o retoma) ``n_simulations`` simulaciones; una fila por (sim, ítem)."""
+    directory = Path(checkpoint_dir) / settings.fingerprint() if checkpoint_dir else None
+    results: dict[int, dict[str, Any]] = {}
+    if directory is not None:
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "settings.json").write_text(json.dumps(asdict(settings), indent=2, sort_keys=True))
+        for sim in range(int(n_simulations)):
+            path = directory / f"sim_{sim:05d}.json"
+            if path.is_file():
+                results[sim] = json.loads(path.read_text())
+
+    pending = [sim for sim in range(int(n_simulations)) if sim not in results]
+    logger.info(
+        "[sbc_s1] backend=%s, simulaciones=%d (%d desde checkpoint), workers=%d, salida=%s",
+        settings.backend, n_simulations, len(results), n_workers, directory,
+    )
+
+    def checkpoint(sim: int) -> str | None:
+        return str(directory / f"sim_{sim:05d}.json") if directory is not None else None
+
+    t0 = time.perf_counter()
+    if pending and int(n_workers) > 1:
+        with ProcessPoolExecutor(max_workers=min(int(n_workers), len(pending)), mp_context=mp.get_context("spawn")) as pool:
+            futures = {pool.submit(run_simulation, settings, sim, checkpoint(sim)): sim for sim in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                logger.debug("[sbc_s1] %d/%d simulaciones", done, len(pending))
+    else:
+        for sim in pending:
+            results[sim] = run_simulation(settings, sim, checkpoint(sim))
+    if pending:
+        logger.info("[sbc_s1] %d ajustes en %.1f s", len(pending), time.perf_counter() - t0)
+
+    rows = []
+    for sim in sorted(results):
+        res = results[sim]
+        n_items = len(res["rank"])
+        rows.append(pd.DataFrame({
+            "sim": sim,
+            "item_id": np.arange(1, n_items + 1),
+            "b_true": res["b_true"],
+            "rank": res["rank"],
+            "n_ranks": res["n_ranks"],
+            "divergences": res["divergences"],
+            "max_rhat": res["max_rhat"],
+            "min_ess_bulk": res["min_ess_bulk"],
+        }))
+    return pd.concat(rows, ignore_index=True)
+
+
+def rank_uniformity(ranks: pd.DataFrame, n_bins: int = 20) -> pd.DataFrame:
+    """Prueba chi-cuadrado de uniformidad de los rangos, por ítem y agrupada.
+
+    ``rank_mean``/``rank_sd`` son los rangos escalados a [0, 1] (uniforme: 0.5 y
+    0.289); una media desplazada indica sesgo y una sd menor (mayor) una
+    posterior demasiado ancha (angosta).
+    """
+    from scipy import stats
+
+    n_ranks = int(ranks["n_ranks"].iloc[0])
+    n_bins = int(min(max(2, n_bins), n_ranks))
+    scaled = ranks["rank"].to_numpy(dtype=float) / (n_ranks - 1)
+    bins = np.minimum((ranks["rank"].to_numpy() * n_bins) // n_ranks, n_bins - 1)
+    frame = ranks.assign(scaled=scaled, bin=bins)
+
+    def test(group: pd.DataFrame, item_id: Any) -> dict[str, Any]:
+        counts = np.bincount(group["bin"], minlength=n_bins)
+        # Esperado por bin proporcional a cuántos rangos caen en él (bins desiguales si no divide)
+        width = np.bincount(np.minimum((np.arange(n_ranks) * n_bins) // n_ranks, n_bins - 1), minlength=n_bins)
+        expected = counts.sum() * width / n_ranks
+        chi2, p_value = stats.chisquare(counts, expected)
+        return {
+            "item_id": item_id,
+            "n_sims": int(counts.sum()),
+            "chi2": float(chi2),
+            "df": n_bins - 1,
+            "p_value": float(p_value),
+            "rank_mean": float(group["scaled"].mean()),
+            "rank_sd": float(group["scaled"].std()),
+        }
+
+    rows = [test(frame, "all")]
+    rows += [test(group, int(item)) for item, group in frame.groupby("item_id")]
+    return pd.DataFrame(rows)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from ..reporting_s1.figures import FigureSpec, render_specs
+from .harness import SBCSettings, rank_uniformity, run_sbc
+
+logger = logging.getLogger(__name__)
+
+
+def run_sbc_s1(
+    sbc: Dict[str, Any],
+    stat_difficulty: Dict[str, float],
+    seed: int,
+    precision: str = "float64",
+) -> pd.DataFrame:
+    """Corre las simulaciones SBC del bloque ``sbc`` con el prior de dificultades de S1.
+
+    El prior de ``b`` es ``N(mean, sqrt(variance))`` de ``stat_difficulty`` (el
+    mismo que genera los datos de S1). Devuelve DF [sim, item_id, b_true, rank,
+    n_ranks, divergences, max_rhat, min_ess_bulk].
+    """
+    settings = SBCSettings(
+        n_persons=int(sbc["n_persons"]),
+        n_items=int(sbc["n_items"]),
+        mu_b=float(stat_difficulty.get("mean", 0.0)),
+        sigma_b=float(np.sqrt(max(float(stat_difficulty.get("variance", 1.0)), 0.0))),
+        backend=str(sbc.get("backend", "nuts")),
+        draws=int(sbc.get("draws", 500)),
+        tune=int(sbc.get("tune", 500)),
+        chains=int(sbc.get("chains", 2)),
+        target_accept=float(sbc.get("target_accept", 0.9)),
+        advi_iterations=int(sbc.get("advi_iterations", 20_000)),
+        n_rank_draws=int(sbc.get("n_rank_draws", 99)),
+        precision=precision,
+        seed=int(seed),
+    )
+    ranks = run_sbc(
+        settings,
+        n_simulations=int(sbc["n_simulations"]),
+        n_workers=int(sbc.get("n_workers", 1)),
+        checkpoint_dir=sbc.get("checkpoint_dir"),
+    )
+    per_sim = ranks.drop_duplicates("sim")
+    logger.info(
+        "[sbc_s1] %d simulaciones: divergencias=%d, max_rhat=%.3f, min_ess_bulk=%.0f",
+        per_sim.shape[0], int(per_sim["divergences"].fillna(0).sum()),
+        per_sim["max_rhat"].max(), per_sim["min_ess_bulk"].min(),
+    )
+    return ranks
+
+
+def summarize_sbc_s1(sbc_ranks: pd.DataFrame, sbc: Dict[str, Any]) -> pd.DataFrame:
+    """Uniformidad de los rangos (chi-cuadrado) agrupada (``item_id='all'``) y por ítem."""
+    summary = rank_uniformity(sbc_ranks, n_bins=int(sbc.get("n_bins", 20)))
+    pooled = summary.iloc[0]
+    logger.info(
+        "[sbc_s1] uniformidad agrupada: chi2=%.2f (df=%d), p=%.4f; ítems con p<0.01: %d/%d",
+        pooled["chi2"], pooled["df"], pooled["p_value"],
+        int((summary["p_value"].iloc[1:] < 0.01).sum()), summary.shape[0] - 1,
+    )
+    return summary
+
+
+def plot_sbc_s1(sbc_ranks: pd.DataFrame, sbc: Dict[str, Any], cache_dir: str | None = None) -> bytes:
+    """Histogramas de rangos (PNG) con el conteo esperado y su banda binomial del 99%."""
+    n_ranks = int(sbc_ranks["n_ranks"].iloc[0])
+    n_bins = int(min(max(2, int(sbc.get("n_bins", 20))), n_ranks))
+    data = sbc_ranks[["item_id", "rank"]].sort_values(["item_id", "rank"]).reset_index(drop=True)
+    n_panels = data["item_id"].nunique() + 1
+    ncols = 4
+    spec = FigureSpec(
+        "sbc_ranks",
+        data,
+        {"n_bins": n_bins, "n_ranks": n_ranks, "ncols": ncols,
+         "title": f"SBC: rangos de b ({int(sbc_ranks['sim'].nunique())} simulaciones)"},
+        size=(2.5 * ncols, 2.0 * int(np.ceil(n_panels / ncols)) + 0.8),
+    )
+    return render_specs({"sbc_rank_histogram": spec}, cache_dir=cache_dir)["sbc_rank_histogram"]
@@ -0,0 +1,42 @@
+"""Calibración basada en simulación (SBC) del modelo Bayes de S1; ver ``harness.py``.
+
+No depende de los datos de S1: cada simulación extrae sus propios parámetros
+del prior. No forma parte de ``__default__``.
+"""
+
+from kedro.pipeline import Pipeline, node
+
+from .nodes import plot_sbc_s1, run_sbc_s1, summarize_sbc_s1
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return Pipeline(
+        [
+            node(
+                func=run_sbc_s1,
+                inputs=dict(
+                    sbc="params:sbc",
+                    stat_difficulty="params:stat_difficulty",
+                    seed="params:seed",
+                    precision="params:precision",
+                ),
+                outputs="sbc_ranks",
+                name="s1_sbc_run",
+                tags={"sample_1", "sbc"},
+            ),
+            node(
+                func=summarize_sbc_s1,
+                inputs=dict(sbc_ranks="sbc_ranks", sbc="params:sbc"),
+                outputs="sbc_summary",
+                name="s1_sbc_summary",
+                tags={"sample_1", "sbc"},
+            ),
+            node(
+                func=plot_sbc_s1,
+                inputs=dict(sbc_ranks="sbc_ranks", sbc="params:sbc", cache_dir="params:cache_dir"),
+                outputs="sbc_rank_histogram",
+                name="s1_sbc_rank_histogram",
+                tags={"sample_1", "sbc", "reporting"},
+            ),
+        ]
+    )
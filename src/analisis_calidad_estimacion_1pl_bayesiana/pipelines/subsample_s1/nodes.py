@@ -18,6 +18,16 @@ def generate_random_subsample_mask(n_total: int, n_selected: int, seed: int | No
     return pd.DataFrame({"mask": mask})
 
 
+def generate_subsample_mask_for_percent(n_total: int, seed: int | None = None, percent: float = 1.0) -> pd.DataFrame:
+    """Máscara con ``round(n_total * percent)`` unos (``percent`` se fija con ``partial``).
+
+    Función de módulo (no closure) para que el nodo sea serializable y pueda
+    correr con ``ParallelRunner``.
+    """
+    n_selected = int(round(n_total * percent))
+    return generate_random_subsample_mask(n_total=n_total, n_selected=n_selected, seed=seed)
+
+
 def generate_multiple_subsamples(n_total: int, sizes: Iterable[int], seed: int | None = None) -> dict[str, pd.DataFrame]:
     """Genera múltiples máscaras para diferentes tamaños de subsample.
 
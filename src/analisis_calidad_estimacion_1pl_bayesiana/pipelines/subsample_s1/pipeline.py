@@ -1,7 +1,9 @@
 from kedro.pipeline import Pipeline, node
 from functools import partial, update_wrapper
 
-from .nodes import generate_random_subsample_mask
+from analisis_calidad_estimacion_1pl_bayesiana.grid import DEFAULT_LEVELS, grid_key
+
+from .nodes import generate_subsample_mask_for_percent
 
 
 def create_pipeline(**kwargs) -> Pipeline:
@@ -13,7 +15,7 @@ def create_pipeline(**kwargs) -> Pipeline:
     Tags: {"sample_1", "random_subsample"}
     """
     # Por comodidad también soportamos percents por defecto si se ejecuta sin registry
-    percents = kwargs.get("percents", [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    percents = kwargs.get("percents", DEFAULT_LEVELS)
 
     # Los tamaños reales se calcularán en tiempo de ejecución según n_total
     # Aquí sólo definimos el esqueleto de nodos; los outputs usan el tamaño calculado
@@ -24,26 +26,19 @@ def create_pipeline(**kwargs) -> Pipeline:
     for i, p in enumerate(percents):
         p = float(p)
 
-        def make_node(percent: float):
-            def bind_n_selected(n_total: int, seed):
-                # Kedro pasará n_total y seed como inputs; calculamos n_selected aquí
-                n_selected = int(round(n_total * percent))
-                return generate_random_subsample_mask(n_total=n_total, n_selected=n_selected, seed=seed)
-
-            return bind_n_selected
-
-        func = make_node(p)
-        update_wrapper(func, generate_random_subsample_mask)
+        # n_selected = round(n_total * p) se calcula en tiempo de ejecución
+        func = partial(generate_subsample_mask_for_percent, percent=p)
+        update_wrapper(func, generate_subsample_mask_for_percent)
 
         # El nombre del output incorpora el percent para estabilidad (independiente de n_total)
-        out_name = f"subsample_mask_p_{str(p).replace('.', '_')}"
+        out_name = f"subsample_mask_p_{grid_key(p)}"
 
         nodes.append(
             node(
                 func=func,
                 inputs=dict(n_total="params:n_total", seed="params:seed"),
                 outputs=out_name,
-                name=f"s1_generate_subsample_mask_p_{str(p).replace('.', '_')}",
+                name=f"s1_generate_subsample_mask_p_{grid_key(p)}",
                 tags={"sample_1", "random_subsample"},
             )
         )
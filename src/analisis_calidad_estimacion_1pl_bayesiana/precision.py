@@ -0,0 +1,100 @@
+"""Modo de precisión numérica compartido por los pipelines (float64 / float32).
+
+La precisión se configura con ``params:sample__s1.precision`` y afecta:
+- la simulación de respuestas (probabilidades en el dtype elegido),
+- la matriz de respuestas (siempre ``int8``, son datos 0/1),
+- el motor MML (buffers de entrada en ``int8``/dtype elegido): girth y el EM
+  propio calculan en float64, así que en MMLE la precisión sólo fija el dtype
+  de las estimaciones devueltas,
+- el modelo PyMC (``pytensor.config.floatX``): en Bayes sí cambia el cálculo.
+"""
+from __future__ import annotations
+
+import contextlib
+import logging
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Las respuestas son 0/1: un byte por celda es suficiente.
+RESPONSE_DTYPE = np.int8
+
+FLOAT_DTYPES: dict[str, type[np.floating]] = {
+    "float64": np.float64,
+    "float32": np.float32,
+}
+
+SUMMARY_METRICS = ("r", "r2", "mse", "mae", "bias")
+
+
+def resolve_float_dtype(precision: str | None) -> np.dtype:
+    """Traduce el nombre de precisión (``float64``/``float32``) a un ``np.dtype``.
+
+    ``None`` equivale a ``float64`` (comportamiento histórico).
+    """
+    name = "float64" if precision is None else str(precision).lower()
+    if name not in FLOAT_DTYPES:
+        raise ValueError(f"Precisión no soportada: {precision!r}. Opciones: {sorted(FLOAT_DTYPES)}")
+    return np.dtype(FLOAT_DTYPES[name])
+
+
+@contextlib.contextmanager
+def pytensor_floatx(precision: str | None) -> Iterator[str]:
+    """Context manager que fija ``pytensor.config.floatX`` para el bloque.
+
+    Se usa alrededor de la construcción y muestreo del modelo PyMC, de modo que
+    variables, constantes y traza queden en la precisión elegida.
+    """
+    import pytensor
+
+    floatx = resolve_float_dtype(precision).name
+    with pytensor.config.change_flags(floatX=floatx):
+        yield floatx
+
+
+def compare_summary_metrics(
+    reference: pd.DataFrame,
+    candidate: pd.DataFrame,
+    tolerance: float,
+    metrics: Iterable[str] = SUMMARY_METRICS,
+) -> pd.DataFrame:
+    """Compara métricas resumen de la ruta float64 (``reference``) con otra ruta.
+
+    Empareja filas por las columnas de celda presentes (``percent`` y, si existen,
+    ``r_level`` y ``replication``) y devuelve, por celda y métrica, ambos valores,
+    la diferencia absoluta y si queda dentro de ``tolerance``.
+    """
+    keys = [c for c in ("percent", "r_level", "replication") if c in reference.columns and c in candidate.columns]
+    metrics = [m for m in metrics if m in reference.columns and m in candidate.columns]
+
+    merged = pd.merge(
+        reference[keys + metrics],
+        candidate[keys + metrics],
+        on=keys,
+        how="inner",
+        suffixes=("_reference", "_candidate"),
+    )
+
+    # Formato largo fila-mayor (celda, métrica) sin iterar filas
+    n_metrics = len(metrics)
+    ref = merged[[f"{m}_reference" for m in metrics]].to_numpy(dtype=float).ravel()
+    cand = merged[[f"{m}_candidate" for m in metrics]].to_numpy(dtype=float).ravel()
+    abs_diff = np.abs(cand - ref)
+    out = pd.DataFrame({
+        **{k: np.repeat(merged[k].to_numpy(), n_metrics) for k in keys},
+        "metric": np.tile(np.asarray(metrics, dtype=object), len(merged)),
+        "reference": ref,
+        "candidate": cand,
+        "abs_diff": abs_diff,
+        "within_tolerance": (abs_diff <= float(tolerance)) | (np.isnan(ref) & np.isnan(cand)),
+    })
+    if not out.empty and not out["within_tolerance"].all():
+        worst = out.loc[~out["within_tolerance"]].sort_values("abs_diff", ascending=False).iloc[0]
+        logger.warning(
+            "[precision] %d métricas fuera de tolerancia %.2e (peor: %s=%.3e)",
+            int((~out["within_tolerance"]).sum()), float(tolerance), worst["metric"], float(worst["abs_diff"]),
+        )
+    return out
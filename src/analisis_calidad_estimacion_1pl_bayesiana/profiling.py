@@ -0,0 +1,133 @@
+"""Utilidades de perfilado por nodo usadas por :class:`~.hooks.ProfilingHook`.
+
+- :class:`NodeSampler`: hilo que muestrea periódicamente la pila del hilo que
+  corre el nodo (perfilador por muestreo) y el RSS del proceso, para obtener
+  stacks "folded" (formato de ``flamegraph.pl``/speedscope) y el RSS pico del
+  nodo.
+- :func:`nbytes`: tamaño en memoria de lo que se carga/guarda en el catálogo.
+- :func:`write_reports`: escribe el perfil folded y las tablas rankeadas.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def rss_bytes() -> int:
+    """RSS actual del proceso (Linux: ``/proc/self/statm``; otro SO: 0)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):  # pragma: no cover - no Linux
+        return 0
+
+
+def nbytes(data: Any) -> int:
+    """Bytes en memoria de un objeto cargado/guardado (aprox. para tipos genéricos)."""
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=True, deep=True).sum())
+    if isinstance(data, pd.Series):
+        return int(data.memory_usage(index=True, deep=True))
+    if isinstance(data, np.ndarray):
+        return int(data.nbytes)
+    if isinstance(data, dict):
+        return sum(nbytes(v) for v in data.values())
+    return sys.getsizeof(data)
+
+
+def file_bytes(path: str | Path | None) -> int | None:
+    """Tamaño en disco de ``path`` si es un archivo local (``None`` si no existe o es un directorio)."""
+    if path is None:
+        return None
+    path = Path(str(path))
+    try:
+        return path.stat().st_size if path.is_file() else None
+    except OSError:
+        return None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class NodeSampler(threading.Thread):
+    """Muestrea la pila de ``thread_id`` y el RSS cada ``interval`` segundos.
+
+    Con ``stacks=False`` sólo sigue el RSS (se usa junto a cProfile).
+    """
+
+    def __init__(self, thread_id: int, root: str, interval: float = 0.005, stacks: bool = True) -> None:
+        super().__init__(daemon=True, name=f"profiler-{root}")
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = float(interval)
+        self.stacks = stacks
+        self.samples: Counter[str] = Counter()
+        self.rss_start = rss_bytes()
+        self.rss_peak = self.rss_start
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.rss_peak = max(self.rss_peak, rss_bytes())
+            if not self.stacks:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            # raíz a la izquierda; el nodo como primer marco del flame graph
+            self.samples[";".join([self.root, *reversed(labels)])] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+        self.rss_peak = max(self.rss_peak, rss_bytes())
+
+
+def write_reports(
+    output_dir: Path,
+    node_rows: list[dict[str, Any]],
+    io_rows: list[dict[str, Any]],
+    folded: Counter[str],
+    top: int = 10,
+) -> None:
+    """Escribe ``profile.folded``, ``nodes.csv`` y ``datasets.csv`` y loguea el top."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if folded:
+        with (output_dir / "profile.folded").open("w") as fh:
+            for stack, count in sorted(folded.items()):
+                fh.write(f"{stack} {count}\n")
+
+    nodes = pd.DataFrame(node_rows)
+    if not nodes.empty:
+        nodes = nodes.sort_values("wall_s", ascending=False).reset_index(drop=True)
+        nodes.to_csv(output_dir / "nodes.csv", index=False)
+        logger.info("[profiling] Nodos más costosos:\n%s", nodes.head(top).to_string(index=False))
+
+    io = pd.DataFrame(io_rows)
+    if not io.empty:
+        io = (
+            io.groupby(["dataset", "operation"], as_index=False)
+            .agg(calls=("seconds", "size"), total_s=("seconds", "sum"),
+                 mem_bytes=("mem_bytes", "sum"), file_bytes=("file_bytes", "max"))
+            .sort_values("total_s", ascending=False)
+            .reset_index(drop=True)
+        )
+        io.to_csv(output_dir / "datasets.csv", index=False)
+        logger.info("[profiling] E/S de datasets más costosa:\n%s", io.head(top).to_string(index=False))
+
+    logger.info("[profiling] Reportes en %s", output_dir)
@@ -0,0 +1,308 @@
+"""Runner paralelo que despacha primero los nodos más caros.
+
+``ParallelRunner`` envía al pool todos los nodos listos en orden arbitrario; en
+la grilla S1 una celda Bayes cara (p=1.0) puede arrancar última y dejar la
+corrida esperando a un solo worker. :class:`CostAwareParallelRunner`:
+
+- estima el costo de cada nodo con el historial de corridas previas (media
+  móvil exponencial de segundos por nombre de nodo) o, si no hay historial, con
+  un modelo simple ``personas × percent × ítems × (draws + tune) × chains``
+  (``warm_tune`` en lugar de ``tune`` en las celdas que reutilizan la
+  adaptación NUTS);
+- prioriza por *camino crítico* (costo propio + la cadena más cara aguas abajo),
+  que en nodos independientes se reduce a "el más largo primero" (LPT);
+- mantiene a lo sumo ``max_workers`` tareas en vuelo, así la prioridad decide
+  qué corre en cada hueco libre;
+- limita cuántos nodos con tag ``memory_heavy`` corren a la vez.
+
+Uso::
+
+    kedro run --runner analisis_calidad_estimacion_1pl_bayesiana.runner.CostAwareParallelRunner
+
+``kedro run`` sólo pasa ``is_async`` al runner; el resto se configura con
+variables de entorno:
+
+- ``S1_RUNNER_MAX_WORKERS``: tamaño del pool (por defecto, núcleos de CPU).
+- ``S1_RUNNER_MAX_MEMORY_HEAVY``: nodos ``memory_heavy`` simultáneos
+  (por defecto la mitad del pool, mínimo 1).
+- ``S1_RUNNER_COST_HISTORY``: JSON con el historial de costos
+  (por defecto ``data/09_tracking/node_costs.json``).
+
+``_run`` reutiliza métodos privados de ``ParallelRunner`` y el constructor de
+``Task``: la versión de Kedro está fijada en ``pyproject.toml`` y
+:func:`kedro_compat.check_runner_internals` los verifica al arrancar.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from kedro.runner import ParallelRunner
+from kedro.runner.task import Task
+
+from .kedro_compat import check_runner_internals
+
+if TYPE_CHECKING:
+    from kedro.io import CatalogProtocol
+    from kedro.pipeline import Pipeline
+    from kedro.pipeline.node import Node
+    from pluggy import PluginManager
+
+logger = logging.getLogger(__name__)
+
+MEMORY_HEAVY_TAG = "memory_heavy"
+DEFAULT_COST_HISTORY = "data/09_tracking/node_costs.json"
+
+# Métodos privados de ParallelRunner que usa _run (ver kedro_compat.py)
+_RUNNER_INTERNALS = (
+    "_validate_catalog",
+    "_validate_nodes",
+    "_set_manager_datasets",
+    "_get_executor",
+    "_suggest_resume_scenario",
+    "_release_datasets",
+    "_raise_runtime_error",
+)
+
+# Costo base (unidades del modelo) de nodos sin modelo propio: E/S, resúmenes, gráficos
+_BASE_COST = 1.0
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+class NodeCostModel:
+    """Estimaciones de costo por nodo: historial (segundos) + modelo de respaldo.
+
+    El historial guarda, por nombre de nodo, una media móvil exponencial de la
+    duración observada. Para nodos sin historial se usa el modelo analítico; si
+    hay nodos con ambos valores, el modelo se reescala a segundos con la mediana
+    de ``segundos / unidades`` para que las dos fuentes sean comparables.
+    """
+
+    def __init__(self, history_path: str | Path | None = None, alpha: float = 0.5) -> None:
+        self.history_path = Path(history_path) if history_path else None
+        self.alpha = float(alpha)
+        self.history: dict[str, float] = {}
+        if self.history_path and self.history_path.exists():
+            try:
+                self.history = {k: float(v) for k, v in json.loads(self.history_path.read_text()).items()}
+            except (OSError, ValueError) as ex:
+                logger.warning("[runner] Historial de costos ilegible (%s); se ignora", ex)
+
+    @staticmethod
+    def _params(catalog: CatalogProtocol) -> dict[str, Any]:
+        try:
+            return catalog.load("parameters") or {}
+        except Exception:  # pragma: no cover - catálogo sin parámetros
+            return {}
+
+    @staticmethod
+    def _param_inputs(node: Node) -> dict[str, str]:
+        """``params:`` que recibe el nodo, por su último segmento (``params:a.b.draws`` -> ``draws``)."""
+        return {
+            name.rsplit(".", 1)[-1].removeprefix("params:"): name
+            for name in node.inputs
+            if name.startswith("params:")
+        }
+
+    @classmethod
+    def _node_param(cls, node: Node, name: str, catalog: CatalogProtocol, default: float) -> float:
+        """Valor del ``params:`` ``name`` que recibe el nodo (``default`` si no lo recibe)."""
+        dataset = cls._param_inputs(node).get(name)
+        if dataset is None:
+            return default
+        try:
+            return float(catalog.load(dataset))
+        except Exception:
+            return default
+
+    def model_cost(self, node: Node, catalog: CatalogProtocol, params: dict[str, Any]) -> float:
+        """Costo analítico (unidades arbitrarias) según el tipo de nodo."""
+        s1 = params.get("sample__s1", {}) or {}
+        persons = float((s1.get("student_parameters", {}) or {}).get("number_of_students", 1000))
+        items = float((s1.get("test_parameters", {}) or {}).get("number_of_questions", 80))
+        percent = float(getattr(node.func, "keywords", {}).get("percent", 1.0))
+        if percent != percent:  # NaN
+            percent = 1.0
+        cells = persons * percent * items
+
+        if "draws" in self._param_inputs(node):  # nodos MCMC
+            draws = self._node_param(node, "draws", catalog, 1000)
+            tune = self._node_param(node, "tune", catalog, 1000)
+            # celdas que reutilizan la adaptación de la referencia calientan con warm_tune
+            if self._node_param(node, "reuse_tuning", catalog, 0):
+                tune = self._node_param(node, "warm_tune", catalog, tune)
+            chains = self._node_param(node, "chains", catalog, 2)
+            return _BASE_COST + cells * (draws + tune) * chains
+        if "mmle" in node.tags and any("subsample_mask" in name for name in node.inputs):
+            # EM con cuadratura: O(personas × ítems × nodos × iteraciones)
+            return _BASE_COST + cells * 50.0
+        return _BASE_COST
+
+    def estimate(self, nodes: list[Node], catalog: CatalogProtocol) -> dict[Node, float]:
+        params = self._params(catalog)
+        model = {n: self.model_cost(n, catalog, params) for n in nodes}
+        ratios = [self.history[n.name] / model[n] for n in nodes if n.name in self.history and model[n] > 0]
+        scale = statistics.median(ratios) if ratios else 1.0
+        return {n: self.history.get(n.name, model[n] * scale) for n in nodes}
+
+    def record(self, node: Node, seconds: float) -> None:
+        prev = self.history.get(node.name)
+        self.history[node.name] = seconds if prev is None else self.alpha * seconds + (1 - self.alpha) * prev
+
+    def save(self) -> None:
+        if not self.history_path:
+            return
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.history_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(dict(sorted(self.history.items())), indent=2))
+        os.replace(tmp, self.history_path)
+
+
+def critical_path_priority(pipeline: Pipeline, costs: dict[Node, float]) -> dict[Node, float]:
+    """Costo del nodo más el de la cadena más cara de sus descendientes."""
+    children: dict[Node, set[Node]] = {n: set() for n in pipeline.nodes}
+    for child, parents in pipeline.node_dependencies.items():
+        for parent in parents:
+            children[parent].add(child)
+
+    priority: dict[Node, float] = {}
+    # pipeline.nodes está en orden topológico: recorrerlo al revés resuelve hijos primero
+    for n in reversed(pipeline.nodes):
+        priority[n] = costs[n] + max((priority[c] for c in children[n]), default=0.0)
+    return priority
+
+
+class CostAwareParallelRunner(ParallelRunner):
+    """``ParallelRunner`` que despacha por prioridad de costo (ver docstring del módulo)."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        is_async: bool = False,
+        extra_dataset_patterns: dict[str, dict[str, Any]] | None = None,
+        max_memory_heavy: int | None = None,
+        cost_history: str | None = None,
+    ):
+        super().__init__(
+            max_workers=max_workers or _env_int("S1_RUNNER_MAX_WORKERS"),
+            is_async=is_async,
+            extra_dataset_patterns=extra_dataset_patterns,
+        )
+        self._max_memory_heavy = max_memory_heavy or _env_int("S1_RUNNER_MAX_MEMORY_HEAVY")
+        self._cost_model = NodeCostModel(
+            cost_history or os.environ.get("S1_RUNNER_COST_HISTORY", DEFAULT_COST_HISTORY)
+        )
+
+    def _get_required_workers_count(self, pipeline: Pipeline) -> int:
+        # El cupo del pool no depende de las capas: con despacho por prioridad
+        # conviene tener todos los workers disponibles desde el inicio.
+        return max(1, min(len(pipeline.nodes), self._max_workers))
+
+    def _run(
+        self,
+        pipeline: Pipeline,
+        catalog: CatalogProtocol,
+        hook_manager: PluginManager | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        nodes = pipeline.nodes
+
+        check_runner_internals(self, _RUNNER_INTERNALS)
+        self._validate_catalog(catalog, pipeline)
+        self._validate_nodes(nodes)
+        self._set_manager_datasets(catalog, pipeline)
+
+        costs = self._cost_model.estimate(nodes, catalog)
+        priority = critical_path_priority(pipeline, costs)
+        order = {n: i for i, n in enumerate(nodes)}  # desempate estable
+
+        max_workers = self._get_required_workers_count(pipeline)
+        max_heavy = self._max_memory_heavy or max(1, max_workers // 2)
+        self._logger.info(
+            "[runner] %d nodos, %d workers, <=%d '%s' simultáneos",
+            len(nodes), max_workers, max_heavy, MEMORY_HEAVY_TAG,
+        )
+
+        load_counts = Counter(chain.from_iterable(n.inputs for n in nodes))
+        node_dependencies = pipeline.node_dependencies
+        pending: dict[Node, set[Node]] = {n: set(deps) for n, deps in node_dependencies.items()}
+        dependents: dict[Node, list[Node]] = {n: [] for n in nodes}
+        for n, deps in node_dependencies.items():
+            for d in deps:
+                dependents[d].append(n)
+
+        ready: list[tuple[float, int, Node]] = []
+        for n, deps in pending.items():
+            if not deps:
+                heapq.heappush(ready, (-priority[n], order[n], n))
+
+        done_nodes: set[Node] = set()
+        running: dict[Future, tuple[Node, float]] = {}
+        heavy_running = 0
+
+        try:
+            with self._get_executor(max_workers) as executor:
+                while ready or running:
+                    # Llenar los huecos libres por prioridad; los memory_heavy que
+                    # excedan el cupo esperan sin bloquear a los livianos.
+                    deferred: list[tuple[float, int, Node]] = []
+                    while ready and len(running) < max_workers:
+                        item = heapq.heappop(ready)
+                        n = item[2]
+                        if MEMORY_HEAVY_TAG in n.tags and heavy_running >= max_heavy:
+                            deferred.append(item)
+                            continue
+                        task = Task(
+                            node=n,
+                            catalog=catalog,
+                            # como en ParallelRunner: cada worker arma su propio hook manager
+                            hook_manager=None,
+                            is_async=self._is_async,
+                            session_id=session_id,
+                            parallel=True,
+                        )
+                        running[executor.submit(task)] = (n, time.perf_counter())
+                        heavy_running += MEMORY_HEAVY_TAG in n.tags
+                    for item in deferred:
+                        heapq.heappush(ready, item)
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        n, started = running.pop(future)
+                        heavy_running -= MEMORY_HEAVY_TAG in n.tags
+                        try:
+                            future.result()
+                        except Exception:
+                            self._suggest_resume_scenario(pipeline, done_nodes, catalog)
+                            raise
+                        self._cost_model.record(n, time.perf_counter() - started)
+                        done_nodes.add(n)
+                        self._logger.info("Completed node: %s", n.name)
+                        self._logger.info("Completed %d out of %d tasks", len(done_nodes), len(nodes))
+                        self._release_datasets(n, catalog, load_counts, pipeline)
+                        for child in dependents[n]:
+                            pending[child].discard(n)
+                            if not pending[child]:
+                                heapq.heappush(ready, (-priority[child], order[child], child))
+        finally:
+            self._cost_model.save()
+
+        if len(done_nodes) < len(nodes):
+            todo = set(nodes) - done_nodes
+            self._raise_runtime_error(todo, done_nodes, {i[2] for i in ready}, None)
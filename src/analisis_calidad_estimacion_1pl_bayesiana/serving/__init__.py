@@ -0,0 +1,4 @@
+"""Servicio local de puntuación de habilidades sobre un banco de ítems calibrado."""
+from .service import ItemBank, MicroBatcher, ScoringService, ServiceStats, start_service
+
+__all__ = ["ItemBank", "MicroBatcher", "ScoringService", "ServiceStats", "start_service"]
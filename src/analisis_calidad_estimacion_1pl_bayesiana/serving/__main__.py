@@ -0,0 +1,41 @@
+"""``python -m analisis_calidad_estimacion_1pl_bayesiana.serving --bank <csv>``."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import SCORING_METHODS
+
+from .service import ItemBank, start_service
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Servicio local de puntuación de habilidades con micro-lotes")
+    parser.add_argument("--bank", default="data/07_model_output/real_data/mmle_item_estimates.csv",
+                        help="CSV con item_id y estimate (dificultades calibradas)")
+    parser.add_argument("--method", choices=SCORING_METHODS, default="eap")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="ruta de socket Unix (en vez de TCP)")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    async def _serve() -> None:
+        _, server = await start_service(
+            ItemBank.from_csv(args.bank), method=args.method, max_batch_size=args.max_batch,
+            max_wait_ms=args.max_wait_ms, host=args.host, port=args.port, unix_path=args.unix,
+        )
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
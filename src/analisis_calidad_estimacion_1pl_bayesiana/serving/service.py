@@ -0,0 +1,360 @@
+"""Servicio asyncio de puntuación con micro-lotes (HTTP/1.1 mínimo sobre TCP o socket Unix).
+
+Carga un banco calibrado (CSV ``item_id, estimate`` como
+``real_data.mmle_item_estimates``) y atiende:
+
+- ``POST /score`` con ``{"id": ..., "responses": {"<item_id>": 0 | 1, ...}}``
+  (una persona; ítems no administrados se omiten) -> ``{"id", "theta", "se",
+  "raw_score", "max_score"}``;
+- ``GET /metrics``: contadores, tamaño medio de lote, throughput y latencias
+  p50/p99 (cuantiles P² de :mod:`aggregation`, memoria constante);
+- ``GET /health``.
+
+Las solicitudes se encolan y :class:`MicroBatcher` arma lotes de hasta
+``max_batch_size`` esperando a lo sumo ``max_wait_ms`` desde la primera; cada
+lote se puntúa en una sola llamada vectorizada (:func:`irt.scoring.score_persons`)
+en un hilo, así el event loop sigue aceptando solicitudes (que forman el lote
+siguiente). Sólo stdlib: sin dependencias de servidor web.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.aggregation import P2Quantile
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import SCORING_METHODS, score_persons
+from analisis_calidad_estimacion_1pl_bayesiana.irt.sparse import SparseResponses
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+MAX_BODY_BYTES = 1 << 20
+
+
+class RequestError(ValueError):
+    """Solicitud inválida (se responde 400 sin afectar al resto del lote)."""
+
+
+@dataclass(frozen=True)
+class ItemBank:
+    """Dificultades calibradas indexadas por ``item_id`` (como texto, igual que en JSON)."""
+
+    item_ids: np.ndarray
+    difficulty: np.ndarray
+    index: dict[str, int] = field(repr=False)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, item_col: str = "item_id", estimate_col: str = "estimate") -> "ItemBank":
+        frame = frame[[item_col, estimate_col]].dropna()
+        item_ids = frame[item_col].astype(str).to_numpy()
+        if len(set(item_ids)) != item_ids.size:
+            raise ValueError("El banco de ítems tiene item_id repetidos")
+        return cls(item_ids, frame[estimate_col].to_numpy(dtype=float), {item: k for k, item in enumerate(item_ids)})
+
+    @classmethod
+    def from_csv(cls, path: str | Path, **kwargs: Any) -> "ItemBank":
+        return cls.from_frame(pd.read_csv(path), **kwargs)
+
+    def parse(self, payload: Any) -> tuple[np.ndarray, np.ndarray]:
+        """Valida ``payload["responses"]``; devuelve (índices de ítem, respuestas 0/1)."""
+        if not isinstance(payload, dict) or not isinstance(payload.get("responses"), dict):
+            raise RequestError('Se espera {"responses": {"<item_id>": 0 | 1, ...}}')
+        items, values = [], []
+        for item, value in payload["responses"].items():
+            k = self.index.get(str(item))
+            if k is None:
+                raise RequestError(f"Ítem desconocido: {item!r}")
+            if value not in (0, 1):
+                raise RequestError(f"Respuesta no binaria para {item!r}: {value!r}")
+            items.append(k)
+            values.append(int(value))
+        return np.asarray(items, dtype=np.int64), np.asarray(values, dtype=np.int64)
+
+    def score(self, parsed: Sequence[tuple[np.ndarray, np.ndarray]], method: str = "eap") -> pd.DataFrame:
+        """Puntúa un lote de solicitudes ya validadas con una sola llamada vectorizada."""
+        lengths = [items.size for items, _ in parsed]
+        person = np.repeat(np.arange(len(parsed)), lengths)
+        item = np.concatenate([items for items, _ in parsed]) if parsed else np.zeros(0, dtype=np.int64)
+        value = np.concatenate([v for _, v in parsed]) if parsed else np.zeros(0, dtype=np.int64)
+        data = SparseResponses.from_coo(
+            person, item, value, person_ids=np.arange(len(parsed)), item_ids=self.item_ids
+        )
+        return score_persons(data, self.difficulty, method=method)
+
+
+class ServiceStats:
+    """Contadores del servicio; latencias con cuantiles P² (memoria constante)."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_batch = 0
+        self._latency = {"p50": P2Quantile(0.5), "p99": P2Quantile(0.99)}
+        self._latency_sum = 0.0
+
+    def record_batch(self, size: int) -> None:
+        self.batches += 1
+        self.max_batch = max(self.max_batch, size)
+
+    def record_request(self, latency_s: float) -> None:
+        self.requests += 1
+        self._latency_sum += latency_s
+        for sketch in self._latency.values():
+            sketch.update(latency_s * 1e3)
+
+    def snapshot(self) -> dict[str, Any]:
+        uptime = time.perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "uptime_s": uptime,
+            "throughput_rps": self.requests / uptime if uptime > 0 else 0.0,
+            "latency_ms": {
+                "mean": 1e3 * self._latency_sum / self.requests if self.requests else None,
+                **{name: (sketch.value if self.requests else None) for name, sketch in self._latency.items()},
+            },
+        }
+
+
+class MicroBatcher:
+    """Agrupa solicitudes concurrentes en lotes por tamaño o ventana de espera.
+
+    ``score_batch(lista de payloads) -> lista de resultados`` corre en un hilo
+    (``run_in_executor``); mientras tanto, las solicitudes nuevas forman el lote
+    siguiente.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[list[Any]], list[Any]],
+        max_batch_size: int = 256,
+        max_wait_ms: float = 2.0,
+        stats: ServiceStats | None = None,
+    ) -> None:
+        self._score_batch = score_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1e3
+        self.stats = stats or ServiceStats()
+        self._queue: asyncio.Queue[tuple[Any, asyncio.Future, float]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, payload: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list[tuple[Any, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            # Lo ya encolado entra sin esperar; luego, hasta agotar la ventana
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            payloads = [payload for payload, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self._score_batch, payloads)
+            except Exception as exc:  # pragma: no cover - error inesperado del motor
+                logger.exception("[serving] Error puntuando un lote de %d solicitudes", len(batch))
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.stats.record_batch(len(batch))
+            now = time.perf_counter()
+            for (_, future, arrived), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                    self.stats.record_request(now - arrived)
+
+
+class ScoringService:
+    """Servidor HTTP mínimo (keep-alive) sobre un :class:`MicroBatcher`."""
+
+    def __init__(self, bank: ItemBank, method: str = "eap", max_batch_size: int = 256, max_wait_ms: float = 2.0) -> None:
+        if method not in SCORING_METHODS:
+            raise ValueError(f"Método de puntuación no soportado: {method!r}. Opciones: {list(SCORING_METHODS)}")
+        self.bank = bank
+        self.method = method
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(self._score_batch, max_batch_size, max_wait_ms, self.stats)
+
+    def _score_batch(self, payloads: list[tuple[Any, np.ndarray, np.ndarray]]) -> list[dict[str, Any]]:
+        table = self.bank.score([(items, values) for _, items, values in payloads], method=self.method)
+        return [
+            {
+                "id": request_id,
+                "theta": _json_float(row.theta),
+                "se": _json_float(row.se),
+                "raw_score": int(row.raw_score),
+                "max_score": int(row.max_score),
+            }
+            for (request_id, _, _), row in zip(payloads, table.itertuples(index=False))
+        ]
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple[int, Any]:
+        if path == "/score":
+            if method != "POST":
+                return 405, {"error": "usar POST"}
+            try:
+                payload = json.loads(body or b"null")
+                items, values = self.bank.parse(payload)
+            except (RequestError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+                self.stats.errors += 1
+                return 400, {"error": str(exc)}
+            return 200, await self.batcher.submit((payload.get("id"), items, values))
+        if path == "/metrics":
+            return 200, self.stats.snapshot()
+        if path == "/health":
+            return 200, {"status": "ok", "items": int(self.bank.item_ids.size), "method": self.method}
+        return 404, {"error": f"ruta desconocida: {path}"}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await _write_response(writer, 400, {"error": "línea de solicitud inválida"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = _content_length(headers.get("content-length"))
+                if length is None:
+                    await _write_response(writer, 400, {"error": "Content-Length inválido"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    # Sin leer el cuerpo: se corta la conexión en vez de consumir hasta MAX_BODY_BYTES
+                    await _write_response(
+                        writer, 413, {"error": f"cuerpo de {length} bytes > {MAX_BODY_BYTES}"}, keep_alive=False
+                    )
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, result = await self.handle(method.upper(), target.split("?", 1)[0], body)
+                except Exception as exc:  # pragma: no cover
+                    logger.exception("[serving] Error atendiendo %s %s", method, target)
+                    status, result = 500, {"error": str(exc)}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write_response(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionResetError):
+            pass
+        except ValueError:
+            # readline() con una línea más larga que el límite del StreamReader (64 KiB)
+            await _write_response(writer, 400, {"error": "línea de encabezado demasiado larga"}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str | None = None) -> asyncio.AbstractServer:
+        self.batcher.start()
+        if unix_path:
+            server = await asyncio.start_unix_server(self._connection, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(self._connection, host=host, port=port)
+            where = f"{host}:{port}"
+        logger.info(
+            "[serving] Escuchando en %s: %d ítems, método=%s, max_batch=%d, max_wait_ms=%.1f",
+            where, self.bank.item_ids.size, self.method, self.batcher.max_batch_size, self.batcher.max_wait_s * 1e3,
+        )
+        return server
+
+    async def close(self, server: asyncio.AbstractServer) -> None:
+        server.close()
+        await server.wait_closed()
+        await self.batcher.stop()
+
+
+async def start_service(
+    bank: ItemBank,
+    method: str = "eap",
+    max_batch_size: int = 256,
+    max_wait_ms: float = 2.0,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: str | None = None,
+) -> tuple[ScoringService, asyncio.AbstractServer]:
+    """Crea y arranca el servicio en el event loop actual (uso en proceso: pruebas, carga)."""
+    service = ScoringService(bank, method=method, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = await service.start(host=host, port=port, unix_path=unix_path)
+    return service, server
+
+
+def _content_length(value: str | None) -> int | None:
+    """Largo declarado del cuerpo (0 si falta); ``None`` si no es un entero >= 0."""
+    if not value:
+        return 0
+    try:
+        length = int(value)
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def _json_float(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
@@ -7,6 +7,9 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # from analisis_calidad_estimacion_1pl_bayesiana.hooks import ProjectHooks
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
 # HOOKS = (ProjectHooks(),)
+from analisis_calidad_estimacion_1pl_bayesiana.hooks import InMemoryIntermediatesHook, ProfilingHook, ResponseCacheHook
+
+HOOKS = (InMemoryIntermediatesHook(), ProfilingHook(), ResponseCacheHook())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
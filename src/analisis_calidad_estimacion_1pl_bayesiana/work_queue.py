@@ -0,0 +1,590 @@
+"""Ejecución distribuida de las celdas de la grilla con una cola sobre un directorio compartido.
+
+Sin planificador de clúster, cualquier máquina que vea el mismo directorio
+(NFS, SMB, ...) y el mismo proyecto puede sumar workers. El coordinador es un
+runner de Kedro; las celdas (nodos con tag ``grid_cell`` cuyos inputs y outputs
+están persistidos en el catálogo) se publican como archivos de tarea y los
+workers las reclaman y escriben sus resultados en el almacén consolidado. El
+resto de los nodos (resúmenes, reportes) corre en el coordinador a medida que
+sus dependencias terminan.
+
+Estructura de ``<cola>/<run_id>/``::
+
+    run.json                 parámetros de la cola (timeouts, intentos)
+    tasks/<nodo>.json        tarea: nodo, inputs/outputs, valores de params:, prioridad
+    leases/<nodo>.<k>        lease del intento k (creado con O_CREAT|O_EXCL)
+    done/<nodo>.json         resultado (ok/failed); se crea con link(2), también exclusivo
+    CLOSED                   el coordinador terminó: los workers de esta corrida salen
+
+Protocolo:
+
+- **Reclamo**: un worker toma la tarea pendiente de mayor prioridad creando el
+  lease del intento siguiente con ``O_EXCL``; sólo uno gana.
+- **Heartbeat**: mientras corre el nodo, un hilo actualiza el mtime del lease
+  cada ``heartbeat`` segundos.
+- **Reclamo de caídas**: un lease cuyo mtime tiene más de ``lease_timeout``
+  segundos (medido contra el reloj del sistema de archivos, no el local) se
+  considera muerto y la tarea vuelve a reclamarse con el intento ``k + 1``; el
+  número de intento hace que ese reclamo también sea atómico. Tras
+  ``max_attempts`` intentos vencidos la tarea se marca ``failed``.
+- Los valores de los ``params:`` viajan en la tarea (incluidos los ``--params``
+  del coordinador); el catálogo del worker sólo resuelve datasets, así que debe
+  usar el mismo entorno de configuración (``KEDRO_ENV``).
+
+Los hooks de nodo (perfil de ``ProfilingHook``) corren para las celdas que toma
+el coordinador, no para las que corren los workers.
+
+Escribir una celda es idempotente (misma semilla, reemplazo atómico en el
+almacén), así que un worker lento cuyo lease fue reclamado no corrompe nada.
+
+Uso::
+
+    # coordinador (+2 workers locales; el coordinador también toma tareas cuando no tiene otra cosa que hacer)
+    S1_QUEUE_LOCAL_WORKERS=2 kedro run --runner analisis_calidad_estimacion_1pl_bayesiana.work_queue.WorkQueueRunner
+
+    # workers en otros nodos, desde la raíz del proyecto
+    python -m analisis_calidad_estimacion_1pl_bayesiana.work_queue worker --queue /shared/queue
+
+Variables de entorno del coordinador: ``S1_QUEUE_DIR`` (por defecto
+``data/09_tracking/work_queue``), ``S1_QUEUE_TAG`` (``grid_cell``),
+``S1_QUEUE_LOCAL_WORKERS`` (0), ``S1_QUEUE_LEASE_TIMEOUT`` (60 s),
+``S1_QUEUE_HEARTBEAT`` (10 s), ``S1_QUEUE_POLL`` (1 s),
+``S1_QUEUE_MAX_ATTEMPTS`` (3) y ``S1_QUEUE_COORDINATOR_CLAIMS`` (1).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from kedro.io import MemoryDataset, SharedMemoryDataset
+from kedro.runner import SequentialRunner
+from kedro.runner.task import Task
+
+from analisis_calidad_estimacion_1pl_bayesiana.kedro_compat import catalog_dataset, check_runner_internals
+from analisis_calidad_estimacion_1pl_bayesiana.runner import NodeCostModel, critical_path_priority
+
+if TYPE_CHECKING:
+    from kedro.io import CatalogProtocol
+    from kedro.pipeline import Pipeline
+    from kedro.pipeline.node import Node
+    from pluggy import PluginManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_DIR = "data/09_tracking/work_queue"
+GRID_CELL_TAG = "grid_cell"
+
+# Métodos privados de SequentialRunner que usa _run (ver kedro_compat.py)
+_RUNNER_INTERNALS = ("_validate_catalog", "_validate_nodes", "_suggest_resume_scenario", "_release_datasets")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class QueueSettings:
+    lease_timeout: float = 60.0
+    heartbeat: float = 10.0
+    max_attempts: int = 3
+
+    @classmethod
+    def from_env(cls) -> "QueueSettings":
+        return cls(
+            lease_timeout=_env_float("S1_QUEUE_LEASE_TIMEOUT", cls.lease_timeout),
+            heartbeat=_env_float("S1_QUEUE_HEARTBEAT", cls.heartbeat),
+            max_attempts=int(_env_float("S1_QUEUE_MAX_ATTEMPTS", cls.max_attempts)),
+        )
+
+
+def _write_exclusive(path: Path, payload: dict[str, Any]) -> bool:
+    """Crea ``path`` con ``payload`` sólo si no existe (contenido completo al aparecer)."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(payload, default=str))
+    try:
+        os.link(tmp, path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_atomic(path: Path, payload: dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(payload, default=str))
+    os.replace(tmp, path)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Lease:
+    """Lease de un intento; mantiene el heartbeat en un hilo mientras está abierto."""
+
+    def __init__(self, queue: "WorkQueue", task: dict[str, Any], attempt: int, path: Path) -> None:
+        self.queue = queue
+        self.task = task
+        self.attempt = attempt
+        self.path = path
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-{task['task']}", daemon=True)
+
+    @property
+    def task_id(self) -> str:
+        return self.task["task"]
+
+    def __enter__(self) -> "Lease":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.path.unlink(missing_ok=True)
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.queue.settings.heartbeat):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                logger.warning("[work_queue] lease %s desapareció; la tarea pudo ser reclamada", self.path.name)
+                return
+            if self.queue.latest_attempt(self.task_id) > self.attempt:
+                logger.warning("[work_queue] %s fue reclamada por otro worker (intento %d > %d)",
+                               self.task_id, self.queue.latest_attempt(self.task_id), self.attempt)
+                return
+
+
+class WorkQueue:
+    """Protocolo de archivos de una corrida (ver docstring del módulo)."""
+
+    def __init__(self, root: str | os.PathLike, run_id: str, settings: QueueSettings | None = None) -> None:
+        self.dir = Path(root) / run_id
+        self.run_id = run_id
+        run_file = self.dir / "run.json"
+        if settings is None and run_file.is_file():
+            settings = QueueSettings(**json.loads(run_file.read_text())["settings"])
+        self.settings = settings or QueueSettings()
+        self.tasks_dir = self.dir / "tasks"
+        self.leases_dir = self.dir / "leases"
+        self.done_dir = self.dir / "done"
+
+    # -- coordinador ---------------------------------------------------------
+    def create(self) -> "WorkQueue":
+        for d in (self.tasks_dir, self.leases_dir, self.done_dir):
+            d.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.dir / "run.json", {"run_id": self.run_id, "created": time.time(),
+                                               "settings": asdict(self.settings)})
+        return self
+
+    def publish(self, task_id: str, payload: dict[str, Any]) -> None:
+        _write_atomic(self.tasks_dir / f"{task_id}.json", {"task": task_id, **payload})
+
+    def close(self) -> None:
+        (self.dir / "CLOSED").touch()
+
+    @property
+    def closed(self) -> bool:
+        return (self.dir / "CLOSED").exists()
+
+    def result(self, task_id: str) -> dict[str, Any] | None:
+        path = self.done_dir / f"{task_id}.json"
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+
+    # -- reclamo ---------------------------------------------------------------
+    def _fs_now(self) -> float:
+        """Hora según el sistema de archivos compartido (evita desfases de reloj entre nodos)."""
+        clock = self.dir / f".clock.{socket.gethostname()}.{os.getpid()}"
+        clock.touch()
+        return clock.stat().st_mtime
+
+    def _attempts(self) -> dict[str, tuple[int, Path]]:
+        latest: dict[str, tuple[int, Path]] = {}
+        for path in self.leases_dir.iterdir():
+            task_id, _, attempt = path.name.rpartition(".")
+            if not attempt.isdigit():
+                continue
+            if int(attempt) > latest.get(task_id, (0, path))[0]:
+                latest[task_id] = (int(attempt), path)
+        return latest
+
+    def latest_attempt(self, task_id: str) -> int:
+        return max((int(p.name.rpartition(".")[2]) for p in self.leases_dir.glob(f"{task_id}.*")
+                    if p.name.rpartition(".")[2].isdigit()), default=0)
+
+    def _try_lease(self, task: dict[str, Any], attempt: int, worker: str) -> Lease | None:
+        path = self.leases_dir / f"{task['task']}.{attempt}"
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "w") as fh:
+            json.dump({"worker": worker, "attempt": attempt, "claimed": time.time()}, fh)
+        # Puede haber terminado entre el escaneo y el reclamo
+        if (self.done_dir / f"{task['task']}.json").exists():
+            path.unlink(missing_ok=True)
+            return None
+        return Lease(self, task, attempt, path)
+
+    def claim(self, worker: str) -> Lease | None:
+        """Reclama la tarea pendiente de mayor prioridad (o una con lease vencido)."""
+        done = {p.stem for p in self.done_dir.glob("*.json")}
+        tasks = []
+        for path in self.tasks_dir.glob("*.json"):
+            if path.stem in done:
+                continue
+            try:
+                tasks.append(json.loads(path.read_text()))
+            except (OSError, ValueError):  # pragma: no cover - publicación en curso
+                continue
+        if not tasks:
+            return None
+        tasks.sort(key=lambda t: (-float(t.get("priority", 0.0)), t["task"]))
+        attempts = self._attempts()
+        now = None
+        for task in tasks:
+            attempt, lease_path = attempts.get(task["task"], (0, None))
+            if attempt:
+                try:
+                    age = (now := now or self._fs_now()) - lease_path.stat().st_mtime
+                except FileNotFoundError:  # liberado sin done: el dueño está terminando
+                    continue
+                if age <= self.settings.lease_timeout:
+                    continue
+                if attempt >= self.settings.max_attempts:
+                    self.fail(task["task"], worker, attempt,
+                              f"{attempt} intentos sin heartbeat por más de {self.settings.lease_timeout:.0f} s")
+                    continue
+                logger.warning("[work_queue] lease vencido de %s (intento %d, %.0f s); se reclama",
+                               task["task"], attempt, age)
+            lease = self._try_lease(task, attempt + 1, worker)
+            if lease is not None:
+                return lease
+        return None
+
+    def complete(self, lease: Lease, worker: str, seconds: float) -> bool:
+        return _write_exclusive(self.done_dir / f"{lease.task_id}.json", {
+            "status": "ok", "worker": worker, "attempt": lease.attempt, "seconds": seconds,
+        })
+
+    def fail(self, task_id: str, worker: str, attempt: int, error: str) -> bool:
+        return _write_exclusive(self.done_dir / f"{task_id}.json", {
+            "status": "failed", "worker": worker, "attempt": attempt, "error": error,
+        })
+
+    def counts(self) -> dict[str, int]:
+        tasks = {p.stem for p in self.tasks_dir.glob("*.json")}
+        done = {p.stem: json.loads(p.read_text())["status"] for p in self.done_dir.glob("*.json")}
+        leased = set(self._attempts()) - set(done)
+        return {
+            "tasks": len(tasks),
+            "ok": sum(s == "ok" for s in done.values()),
+            "failed": sum(s == "failed" for s in done.values()),
+            "running": len(leased & tasks),
+            "pending": len(tasks - set(done) - leased),
+        }
+
+
+def execute_leased(
+    queue: WorkQueue,
+    lease: Lease,
+    node: Node,
+    catalog: CatalogProtocol,
+    worker: str,
+    hook_manager: PluginManager | None = None,
+    session_id: str | None = None,
+) -> bool:
+    """Corre el nodo de ``lease`` (params desde la tarea), guarda sus outputs y marca ``done``.
+
+    Con ``hook_manager`` se llaman los hooks de nodo (``before_node_run``,
+    ``after_node_run``, ``on_node_error``), como hace ``Task``; el coordinador
+    pasa el suyo. Los workers no corren un pipeline de Kedro y llaman sin hooks:
+    las celdas que corren ahí no aparecen en el perfil de ``ProfilingHook``.
+    """
+    task = lease.task
+    t0 = time.perf_counter()
+    with lease:
+        inputs: dict[str, Any] = {}
+        try:
+            if sorted(node.inputs) != sorted(task["inputs"]) or sorted(node.outputs) != sorted(task["outputs"]):
+                raise RuntimeError(
+                    f"El nodo {node.name} del worker no coincide con el de la tarea (¿otra versión o grilla?)"
+                )
+            params = task.get("params", {})
+            inputs = {name: params[name] if name in params else catalog.load(name) for name in node.inputs}
+            hook_args = dict(node=node, catalog=catalog, inputs=inputs, is_async=False, session_id=session_id)
+            if hook_manager is not None:
+                hook_manager.hook.before_node_run(**hook_args)
+            outputs = node.run(inputs)
+            if hook_manager is not None:
+                hook_manager.hook.after_node_run(outputs=outputs, **hook_args)
+            for name, value in outputs.items():
+                catalog.save(name, value)
+        except Exception as ex:
+            if hook_manager is not None:
+                hook_manager.hook.on_node_error(
+                    error=ex, node=node, catalog=catalog, inputs=inputs, is_async=False, session_id=session_id
+                )
+            queue.fail(lease.task_id, worker, lease.attempt, traceback.format_exc())
+            logger.exception("[work_queue] %s falló (intento %d)", lease.task_id, lease.attempt)
+            return False
+        seconds = time.perf_counter() - t0
+        if not queue.complete(lease, worker, seconds):
+            logger.info("[work_queue] %s ya estaba completa (otro intento terminó antes)", lease.task_id)
+        else:
+            logger.info("[work_queue] %s OK en %.1f s (intento %d)", lease.task_id, seconds, lease.attempt)
+    return True
+
+
+# --------------------------------------------------------------------------- #
+# Coordinador
+# --------------------------------------------------------------------------- #
+class WorkQueueRunner(SequentialRunner):
+    """Runner que publica las celdas de la grilla en la cola y corre el resto localmente."""
+
+    def __init__(
+        self,
+        is_async: bool = False,
+        extra_dataset_patterns: dict[str, dict[str, Any]] | None = None,
+        queue_dir: str | None = None,
+        tag: str | None = None,
+        local_workers: int | None = None,
+        coordinator_claims: bool | None = None,
+        poll: float | None = None,
+        settings: QueueSettings | None = None,
+    ):
+        super().__init__(is_async=is_async, extra_dataset_patterns=extra_dataset_patterns)
+        self._queue_dir = queue_dir or os.environ.get("S1_QUEUE_DIR", DEFAULT_QUEUE_DIR)
+        self._tag = tag or os.environ.get("S1_QUEUE_TAG", GRID_CELL_TAG)
+        self._local_workers = int(local_workers if local_workers is not None else _env_float("S1_QUEUE_LOCAL_WORKERS", 0))
+        self._coordinator_claims = (
+            coordinator_claims if coordinator_claims is not None
+            else bool(int(_env_float("S1_QUEUE_COORDINATOR_CLAIMS", 1)))
+        )
+        self._poll = float(poll if poll is not None else _env_float("S1_QUEUE_POLL", 1.0))
+        self._settings = settings or QueueSettings.from_env()
+
+    @staticmethod
+    def _persisted(name: str, catalog: CatalogProtocol) -> bool:
+        if name.startswith("params:") or name == "parameters":
+            return True
+        return not isinstance(catalog_dataset(catalog, name), (MemoryDataset, SharedMemoryDataset))
+
+    def _remote(self, node: Node, catalog: CatalogProtocol) -> bool:
+        if self._tag not in node.tags:
+            return False
+        transient = [d for d in (*node.inputs, *node.outputs) if not self._persisted(d, catalog)]
+        if transient:
+            self._logger.warning("[work_queue] %s corre local: datasets en memoria %s", node.name, transient)
+        return not transient
+
+    def _spawn_workers(self, run_id: str) -> list[subprocess.Popen]:
+        cmd = [sys.executable, "-m", __name__, "worker", "--queue", self._queue_dir, "--run-id", run_id]
+        return [subprocess.Popen(cmd) for _ in range(self._local_workers)]
+
+    def _run(
+        self,
+        pipeline: Pipeline,
+        catalog: CatalogProtocol,
+        hook_manager: PluginManager | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        nodes = pipeline.nodes
+        check_runner_internals(self, _RUNNER_INTERNALS)
+        self._validate_catalog(catalog, pipeline)
+        self._validate_nodes(nodes)
+
+        run_id = session_id or time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+        queue = WorkQueue(self._queue_dir, run_id, self._settings).create()
+        remote = {n for n in nodes if self._remote(n, catalog)}
+        by_name = {n.name: n for n in nodes}
+        priority = critical_path_priority(pipeline, NodeCostModel().estimate(nodes, catalog))
+        me = worker_id()
+        self._logger.info("[work_queue] corrida %s: %d tareas en la cola, %d nodos locales, %d workers locales (%s)",
+                          run_id, len(remote), len(nodes) - len(remote), self._local_workers, queue.dir)
+
+        load_counts = Counter(chain.from_iterable(n.inputs for n in nodes))
+        pending = {n: set(deps) for n, deps in pipeline.node_dependencies.items()}
+        published: set[Node] = set()
+        done_nodes: set[Node] = set()
+        workers = self._spawn_workers(run_id)
+        last_report = time.monotonic()
+
+        def finish(n: Node) -> None:
+            done_nodes.add(n)
+            self._logger.info("Completed node: %s", n.name)
+            self._logger.info("Completed %d out of %d tasks", len(done_nodes), len(nodes))
+            self._release_datasets(n, catalog, load_counts, pipeline)
+
+        try:
+            while len(done_nodes) < len(nodes):
+                ready = [n for n in nodes if n not in done_nodes and n not in published and pending[n] <= done_nodes]
+                for n in ready:
+                    if n in remote:
+                        params = {d: catalog.load(d) for d in n.inputs if d.startswith("params:")}
+                        queue.publish(n.name, {"node": n.name, "inputs": list(n.inputs), "outputs": list(n.outputs),
+                                               "params": params, "priority": priority[n]})
+                        published.add(n)
+                local = [n for n in ready if n not in remote]
+                if local:
+                    n = local[0]
+                    try:
+                        Task(node=n, catalog=catalog, hook_manager=hook_manager, is_async=self._is_async,
+                             session_id=session_id).execute()
+                    except Exception:
+                        self._suggest_resume_scenario(pipeline, done_nodes, catalog)
+                        raise
+                    finish(n)
+                    continue
+
+                progressed = False
+                for n in sorted(published - done_nodes, key=lambda x: x.name):
+                    result = queue.result(n.name)
+                    if result is None:
+                        continue
+                    if result["status"] != "ok":
+                        raise RuntimeError(f"[work_queue] la tarea {n.name} falló en {result.get('worker')}:\n"
+                                           f"{result.get('error')}")
+                    finish(n)
+                    progressed = True
+                if progressed:
+                    continue
+
+                if self._coordinator_claims:
+                    lease = queue.claim(me)
+                    if lease is not None:
+                        execute_leased(queue, lease, by_name[lease.task_id], catalog, me, hook_manager, session_id)
+                        continue
+                if time.monotonic() - last_report > 30:
+                    self._logger.info("[work_queue] esperando workers: %s", queue.counts())
+                    last_report = time.monotonic()
+                time.sleep(self._poll)
+        finally:
+            queue.close()
+            for proc in workers:
+                try:
+                    proc.wait(timeout=self._settings.lease_timeout)
+                except subprocess.TimeoutExpired:  # pragma: no cover
+                    proc.terminate()
+            self._logger.info("[work_queue] corrida %s cerrada: %s", run_id, queue.counts())
+
+
+# --------------------------------------------------------------------------- #
+# Worker
+# --------------------------------------------------------------------------- #
+def _open_runs(root: Path, run_id: str | None) -> list[WorkQueue]:
+    if run_id is not None:
+        return [WorkQueue(root, run_id)]
+    if not root.is_dir():
+        return []
+    runs = [d for d in root.iterdir() if (d / "run.json").is_file() and not (d / "CLOSED").exists()]
+    return [WorkQueue(root, d.name) for d in sorted(runs)]
+
+
+def run_worker(
+    queue_dir: str,
+    run_id: str | None = None,
+    env: str | None = None,
+    project_path: str | None = None,
+    poll: float = 2.0,
+    idle_exit: float | None = None,
+    max_tasks: int | None = None,
+) -> int:
+    """Reclama y corre tareas hasta que la corrida ``run_id`` se cierre (o, sin ``run_id``,
+    indefinidamente / hasta ``idle_exit`` segundos sin trabajo). Devuelve las tareas corridas."""
+    from kedro.framework.project import pipelines
+    from kedro.framework.session import KedroSession
+    from kedro.framework.startup import bootstrap_project
+
+    project = Path(project_path or Path.cwd()).resolve()
+    bootstrap_project(project)
+    session = KedroSession.create(project_path=project, env=env or os.environ.get("KEDRO_ENV"))
+    catalog = session.load_context().catalog
+    nodes = {n.name: n for pipe in pipelines.values() for n in pipe.nodes}
+    root = Path(queue_dir)
+    if not root.is_absolute():
+        root = project / root
+    me = worker_id()
+    logger.info("[work_queue] worker %s en %s (corrida %s)", me, root, run_id or "todas")
+
+    n_tasks = 0
+    idle_since = time.monotonic()
+    while max_tasks is None or n_tasks < max_tasks:
+        runs = _open_runs(root, run_id)
+        if run_id is not None and all(q.closed for q in runs):
+            break
+        lease = None
+        for queue in runs:
+            if not queue.tasks_dir.is_dir():
+                continue
+            lease = queue.claim(me)
+            if lease is not None:
+                break
+        if lease is None:
+            if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                break
+            time.sleep(poll)
+            continue
+        node = nodes.get(lease.task["node"])
+        if node is None:
+            with lease:
+                lease.queue.fail(lease.task_id, me, lease.attempt, f"Nodo desconocido en este worker: {lease.task['node']}")
+            continue
+        execute_leased(lease.queue, lease, node, catalog, me)
+        n_tasks += 1
+        idle_since = time.monotonic()
+    logger.info("[work_queue] worker %s termina: %d tareas", me, n_tasks)
+    return n_tasks
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m analisis_calidad_estimacion_1pl_bayesiana.work_queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker = sub.add_parser("worker", help="reclama y corre tareas de la cola")
+    worker.add_argument("--queue", default=os.environ.get("S1_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+    worker.add_argument("--run-id", default=None, help="sólo esta corrida; sale cuando se cierra")
+    worker.add_argument("--env", default=None, help="entorno de configuración de Kedro (por defecto KEDRO_ENV)")
+    worker.add_argument("--project", default=None, help="raíz del proyecto (por defecto el directorio actual)")
+    worker.add_argument("--poll", type=float, default=2.0)
+    worker.add_argument("--idle-exit", type=float, default=None, help="salir tras N segundos sin tareas")
+    worker.add_argument("--max-tasks", type=int, default=None)
+    status = sub.add_parser("status", help="conteo de tareas por corrida")
+    status.add_argument("--queue", default=os.environ.get("S1_QUEUE_DIR", DEFAULT_QUEUE_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        root = Path(args.queue)
+        for d in sorted(root.iterdir()) if root.is_dir() else []:
+            if (d / "run.json").is_file():
+                q = WorkQueue(root, d.name)
+                print(d.name, "cerrada" if q.closed else "abierta", q.counts())
+        return 0
+    try:
+        run_worker(args.queue, args.run_id, args.env, args.project, args.poll, args.idle_exit, args.max_tasks)
+    except KeyboardInterrupt:  # pragma: no cover
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
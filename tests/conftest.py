@@ -0,0 +1,39 @@
+"""Datos chicos y deterministas compartidos por las pruebas."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt import SparseResponses
+
+
+def simulate_rasch(
+    n_persons: int, n_items: int, seed: int = 7, missing: float = 0.0
+) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Matriz ``person_id, item_1..item_N`` (NaN = no observado), dificultades y thetas verdaderas."""
+    rng = np.random.default_rng(seed)
+    theta = rng.normal(size=n_persons)
+    b = np.linspace(-1.5, 1.5, n_items)
+    p = 1.0 / (1.0 + np.exp(-(theta[:, None] - b[None, :])))
+    x = (rng.random((n_persons, n_items)) < p).astype(float)
+    if missing:
+        x[rng.random(x.shape) < missing] = np.nan
+    frame = pd.DataFrame(x, columns=[f"item_{i + 1}" for i in range(n_items)])
+    frame.insert(0, "person_id", np.arange(1, n_persons + 1))
+    return frame, b, theta
+
+
+@pytest.fixture(scope="session")
+def complete_responses() -> pd.DataFrame:
+    return simulate_rasch(2000, 15)[0]
+
+
+@pytest.fixture(scope="session")
+def complete_sparse(complete_responses: pd.DataFrame) -> SparseResponses:
+    return SparseResponses.from_dense(complete_responses)
+
+
+@pytest.fixture(scope="session")
+def incomplete_sparse() -> SparseResponses:
+    return SparseResponses.from_dense(simulate_rasch(600, 12, seed=11, missing=0.3)[0])
@@ -0,0 +1,87 @@
+"""Almacén particionado de resultados (datasets/results_store.py)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io import DatasetError
+
+from analisis_calidad_estimacion_1pl_bayesiana.datasets import (
+    ResultsPartition,
+    ResultsStoreDataset,
+    make_person_frame,
+    make_results_frame,
+    read_results,
+)
+
+
+def _cell(root, estimator, percent, r_level=None, **kwargs) -> ResultsStoreDataset:
+    cell = {"estimator": estimator, "percent": percent}
+    if r_level is not None:
+        cell["r_level"] = r_level
+    return ResultsStoreDataset(str(root), cell=cell, **kwargs)
+
+
+def test_cell_round_trip_and_lazy_handle(tmp_path):
+    frame = make_results_frame("bayes", np.array([0.1, -0.2, 0.3]), sd=np.full(3, 0.5), percent=0.5,
+                               r_level=0.9, replication=2)
+    ds = _cell(tmp_path, "bayes", "0_5", "0_9")
+    ds.save(frame)
+
+    assert (tmp_path / "estimator=bayes" / "percent=0.5" / "r_level=0.9" / "replication=2.parquet").is_file()
+    loaded = ds.load()
+    assert list(loaded["estimate"]) == [0.1, -0.2, 0.3]
+    assert set(loaded[["estimator", "percent", "r_level", "replication"]].itertuples(index=False)) == {
+        ("bayes", 0.5, 0.9, 2)
+    }
+    handle = _cell(tmp_path, "bayes", "0_5", "0_9", lazy=True).load()
+    assert isinstance(handle, ResultsPartition)
+    pd.testing.assert_frame_equal(handle.to_pandas(), loaded)
+
+
+def test_single_scan_filters_cells_and_null_r_level(tmp_path):
+    for estimator, percent, r_level in [("mmle", 0.5, None), ("mmle", 1.0, None), ("bayes", 0.5, 0.1),
+                                        ("bayes", 0.5, 0.9)]:
+        frame = make_results_frame(estimator, np.zeros(2) + percent, percent=percent, r_level=r_level)
+        _cell(tmp_path, estimator, percent, r_level).save(frame)
+
+    handles = [_cell(tmp_path, "mmle", "1_0", lazy=True).load(), _cell(tmp_path, "bayes", "0_5", "0_9", lazy=True).load()]
+    out = read_results(handles, columns=["estimator", "percent", "r_level", "item_id"])
+
+    cells = sorted(set(zip(out["estimator"], out["percent"], out["r_level"].fillna(-1))))
+    assert cells == [("bayes", 0.5, 0.9), ("mmle", 1.0, -1)]
+    assert len(out) == 4
+
+
+def test_replications_are_separate_files_and_overwrite_atomically(tmp_path):
+    ds = _cell(tmp_path, "mmle", "0_5")
+    for replication in (0, 1):
+        ds.save(make_results_frame("mmle", np.full(2, replication), percent=0.5, replication=replication))
+    ds.save(make_results_frame("mmle", np.full(2, 7.0), percent=0.5, replication=1))
+
+    out = ds.load().sort_values(["replication", "item_id"])
+    assert list(out["replication"]) == [0, 0, 1, 1]
+    assert list(out["estimate"]) == [0.0, 0.0, 7.0, 7.0]
+    assert not list(tmp_path.rglob(".*.tmp"))
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    with pytest.raises(DatasetError, match="Faltan columnas"):
+        _cell(tmp_path, "mmle", "0_5").save(pd.DataFrame({"item_id": [1], "estimate": [0.0]}))
+    with pytest.raises(DatasetError, match="Tabla no soportada"):
+        ResultsStoreDataset(str(tmp_path), table="cells")
+
+
+def test_persons_table(tmp_path):
+    persons = make_person_frame("bayes", np.array([4, 8]), {"theta": np.array([0.5, -0.5]), "n_obs": np.array([3, 2]),
+                                                            "infit": np.array([1.1, np.nan])}, percent=1.0, r_level=0.5)
+    ds = _cell(tmp_path, "bayes", "1_0", "0_5", table="persons")
+
+    assert not ds.exists()
+    ds.save(persons)
+
+    assert ds.exists()
+    out = ds.load()
+    assert list(out["person_id"]) == [4, 8]
+    assert out["n_obs"].dtype == np.int64
+    assert np.isnan(out["infit"].iloc[1]) and np.isnan(out["outfit"]).all()
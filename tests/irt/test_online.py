@@ -0,0 +1,82 @@
+"""Estado de la calibración incremental (irt/online.py)."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt import OnlineCalibration, SparseResponses, rasch_mml_em
+
+
+def _halves(data: SparseResponses) -> tuple[SparseResponses, SparseResponses]:
+    first = np.arange(data.n_persons) < data.n_persons // 2
+    return data.select_persons(first), data.select_persons(~first)
+
+
+def test_repeated_batch_is_ignored(incomplete_sparse):
+    state = OnlineCalibration()
+
+    assert state.update(incomplete_sparse)
+    before = state.to_dict()
+    assert not state.update(incomplete_sparse)
+
+    assert state.to_dict() == before
+    assert state.n_persons == incomplete_sparse.n_persons
+    assert state.batches == before["batches"] and len(state.batches) == 1
+
+
+def test_state_round_trips_through_json(incomplete_sparse):
+    first, second = _halves(incomplete_sparse)
+    state = OnlineCalibration(prior_mean=0.2, prior_sd=1.5)
+    state.update(first)
+
+    restored = OnlineCalibration.from_dict(json.loads(json.dumps(state.to_dict())))
+    state.update(second)
+    restored.update(second)
+
+    np.testing.assert_array_equal(restored.mean, state.mean)
+    np.testing.assert_array_equal(restored.precision, state.precision)
+    assert restored.item_ids == state.item_ids
+    assert restored.compatible_with(0.2, 1.5, 41) and not restored.compatible_with(0.0, 1.5, 41)
+
+
+def test_unknown_state_version_is_rejected():
+    data = OnlineCalibration().to_dict()
+    data["version"] = 999
+    with pytest.raises(ValueError, match="Versión"):
+        OnlineCalibration.from_dict(data)
+
+
+def test_new_items_enter_with_the_prior(incomplete_sparse):
+    first, second = _halves(incomplete_sparse)
+    keep = first.item < 6
+    partial = SparseResponses.from_coo(
+        first.person[keep], first.item[keep], first.successes[keep],
+        person_ids=first.person_ids, item_ids=first.item_ids[:6],
+    )
+    state = OnlineCalibration(prior_sd=2.0)
+    state.update(partial)
+    assert state.item_ids == list(range(1, 7))
+
+    state.update(second)
+
+    assert state.item_ids == list(range(1, 13))
+    # Los ítems que sólo vio el segundo lote tienen menos información acumulada
+    assert np.all(state.precision[6:] < state.precision[:6])
+    assert np.all(state.precision > 2.0**-2)
+    expected_obs = np.bincount(partial.item, minlength=12) + np.bincount(second.item, minlength=12)
+    np.testing.assert_array_equal(state.n_obs, expected_obs)
+
+
+def test_sequential_posterior_tracks_batch_mml(complete_sparse):
+    first, second = _halves(complete_sparse)
+    state = OnlineCalibration(prior_sd=10.0)
+    state.update(first)
+    state.update(second)
+
+    frame = state.to_frame()
+    mml = rasch_mml_em(complete_sparse)
+
+    np.testing.assert_allclose(frame["estimate"], mml.difficulty, atol=0.05)
+    np.testing.assert_allclose(frame["sd"], mml.se, rtol=0.15)
@@ -0,0 +1,95 @@
+"""``RaschLogLik``: log-verosimilitud y gradiente (irt/rasch_op.py)."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytensor = pytest.importorskip("pytensor")
+pt = pytest.importorskip("pytensor.tensor")
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.rasch_op import RaschLogLik  # noqa: E402
+
+
+def _reference_logp(data, theta, b):
+    eta = theta[data.person] - b[data.item]
+    return float(np.sum(data.successes * eta - data.trials * np.logaddexp(0.0, eta)))
+
+
+def _compile(op):
+    theta, b = pt.dvector("theta"), pt.dvector("b")
+    logp = op(theta, b)[0]
+    return pytensor.function([theta, b], [logp, *pytensor.grad(logp, [theta, b])])
+
+
+@pytest.fixture(scope="module")
+def point(incomplete_sparse):
+    rng = np.random.default_rng(3)
+    return rng.normal(size=incomplete_sparse.n_persons), rng.normal(size=incomplete_sparse.n_items)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_logp_matches_reference(incomplete_sparse, point, dense):
+    theta, b = point
+    logp, _, _ = _compile(RaschLogLik.from_responses(incomplete_sparse, dense=dense))(theta, b)
+
+    assert logp == pytest.approx(_reference_logp(incomplete_sparse, theta, b), rel=1e-12)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_gradient_matches_finite_differences(incomplete_sparse, point, dense):
+    theta, b = point
+    f = _compile(RaschLogLik.from_responses(incomplete_sparse, dense=dense))
+    _, d_theta, d_b = f(theta, b)
+
+    eps = 1e-6
+    for k in (0, 17, incomplete_sparse.n_persons - 1):
+        step = np.zeros_like(theta)
+        step[k] = eps
+        numeric = (f(theta + step, b)[0] - f(theta - step, b)[0]) / (2 * eps)
+        assert d_theta[k] == pytest.approx(numeric, rel=1e-5, abs=1e-6)
+    for k in range(incomplete_sparse.n_items):
+        step = np.zeros_like(b)
+        step[k] = eps
+        numeric = (f(theta, b + step)[0] - f(theta, b - step)[0]) / (2 * eps)
+        assert d_b[k] == pytest.approx(numeric, rel=1e-5, abs=1e-6)
+
+
+def test_verify_grad_on_complete_data(complete_sparse):
+    # Pocas personas: con miles de términos la diferencia finita de pytensor pierde precisión
+    data = complete_sparse.select_persons(np.arange(complete_sparse.n_persons) < 40)
+    op = RaschLogLik.from_responses(data)
+    rng = np.random.default_rng(5)
+
+    pytensor.gradient.verify_grad(
+        lambda theta, b: op(theta, b)[0],
+        [rng.normal(size=data.n_persons), rng.normal(size=data.n_items)],
+        rng=rng,
+    )
+
+
+def test_extreme_logits_stay_finite(incomplete_sparse):
+    f = _compile(RaschLogLik.from_responses(incomplete_sparse, dense=False))
+    theta = np.full(incomplete_sparse.n_persons, 40.0)
+    b = np.full(incomplete_sparse.n_items, -40.0)
+
+    logp, d_theta, d_b = f(theta, b)
+
+    assert np.isfinite(logp) and np.isfinite(d_theta).all() and np.isfinite(d_b).all()
+    assert logp == pytest.approx(_reference_logp(incomplete_sparse, theta, b), rel=1e-9)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_perform_reuses_output_buffers(incomplete_sparse, point, dense):
+    theta, b = point
+    op = RaschLogLik.from_responses(incomplete_sparse, dense=dense)
+    storage = [[None], [None], [None]]
+    op.perform(None, [theta, b], storage)
+    d_theta, d_b = storage[1][0], storage[2][0]
+
+    op.perform(None, [theta + 0.1, b], storage)
+    fresh = [[None], [None], [None]]
+    op.perform(None, [theta + 0.1, b], fresh)
+
+    assert storage[1][0] is d_theta and storage[2][0] is d_b
+    np.testing.assert_array_equal(d_theta, fresh[1][0])
+    np.testing.assert_array_equal(d_b, fresh[2][0])
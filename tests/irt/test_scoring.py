@@ -0,0 +1,93 @@
+"""Puntuación por tabla (patrón, puntaje) contra el cálculo persona por persona."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import optimize
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt import normal_quadrature
+from analisis_calidad_estimacion_1pl_bayesiana.irt import scoring
+from analisis_calidad_estimacion_1pl_bayesiana.irt.scoring import score_persons
+
+
+def _person_cells(data, k):
+    rows = data.person == k
+    return data.item[rows], data.successes[rows].astype(float), data.trials[rows].astype(float)
+
+
+def _loglik(theta, b, n, x):
+    eta = theta - b
+    return float(np.sum(x * eta - n * np.logaddexp(0.0, eta)))
+
+
+def _brute_eap(data, b, k):
+    quad = normal_quadrature(41)
+    item, x, n = _person_cells(data, k)
+    log_post = quad.log_weights + np.array([_loglik(t, b[item], n, x) for t in quad.theta])
+    w = np.exp(log_post - log_post.max())
+    w /= w.sum()
+    mean = float(w @ quad.theta)
+    return mean, float(np.sqrt(w @ (quad.theta - mean) ** 2))
+
+
+def _brute_mode(data, b, k, prior_precision):
+    item, x, n = _person_cells(data, k)
+    res = optimize.minimize_scalar(
+        lambda t: -_loglik(t, b[item], n, x) + 0.5 * prior_precision * t**2, bounds=(-8, 8), method="bounded",
+        options={"xatol": 1e-10},
+    )
+    return res.x
+
+
+@pytest.fixture(scope="module")
+def difficulty(incomplete_sparse):
+    return np.linspace(-1.0, 1.0, incomplete_sparse.n_items)
+
+
+def test_eap_matches_brute_force(incomplete_sparse, difficulty):
+    scores = score_persons(incomplete_sparse, difficulty, method="eap")
+
+    for k in range(0, incomplete_sparse.n_persons, 25):
+        theta, se = _brute_eap(incomplete_sparse, difficulty, k)
+        assert scores["theta"].iloc[k] == pytest.approx(theta, abs=1e-8)
+        assert scores["se"].iloc[k] == pytest.approx(se, abs=1e-8)
+
+
+@pytest.mark.parametrize("method, prior_precision", [("map", 1.0), ("ml", 0.0)])
+def test_newton_matches_brute_force(incomplete_sparse, difficulty, method, prior_precision):
+    scores = score_persons(incomplete_sparse, difficulty, method=method)
+
+    for k in range(0, incomplete_sparse.n_persons, 25):
+        raw, max_score = scores["raw_score"].iloc[k], scores["max_score"].iloc[k]
+        if method == "ml" and raw in (0, max_score):
+            assert np.isnan(scores["theta"].iloc[k])
+            continue
+        assert scores["theta"].iloc[k] == pytest.approx(_brute_mode(incomplete_sparse, difficulty, k, prior_precision),
+                                                        abs=1e-5)
+
+
+def test_totals_and_ids(incomplete_sparse, difficulty):
+    scores = score_persons(incomplete_sparse, difficulty)
+
+    np.testing.assert_array_equal(scores["person_id"], incomplete_sparse.person_ids)
+    np.testing.assert_array_equal(scores["raw_score"], np.bincount(incomplete_sparse.person,
+                                                                   weights=incomplete_sparse.successes))
+    np.testing.assert_array_equal(scores["n_items"], np.bincount(incomplete_sparse.person))
+
+
+def test_hash_collision_falls_back_to_exact_patterns(monkeypatch, incomplete_sparse, difficulty):
+    expected = score_persons(incomplete_sparse, difficulty)
+
+    class _ZeroWeights:
+        def __init__(self, seed):
+            pass
+
+        def integers(self, low, high, size, dtype):
+            return np.zeros(size, dtype=dtype)
+
+    # Pesos nulos: todos los patrones caen en el mismo grupo de hash
+    monkeypatch.setattr(scoring.np.random, "default_rng", _ZeroWeights)
+    collided = score_persons(incomplete_sparse, difficulty)
+
+    pd.testing.assert_frame_equal(collided, expected)
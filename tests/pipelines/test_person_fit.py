@@ -0,0 +1,32 @@
+"""Celdas MMLE con y sin el ajuste por persona (``person_fit``)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.irt.fit import FIT_COLUMNS
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.mmle_estimation_s1.nodes import mmle_estimate_cell
+
+
+@pytest.fixture(scope="module")
+def cell_inputs(complete_responses):
+    mask = pd.DataFrame({"mask": (np.arange(len(complete_responses)) % 2 == 0).astype(int)})
+    return complete_responses, mask
+
+
+def test_person_fit_on_by_default(cell_inputs):
+    items, persons = mmle_estimate_cell(*cell_inputs, percent=0.5, engine="sparse")
+
+    assert len(persons) == len(cell_inputs[0]) // 2
+    assert persons["theta"].notna().all()
+    assert items[[c for c in FIT_COLUMNS if c in items.columns]].notna().any().all()
+
+
+def test_person_fit_off_skips_scoring_and_fit(cell_inputs):
+    with_fit, _ = mmle_estimate_cell(*cell_inputs, percent=0.5, engine="sparse")
+    items, persons = mmle_estimate_cell(*cell_inputs, percent=0.5, engine="sparse", person_fit=False)
+
+    assert persons.empty
+    assert not set(FIT_COLUMNS) & set(items.columns)
+    np.testing.assert_array_equal(items["estimate"], with_fit["estimate"])
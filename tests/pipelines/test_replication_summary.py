@@ -0,0 +1,73 @@
+"""Resúmenes con varias réplicas: cada una contra sus propias dificultades verdaderas."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.datasets import make_results_frame
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.bayes_estimation_s1.nodes import summarize_bayes_estimation
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.mmle_estimation_s1.nodes import summarize_mmle_estimation
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.sample_s1.nodes import (
+    generate_difficulties_s1,
+    record_replication_difficulties,
+)
+
+_STAT = {"mean": 0.0, "variance": 1.0}
+
+
+@pytest.fixture
+def two_replications():
+    """Particiones de dos réplicas (como las carga PartitionedDataset) y sus dificultades."""
+    truth = {rep: generate_difficulties_s1(20, _STAT, seed=123, replication=rep) for rep in (0, 1)}
+    partitions = {}
+    for rep, frame in truth.items():
+        for key, part in record_replication_difficulties(frame, rep).items():
+            partitions[key] = lambda part=part: part
+    return partitions, truth
+
+
+def _estimates(truth, estimator, offsets, **cell):
+    return [
+        make_results_frame(estimator, truth[rep]["difficulty"].to_numpy() + offset, sd=np.full(20, 0.1),
+                           replication=rep, item_id=truth[rep]["item_id"].to_numpy(), **cell)
+        for rep, offset in offsets.items()
+    ]
+
+
+def test_replications_simulate_different_difficulties(two_replications):
+    _, truth = two_replications
+    assert not np.allclose(truth[0]["difficulty"], truth[1]["difficulty"])
+
+
+def test_mmle_summary_matches_each_replication_with_its_truth(two_replications):
+    partitions, truth = two_replications
+    est_0, est_1 = _estimates(truth, "mmle", {0: 0.0, 1: 0.5}, percent=0.5)
+
+    summary = summarize_mmle_estimation(partitions, est_0=est_0, est_1=est_1).set_index("replication")
+
+    assert summary.loc[0, "mse"] == pytest.approx(0.0)
+    assert summary.loc[1, "mse"] == pytest.approx(0.25)
+    assert summary.loc[1, "bias"] == pytest.approx(0.5)
+    assert summary.loc[0, "r"] == summary.loc[1, "r"] == pytest.approx(1.0)
+
+
+def test_bayes_summary_matches_each_replication_with_its_truth(two_replications):
+    partitions, truth = two_replications
+    est_0, est_1 = _estimates(truth, "bayes", {0: 0.0, 1: 0.0}, percent=1.0, r_level=0.5)
+
+    summary = summarize_bayes_estimation(partitions, est_0=est_0, est_1=est_1)
+
+    assert list(summary["replication"]) == [0, 1]
+    np.testing.assert_allclose(summary["mse"], 0.0, atol=1e-12)
+    np.testing.assert_allclose(summary["coverage"], 1.0)
+
+
+def test_replications_without_truth_are_skipped(two_replications, caplog):
+    partitions, truth = two_replications
+    est_0, est_1 = _estimates(truth, "mmle", {0: 0.0, 1: 0.0}, percent=0.5)
+    del partitions["replication=1"]
+
+    summary = summarize_mmle_estimation(partitions, est_0=est_0, est_1=est_1)
+
+    assert list(summary["replication"]) == [0]
+    assert "[1]" in caplog.text
@@ -0,0 +1,71 @@
+"""Figuras de S1: media entre réplicas y caché acotada."""
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.reporting_s1.figures import evict_cache
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.reporting_s1.nodes import (
+    _bayes_with_mmle_spec,
+    _metric_spec,
+)
+
+
+@pytest.fixture
+def summaries():
+    mmle = pd.DataFrame({
+        "percent": [0.5, 1.0, 0.5, 1.0],
+        "replication": [0, 0, 1, 1],
+        "mse": [0.4, 0.2, 0.6, 0.4],
+    })
+    bayes = pd.DataFrame({
+        "percent": [0.5, 1.0] * 2,
+        "r_level": [0.5] * 4,
+        "replication": [0, 0, 1, 1],
+        "mse": [0.3, 0.1, 0.5, 0.3],
+    })
+    return mmle, bayes
+
+
+def test_metric_lines_average_replications(summaries):
+    mmle, bayes = summaries
+
+    spec = _metric_spec(mmle, "mse", "MMLE")
+    bayes_spec = _metric_spec(bayes, "mse", "Bayes")
+
+    assert spec.data["percent"].tolist() == [0.5, 1.0]
+    assert spec.data["mse"].tolist() == pytest.approx([0.5, 0.3])
+    assert spec.options["title"] == "MMLE (media de 2 réplicas)"
+    assert bayes_spec.data["mse"].tolist() == pytest.approx([0.4, 0.2])
+
+
+def test_mmle_baseline_averages_replications(summaries):
+    mmle, bayes = summaries
+
+    spec = _bayes_with_mmle_spec(bayes, mmle, "mse", "Bayes vs MMLE")
+
+    assert spec.options["baseline"] == pytest.approx(0.3)
+    assert len(spec.data) == 2
+
+
+def test_single_replication_keeps_title(summaries):
+    mmle, _ = summaries
+
+    spec = _metric_spec(mmle[mmle["replication"] == 0], "mse", "MMLE")
+
+    assert spec.options["title"] == "MMLE"
+    assert spec.data["mse"].tolist() == pytest.approx([0.4, 0.2])
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"k{i}.png"
+        path.write_bytes(b"png")
+        os.utime(path, (1000 + i, 1000 + i))
+
+    removed = evict_cache(tmp_path, keep={"k0"}, max_entries=2)
+
+    assert removed == 2
+    assert sorted(p.stem for p in tmp_path.glob("*.png")) == ["k0", "k3", "k4"]
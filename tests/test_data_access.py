@@ -0,0 +1,62 @@
+"""Caché de respuestas del proceso (data_access.py)."""
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.data_access import (
+    ResponseCache,
+    filter_responses_with_mask,
+    masked_sparse_responses,
+)
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return np.arange(5)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert cache.stats().misses == 1 and cache.stats().hits == 3
+
+
+def test_failed_compute_is_not_cached():
+    cache = ResponseCache()
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+
+    assert cache.get_or_compute("k", lambda: np.ones(2)).sum() == 2
+
+
+def test_cached_objects_are_read_only(complete_responses):
+    mask = pd.DataFrame({"mask": (np.arange(len(complete_responses)) % 2).astype(int)})
+
+    filtered = filter_responses_with_mask(complete_responses, mask)
+    data = masked_sparse_responses(complete_responses, mask)
+
+    assert filter_responses_with_mask(complete_responses, mask) is filtered
+    assert len(filtered) == data.n_persons == len(complete_responses) // 2
+    with pytest.raises(ValueError, match="read-only"):
+        filtered.iloc[0, 1] = 5
+    with pytest.raises(ValueError, match="read-only"):
+        data.successes[0] = 0
+    # Las derivaciones son modificables
+    copy = filtered.copy()
+    copy.iloc[0, 1] = 5
@@ -0,0 +1,36 @@
+"""Comparación de métricas resumen entre la ruta float64 y la precisión candidata."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from analisis_calidad_estimacion_1pl_bayesiana.pipelines.precision_check_s1.nodes import check_precision_accuracy
+from analisis_calidad_estimacion_1pl_bayesiana.precision import compare_summary_metrics
+
+
+def _summary(mse, r2, **cells):
+    return pd.DataFrame({"percent": [0.5, 1.0], "replication": [0, 0], "mse": mse, "r2": r2, **cells})
+
+
+def test_compare_is_long_by_cell_and_metric():
+    reference = _summary([0.10, 0.05], [0.90, np.nan])
+    candidate = _summary([0.10 + 1e-7, 0.06], [0.90, np.nan])
+
+    out = compare_summary_metrics(reference, candidate, tolerance=1e-5, metrics=("mse", "r2"))
+
+    assert list(out.columns) == ["percent", "replication", "metric", "reference", "candidate", "abs_diff",
+                                 "within_tolerance"]
+    assert list(zip(out["percent"], out["metric"])) == [(0.5, "mse"), (0.5, "r2"), (1.0, "mse"), (1.0, "r2")]
+    # NaN en ambas rutas cuenta como coincidencia; 0.01 de diferencia no
+    assert out["within_tolerance"].tolist() == [True, True, False, True]
+    np.testing.assert_allclose(out["abs_diff"].iloc[2], 0.01)
+
+
+def test_summary_marks_where_candidate_precision_applies():
+    mmle = _summary([0.1, 0.05], [0.9, 0.95])
+    bayes = _summary([0.1, 0.05], [0.9, 0.95], r_level=[1.0, 1.0])
+
+    out = check_precision_accuracy(1e-5, mmle, mmle, bayes, bayes)
+
+    scopes = out.groupby("estimator")["candidate_scope"].unique().map(list).to_dict()
+    assert scopes == {"bayes": ["model"], "mmle": ["output_cast"]}
@@ -0,0 +1,113 @@
+"""Runners propios (costo y cola de trabajo) con la versión de Kedro fijada."""
+from __future__ import annotations
+
+from functools import partial, update_wrapper
+
+import pytest
+from kedro.framework.hooks import hook_impl
+from kedro.framework.hooks.specs import DatasetSpecs, NodeSpecs
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import Pipeline, node
+from kedro_datasets.pickle import PickleDataset
+from pluggy import PluginManager
+
+from analisis_calidad_estimacion_1pl_bayesiana.kedro_compat import check_runner_internals
+from analisis_calidad_estimacion_1pl_bayesiana.runner import _RUNNER_INTERNALS, CostAwareParallelRunner, NodeCostModel
+from analisis_calidad_estimacion_1pl_bayesiana.work_queue import GRID_CELL_TAG, QueueSettings, WorkQueueRunner
+
+
+def _double(x):
+    return 2 * x
+
+
+def _add(a, b):
+    return a + b
+
+
+def _cell(draws, tune, chains, reuse_tuning=False, warm_tune=0, percent=1.0):
+    return draws
+
+
+def test_runner_internals_available():
+    check_runner_internals(CostAwareParallelRunner(max_workers=1), _RUNNER_INTERNALS)
+
+
+def test_missing_internals_fail_early():
+    with pytest.raises(RuntimeError, match="_no_existe"):
+        check_runner_internals(CostAwareParallelRunner(max_workers=1), ("_no_existe",))
+
+
+def test_runner_smoke(tmp_path):
+    pipeline = Pipeline([
+        node(_double, "x", "y", name="double"),
+        node(_add, ["x", "y"], "z", name="add"),
+        node(_double, "z", "w", name="double_z"),
+    ])
+    catalog = DataCatalog({"x": MemoryDataset(3)})
+    runner = CostAwareParallelRunner(max_workers=2, cost_history=str(tmp_path / "costs.json"))
+
+    outputs = runner.run(pipeline, catalog)
+
+    assert outputs["w"] == 18
+    assert set(NodeCostModel(tmp_path / "costs.json").history) == {"double", "add", "double_z"}
+
+
+def test_cost_model_uses_warm_tune_when_reusing_tuning():
+    func = partial(_cell, percent=1.0)
+    update_wrapper(func, _cell)
+    inputs = {"draws": "params:ns.draws", "tune": "params:ns.tune", "chains": "params:ns.chains"}
+    reference = node(func, inputs, "ref", name="reference")
+    warm = node(func, {**inputs, "reuse_tuning": "params:ns.reuse_tuning", "warm_tune": "params:ns.warm_tune"},
+                "warm", name="warm")
+    catalog = DataCatalog({
+        f"params:ns.{k}": MemoryDataset(v)
+        for k, v in {"draws": 100, "tune": 300, "chains": 2, "reuse_tuning": True, "warm_tune": 50}.items()
+    })
+    model = NodeCostModel()
+    params = {"sample__s1": {"student_parameters": {"number_of_students": 10},
+                             "test_parameters": {"number_of_questions": 5}}}
+
+    ref_cost = model.model_cost(reference, catalog, params)
+    warm_cost = model.model_cost(warm, catalog, params)
+
+    assert ref_cost == pytest.approx(1 + 50 * 400 * 2)
+    assert warm_cost == pytest.approx(1 + 50 * 150 * 2)
+
+
+class _NodeRecorder:
+    def __init__(self):
+        self.events = []
+
+    @hook_impl
+    def before_node_run(self, node):
+        self.events.append(("before", node.name))
+
+    @hook_impl
+    def after_node_run(self, node):
+        self.events.append(("after", node.name))
+
+
+def test_work_queue_runner_smoke(tmp_path):
+    pipeline = Pipeline([
+        node(_double, "x", "y", name="cell", tags={GRID_CELL_TAG}),
+        node(_add, ["x", "y"], "z", name="summary"),
+    ])
+    catalog = DataCatalog({
+        "x": PickleDataset(filepath=str(tmp_path / "x.pkl")),
+        "y": PickleDataset(filepath=str(tmp_path / "y.pkl")),
+    })
+    catalog.save("x", 3)
+    hooks = PluginManager("kedro")
+    hooks.add_hookspecs(NodeSpecs)
+    hooks.add_hookspecs(DatasetSpecs)
+    recorder = _NodeRecorder()
+    hooks.register(recorder)
+    runner = WorkQueueRunner(queue_dir=str(tmp_path / "queue"), local_workers=0, coordinator_claims=True, poll=0.01,
+                             settings=QueueSettings(lease_timeout=30.0, heartbeat=0.05, max_attempts=1))
+
+    outputs = runner.run(pipeline, catalog, hook_manager=hooks)
+
+    assert outputs["z"] == 9
+    assert catalog.load("y") == 6
+    # la celda la corrió el coordinador desde la cola, con los hooks de nodo
+    assert [e for e in recorder.events if e[1] == "cell"] == [("before", "cell"), ("after", "cell")]
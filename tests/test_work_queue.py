@@ -0,0 +1,87 @@
+"""Protocolo de archivos de la cola de trabajo: reclamo, lease vencido y resultado."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from analisis_calidad_estimacion_1pl_bayesiana.work_queue import QueueSettings, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path) -> WorkQueue:
+    q = WorkQueue(tmp_path, "run", QueueSettings(lease_timeout=30.0, heartbeat=0.05, max_attempts=2)).create()
+    q.publish("low", {"node": "low", "priority": 1.0})
+    q.publish("high", {"node": "high", "priority": 5.0})
+    return q
+
+
+def _expire(lease, queue: WorkQueue) -> None:
+    """Lleva el mtime del lease más atrás que ``lease_timeout`` (worker caído)."""
+    old = queue._fs_now() - 10 * queue.settings.lease_timeout
+    os.utime(lease.path, (old, old))
+
+
+def test_claims_by_priority_and_only_once(queue):
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+
+    assert (first.task_id, first.attempt) == ("high", 1)
+    assert (second.task_id, second.attempt) == ("low", 1)
+    assert queue.claim("w3") is None
+    assert queue.counts() == {"tasks": 2, "ok": 0, "failed": 0, "running": 2, "pending": 0}
+
+
+def test_settings_are_read_back_by_workers(queue):
+    assert WorkQueue(queue.dir.parent, queue.run_id).settings == queue.settings
+
+
+def test_expired_lease_is_reclaimed_with_next_attempt(queue):
+    stale = queue.claim("crashed")
+    queue.claim("busy")
+    _expire(stale, queue)
+
+    reclaimed = queue.claim("w2")
+
+    assert (reclaimed.task_id, reclaimed.attempt) == (stale.task_id, 2)
+    assert queue.latest_attempt(stale.task_id) == 2
+    # Sólo un reclamo del mismo intento gana
+    assert queue.claim("w3") is None
+
+
+def test_live_heartbeat_keeps_the_lease(queue):
+    lease = queue.claim("w1")
+    queue.claim("w1")
+    _expire(lease, queue)
+
+    with lease:
+        lease._stop.wait(0.3)  # varios heartbeats
+        assert queue.claim("w2") is None
+    assert not lease.path.exists()
+
+
+def test_too_many_expired_attempts_mark_the_task_failed(queue):
+    queue.claim("busy")  # "high" sigue corriendo
+    first = queue.claim("w1")
+    _expire(first, queue)
+    second = queue.claim("w2")
+    assert second.attempt == 2
+    _expire(second, queue)
+
+    assert queue.claim("w3") is None
+
+    result = queue.result("low")
+    assert result["status"] == "failed" and result["attempt"] == 2
+    assert queue.counts()["failed"] == 1
+
+
+def test_complete_is_exclusive(queue):
+    lease = queue.claim("w1")
+    _expire(lease, queue)
+    late = queue.claim("w2")
+
+    assert queue.complete(late, "w2", seconds=1.0)
+    assert not queue.complete(lease, "w1", seconds=5.0)
+    assert queue.result("high")["worker"] == "w2"
+    # Una tarea terminada no se vuelve a reclamar
+    assert queue.claim("w3").task_id == "low"